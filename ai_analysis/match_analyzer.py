@@ -240,15 +240,27 @@ class AIMatchAnalyzer:
         
         return surface_preferences.get(surface, 'neutral')
     
+    async def _get_recent_opportunities(self, hours: int) -> List:
+        """Fetch recent opportunities without blocking the event loop
+        
+        Uses the awaitable API of AsyncOddsDatabase when given one, and runs a
+        plain OddsDatabase query in a worker thread otherwise.
+        """
+        if not self.database:
+            return []
+        
+        recent_opportunities = getattr(self.database, 'recent_opportunities', None)
+        if recent_opportunities and asyncio.iscoroutinefunction(recent_opportunities):
+            return await recent_opportunities(hours=hours)
+        
+        return await asyncio.to_thread(self.database.get_recent_opportunities, hours=hours)
+    
     async def _get_historical_context(self, opportunity) -> str:
         """Get historical context for the match/teams"""
         
         try:
             # Get recent opportunities for similar matches (if database available)
-            if self.database:
-                recent_opportunities = self.database.get_recent_opportunities(hours=168)  # 1 week
-            else:
-                recent_opportunities = []
+            recent_opportunities = await self._get_recent_opportunities(hours=168)  # 1 week
             
             # Filter for same league
             league_opportunities = [
@@ -441,10 +453,7 @@ class AIMatchAnalyzer:
         
         try:
             # Get recent opportunities (if database available)
-            if self.database:
-                opportunities = self.database.get_recent_opportunities(hours=168 * 4)  # 4 weeks
-            else:
-                opportunities = []
+            opportunities = await self._get_recent_opportunities(hours=168 * 4)  # 4 weeks
             
             if len(opportunities) < 10:
                 logger.warning("Insufficient data for pattern analysis")
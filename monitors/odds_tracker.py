@@ -57,9 +57,15 @@ class OddsMovement:
 class OddsTracker:
     """Real-time odds tracking and movement detection"""
     
-    def __init__(self):
+    def __init__(self, database=None):
+        """
+        Args:
+            database: Optional AsyncOddsDatabase; fetched snapshots are stored
+                through its awaitable API, off the event loop
+        """
         self.config = LiveMonitoringConfig()
         self.session: Optional[aiohttp.ClientSession] = None
+        self.database = database
         
         # Storage for current and historical odds
         self.current_odds: Dict[str, OddsSnapshot] = {}
@@ -142,6 +148,12 @@ class OddsTracker:
                             snapshots.append(snapshot)
                     
                     logger.debug(f"Fetched {len(snapshots)} odds from {league}")
+                    
+                    if self.database and snapshots:
+                        try:
+                            await self.database.store_many(snapshots)
+                        except Exception as e:
+                            logger.error(f"Error storing odds for {league}: {e}")
                     return snapshots
                 
                 elif response.status == 429:
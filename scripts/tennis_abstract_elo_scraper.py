@@ -7,7 +7,9 @@ Production-ready scraper that fetches ELO ratings from tennisabstract.com
 and updates Player Cards database in Notion.
 
 Features:
-- Scrapes player ELO ratings (Overall, Hard, Clay, Grass)
+- Local ELO ratings from src/ml/elo_engine.py by default (no network)
+- Scrapes player ELO ratings (Overall, Hard, Clay, Grass) with --source scrape,
+  or as a cross-check of the local ratings with --cross-check
 - Updates Player Cards DB in Notion
 - Calculates ELO Change (7D, 30D, 90D)
 - Rate limiting and retry logic
@@ -26,7 +28,7 @@ from dataclasses import dataclass
 from dotenv import load_dotenv
 
 # Add project root to path
-project_root = Path(__file__).parent.parent.parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 # Load environment variables
@@ -53,6 +55,8 @@ except ImportError:
     print("❌ ERROR: requests or beautifulsoup4 not installed")
     print("   Install: pip install requests beautifulsoup4")
 
+from src.ml.player_resolver import get_resolver
+
 logger = logging.getLogger(__name__)
 
 
@@ -323,6 +327,9 @@ class PlayerCardsELOUpdater:
         """
         Find Player Card page ID by name
         
+        Uses the shared player resolver (Player Cards are scanned once per
+        run, then names resolve from the alias table).
+        
         Args:
             player_name: Player name to search for
             
@@ -333,51 +340,9 @@ class PlayerCardsELOUpdater:
             return None
         
         try:
-            # Query Player Cards database for matching name
-            response = self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "or": [
-                        {
-                            "property": "Name",
-                            "title": {
-                                "contains": player_name
-                            }
-                        },
-                        {
-                            "property": "Player Name",
-                            "rich_text": {
-                                "contains": player_name
-                            }
-                        }
-                    ]
-                }
-            )
-            
-            results = response.get('results', [])
-            if results:
-                # Try exact match first
-                for result in results:
-                    props = result.get('properties', {})
-                    name_props = ['Name', 'Player Name', 'Full Name']
-                    for prop_name in name_props:
-                        prop = props.get(prop_name, {})
-                        if prop.get('title'):
-                            db_name = prop['title'][0]['plain_text']
-                        elif prop.get('rich_text'):
-                            db_name = prop['rich_text'][0]['plain_text']
-                        else:
-                            continue
-                        
-                        # Exact or last name match
-                        if (player_name.lower() == db_name.lower() or
-                            player_name.split()[-1].lower() == db_name.split()[-1].lower()):
-                            return result['id']
-                
-                # Return first result if no exact match
-                return results[0]['id']
-            
-            return None
+            resolver = get_resolver()
+            resolver.sync_notion_cards(self.client, self.database_id)
+            return resolver.notion_page_id(player_name)
             
         except Exception as e:
             logger.error(f"❌ Error finding player card for {player_name}: {e}")
@@ -523,6 +488,65 @@ class PlayerCardsELOUpdater:
             return None
 
 
+def get_local_elo(player_names: List[str]) -> Dict[str, Optional[PlayerELO]]:
+    """
+    Get ELO ratings from the local Elo engine (match results database)
+    
+    Args:
+        player_names: Player names
+        
+    Returns:
+        Dictionary mapping player name to PlayerELO (None if unrated)
+    """
+    from src.ml.elo_engine import EloEngine
+    
+    engine = EloEngine()
+    results = {}
+    for player_name in player_names:
+        ratings = engine.get_player_ratings(player_name)
+        if not ratings:
+            logger.warning(f"⚠️ No local ELO for {player_name}")
+            results[player_name] = None
+            continue
+        results[player_name] = PlayerELO(
+            player_name=player_name,
+            overall_elo=ratings['overall'],
+            hard_elo=ratings['hard'],
+            clay_elo=ratings['clay'],
+            grass_elo=ratings['grass']
+        )
+    return results
+
+
+def cross_check_elo(local_results: Dict[str, Optional[PlayerELO]],
+                    scraper: TennisAbstractELOScraper) -> Dict[str, Optional[float]]:
+    """
+    Compare local ELO ratings with Tennis Abstract (slow, network)
+    
+    Args:
+        local_results: Ratings from get_local_elo
+        scraper: Tennis Abstract scraper
+        
+    Returns:
+        Dictionary mapping player name to overall ELO difference (local - scraped)
+    """
+    rated = [name for name, elo in local_results.items() if elo and elo.overall_elo]
+    scraped = scraper.scrape_multiple_players(rated)
+    
+    differences = {}
+    for player_name in rated:
+        remote = scraped.get(player_name)
+        if remote and remote.overall_elo:
+            differences[player_name] = local_results[player_name].overall_elo - remote.overall_elo
+            logger.info(
+                f"🔍 {player_name}: local {local_results[player_name].overall_elo:.0f} "
+                f"vs Tennis Abstract {remote.overall_elo:.0f} ({differences[player_name]:+.0f})"
+            )
+        else:
+            differences[player_name] = None
+    return differences
+
+
 def main():
     """Main entry point"""
     import argparse
@@ -531,6 +555,10 @@ def main():
     parser.add_argument('--players', nargs='+', help='Player names to scrape')
     parser.add_argument('--limit', type=int, default=100, help='Limit number of players (default: 100)')
     parser.add_argument('--test', action='store_true', help='Test mode (5 players only)')
+    parser.add_argument('--source', choices=['local', 'scrape'], default='local',
+                        help='ELO source: local Elo engine (default) or tennisabstract.com scrape')
+    parser.add_argument('--cross-check', action='store_true',
+                        help='With --source local, also scrape tennisabstract.com and log differences')
     args = parser.parse_args()
     
     logging.basicConfig(
@@ -538,12 +566,13 @@ def main():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
     
-    # Initialize scraper
-    if not REQUESTS_AVAILABLE:
+    # Initialize scraper (only needed for scraping / cross-checking)
+    needs_scraper = args.source == 'scrape' or args.cross_check
+    if needs_scraper and not REQUESTS_AVAILABLE:
         logger.error("❌ Required packages not installed")
         return
     
-    scraper = TennisAbstractELOScraper()
+    scraper = TennisAbstractELOScraper() if needs_scraper else None
     updater = PlayerCardsELOUpdater()
     
     # Get player list
@@ -587,8 +616,13 @@ def main():
             logger.error(f"❌ Error getting player list: {e}")
             return
     
-    # Scrape ELO ratings
-    elo_results = scraper.scrape_multiple_players(player_names)
+    # Get ELO ratings
+    if args.source == 'local':
+        elo_results = get_local_elo(player_names)
+        if args.cross_check:
+            cross_check_elo(elo_results, scraper)
+    else:
+        elo_results = scraper.scrape_multiple_players(player_names)
     
     # Update Player Cards DB
     updated_count = 0
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the FlashScore page parsers on saved pages.
+
+Compares the single-pass parser (lxml tree, one document-order walk) with
+_parse_matches_enhanced (html.parser, backwards tournament lookup per row)
+on the debug HTML saved by the scraper, and checks that both return the
+same matches.
+
+Usage:
+    python scripts/tennis_ai/benchmark_flashscore_parser.py
+    python scripts/tennis_ai/benchmark_flashscore_parser.py --repeat 5 data/debug_W15_*.html
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from bs4 import BeautifulSoup
+
+from src.scrapers.flashscore_itf_scraper import FlashScoreITFScraperEnhanced, HTML_PARSER
+
+
+def _comparable(matches):
+    """Match dicts without the per-call timestamp"""
+    return [{k: v for k, v in m.items() if k != 'scraped_at'} for m in matches]
+
+
+def _best_time(func, repeat):
+    """Fastest of repeat runs (seconds) and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark(paths, tier='W15', repeat=3):
+    """
+    Time both parsers on each page
+
+    Returns:
+        True if both parsers agree on every page
+    """
+    scraper = FlashScoreITFScraperEnhanced(use_selenium=False)
+    all_equal = True
+
+    print(f"\n{'page':40} {'rows':>5} {'matches':>8} {'enhanced':>10} {'single-pass':>12} {'speedup':>8}  same")
+    for path in paths:
+        html = Path(path).read_text(encoding='utf-8')
+        rows = html.count('event__match ')
+
+        old_time, old = _best_time(
+            lambda: scraper._parse_matches_enhanced(BeautifulSoup(html, 'html.parser'), tier), repeat)
+        new_time, new = _best_time(
+            lambda: scraper._parse_matches_linear(BeautifulSoup(html, HTML_PARSER), tier), repeat)
+
+        same = _comparable(old) == _comparable(new)
+        all_equal &= same
+        speedup = old_time / new_time if new_time else float('inf')
+        print(f"{Path(path).name:40} {rows:>5} {len(new):>8} {old_time:>9.3f}s {new_time:>11.3f}s "
+              f"{speedup:>7.1f}x  {'✅' if same else '❌'}")
+
+    return all_equal
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FlashScore page parsers')
+    parser.add_argument('pages', nargs='*', help='Saved HTML pages (default: data/debug_W15_*.html)')
+    parser.add_argument('--tier', default='W15', help='Tier label passed to the parsers')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per parser (best is reported)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    pages = args.pages or sorted(str(p) for p in (project_root / 'data').glob('debug_W15_*.html'))
+    if not pages:
+        print("❌ No saved pages found (enable save_debug_html in the scraper config)")
+        sys.exit(1)
+
+    print(f"🧪 Parser benchmark ({HTML_PARSER} tree builder for single pass)")
+    if benchmark(pages, args.tier, args.repeat):
+        print("\n✅ Both parsers return identical matches")
+    else:
+        print("\n❌ Parsers disagree")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,8 @@ except ImportError:
     print("❌ ERROR: notion-client not installed")
     exit(1)
 
+from src.ml.player_resolver import get_resolver
+
 logger = logging.getLogger(__name__)
 
 # CONFIG
@@ -62,6 +64,9 @@ def find_player_card_by_name(player_name: str) -> Optional[str]:
     """
     Find Player Card page ID by player name
     
+    Uses the shared player resolver (Player Cards are scanned once per run,
+    then names resolve from the alias table).
+    
     Args:
         player_name: Player name to search for
     
@@ -72,50 +77,9 @@ def find_player_card_by_name(player_name: str) -> Optional[str]:
         return None
     
     try:
-        # Query Player Cards database for matching name
-        response = notion_client.databases.query(
-            database_id=PLAYER_CARDS_DB_ID,
-            filter={
-                "or": [
-                    {
-                        "property": "Name",
-                        "title": {
-                            "contains": player_name
-                        }
-                    },
-                    {
-                        "property": "Player Name",
-                        "rich_text": {
-                            "contains": player_name
-                        }
-                    }
-                ]
-            }
-        )
-        
-        results = response.get('results', [])
-        if results:
-            # Try exact match first
-            for result in results:
-                props = result.get('properties', {})
-                # Check various name property formats
-                name_props = ['Name', 'Player Name', 'Full Name']
-                for prop_name in name_props:
-                    prop = props.get(prop_name, {})
-                    if prop.get('title'):
-                        db_name = prop['title'][0]['plain_text']
-                    elif prop.get('rich_text'):
-                        db_name = prop['rich_text'][0]['plain_text']
-                    else:
-                        continue
-                    
-                    # Exact or last name match
-                    if (player_name.lower() == db_name.lower() or
-                        player_name.split()[-1].lower() == db_name.split()[-1].lower()):
-                        return result['id']
-            
-            # Return first result if no exact match
-            return results[0]['id']
+        resolver = get_resolver()
+        resolver.sync_notion_cards(notion_client, PLAYER_CARDS_DB_ID)
+        return resolver.notion_page_id(player_name)
         
     except Exception as e:
         logger.error(f"❌ Error finding player card for {player_name}: {e}")
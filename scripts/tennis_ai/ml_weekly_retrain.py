@@ -20,6 +20,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.ml.xgboost_trainer import XGBoostTrainer
 from src.ml.lightgbm_trainer import LightGBMTrainer
 from src.ml.data_collector import MatchResultsDB
+from src.ml.incremental_learner import IncrementalLearner
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +29,32 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def search_params(trainer, args, matrix) -> dict:
+    """
+    Best parameters from a walk-forward CV search across all cores
+    
+    Returns:
+        train() keyword arguments ({} to keep the defaults)
+    """
+    if args.no_search:
+        return {}
+    
+    search = trainer.search(
+        n_iter=args.search_iter,
+        n_folds=args.folds,
+        workers=args.workers,
+        limit=args.limit,
+        matrix=matrix
+    )
+    if not search.get('success'):
+        logger.warning(f"⚠️ Hyperparameter search failed: {search.get('error')} - using default parameters")
+        return {}
+    
+    logger.info(f"🏆 Best parameters: {search['best_params']} "
+                f"(CV log-loss {search['best_log_loss']:.4f}, accuracy {search['best_accuracy']:.3f})")
+    return search['best_params']
+
+
 def main():
     """Run weekly retraining"""
     import argparse
@@ -36,6 +63,10 @@ def main():
     parser.add_argument('--limit', type=int, help='Limit training samples')
     parser.add_argument('--xgboost-only', action='store_true', help='Only retrain XGBoost')
     parser.add_argument('--lightgbm-only', action='store_true', help='Only retrain LightGBM')
+    parser.add_argument('--no-search', action='store_true', help='Skip hyperparameter search (default parameters)')
+    parser.add_argument('--search-iter', type=int, default=24, help='Random-search budget per model')
+    parser.add_argument('--folds', type=int, default=5, help='Walk-forward CV folds')
+    parser.add_argument('--workers', type=int, help='Search worker processes (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -59,6 +90,11 @@ def main():
         logger.info("💡 Collect more match results before retraining")
         return
     
+    # Cached training matrix, topped up with rows added since the last run
+    learner = IncrementalLearner()
+    X, y, watermark = learner.load_training_matrix()
+    matrix = (X, y)
+    
     results = {}
     
     # Retrain XGBoost
@@ -68,10 +104,13 @@ def main():
         logger.info("=" * 80)
         
         xgboost_trainer = XGBoostTrainer()
-        xgboost_result = xgboost_trainer.train(limit=args.limit)
+        params = search_params(xgboost_trainer, args, matrix)
+        xgboost_result = xgboost_trainer.train(**params, limit=args.limit, matrix=matrix)
         
         if xgboost_result.get('success'):
             xgboost_trainer.save_model()
+            xgboost_trainer.export_arrays()
+            xgboost_trainer.register_version(xgboost_result, {'results_through': watermark.get('results')})
             results['xgboost'] = xgboost_result
             logger.info("✅ XGBoost model retrained and saved")
         else:
@@ -85,16 +124,23 @@ def main():
         logger.info("=" * 80)
         
         lightgbm_trainer = LightGBMTrainer()
-        lightgbm_result = lightgbm_trainer.train(limit=args.limit)
+        params = search_params(lightgbm_trainer, args, matrix)
+        lightgbm_result = lightgbm_trainer.train(**params, limit=args.limit, matrix=matrix)
         
         if lightgbm_result.get('success'):
             lightgbm_trainer.save_model()
+            lightgbm_trainer.export_arrays()
+            lightgbm_trainer.register_version(lightgbm_result, {'results_through': watermark.get('results')})
             results['lightgbm'] = lightgbm_result
             logger.info("✅ LightGBM model retrained and saved")
         else:
             logger.error(f"❌ LightGBM training failed: {lightgbm_result.get('error')}")
             results['lightgbm'] = {'success': False, 'error': lightgbm_result.get('error')}
     
+    # Incremental updates continue from this retrain
+    if not args.limit:
+        learner.record_full_retrain(watermark, results)
+    
     # Summary
     logger.info("\n" + "=" * 80)
     logger.info("✅ WEEKLY RETRAINING COMPLETED")
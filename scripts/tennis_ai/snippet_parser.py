@@ -18,8 +18,14 @@ Usage:
 """
 
 import re
+import sys
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from difflib import SequenceMatcher
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.ml.player_resolver import name_similarity
 
 
 def normalize_player_name(name: str) -> str:
@@ -46,7 +52,8 @@ def normalize_player_name(name: str) -> str:
 def fuzzy_match_name(name1: str, name2: str, threshold: float = 0.6) -> bool:
     """
     Check if two player names match (fuzzy matching).
-    Handles abbreviations and variations.
+    Handles abbreviations and variations; scoring is shared with the
+    player resolver (initial + surname, sequence similarity for typos).
     """
     norm1 = normalize_player_name(name1).lower()
     norm2 = normalize_player_name(name2).lower()
@@ -59,9 +66,8 @@ def fuzzy_match_name(name1: str, name2: str, threshold: float = 0.6) -> bool:
     if norm1 in norm2 or norm2 in norm1:
         return True
     
-    # Sequence similarity
-    similarity = SequenceMatcher(None, norm1, norm2).ratio()
-    return similarity >= threshold
+    # Initial + surname / sequence similarity
+    return name_similarity(name1, name2) >= threshold
 
 
 def validate_tennis_score(games: int) -> bool:
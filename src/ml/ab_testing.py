@@ -7,6 +7,12 @@ Test multiple strategies in parallel.
 Track performance per strategy.
 Automatic strategy selection.
 
+Results are recorded in batches: one executemany insert plus one UPSERT per
+strategy that adds the batch totals to performance_summary inside the same
+transaction, so concurrent writers never overwrite each other's counts.
+Strategy selection reads only those aggregates; Bayesian win-rate
+posteriors for every strategy are sampled as one NumPy array.
+
 This is part of Layer 5: Continuous Learning.
 """
 
@@ -15,14 +21,47 @@ import json
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable
 from dataclasses import dataclass, asdict
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Strategies need this many results before they can be selected
+MIN_MATCHES = 10
+
+# Sequential test: stop once the best strategy's expected win-rate loss is below this
+EXPECTED_LOSS_THRESHOLD = 0.01
+
+RESULT_INSERT_SQL = """
+    INSERT INTO strategy_results
+    (strategy_id, match_id, prediction_json, actual_result, stake, return_amount, profit)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Adds batch totals; SET expressions read the pre-update row
+SUMMARY_UPSERT_SQL = """
+    INSERT INTO performance_summary
+    (strategy_id, matches_played, wins, losses, win_rate, roi, total_stake, total_return, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (strategy_id) DO UPDATE SET
+        matches_played = matches_played + excluded.matches_played,
+        wins = wins + excluded.wins,
+        losses = losses + excluded.losses,
+        win_rate = CAST(wins + excluded.wins AS REAL) / (matches_played + excluded.matches_played),
+        roi = CASE WHEN total_stake + excluded.total_stake > 0
+              THEN (total_return + excluded.total_return - total_stake - excluded.total_stake)
+                   / (total_stake + excluded.total_stake)
+              ELSE 0.0 END,
+        total_stake = total_stake + excluded.total_stake,
+        total_return = total_return + excluded.total_return,
+        last_updated = excluded.last_updated
+"""
+
 
 @dataclass
 class StrategyResult:
@@ -161,7 +200,7 @@ class ABTestingFramework:
                      stake: float,
                      return_amount: float) -> bool:
         """
-        Record a strategy result
+        Record a strategy result (see record_results_batch)
         
         Args:
             strategy_id: Strategy identifier
@@ -174,71 +213,117 @@ class ABTestingFramework:
         Returns:
             True if successful
         """
+        return self.record_results_batch([{
+            'strategy_id': strategy_id,
+            'match_id': match_id,
+            'prediction': prediction,
+            'actual_result': actual_result,
+            'stake': stake,
+            'return_amount': return_amount
+        }]) == 1
+    
+    def record_results_batch(self, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Record strategy results in one transaction
+        
+        Rows are inserted with executemany and each strategy's summary is
+        incremented by the batch totals with an UPSERT, so the summary never
+        misses results written concurrently by another process.
+        
+        Args:
+            results: Dictionaries with the record_result arguments
+                (strategy_id, match_id, prediction, actual_result, stake, return_amount)
+            
+        Returns:
+            Number of results recorded (0 on failure)
+        """
+        rows = []
+        totals: Dict[str, List[float]] = {}
+        for result in results:
+            stake = float(result['stake'])
+            return_amount = float(result['return_amount'])
+            won = result['actual_result'] == 'win'
+            rows.append((
+                result['strategy_id'], result.get('match_id'), json.dumps(result.get('prediction') or {}),
+                result['actual_result'], stake, return_amount, return_amount - stake
+            ))
+            total = totals.setdefault(result['strategy_id'], [0, 0, 0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += int(won)
+            total[2] += int(not won)
+            total[3] += stake
+            total[4] += return_amount
+        
+        if not rows:
+            return 0
+        
+        now = datetime.now().isoformat()
+        summaries = [
+            (strategy_id, n, wins, losses, wins / n,
+             (total_return - total_stake) / total_stake if total_stake > 0 else 0.0,
+             total_stake, total_return, now)
+            for strategy_id, (n, wins, losses, total_stake, total_return) in totals.items()
+        ]
+        
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+        
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            cursor.executemany(RESULT_INSERT_SQL, rows)
+            cursor.executemany(SUMMARY_UPSERT_SQL, summaries)
+            conn.commit()
+            return len(rows)
             
-            profit = return_amount - stake
-            prediction_json = json.dumps(prediction)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error recording results: {e}")
+            return 0
             
+        finally:
+            conn.close()
+    
+    def rebuild_summaries(self) -> int:
+        """
+        Recompute every performance summary from strategy_results
+        
+        Returns:
+            Number of strategies summarized
+        """
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("DELETE FROM performance_summary")
             cursor.execute("""
-                INSERT INTO strategy_results 
-                (strategy_id, match_id, prediction_json, actual_result, stake, return_amount, profit)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (strategy_id, match_id, prediction_json, actual_result, stake, return_amount, profit))
-            
-            # Update performance summary
-            self._update_performance_summary(strategy_id, actual_result == 'win', stake, return_amount)
+                INSERT INTO performance_summary
+                (strategy_id, matches_played, wins, losses, win_rate, roi, total_stake, total_return, last_updated)
+                SELECT strategy_id, COUNT(*),
+                       SUM(actual_result = 'win'), SUM(actual_result != 'win'),
+                       AVG(actual_result = 'win'),
+                       CASE WHEN SUM(stake) > 0 THEN (SUM(return_amount) - SUM(stake)) / SUM(stake) ELSE 0.0 END,
+                       SUM(stake), SUM(return_amount), ?
+                FROM strategy_results
+                GROUP BY strategy_id
+            """, (datetime.now().isoformat(),))
+            rebuilt = cursor.rowcount
             
+            # Registered strategies without results keep an empty summary
+            cursor.execute("""
+                INSERT OR IGNORE INTO performance_summary (strategy_id)
+                SELECT strategy_id FROM strategies
+            """)
             conn.commit()
-            conn.close()
             
-            return True
+            logger.info(f"✅ Rebuilt performance summaries for {rebuilt} strategies")
+            return rebuilt
             
         except Exception as e:
-            logger.error(f"Error recording result: {e}")
-            return False
-    
-    def _update_performance_summary(self, strategy_id: str, won: bool, stake: float, return_amount: float):
-        """Update performance summary for a strategy"""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        
-        # Get current summary
-        cursor.execute("""
-            SELECT matches_played, wins, losses, total_stake, total_return
-            FROM performance_summary WHERE strategy_id = ?
-        """, (strategy_id,))
-        
-        row = cursor.fetchone()
-        if row:
-            matches_played, wins, losses, total_stake, total_return = row
-        else:
-            matches_played, wins, losses, total_stake, total_return = 0, 0, 0, 0.0, 0.0
-        
-        # Update
-        matches_played += 1
-        if won:
-            wins += 1
-        else:
-            losses += 1
-        
-        total_stake += stake
-        total_return += return_amount
-        
-        win_rate = wins / matches_played if matches_played > 0 else 0.0
-        roi = (total_return - total_stake) / total_stake if total_stake > 0 else 0.0
-        
-        cursor.execute("""
-            UPDATE performance_summary
-            SET matches_played = ?, wins = ?, losses = ?, win_rate = ?, 
-                roi = ?, total_stake = ?, total_return = ?, last_updated = ?
-            WHERE strategy_id = ?
-        """, (matches_played, wins, losses, win_rate, roi, total_stake, total_return,
-              datetime.now().isoformat(), strategy_id))
-        
-        conn.commit()
-        conn.close()
+            conn.rollback()
+            logger.error(f"Error rebuilding performance summaries: {e}")
+            return 0
+            
+        finally:
+            conn.close()
     
     def get_strategy_performance(self, strategy_id: str, days: int = 30) -> Optional[StrategyResult]:
         """
@@ -289,34 +374,38 @@ class ABTestingFramework:
             logger.error(f"Error getting strategy performance: {e}")
             return None
     
-    def get_best_strategy(self, metric: str = 'roi') -> Optional[str]:
+    def get_best_strategy(self, metric: str = 'roi', min_matches: int = MIN_MATCHES) -> Optional[str]:
         """
         Get best performing strategy
         
         Args:
-            metric: Metric to use ('roi' or 'win_rate')
+            metric: Metric to use ('roi', 'win_rate', or 'prob_best' for the
+                posterior probability of having the highest win rate)
+            min_matches: Minimum recorded results per strategy
             
         Returns:
             Strategy ID of best strategy or None
         """
+        if metric == 'prob_best':
+            posteriors = self.get_win_rate_posteriors(min_matches=min_matches)
+            if not posteriors['strategies']:
+                return None
+            return max(posteriors['strategies'], key=lambda s: s['prob_best'])['strategy_id']
+        
+        if metric not in ('roi', 'win_rate'):
+            logger.error(f"Unknown metric: {metric}")
+            return None
+        
         try:
             conn = sqlite3.connect(str(self.db_path))
             cursor = conn.cursor()
             
-            if metric == 'roi':
-                cursor.execute("""
-                    SELECT strategy_id FROM performance_summary
-                    WHERE matches_played >= 10
-                    ORDER BY roi DESC
-                    LIMIT 1
-                """)
-            else:
-                cursor.execute("""
-                    SELECT strategy_id FROM performance_summary
-                    WHERE matches_played >= 10
-                    ORDER BY win_rate DESC
-                    LIMIT 1
-                """)
+            cursor.execute(f"""
+                SELECT strategy_id FROM performance_summary
+                WHERE matches_played >= ?
+                ORDER BY {metric} DESC
+                LIMIT 1
+            """, (min_matches,))
             
             row = cursor.fetchone()
             conn.close()
@@ -327,6 +416,83 @@ class ABTestingFramework:
             logger.error(f"Error getting best strategy: {e}")
             return None
     
+    def get_win_rate_posteriors(self,
+                                min_matches: int = 0,
+                                prior_alpha: float = 1.0,
+                                prior_beta: float = 1.0,
+                                n_samples: int = 20000,
+                                seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Bayesian sequential test over the win rates of all strategies
+        
+        Each strategy's win rate has a Beta(prior_alpha + wins, prior_beta +
+        losses) posterior. One (n_samples, n_strategies) draw gives every
+        strategy's probability of being best and its expected loss (win rate
+        given up by choosing it); the test stops when the best strategy's
+        expected loss falls below EXPECTED_LOSS_THRESHOLD.
+        
+        Args:
+            min_matches: Minimum recorded results per strategy
+            prior_alpha: Beta prior wins
+            prior_beta: Beta prior losses
+            n_samples: Monte Carlo draws
+            seed: Random seed
+            
+        Returns:
+            Dictionary with per-strategy posteriors ('strategies', sorted by
+            prob_best), the 'leader' and 'decision' (leader if the test
+            stopped, else None)
+        """
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+            rows = conn.execute("""
+                SELECT strategy_id, wins, losses FROM performance_summary
+                WHERE matches_played >= ? AND matches_played > 0
+                ORDER BY strategy_id
+            """, (min_matches,)).fetchall()
+            conn.close()
+            
+        except Exception as e:
+            logger.error(f"Error getting win-rate posteriors: {e}")
+            rows = []
+        
+        if not rows:
+            return {'strategies': [], 'leader': None, 'decision': None}
+        
+        strategy_ids = [row[0] for row in rows]
+        wins = np.array([row[1] for row in rows], dtype=np.float64)
+        losses = np.array([row[2] for row in rows], dtype=np.float64)
+        alpha = prior_alpha + wins
+        beta = prior_beta + losses
+        
+        rng = np.random.default_rng(seed)
+        samples = rng.beta(alpha, beta, size=(n_samples, len(rows)))
+        
+        best = samples.max(axis=1, keepdims=True)
+        prob_best = np.bincount(samples.argmax(axis=1), minlength=len(rows)) / n_samples
+        expected_loss = (best - samples).mean(axis=0)
+        ci_low, ci_high = np.quantile(samples, [0.025, 0.975], axis=0)
+        mean = alpha / (alpha + beta)
+        
+        strategies = [{
+            'strategy_id': strategy_id,
+            'wins': int(wins[i]),
+            'losses': int(losses[i]),
+            'posterior_mean': float(mean[i]),
+            'ci_low': float(ci_low[i]),
+            'ci_high': float(ci_high[i]),
+            'prob_best': float(prob_best[i]),
+            'expected_loss': float(expected_loss[i])
+        } for i, strategy_id in enumerate(strategy_ids)]
+        strategies.sort(key=lambda s: s['prob_best'], reverse=True)
+        
+        leader = strategies[0]
+        return {
+            'strategies': strategies,
+            'leader': leader['strategy_id'],
+            'decision': leader['strategy_id'] if leader['expected_loss'] < EXPECTED_LOSS_THRESHOLD else None
+        }
+    
     def get_all_strategies(self) -> List[Dict[str, Any]]:
         """
         Get all registered strategies
@@ -385,6 +551,19 @@ def main():
     print(f"\n📊 Registered Strategies: {len(strategies)}")
     for strategy in strategies:
         print(f"   {strategy['name']}: {strategy.get('win_rate', 0):.1%} win rate, {strategy.get('roi', 0):.1%} ROI")
+    
+    # Sequential test on the recorded results
+    posteriors = framework.get_win_rate_posteriors()
+    if posteriors['strategies']:
+        print("\n📈 Win-Rate Posteriors:")
+        for s in posteriors['strategies']:
+            print(f"   {s['strategy_id']}: {s['posterior_mean']:.1%} "
+                  f"[{s['ci_low']:.1%}, {s['ci_high']:.1%}], P(best) {s['prob_best']:.1%}, "
+                  f"expected loss {s['expected_loss']:.3f}")
+        if posteriors['decision']:
+            print(f"   ✅ Winner: {posteriors['decision']}")
+        else:
+            print(f"   ⏳ No winner yet (leader: {posteriors['leader']})")
 
 
 if __name__ == "__main__":
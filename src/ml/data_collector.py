@@ -14,7 +14,7 @@ import logging
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Iterable, Tuple
 import json
 
 import sys
@@ -24,6 +24,46 @@ from src.scrapers.sportbex_client import SportbexClient, SportbexMatch
 
 logger = logging.getLogger(__name__)
 
+# Keeps created_at of existing matches
+MATCH_UPSERT_SQL = """
+    INSERT INTO matches (
+        match_id, tournament, tournament_tier, player1, player2,
+        player1_ranking, player2_ranking, player1_odds, player2_odds,
+        commence_time, surface, match_date, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (match_id) DO UPDATE SET
+        tournament = excluded.tournament,
+        tournament_tier = excluded.tournament_tier,
+        player1 = excluded.player1,
+        player2 = excluded.player2,
+        player1_ranking = excluded.player1_ranking,
+        player2_ranking = excluded.player2_ranking,
+        player1_odds = excluded.player1_odds,
+        player2_odds = excluded.player2_odds,
+        commence_time = excluded.commence_time,
+        surface = excluded.surface,
+        match_date = excluded.match_date,
+        updated_at = excluded.updated_at
+"""
+
+# Only a changed result is rewritten (and gets a new created_at for the
+# training watermark); re-syncing an unchanged result is a no-op
+RESULT_UPSERT_SQL = """
+    INSERT INTO results (
+        match_id, winner, score, result_date, player1_won, player2_won
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (match_id) DO UPDATE SET
+        winner = excluded.winner,
+        score = excluded.score,
+        result_date = excluded.result_date,
+        player1_won = excluded.player1_won,
+        player2_won = excluded.player2_won,
+        created_at = CURRENT_TIMESTAMP
+    WHERE results.winner IS NOT excluded.winner
+       OR results.score IS NOT excluded.score
+       OR results.player1_won IS NOT excluded.player1_won
+"""
+
 
 class MatchResultsDB:
     """SQLite database for storing match results and training data"""
@@ -41,6 +81,9 @@ class MatchResultsDB:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Callbacks run inside insert_result's transaction
+        self._result_listeners: List[Callable[[sqlite3.Cursor, str], Any]] = []
+        
         self._init_database()
         logger.info(f"✅ Match Results DB initialized: {self.db_path}")
     
@@ -83,7 +126,7 @@ class MatchResultsDB:
             )
         """)
         
-        # Features table - stores extracted features for ML
+        # Features table - JSON feature vectors from before feature_matrix_v{N}
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS features (
                 match_id TEXT PRIMARY KEY,
@@ -95,41 +138,33 @@ class MatchResultsDB:
             )
         """)
         
-        # Training data view - combines matches, results, and features
-        cursor.execute("""
-            CREATE VIEW IF NOT EXISTS training_data AS
-            SELECT 
-                m.match_id,
-                m.tournament,
-                m.tournament_tier,
-                m.player1,
-                m.player2,
-                m.player1_ranking,
-                m.player2_ranking,
-                m.player1_odds,
-                m.player2_odds,
-                m.commence_time,
-                m.surface,
-                m.match_date,
-                r.winner,
-                r.score,
-                r.player1_won,
-                r.player2_won,
-                f.features_json,
-                f.feature_version
-            FROM matches m
-            LEFT JOIN results r ON m.match_id = r.match_id
-            LEFT JOIN features f ON m.match_id = f.match_id
-        """)
+        # Training data is read from FeatureStore's per-version feature_matrix_v{N}
+        # table; the old view over the JSON features table went stale
+        cursor.execute("DROP VIEW IF EXISTS training_data")
         
         # Indexes for performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(match_date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament_tier)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_results_date ON results(result_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_results_created ON results(created_at)")
         
         conn.commit()
         conn.close()
     
+    def add_result_listener(self, listener: Callable[[sqlite3.Cursor, str], Any]):
+        """
+        Register a callback for new results
+        
+        The listener is called as listener(cursor, match_id) after the result
+        row is written and before commit, so its writes commit (or roll back)
+        together with the result.
+        
+        Args:
+            listener: Callable taking (cursor, match_id)
+        """
+        if listener not in self._result_listeners:
+            self._result_listeners.append(listener)
+    
     def insert_match(self, match: SportbexMatch) -> bool:
         """
         Insert or update match data
@@ -144,29 +179,7 @@ class MatchResultsDB:
             conn = sqlite3.connect(str(self.db_path))
             cursor = conn.cursor()
             
-            match_date = match.commence_time.date() if match.commence_time else None
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO matches (
-                    match_id, tournament, tournament_tier, player1, player2,
-                    player1_ranking, player2_ranking, player1_odds, player2_odds,
-                    commence_time, surface, match_date, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                match.match_id,
-                match.tournament,
-                match.tournament_tier,
-                match.player1,
-                match.player2,
-                match.player1_ranking,
-                match.player2_ranking,
-                match.player1_odds,
-                match.player2_odds,
-                match.commence_time.isoformat() if match.commence_time else None,
-                match.surface,
-                match_date.isoformat() if match_date else None,
-                datetime.now().isoformat()
-            ))
+            cursor.execute(MATCH_UPSERT_SQL, self._match_row(match))
             
             conn.commit()
             conn.close()
@@ -176,6 +189,66 @@ class MatchResultsDB:
             logger.error(f"Error inserting match {match.match_id}: {e}")
             return False
     
+    @staticmethod
+    def _match_row(match: SportbexMatch) -> Tuple:
+        """Parameters of MATCH_UPSERT_SQL for a match"""
+        match_date = match.commence_time.date() if match.commence_time else None
+        return (
+            match.match_id,
+            match.tournament,
+            match.tournament_tier,
+            match.player1,
+            match.player2,
+            match.player1_ranking,
+            match.player2_ranking,
+            match.player1_odds,
+            match.player2_odds,
+            match.commence_time.isoformat() if match.commence_time else None,
+            match.surface,
+            match_date.isoformat() if match_date else None,
+            datetime.now().isoformat()
+        )
+    
+    def upsert_matches(self, cursor: sqlite3.Cursor, matches: Iterable[SportbexMatch]) -> int:
+        """
+        Insert or update matches on the caller's cursor (caller commits)
+        
+        Args:
+            cursor: Cursor inside the caller's transaction
+            matches: SportbexMatch objects
+            
+        Returns:
+            Number of matches written
+        """
+        rows = [self._match_row(match) for match in matches]
+        cursor.executemany(MATCH_UPSERT_SQL, rows)
+        return len(rows)
+    
+    def upsert_results(self, cursor: sqlite3.Cursor, results: Iterable[Tuple]) -> List[str]:
+        """
+        Insert or update results on the caller's cursor (caller commits)
+        
+        Result listeners run for every new or changed result, in the same
+        transaction.
+        
+        Args:
+            cursor: Cursor inside the caller's transaction
+            results: (match_id, winner, score, result_date, player1_won, player2_won) tuples
+            
+        Returns:
+            Match IDs whose result was new or changed
+        """
+        changed = []
+        for row in results:
+            cursor.execute(RESULT_UPSERT_SQL, row)
+            if cursor.rowcount:
+                changed.append(row[0])
+        
+        for match_id in changed:
+            for listener in self._result_listeners:
+                listener(cursor, match_id)
+        return changed
+    
     def insert_result(self, match_id: str, winner: str, score: Optional[str] = None) -> bool:
         """
         Insert match result
@@ -217,12 +290,18 @@ class MatchResultsDB:
                 player2_won
             ))
             
+            for listener in self._result_listeners:
+                listener(cursor, match_id)
+            
             conn.commit()
             conn.close()
             return True
             
         except Exception as e:
             logger.error(f"Error inserting result for {match_id}: {e}")
+            if 'conn' in locals():
+                conn.rollback()
+                conn.close()
             return False
     
     def get_matches_without_results(self, days_back: int = 7) -> List[Dict]:
@@ -256,31 +335,6 @@ class MatchResultsDB:
         conn.close()
         return matches
     
-    def get_training_data(self, limit: Optional[int] = None) -> List[Dict]:
-        """
-        Get training data (matches with results and features)
-        
-        Args:
-            limit: Maximum number of records to return
-            
-        Returns:
-            List of training data dictionaries
-        """
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM training_data WHERE player1_won IS NOT NULL"
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        data = [dict(row) for row in rows]
-        
-        conn.close()
-        return data
-    
     def count_matches(self) -> int:
         """Get total number of matches"""
         conn = sqlite3.connect(str(self.db_path))
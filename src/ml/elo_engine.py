@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Elo Engine
+==========
+
+Local Elo ratings computed from the Match Results database.
+
+Replays matches + results once, then updates ratings incrementally as
+results land (inside MatchResultsDB.insert_result's transaction). Keeps an
+overall and a per-surface rating per player, plus a pre-match snapshot per
+match so training features only see ratings from before the match.
+
+This feeds Layer 2 (Feature Store) of the Self-Learning AI Engine.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.ml.result_index import ResultIndex
+from src.scrapers.sportbex_client import SportbexMatch
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+OVERALL = 'overall'
+SURFACES = ('hard', 'clay', 'grass')
+
+# K-factor decays with experience: K = K_BASE / (matches + K_OFFSET) ** K_SHAPE
+K_BASE = 250.0
+K_OFFSET = 5.0
+K_SHAPE = 0.4
+
+# SQLite caps host parameters per statement
+_SQL_CHUNK = 900
+
+RATING_UPSERT_SQL = """
+    INSERT INTO player_ratings (player, surface, rating, matches, last_match_id, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (player, surface) DO UPDATE SET
+        rating = excluded.rating,
+        matches = excluded.matches,
+        last_match_id = excluded.last_match_id,
+        updated_at = excluded.updated_at
+"""
+
+MATCH_RATING_INSERT_SQL = """
+    INSERT OR REPLACE INTO match_ratings (
+        match_id, surface, player1_elo, player2_elo,
+        player1_surface_elo, player2_surface_elo, player1_won, applied_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Results in the order they should be replayed
+RESULTS_REPLAY_SQL = """
+    SELECT m.match_id, m.player1, m.player2, m.surface, r.player1_won
+    FROM results r
+    JOIN matches m ON m.match_id = r.match_id
+    WHERE r.player1_won IS NOT NULL
+    {where}
+    ORDER BY COALESCE(m.commence_time, r.result_date), m.match_id
+"""
+
+
+def normalize_surface(surface: Optional[str]) -> Optional[str]:
+    """
+    Map a surface label to 'hard', 'clay' or 'grass'
+
+    Args:
+        surface: Surface as stored in the matches table
+
+    Returns:
+        Surface key, or None if unknown
+    """
+    if not surface:
+        return None
+    surface = surface.lower()
+    if 'clay' in surface:
+        return 'clay'
+    if 'grass' in surface:
+        return 'grass'
+    if 'hard' in surface or 'carpet' in surface or 'indoor' in surface:
+        return 'hard'
+    return None
+
+
+def blend_ratings(overall: float, surface_rating: Optional[float]) -> float:
+    """Average of overall and surface rating (overall alone if no surface)"""
+    if surface_rating is None:
+        return overall
+    return (overall + surface_rating) / 2
+
+
+class EloEngine(ResultIndex):
+    """Overall and per-surface Elo ratings over MatchResultsDB"""
+
+    REPLAY_SQL = RESULTS_REPLAY_SQL
+    SNAPSHOT_TABLE = 'match_ratings'
+    LABEL = 'Elo ratings'
+
+    def _init_tables(self):
+        """Create ratings tables"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        # Current ratings: one row per player and surface ('overall' + surfaces)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_ratings (
+                player TEXT NOT NULL,
+                surface TEXT NOT NULL,
+                rating REAL NOT NULL,
+                matches INTEGER NOT NULL DEFAULT 0,
+                last_match_id TEXT,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (player, surface)
+            )
+        """)
+
+        # Pre-match ratings per rated match (point-in-time features)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS match_ratings (
+                match_id TEXT PRIMARY KEY,
+                surface TEXT,
+                player1_elo REAL,
+                player2_elo REAL,
+                player1_surface_elo REAL,
+                player2_surface_elo REAL,
+                player1_won BOOLEAN,
+                applied_at TIMESTAMP,
+                FOREIGN KEY (match_id) REFERENCES matches(match_id)
+            )
+        """)
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_player_ratings_rating ON player_ratings(surface, rating DESC)")
+
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _k_factor(matches: int) -> float:
+        return K_BASE / (matches + K_OFFSET) ** K_SHAPE
+
+    def _rate(self,
+              state: Dict[Tuple[str, str], List],
+              match_id: str,
+              player1: str,
+              player2: str,
+              surface: Optional[str],
+              player1_won: bool) -> Tuple:
+        """
+        Apply one result to an in-memory rating state
+
+        Args:
+            state: (player, surface) -> [rating, matches]; updated in place
+            match_id: Match ID
+            player1: Player 1 name
+            player2: Player 2 name
+            surface: Normalized surface key (or None)
+            player1_won: Whether player 1 won
+
+        Returns:
+            match_ratings row with the pre-match ratings
+        """
+        scopes = [OVERALL] + ([surface] if surface else [])
+        pre = {}
+        score = 1.0 if player1_won else 0.0
+
+        for scope in scopes:
+            r1, n1 = state.setdefault((player1, scope), [INITIAL_RATING, 0])
+            r2, n2 = state.setdefault((player2, scope), [INITIAL_RATING, 0])
+            pre[scope] = (r1, r2)
+
+            expected = 1.0 / (1.0 + 10 ** ((r2 - r1) / 400.0))
+            state[(player1, scope)] = [r1 + self._k_factor(n1) * (score - expected), n1 + 1]
+            state[(player2, scope)] = [r2 + self._k_factor(n2) * (expected - score), n2 + 1]
+
+        surface_pre = pre.get(surface, (None, None))
+        return (
+            match_id, surface, pre[OVERALL][0], pre[OVERALL][1],
+            surface_pre[0], surface_pre[1], bool(player1_won), datetime.now().isoformat()
+        )
+
+    def _apply_row(self, cursor: sqlite3.Cursor, row: Tuple):
+        """Rate one result against the stored ratings"""
+        match_id, player1, player2, surface, player1_won = row
+        surface = normalize_surface(surface)
+        scopes = [OVERALL] + ([surface] if surface else [])
+
+        # Load the (at most four) affected ratings
+        state = {}
+        cursor.execute(f"""
+            SELECT player, surface, rating, matches FROM player_ratings
+            WHERE player IN (?, ?) AND surface IN ({','.join('?' * len(scopes))})
+        """, (player1, player2, *scopes))
+        for player, scope, rating, matches in cursor.fetchall():
+            state[(player, scope)] = [rating, matches]
+
+        match_row = self._rate(state, match_id, player1, player2, surface, bool(player1_won))
+
+        now = datetime.now().isoformat()
+        cursor.executemany(RATING_UPSERT_SQL, [
+            (player, scope, rating, matches, match_id, now)
+            for (player, scope), (rating, matches) in state.items()
+        ])
+        cursor.execute(MATCH_RATING_INSERT_SQL, match_row)
+
+    def _replay(self, cursor: sqlite3.Cursor, rows: List[Tuple]) -> int:
+        """Recompute all ratings from the full result history"""
+        state: Dict[Tuple[str, str], List] = {}
+        last_match: Dict[str, str] = {}
+        match_rows = []
+
+        for match_id, player1, player2, surface, player1_won in rows:
+            match_rows.append(self._rate(
+                state, match_id, player1, player2, normalize_surface(surface), bool(player1_won)
+            ))
+            last_match[player1] = last_match[player2] = match_id
+
+        now = datetime.now().isoformat()
+        cursor.execute("DELETE FROM player_ratings")
+        cursor.execute("DELETE FROM match_ratings")
+        cursor.executemany(RATING_UPSERT_SQL, [
+            (player, scope, rating, matches, last_match.get(player), now)
+            for (player, scope), (rating, matches) in state.items()
+        ])
+        cursor.executemany(MATCH_RATING_INSERT_SQL, match_rows)
+        return len(last_match)
+
+    def _fetch_ratings(self, cursor: sqlite3.Cursor, players: Iterable[str]) -> Dict[Tuple[str, str], float]:
+        """Current ratings for a set of players, keyed by (player, surface)"""
+        players = list(set(players))
+        ratings = {}
+        for i in range(0, len(players), _SQL_CHUNK):
+            chunk = players[i:i + _SQL_CHUNK]
+            cursor.execute(f"""
+                SELECT player, surface, rating FROM player_ratings
+                WHERE player IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for player, scope, rating in cursor.fetchall():
+                ratings[(player, scope)] = rating
+        return ratings
+
+    def _fetch_snapshots(self, cursor: sqlite3.Cursor, match_ids: List[str]) -> Dict[str, Tuple]:
+        """Pre-match ratings for already-rated matches"""
+        snapshots = {}
+        for i in range(0, len(match_ids), _SQL_CHUNK):
+            chunk = match_ids[i:i + _SQL_CHUNK]
+            cursor.execute(f"""
+                SELECT match_id, player1_elo, player2_elo, player1_surface_elo, player2_surface_elo
+                FROM match_ratings
+                WHERE match_id IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for match_id, *values in cursor.fetchall():
+                snapshots[match_id] = tuple(values)
+        return snapshots
+
+    def get_player_ratings(self, player: str) -> Optional[Dict[str, Any]]:
+        """
+        Current ratings of one player
+
+        Args:
+            player: Player name as stored in matches
+
+        Returns:
+            Dictionary with 'overall', 'hard', 'clay', 'grass' (None if
+            unrated on that surface) and 'matches', or None if unknown
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT surface, rating, matches FROM player_ratings WHERE player = ?", (player,))
+        rows = cursor.fetchall()
+        conn.close()
+
+        if not rows:
+            return None
+
+        ratings: Dict[str, Any] = {scope: None for scope in SURFACES}
+        for scope, rating, matches in rows:
+            ratings[scope] = rating
+            if scope == OVERALL:
+                ratings['matches'] = matches
+        return ratings
+
+    def get_match_elo_batch(self, matches: List[SportbexMatch]) -> List[Dict[str, float]]:
+        """
+        Elo features for many matches with two indexed queries
+
+        Rated (finished) matches use their pre-match snapshot; upcoming
+        matches use current ratings. Each rating is the blend of overall and
+        surface Elo.
+
+        Args:
+            matches: SportbexMatch objects
+
+        Returns:
+            One {'player1_elo', 'player2_elo'} dictionary per match
+        """
+        if not matches:
+            return []
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        snapshots = self._fetch_snapshots(cursor, [m.match_id for m in matches])
+        ratings = self._fetch_ratings(
+            cursor,
+            [p for m in matches if m.match_id not in snapshots for p in (m.player1, m.player2)]
+        )
+        conn.close()
+
+        results = []
+        for m in matches:
+            if m.match_id in snapshots:
+                p1_overall, p2_overall, p1_surface, p2_surface = snapshots[m.match_id]
+            else:
+                surface = normalize_surface(m.surface)
+                p1_overall = ratings.get((m.player1, OVERALL), INITIAL_RATING)
+                p2_overall = ratings.get((m.player2, OVERALL), INITIAL_RATING)
+                p1_surface = ratings.get((m.player1, surface), INITIAL_RATING) if surface else None
+                p2_surface = ratings.get((m.player2, surface), INITIAL_RATING) if surface else None
+
+            results.append({
+                'player1_elo': blend_ratings(p1_overall, p1_surface),
+                'player2_elo': blend_ratings(p2_overall, p2_surface)
+            })
+        return results
+
+    def get_match_elo(self, match: SportbexMatch) -> Dict[str, float]:
+        """
+        Elo features for one match (see get_match_elo_batch)
+
+        Args:
+            match: SportbexMatch object
+
+        Returns:
+            Dictionary with 'player1_elo' and 'player2_elo'
+        """
+        return self.get_match_elo_batch([match])[0]
+
+    def get_top_players(self, surface: str = OVERALL, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Highest rated players
+
+        Args:
+            surface: 'overall', 'hard', 'clay' or 'grass'
+            limit: Number of players
+
+        Returns:
+            List of {'player', 'rating', 'matches'} dictionaries
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT player, rating, matches FROM player_ratings
+            WHERE surface = ?
+            ORDER BY rating DESC
+            LIMIT ?
+        """, (surface, limit))
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return rows
+
+
+def main():
+    """Rebuild and show Elo ratings"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local Elo Engine')
+    parser.add_argument('--rebuild', action='store_true', help='Replay all results from scratch')
+    parser.add_argument('--surface', default=OVERALL, choices=(OVERALL,) + SURFACES, help='Ranking to show')
+    parser.add_argument('--top', type=int, default=20, help='Number of players to show')
+    parser.add_argument('--player', help='Show ratings for one player')
+    args = parser.parse_args()
+
+    engine = EloEngine()
+
+    if args.rebuild:
+        applied = engine.rebuild()
+        print(f"\n✅ Replayed {applied} results")
+
+    if args.player:
+        ratings = engine.get_player_ratings(args.player)
+        if not ratings:
+            print(f"\n❌ No ratings for {args.player}")
+            return
+        print(f"\n🎾 {args.player} ({ratings['matches']} matches)")
+        for scope in (OVERALL,) + SURFACES:
+            value = ratings.get(scope)
+            print(f"   {scope.capitalize():8} {value:.0f}" if value else f"   {scope.capitalize():8} -")
+        return
+
+    print(f"\n🏆 Top {args.top} ({args.surface})")
+    for i, row in enumerate(engine.get_top_players(args.surface, args.top), 1):
+        print(f"   {i:2}. {row['player']:30} {row['rating']:.0f} ({row['matches']} matches)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Feature Backfill
+================
+
+Recomputes stored features that are missing or stale for the current
+FeatureStore.feature_version.
+
+A feature row is stale when the match row, its Elo snapshot or its player
+stats snapshot changed after the features were written. Matches are read
+in chunks, historical data is looked up per chunk, features are computed in
+a process pool and each chunk is written with executemany in a single
+transaction together with a resumable checkpoint.
+
+This is part of Layer 2 (Feature Store) of the Self-Learning AI Engine.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+from src.ml.feature_store import FeatureStore
+from src.scrapers.sportbex_client import SportbexMatch
+
+logger = logging.getLogger(__name__)
+
+# Matches needing (re)computation, in keyset order
+CANDIDATES_SQL = """
+    SELECT m.match_id, m.tournament, m.tournament_tier, m.player1, m.player2,
+           m.player1_ranking, m.player2_ranking, m.player1_odds, m.player2_odds,
+           m.commence_time, m.surface
+    FROM matches m
+    LEFT JOIN {table} f ON f.match_id = m.match_id
+    WHERE m.match_id > ?
+    AND (
+        f.match_id IS NULL
+        OR m.updated_at > f.updated_at
+        OR EXISTS (SELECT 1 FROM match_ratings mr WHERE mr.match_id = m.match_id AND mr.applied_at > f.updated_at)
+        OR EXISTS (SELECT 1 FROM match_player_stats s WHERE s.match_id = m.match_id AND s.applied_at > f.updated_at)
+    )
+    ORDER BY m.match_id
+    LIMIT ?
+"""
+
+
+def _match_from_row(row: Tuple) -> SportbexMatch:
+    """Rebuild a SportbexMatch from a CANDIDATES_SQL row"""
+    (match_id, tournament, tournament_tier, player1, player2, player1_ranking,
+     player2_ranking, player1_odds, player2_odds, commence_time, surface) = row
+
+    if commence_time:
+        try:
+            commence_time = datetime.fromisoformat(commence_time)
+        except ValueError:
+            commence_time = None
+
+    return SportbexMatch(
+        match_id=match_id,
+        tournament=tournament or '',
+        player1=player1,
+        player2=player2,
+        player1_odds=player1_odds,
+        player2_odds=player2_odds,
+        commence_time=commence_time,
+        surface=surface,
+        tournament_tier=tournament_tier,
+        player1_ranking=player1_ranking,
+        player2_ranking=player2_ranking
+    )
+
+
+def _compute_chunk(feature_version: int,
+                   matches: List[SportbexMatch],
+                   match_data: List[Optional[Dict]]) -> np.ndarray:
+    """Worker: feature matrix for one chunk (no database access)"""
+    return FeatureStore.detached(feature_version).extract_features_batch(matches, match_data)
+
+
+class FeatureBackfill:
+    """Recomputes missing or stale feature rows for the current version"""
+
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 chunk_size: int = 2000,
+                 workers: Optional[int] = None):
+        """
+        Initialize feature backfill
+
+        Args:
+            db_path: Path to Match Results database
+            chunk_size: Matches per chunk (one transaction each)
+            workers: Worker processes (default: CPU count)
+        """
+        self.feature_store = FeatureStore(db_path)
+        self.db_path = self.feature_store.db.db_path
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+
+        # Create and catch up the indexes up front: CANDIDATES_SQL reads their
+        # snapshot tables, and backfilled features must see current ratings
+        self.elo = self.feature_store.elo
+        self.player_stats = self.feature_store.player_stats
+
+        self._init_checkpoint_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path))
+
+    def _init_checkpoint_table(self):
+        """Create checkpoint table"""
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS feature_backfill_state (
+                feature_version INTEGER PRIMARY KEY,
+                last_match_id TEXT NOT NULL,
+                rows_done INTEGER NOT NULL DEFAULT 0,
+                started_at TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Checkpoint of an interrupted run for the current feature version
+
+        Returns:
+            Dictionary with last_match_id, rows_done, started_at, or None
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            "SELECT * FROM feature_backfill_state WHERE feature_version = ?",
+            (self.feature_store.feature_version,)
+        ).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def clear_checkpoint(self):
+        """Forget progress of an interrupted run"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "DELETE FROM feature_backfill_state WHERE feature_version = ?",
+                (self.feature_store.feature_version,)
+            )
+        conn.close()
+
+    def count_pending(self) -> int:
+        """
+        Number of missing or stale feature rows
+
+        Returns:
+            Row count
+        """
+        query = CANDIDATES_SQL.format(table=self.feature_store.feature_table)
+        conn = self._connect()
+        count = conn.execute(f"SELECT COUNT(*) FROM ({query})", ('', -1)).fetchone()[0]
+        conn.close()
+        return count
+
+    def _read_chunk(self, conn: sqlite3.Connection, after: str) -> List[SportbexMatch]:
+        query = CANDIDATES_SQL.format(table=self.feature_store.feature_table)
+        return [_match_from_row(row) for row in conn.execute(query, (after, self.chunk_size))]
+
+    def _write_chunk(self, conn: sqlite3.Connection, matches: List[SportbexMatch],
+                     X: np.ndarray, rows_done: int, started_at: str):
+        """Store one chunk and advance the checkpoint in the same transaction"""
+        updated_at = datetime.now().isoformat()
+        with conn:
+            conn.executemany(self.feature_store._insert_sql(), [
+                (match.match_id, updated_at, *values)
+                for match, values in zip(matches, X.tolist())
+            ])
+            conn.execute("""
+                INSERT OR REPLACE INTO feature_backfill_state (
+                    feature_version, last_match_id, rows_done, started_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?)
+            """, (self.feature_store.feature_version, matches[-1].match_id, rows_done, started_at, updated_at))
+
+    def run(self, resume: bool = True) -> Dict[str, Any]:
+        """
+        Backfill every missing or stale feature row
+
+        Args:
+            resume: Continue after the last checkpoint of an interrupted run
+
+        Returns:
+            Dictionary with rows written, elapsed seconds and rows/sec
+        """
+        checkpoint = self.get_checkpoint() if resume else None
+        if not resume:
+            self.clear_checkpoint()
+
+        after = checkpoint['last_match_id'] if checkpoint else ''
+        rows_done = checkpoint['rows_done'] if checkpoint else 0
+        started_at = checkpoint['started_at'] if checkpoint else datetime.now().isoformat()
+        if checkpoint:
+            logger.info(f"⏩ Resuming {self.feature_store.feature_table} backfill after {after} ({rows_done} rows done)")
+
+        feature_version = self.feature_store.feature_version
+        written = 0
+        start = time.perf_counter()
+        conn = self._connect()
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                in_flight = deque()
+                exhausted = False
+
+                while in_flight or not exhausted:
+                    # Keep the pool busy: read, look up and submit ahead of writes
+                    while not exhausted and len(in_flight) < self.workers * 2:
+                        matches = self._read_chunk(conn, after)
+                        if not matches:
+                            exhausted = True
+                            break
+                        after = matches[-1].match_id
+                        match_data = self.feature_store._historical_data_batch(matches)
+                        in_flight.append((matches, pool.submit(_compute_chunk, feature_version, matches, match_data)))
+
+                    if not in_flight:
+                        break
+
+                    # Write in submission order so the checkpoint is a true prefix
+                    matches, future = in_flight.popleft()
+                    X = future.result()
+                    written += len(matches)
+                    rows_done += len(matches)
+                    self._write_chunk(conn, matches, X, rows_done, started_at)
+
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"📊 {rows_done} rows ({written / max(elapsed, 1e-9):.0f} rows/sec)")
+
+            self.clear_checkpoint()
+
+        except Exception as e:
+            logger.error(f"Backfill interrupted after {written} rows: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'rows_written': written,
+                'resumable': True
+            }
+
+        finally:
+            conn.close()
+
+        elapsed = time.perf_counter() - start
+        rows_per_sec = written / max(elapsed, 1e-9)
+        logger.info(f"✅ Backfilled {written} rows into {self.feature_store.feature_table} "
+                    f"in {elapsed:.1f}s ({rows_per_sec:.0f} rows/sec)")
+
+        return {
+            'success': True,
+            'feature_table': self.feature_store.feature_table,
+            'rows_written': written,
+            'elapsed_seconds': elapsed,
+            'rows_per_sec': rows_per_sec
+        }
+
+
+def main():
+    """Run feature backfill"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Feature Backfill')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Matches per chunk')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint of an interrupted run')
+    parser.add_argument('--dry-run', action='store_true', help='Only count missing or stale rows')
+    args = parser.parse_args()
+
+    backfill = FeatureBackfill(chunk_size=args.chunk_size, workers=args.workers)
+
+    if args.dry_run:
+        print(f"\n📊 {backfill.count_pending()} missing or stale rows in {backfill.feature_store.feature_table}")
+        checkpoint = backfill.get_checkpoint()
+        if checkpoint:
+            print(f"⏩ Checkpoint: {checkpoint['rows_done']} rows done, last match {checkpoint['last_match_id']}")
+        return
+
+    result = backfill.run(resume=not args.restart)
+    if result['success']:
+        print(f"\n✅ {result['rows_written']} rows in {result['elapsed_seconds']:.1f}s "
+              f"({result['rows_per_sec']:.0f} rows/sec)")
+    else:
+        print(f"\n❌ Backfill failed: {result['error']} (rerun to resume)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
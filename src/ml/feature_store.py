@@ -11,14 +11,20 @@ This is Layer 2 of the Self-Learning AI Engine.
 
 import logging
 import json
+import sqlite3
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import sys
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.ml.data_collector import MatchResultsDB
+from src.ml.elo_engine import EloEngine
+from src.ml.player_stats import PlayerStatsIndex
 from src.scrapers.sportbex_client import SportbexMatch
 
 logger = logging.getLogger(__name__)
@@ -36,6 +42,113 @@ class FeatureStore:
         """
         self.db = MatchResultsDB(db_path)
         self.feature_version = 1
+        self._feature_names: Optional[List[str]] = None
+        
+        self._init_feature_table()
+        
+        # Local Elo ratings and player stats; created on first use so stores
+        # that only read stored features skip the catch-up replay
+        self._elo: Optional[EloEngine] = None
+        self._player_stats: Optional[PlayerStatsIndex] = None
+    
+    @classmethod
+    def detached(cls, feature_version: int = 1) -> 'FeatureStore':
+        """
+        Feature store without a database connection
+        
+        For pure feature computation (e.g. in worker processes) where
+        match_data is always passed in; storage and lookups are unavailable.
+        
+        Args:
+            feature_version: Feature version to compute
+            
+        Returns:
+            FeatureStore instance
+        """
+        store = cls.__new__(cls)
+        store.db = None
+        store.feature_version = feature_version
+        store._feature_names = None
+        store._elo = None
+        store._player_stats = None
+        return store
+    
+    @property
+    def elo(self) -> Optional[EloEngine]:
+        if self._elo is None and self.db is not None:
+            self._elo = EloEngine(db=self.db)
+        return self._elo
+    
+    @property
+    def player_stats(self) -> Optional[PlayerStatsIndex]:
+        if self._player_stats is None and self.db is not None:
+            self._player_stats = PlayerStatsIndex(db=self.db)
+        return self._player_stats
+    
+    @property
+    def feature_table(self) -> str:
+        """Columnar feature table for the current feature version"""
+        return f"feature_matrix_v{self.feature_version}"
+    
+    def _init_feature_table(self):
+        """
+        Create the columnar feature table for the current version
+        
+        One typed REAL column per feature, in get_feature_names() order, so
+        training data is read with a single join instead of one JSON blob per
+        row. Feature vectors stored as JSON by earlier versions are migrated
+        once.
+        """
+        columns = ",\n".join(f'"{name}" REAL' for name in self.get_feature_names())
+        
+        conn = sqlite3.connect(str(self.db.db_path))
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.feature_table} (
+                match_id TEXT PRIMARY KEY,
+                updated_at TIMESTAMP,
+                {columns},
+                FOREIGN KEY (match_id) REFERENCES matches(match_id)
+            )
+        """)
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.feature_table}_updated ON {self.feature_table}(updated_at)"
+        )
+        
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {self.feature_table})")
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                "SELECT match_id, features_json, updated_at FROM features WHERE feature_version = ?",
+                (self.feature_version,)
+            )
+            legacy_rows = [
+                (match_id, updated_at, *self._feature_row(json.loads(features_json)))
+                for match_id, features_json, updated_at in cursor.fetchall()
+                if features_json
+            ]
+            if legacy_rows:
+                cursor.executemany(self._insert_sql(), legacy_rows)
+                logger.info(f"✅ Migrated {len(legacy_rows)} JSON feature rows to {self.feature_table}")
+        
+        conn.commit()
+        conn.close()
+    
+    def _insert_sql(self) -> str:
+        """INSERT OR REPLACE statement for the columnar feature table"""
+        names = self.get_feature_names()
+        columns = ", ".join(f'"{name}"' for name in names)
+        placeholders = ", ".join("?" for _ in names)
+        return (
+            f"INSERT OR REPLACE INTO {self.feature_table} (match_id, updated_at, {columns}) "
+            f"VALUES (?, ?, {placeholders})"
+        )
+    
+    def _feature_row(self, features: Dict[str, Any]) -> List[Optional[float]]:
+        """Feature values in column order (missing features are stored as NULL)"""
+        return [
+            float(features[name]) if features.get(name) is not None else None
+            for name in self.get_feature_names()
+        ]
     
     def extract_features(self, match: SportbexMatch, match_data: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -43,11 +156,15 @@ class FeatureStore:
         
         Args:
             match: SportbexMatch object
-            match_data: Additional match data from database (optional)
+            match_data: Additional match data (optional; looked up from the
+                local rating and player stats indexes when omitted)
             
         Returns:
             Dictionary of features
         """
+        if match_data is None:
+            match_data = self._historical_data_batch([match])[0]
+        
         features = {}
         
         # Basic match features
@@ -136,6 +253,149 @@ class FeatureStore:
         # Total features: 30+
         return features
     
+    def extract_features_batch(self,
+                               matches: List[SportbexMatch],
+                               match_data: Optional[List[Optional[Dict]]] = None) -> np.ndarray:
+        """
+        Extract features for many matches with NumPy column operations
+        
+        Produces exactly the values of extract_features(), one row per match,
+        with columns in get_feature_names() order.
+        
+        Args:
+            matches: SportbexMatch objects
+            match_data: Optional per-match historical data (aligned with
+                matches; looked up from the local indexes when omitted)
+            
+        Returns:
+            float32 array of shape (len(matches), n_features)
+        """
+        names = self.get_feature_names()
+        n = len(matches)
+        if n == 0:
+            return np.empty((0, len(names)), dtype=np.float32)
+        
+        if match_data is None:
+            match_data = self._historical_data_batch(matches)
+        
+        def column(values, default):
+            # Mirrors ``value or default``: None and 0 fall back to the default
+            return np.array([value or default for value in values], dtype=np.float64)
+        
+        cols: Dict[str, np.ndarray] = {}
+        
+        # Basic match features (string encodings memoized per distinct value)
+        tier_codes: Dict[Optional[str], int] = {}
+        surface_codes: Dict[Optional[str], int] = {}
+        for m in matches:
+            if m.tournament_tier not in tier_codes:
+                tier_codes[m.tournament_tier] = self._encode_tournament_tier(m.tournament_tier)
+            if m.surface not in surface_codes:
+                surface_codes[m.surface] = self._encode_surface(m.surface)
+        tier = np.array([tier_codes[m.tournament_tier] for m in matches], dtype=np.float64)
+        surface = np.array([surface_codes[m.surface] for m in matches], dtype=np.float64)
+        cols['tournament_tier_encoded'] = tier
+        cols['surface_encoded'] = surface
+        
+        # Ranking features
+        rank1 = column((m.player1_ranking for m in matches), 500)
+        rank2 = column((m.player2_ranking for m in matches), 500)
+        ranking_delta = rank2 - rank1
+        cols['player1_ranking'] = rank1
+        cols['player2_ranking'] = rank2
+        cols['ranking_delta'] = ranking_delta
+        cols['ranking_advantage'] = (rank1 < rank2).astype(np.float64)
+        cols['ranking_ratio'] = rank1 / np.maximum(rank2, 1)
+        
+        # Odds features
+        odds1 = column((m.player1_odds for m in matches), 2.0)
+        odds2 = column((m.player2_odds for m in matches), 2.0)
+        has_odds1 = np.array([bool(m.player1_odds) for m in matches])
+        has_odds2 = np.array([bool(m.player2_odds) for m in matches])
+        odds_delta = odds2 - odds1
+        cols['player1_odds'] = odds1
+        cols['player2_odds'] = odds2
+        cols['odds_delta'] = odds_delta
+        cols['implied_prob_player1'] = np.where(has_odds1, 1.0 / odds1, 0.5)
+        cols['implied_prob_player2'] = np.where(has_odds2, 1.0 / odds2, 0.5)
+        cols['odds_favorite'] = (odds1 < odds2).astype(np.float64)
+        
+        # Time features
+        hour = np.full(n, 14.0)
+        weekday = np.full(n, 2.0)
+        has_time = np.zeros(n, dtype=bool)
+        for i, m in enumerate(matches):
+            if m.commence_time:
+                hour[i] = m.commence_time.hour
+                weekday[i] = m.commence_time.weekday()
+                has_time[i] = True
+        cols['hour_of_day'] = hour
+        cols['day_of_week'] = weekday
+        cols['is_weekend'] = (has_time & (weekday >= 5)).astype(np.float64)
+        
+        # Historical features (defaults match extract_features without match_data)
+        historical_defaults = {
+            'player1_recent_form': (0.5, 0.5),
+            'player2_recent_form': (0.5, 0.5),
+            'player1_surface_win_pct': (0.5, 0.5),
+            'player2_surface_win_pct': (0.5, 0.5),
+            'h2h_player1_wins': (0, 0),
+            'h2h_player2_wins': (0, 0),
+            'player1_elo': (1500, 1500),
+            'player2_elo': (1500, 0),
+        }
+        data = match_data or [None] * n
+        has_data = np.array([bool(d) for d in data])
+        for key, (data_default, no_data_default) in historical_defaults.items():
+            cols[key] = np.array([
+                d.get(key, data_default) if d else no_data_default for d in data
+            ], dtype=np.float64)
+        
+        cols['form_delta'] = cols['player1_recent_form'] - cols['player2_recent_form']
+        cols['surface_win_delta'] = cols['player1_surface_win_pct'] - cols['player2_surface_win_pct']
+        h2h_total = cols['h2h_player1_wins'] + cols['h2h_player2_wins']
+        cols['h2h_total'] = h2h_total
+        cols['h2h_ratio'] = np.where(
+            h2h_total > 0, cols['h2h_player1_wins'] / np.maximum(h2h_total, 1), 0.5
+        )
+        elo_delta = np.where(has_data, cols['player1_elo'] - cols['player2_elo'], 0.0)
+        cols['elo_delta'] = elo_delta
+        cols['elo_advantage'] = (elo_delta > 0).astype(np.float64)
+        
+        # Derived features
+        cols['ranking_vs_odds'] = ranking_delta * odds_delta
+        cols['form_vs_odds'] = cols['form_delta'] * odds_delta
+        cols['surface_vs_odds'] = cols['surface_win_delta'] * odds_delta
+        
+        # Interaction features
+        cols['ranking_form_interaction'] = ranking_delta * cols['form_delta']
+        cols['ranking_surface_interaction'] = ranking_delta * cols['surface_win_delta']
+        cols['form_surface_interaction'] = cols['form_delta'] * cols['surface_win_delta']
+        
+        # Tournament tier interactions
+        cols['tier_ranking_interaction'] = tier * ranking_delta
+        cols['tier_surface_interaction'] = tier * surface
+        
+        return np.column_stack([cols[name] for name in names]).astype(np.float32)
+    
+    def _historical_data_batch(self, matches: List[SportbexMatch]) -> List[Optional[Dict]]:
+        """
+        Historical match data from the local indexes, one entry per match
+        
+        Args:
+            matches: SportbexMatch objects
+            
+        Returns:
+            List of match_data dictionaries (None where unavailable)
+        """
+        try:
+            elo = self.elo.get_match_elo_batch(matches)
+            stats = self.player_stats.get_match_stats_batch(matches)
+            return [{**match_stats, **match_elo} for match_stats, match_elo in zip(stats, elo)]
+        except Exception as e:
+            logger.warning(f"Historical data lookup failed: {e}")
+            return [None] * len(matches)
+    
     def _encode_tournament_tier(self, tier: Optional[str]) -> int:
         """Encode tournament tier as integer"""
         if not tier:
@@ -187,36 +447,40 @@ class FeatureStore:
         Returns:
             True if successful
         """
-        try:
-            import sqlite3
-            from pathlib import Path
-            
-            db_path = self.db.db_path
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.cursor()
-            
-            features_json = json.dumps(features)
+        if self.store_features_batch([(match_id, features)]):
+            logger.debug(f"✅ Stored features for match {match_id}")
+            return True
+        return False
+    
+    def store_features_batch(self, rows: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Store many feature vectors in one transaction
+        
+        Args:
+            rows: List of (match_id, feature dictionary)
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO features (
-                    match_id, features_json, feature_version, updated_at
-                ) VALUES (?, ?, ?, ?)
-            """, (
-                match_id,
-                features_json,
-                self.feature_version,
-                datetime.now().isoformat()
-            ))
+        Returns:
+            Number of rows stored (0 on failure)
+        """
+        if not rows:
+            return 0
+        
+        try:
+            updated_at = datetime.now().isoformat()
             
-            conn.commit()
+            conn = sqlite3.connect(str(self.db.db_path))
+            with conn:
+                conn.executemany(self._insert_sql(), [
+                    (match_id, updated_at, *self._feature_row(features))
+                    for match_id, features in rows
+                ])
             conn.close()
             
-            logger.debug(f"✅ Stored features for match {match_id}")
-            return True
+            return len(rows)
             
         except Exception as e:
-            logger.error(f"Error storing features for {match_id}: {e}")
-            return False
+            logger.error(f"Error storing features for {len(rows)} matches: {e}")
+            return 0
     
     def get_features(self, match_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -229,25 +493,119 @@ class FeatureStore:
             Feature dictionary or None
         """
         try:
-            import sqlite3
-            
-            db_path = self.db.db_path
-            conn = sqlite3.connect(str(db_path))
+            conn = sqlite3.connect(str(self.db.db_path))
+            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
-            cursor.execute("SELECT features_json FROM features WHERE match_id = ?", (match_id,))
+            cursor.execute(f"SELECT * FROM {self.feature_table} WHERE match_id = ?", (match_id,))
             row = cursor.fetchone()
             
             conn.close()
             
             if row:
-                return json.loads(row[0])
+                return {name: row[name] for name in self.get_feature_names()}
             return None
             
         except Exception as e:
             logger.error(f"Error getting features for {match_id}: {e}")
             return None
     
+    def training_watermark(self) -> Dict[str, Optional[str]]:
+        """
+        High-water marks of the training data
+        
+        Pass to get_training_matrix(since=...) later to read only rows whose
+        result or features were written since. Take the watermark before
+        reading so rows written during the read are picked up next time.
+        The bound is inclusive (timestamps can tie), so rows at the watermark
+        are read again; compare row versions to skip them.
+        
+        Returns:
+            Dictionary with latest results.created_at and feature updated_at
+        """
+        conn = sqlite3.connect(str(self.db.db_path))
+        results = conn.execute("SELECT MAX(created_at) FROM results").fetchone()[0]
+        features = conn.execute(f"SELECT MAX(updated_at) FROM {self.feature_table}").fetchone()[0]
+        conn.close()
+        return {'results': results, 'features': features}
+    
+    def get_training_matrix(self,
+                            limit: Optional[int] = None,
+                            since: Optional[Dict[str, Optional[str]]] = None,
+                            versions: bool = False) -> Tuple:
+        """
+        Load the training set as a ready float32 matrix
+        
+        One join of results against the columnar feature table; no per-row
+        queries or JSON parsing. Rows are ordered by commence time so callers
+        can split them chronologically.
+        
+        Args:
+            limit: Maximum number of records
+            since: Watermark from training_watermark(); only rows whose result
+                or features were written at or after it are returned
+            versions: Also return each row's version (result created_at and
+                feature updated_at), which changes whenever the row does
+            
+        Returns:
+            X (n_samples, n_features) float32 in get_feature_names() order,
+            y (n_samples,) float32 with 1.0 when player 1 won, match IDs,
+            and the row versions if requested
+        """
+        names = self.get_feature_names()
+        columns = ", ".join(f'f."{name}"' for name in names)
+        query = f"""
+            SELECT f.match_id, r.created_at || '|' || f.updated_at, r.player1_won, {columns}
+            FROM results r
+            JOIN {self.feature_table} f ON f.match_id = r.match_id
+            JOIN matches m ON m.match_id = r.match_id
+            WHERE r.player1_won IS NOT NULL
+            {{since}}
+            ORDER BY m.commence_time, f.match_id
+        """
+        params: Tuple = ()
+        if since:
+            # Indexed lookups on both watermark columns
+            query = query.format(since=f"""AND r.match_id IN (
+                SELECT match_id FROM results WHERE created_at >= ?
+                UNION
+                SELECT match_id FROM {self.feature_table} WHERE updated_at >= ?
+            )""")
+            params = (since.get('results') or '', since.get('features') or '')
+        else:
+            query = query.format(since="")
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+        
+        conn = sqlite3.connect(str(self.db.db_path))
+        rows = conn.execute(query, params).fetchall()
+        missing = 0
+        if not since:
+            missing = conn.execute(f"""
+                SELECT COUNT(*) FROM results r
+                WHERE r.player1_won IS NOT NULL
+                AND NOT EXISTS (SELECT 1 FROM {self.feature_table} f WHERE f.match_id = r.match_id)
+            """).fetchone()[0]
+        conn.close()
+        
+        if missing:
+            logger.warning(
+                f"⚠️ {missing} matches with results have no {self.feature_table} row - "
+                f"run src/ml/feature_backfill.py"
+            )
+        
+        if not rows:
+            empty = (np.empty((0, len(names)), dtype=np.float32), np.empty(0, dtype=np.float32), [])
+            return empty + ([],) if versions else empty
+        
+        # NULL features become NaN
+        data = np.array([row[2:] for row in rows], dtype=np.float32)
+        match_ids = [row[0] for row in rows]
+        if versions:
+            return data[:, 1:], data[:, 0], match_ids, [row[1] or '' for row in rows]
+        return data[:, 1:], data[:, 0], match_ids
+    
     def get_training_features(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get features for all matches with results (for training)
@@ -258,22 +616,15 @@ class FeatureStore:
         Returns:
             List of feature dictionaries with results
         """
-        training_data = self.db.get_training_data(limit=limit)
+        X, y, match_ids = self.get_training_matrix(limit=limit)
+        names = self.get_feature_names()
         
         features_list = []
-        for match_data in training_data:
-            match_id = match_data['match_id']
-            
-            # Get stored features
-            features = self.get_features(match_id)
-            
-            if not features:
-                # Extract features on the fly if not stored
-                # This would require reconstructing SportbexMatch object
-                continue
+        for match_id, values, target in zip(match_ids, X.tolist(), y.tolist()):
+            features = dict(zip(names, values))
             
             # Add target variable (result)
-            features['target'] = 1 if match_data.get('player1_won') else 0
+            features['target'] = int(target)
             features['match_id'] = match_id
             
             features_list.append(features)
@@ -287,6 +638,9 @@ class FeatureStore:
         Returns:
             List of feature names
         """
+        if self._feature_names is not None:
+            return self._feature_names
+        
         # Return all feature names except target and match_id
         sample_features = self.extract_features(
             SportbexMatch(
@@ -294,15 +648,88 @@ class FeatureStore:
                 tournament="ITF W15",
                 player1="Player A",
                 player2="Player B"
-            )
+            ),
+            match_data={}  # names only - skip the rating lookup
         )
         
         feature_names = [k for k in sample_features.keys() if k not in ['target', 'match_id']]
-        return sorted(feature_names)
+        self._feature_names = sorted(feature_names)
+        return self._feature_names
+
+
+def benchmark_batch_extraction(store: FeatureStore, n_matches: int = 10000) -> Dict[str, float]:
+    """
+    Compare extract_features (dict per match) with extract_features_batch
+    
+    Args:
+        store: FeatureStore instance
+        n_matches: Number of synthetic matches
+        
+    Returns:
+        Timings in seconds, speedup and max absolute difference
+    """
+    import random
+    
+    rng = random.Random(42)
+    tiers = ['W15', 'W25', 'W35', 'W50', 'W100', None]
+    surfaces = ['Hard', 'Clay', 'Grass', None]
+    now = datetime.now()
+    matches = [
+        SportbexMatch(
+            match_id=f"bench_{i}",
+            tournament="ITF Benchmark",
+            player1=f"Player {i}A",
+            player2=f"Player {i}B",
+            player1_ranking=rng.choice([None, rng.randint(1, 1500)]),
+            player2_ranking=rng.choice([None, rng.randint(1, 1500)]),
+            player1_odds=rng.choice([None, round(rng.uniform(1.05, 8.0), 2)]),
+            player2_odds=rng.choice([None, round(rng.uniform(1.05, 8.0), 2)]),
+            commence_time=rng.choice([None, now + timedelta(hours=rng.randint(0, 200))]),
+            surface=rng.choice(surfaces),
+            tournament_tier=rng.choice(tiers)
+        )
+        for i in range(n_matches)
+    ]
+    names = store.get_feature_names()
+    
+    start = time.perf_counter()
+    dict_matrix = np.array(
+        [[features[name] for name in names] for features in map(store.extract_features, matches)],
+        dtype=np.float32
+    )
+    dict_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch_matrix = store.extract_features_batch(matches)
+    batch_seconds = time.perf_counter() - start
+    
+    return {
+        'n_matches': n_matches,
+        'dict_seconds': dict_seconds,
+        'batch_seconds': batch_seconds,
+        'speedup': dict_seconds / max(batch_seconds, 1e-9),
+        'max_abs_diff': float(np.max(np.abs(dict_matrix - batch_matrix)))
+    }
 
 
 def main():
     """Test feature store"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Feature Store')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Benchmark dict vs batch extraction on N synthetic matches')
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        result = benchmark_batch_extraction(FeatureStore(), args.benchmark)
+        print(f"\n⏱️ Feature extraction for {result['n_matches']} matches:")
+        print(f"   Dict path:  {result['dict_seconds'] * 1000:.1f} ms")
+        print(f"   Batch path: {result['batch_seconds'] * 1000:.1f} ms")
+        print(f"   Speedup:    {result['speedup']:.1f}x")
+        print(f"   Max diff:   {result['max_abs_diff']:.2e}")
+        return
+    
     print("\n" + "="*80)
     print("🧪 TESTING FEATURE STORE")
     print("="*80)
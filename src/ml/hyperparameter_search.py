@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Search
+=====================
+
+Walk-forward cross-validated hyperparameter search for the XGBoost and
+LightGBM trainers.
+
+The training matrix is time-ordered, so each fold trains on an expanding
+prefix and tests on the block that follows it. Every (configuration, fold)
+pair runs as one task in a process pool sized to the machine's cores. The
+feature matrix is written once to .npy files that workers memory-map, so
+it is never pickled to a worker. Results are ranked into a leaderboard
+with per-fold timing.
+
+This is part of Layer 3: Multi-Model Ensemble.
+"""
+
+import itertools
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, log_loss, roc_auc_score
+
+logger = logging.getLogger(__name__)
+
+# Default grids (keys are train() arguments of the trainers)
+XGBOOST_GRID = {
+    'n_estimators': [100, 200, 400],
+    'max_depth': [3, 4, 6, 8],
+    'learning_rate': [0.03, 0.05, 0.1, 0.2],
+    'min_samples_split': [1, 5, 10, 20]
+}
+
+LIGHTGBM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [3, 5, 7, -1],
+    'learning_rate': [0.05, 0.1, 0.2]
+}
+
+# First fold trains on at least this share of the rows
+MIN_TRAIN_FRACTION = 0.5
+
+# Memory-mapped arrays opened by this worker process, keyed by path
+_worker_arrays: Dict[str, np.ndarray] = {}
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Every combination of a parameter grid
+
+    Args:
+        grid: Parameter name -> candidate values
+
+    Returns:
+        List of parameter dictionaries
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def sample_grid(grid: Dict[str, List[Any]], n_iter: int, random_state: int = 42) -> List[Dict[str, Any]]:
+    """
+    Random search: n_iter distinct combinations of a parameter grid
+
+    Args:
+        grid: Parameter name -> candidate values
+        n_iter: Number of configurations (capped at the grid size)
+        random_state: Random seed
+
+    Returns:
+        List of parameter dictionaries
+    """
+    configs = expand_grid(grid)
+    if n_iter >= len(configs):
+        return configs
+    return random.Random(random_state).sample(configs, n_iter)
+
+
+def walk_forward_folds(n_samples: int,
+                       n_folds: int = 5,
+                       min_train_fraction: float = MIN_TRAIN_FRACTION) -> List[Tuple[int, int]]:
+    """
+    Expanding-window folds over time-ordered rows
+
+    Fold k trains on rows [0, train_end) and tests on [train_end, test_end).
+
+    Args:
+        n_samples: Number of rows
+        n_folds: Number of folds
+        min_train_fraction: Share of rows in the first training window
+
+    Returns:
+        List of (train_end, test_end) pairs
+    """
+    first_train = int(n_samples * min_train_fraction)
+    block = (n_samples - first_train) // n_folds
+    if block == 0:
+        return []
+    return [
+        (first_train + k * block, n_samples if k == n_folds - 1 else first_train + (k + 1) * block)
+        for k in range(n_folds)
+    ]
+
+
+def _build_model(model_type: str, params: Dict[str, Any]):
+    """Untrained classifier of a trainer, single-threaded (parallelism is across processes)"""
+    if model_type == 'xgboost':
+        from src.ml.xgboost_trainer import XGBoostTrainer
+        return XGBoostTrainer.build_model(**params, n_jobs=1)
+    if model_type == 'lightgbm':
+        from src.ml.lightgbm_trainer import LightGBMTrainer
+        return LightGBMTrainer.build_model(**params, n_jobs=1)
+    raise ValueError(f"Unknown model type: {model_type}")
+
+
+def _open_array(path: str) -> np.ndarray:
+    """Memory-map an .npy file once per worker process"""
+    if path not in _worker_arrays:
+        _worker_arrays[path] = np.load(path, mmap_mode='r')
+    return _worker_arrays[path]
+
+
+def _evaluate_fold(model_type: str,
+                   config_index: int,
+                   params: Dict[str, Any],
+                   fold: int,
+                   train_end: int,
+                   test_end: int,
+                   X_path: str,
+                   y_path: str,
+                   feature_names: List[str]) -> Dict[str, Any]:
+    """Worker: fit one configuration on one fold and score the held-out block"""
+    X = _open_array(X_path)
+    y = _open_array(y_path)
+
+    X_train = pd.DataFrame(X[:train_end], columns=feature_names)
+    X_test = pd.DataFrame(X[train_end:test_end], columns=feature_names)
+    y_train, y_test = y[:train_end], y[train_end:test_end]
+
+    result = {
+        'config_index': config_index,
+        'fold': fold,
+        'train_samples': int(train_end),
+        'test_samples': int(test_end - train_end)
+    }
+
+    if len(np.unique(y_train)) < 2:
+        result['error'] = 'Single class in training window'
+        return result
+
+    try:
+        model = _build_model(model_type, params)
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        result['fit_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        proba = model.predict_proba(X_test)[:, 1]
+        result['predict_seconds'] = time.perf_counter() - start
+
+        result['accuracy'] = float(accuracy_score(y_test, proba > 0.5))
+        result['log_loss'] = float(log_loss(y_test, proba, labels=[0, 1]))
+        try:
+            result['auc'] = float(roc_auc_score(y_test, proba))
+        except ValueError:
+            result['auc'] = None
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+class HyperparameterSearch:
+    """Parallel walk-forward CV over a parameter grid"""
+
+    def __init__(self,
+                 model_type: str,
+                 n_folds: int = 5,
+                 workers: Optional[int] = None,
+                 leaderboard_path: Optional[str] = None):
+        """
+        Initialize hyperparameter search
+
+        Args:
+            model_type: 'xgboost' or 'lightgbm'
+            n_folds: Walk-forward folds
+            workers: Worker processes (default: CPU count)
+            leaderboard_path: Where to save the leaderboard JSON
+        """
+        if model_type not in ('xgboost', 'lightgbm'):
+            raise ValueError(f"Unknown model type: {model_type}")
+
+        self.model_type = model_type
+        self.n_folds = n_folds
+        self.workers = workers or os.cpu_count() or 1
+
+        if leaderboard_path is None:
+            leaderboard_path = Path(__file__).parent.parent.parent / 'data' / 'models' / f'{model_type}_search_leaderboard.json'
+        self.leaderboard_path = Path(leaderboard_path)
+        self.leaderboard_path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _summarize(params: Dict[str, Any], folds: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Leaderboard entry of one configuration"""
+        scored = [f for f in folds if 'error' not in f]
+        entry = {
+            'params': params,
+            'folds': sorted(folds, key=lambda f: f['fold']),
+            'scored_folds': len(scored),
+            'fit_seconds': sum(f.get('fit_seconds', 0.0) for f in folds)
+        }
+        if scored:
+            log_losses = [f['log_loss'] for f in scored]
+            aucs = [f['auc'] for f in scored if f['auc'] is not None]
+            entry.update({
+                'mean_log_loss': float(np.mean(log_losses)),
+                'std_log_loss': float(np.std(log_losses)),
+                'mean_accuracy': float(np.mean([f['accuracy'] for f in scored])),
+                'mean_auc': float(np.mean(aucs)) if aucs else None
+            })
+        return entry
+
+    def run(self,
+            X: np.ndarray,
+            y: np.ndarray,
+            feature_names: List[str],
+            grid: Dict[str, List[Any]],
+            n_iter: Optional[int] = None,
+            random_state: int = 42) -> Dict[str, Any]:
+        """
+        Evaluate every configuration on every fold
+
+        Args:
+            X: Time-ordered feature matrix
+            y: Targets
+            feature_names: Column names of X
+            grid: Parameter grid (train() arguments)
+            n_iter: Random-search budget (default: full grid)
+            random_state: Seed for random search
+
+        Returns:
+            Dictionary with 'leaderboard' (best first), 'best_params' and timing
+        """
+        configs = sample_grid(grid, n_iter, random_state) if n_iter else expand_grid(grid)
+        folds = walk_forward_folds(len(X), self.n_folds)
+        if not folds:
+            return {'success': False, 'error': f'Too few samples for {self.n_folds} folds: {len(X)}'}
+
+        logger.info(f"🔎 {self.model_type} search: {len(configs)} configurations x {len(folds)} folds "
+                    f"on {self.workers} workers ({len(X)} samples)")
+
+        start = time.perf_counter()
+        results: Dict[int, List[Dict[str, Any]]] = {i: [] for i in range(len(configs))}
+
+        with tempfile.TemporaryDirectory(prefix='hpsearch_') as tmp:
+            # Written once; workers memory-map instead of receiving pickled copies
+            X_path, y_path = str(Path(tmp) / 'X.npy'), str(Path(tmp) / 'y.npy')
+            np.save(X_path, np.ascontiguousarray(X, dtype=np.float32))
+            np.save(y_path, np.ascontiguousarray(y))
+
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(_evaluate_fold, self.model_type, i, params, fold,
+                                train_end, test_end, X_path, y_path, list(feature_names))
+                    for i, params in enumerate(configs)
+                    for fold, (train_end, test_end) in enumerate(folds)
+                ]
+                for done, future in enumerate(as_completed(futures), 1):
+                    fold_result = future.result()
+                    results[fold_result['config_index']].append(fold_result)
+                    if done % max(len(futures) // 10, 1) == 0:
+                        logger.info(f"📊 {done}/{len(futures)} fold fits done")
+
+        elapsed = time.perf_counter() - start
+
+        leaderboard = [self._summarize(configs[i], fold_results) for i, fold_results in results.items()]
+        leaderboard.sort(key=lambda e: e.get('mean_log_loss', float('inf')))
+        for rank, entry in enumerate(leaderboard, 1):
+            entry['rank'] = rank
+
+        if 'mean_log_loss' not in leaderboard[0]:
+            return {'success': False, 'error': 'No configuration could be scored', 'leaderboard': leaderboard}
+
+        best = leaderboard[0]
+        search_result = {
+            'success': True,
+            'model_type': self.model_type,
+            'best_params': best['params'],
+            'best_log_loss': best['mean_log_loss'],
+            'best_accuracy': best['mean_accuracy'],
+            'n_configs': len(configs),
+            'n_folds': len(folds),
+            'workers': self.workers,
+            'elapsed_seconds': elapsed,
+            'fit_seconds': sum(e['fit_seconds'] for e in leaderboard),
+            'timestamp': datetime.now().isoformat(),
+            'leaderboard': leaderboard
+        }
+        self._save_leaderboard(search_result)
+
+        logger.info(f"✅ Search finished in {elapsed:.1f}s "
+                    f"({search_result['fit_seconds']:.1f}s of fitting across {self.workers} workers)")
+        logger.info(f"🏆 Best: {best['params']} (log-loss {best['mean_log_loss']:.4f}, "
+                    f"accuracy {best['mean_accuracy']:.3f})")
+
+        return search_result
+
+    def _save_leaderboard(self, search_result: Dict[str, Any]):
+        """Save search results to JSON"""
+        try:
+            with open(self.leaderboard_path, 'w') as f:
+                json.dump(search_result, f, indent=2, default=str)
+            logger.info(f"✅ Leaderboard saved to {self.leaderboard_path}")
+        except Exception as e:
+            logger.error(f"Error saving leaderboard: {e}")
+
+
+def print_leaderboard(search_result: Dict[str, Any], top: int = 10):
+    """Print the top of a search leaderboard"""
+    print(f"\n🏆 {search_result['model_type']} leaderboard "
+          f"({search_result['n_configs']} configs x {search_result['n_folds']} folds, "
+          f"{search_result['elapsed_seconds']:.1f}s on {search_result['workers']} workers)")
+    for entry in search_result['leaderboard'][:top]:
+        if 'mean_log_loss' not in entry:
+            continue
+        fold_times = ' '.join(f"{f.get('fit_seconds', 0):.2f}s" for f in entry['folds'])
+        print(f"   {entry['rank']:2}. log-loss {entry['mean_log_loss']:.4f} ± {entry['std_log_loss']:.4f}  "
+              f"acc {entry['mean_accuracy']:.3f}  {entry['params']}  [{fold_times}]")
+
+
+def main():
+    """Run hyperparameter search"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Walk-forward Hyperparameter Search')
+    parser.add_argument('--model', choices=('xgboost', 'lightgbm'), default='xgboost', help='Model to tune')
+    parser.add_argument('--n-iter', type=int, help='Random-search budget (default: full grid)')
+    parser.add_argument('--folds', type=int, default=5, help='Walk-forward folds')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--limit', type=int, help='Limit training samples')
+    args = parser.parse_args()
+
+    if args.model == 'xgboost':
+        from src.ml.xgboost_trainer import XGBoostTrainer
+        trainer = XGBoostTrainer()
+    else:
+        from src.ml.lightgbm_trainer import LightGBMTrainer
+        trainer = LightGBMTrainer()
+
+    result = trainer.search(n_iter=args.n_iter, n_folds=args.folds, workers=args.workers, limit=args.limit)
+    if result.get('success'):
+        print_leaderboard(result)
+    else:
+        print(f"\n❌ Search failed: {result.get('error')}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
@@ -10,36 +10,53 @@ Tracks feature importance changes.
 This is part of Layer 5: Continuous Learning.
 """
 
+import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import numpy as np
+
 from src.ml.data_collector import MatchResultsDB
 from src.ml.feature_store import FeatureStore
+from src.ml.prediction_log import PredictionLog, ROLLING_WINDOWS
 from src.ml.meta_learner import MetaLearner
 from src.ml.xgboost_trainer import XGBoostTrainer
 from src.ml.lightgbm_trainer import LightGBMTrainer
 
 logger = logging.getLogger(__name__)
 
+# Full retrain at least this often; warm starts in between
+FULL_RETRAIN_DAYS = 7
+
+# Minimum new rows before boosting rounds are appended
+MIN_NEW_ROWS = 20
+
+# Drift: accuracy of the current model on new rows drops this far below
+# its accuracy at the last full retrain (needs DRIFT_MIN_ROWS rows)
+DRIFT_ACCURACY_DROP = 0.08
+DRIFT_MIN_ROWS = 50
+
 
 class IncrementalLearner:
     """Performs incremental learning from new data"""
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, state_dir: Optional[str] = None):
         """
         Initialize incremental learner
         
         Args:
             db_path: Path to Match Results database
+            state_dir: Directory for the checkpoint and feature matrix cache
         """
         self.db = MatchResultsDB(db_path)
         self.feature_store = FeatureStore(db_path)
         self.meta_learner = MetaLearner()
+        self.prediction_log = PredictionLog(db=self.feature_store.db)
         
         # Model trainers
         self.xgboost_trainer = XGBoostTrainer(db_path=db_path)
@@ -49,58 +66,263 @@ class IncrementalLearner:
         self.xgboost_trainer.load_model()
         self.lightgbm_trainer.load_model()
         
+        if state_dir is None:
+            state_dir = Path(__file__).parent.parent.parent / 'data' / 'models'
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.state_dir / 'incremental_state.json'
+        self.cache_path = self.state_dir / f'training_matrix_v{self.feature_store.feature_version}.npz'
+        
         logger.info("✅ Incremental Learner initialized")
     
+    def _load_state(self) -> Dict[str, Any]:
+        """Load the learning checkpoint"""
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Error loading learning checkpoint: {e} - starting fresh")
+            return {}
+    
+    def _save_state(self, state: Dict[str, Any]):
+        """Save the learning checkpoint"""
+        try:
+            with open(self.state_path, 'w') as f:
+                json.dump(state, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving learning checkpoint: {e}")
+    
+    def _load_cache(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Load the cached training matrix and row versions (empty if missing)"""
+        n_features = len(self.feature_store.get_feature_names())
+        empty = (np.empty((0, n_features), dtype=np.float32), np.empty(0, dtype=np.float32),
+                 np.empty(0, dtype=str), np.empty(0, dtype=str))
+        if not self.cache_path.exists():
+            return empty
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if data['X'].shape[1] != n_features or 'versions' not in data:
+                    logger.warning("⚠️ Cached training matrix has a different layout - rebuilding")
+                    return empty
+                return data['X'], data['y'], data['match_ids'], data['versions']
+        except Exception as e:
+            logger.warning(f"Error loading training matrix cache: {e} - rebuilding")
+            return empty
+    
+    def _save_cache(self, X: np.ndarray, y: np.ndarray, match_ids: np.ndarray, versions: np.ndarray):
+        """Save the training matrix cache"""
+        try:
+            with open(self.cache_path, 'wb') as f:
+                np.savez(f, X=X, y=y, match_ids=match_ids, versions=versions)
+        except Exception as e:
+            logger.error(f"Error saving training matrix cache: {e}")
+    
+    def refresh_training_matrix(self, state: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Bring the cached training matrix up to date
+        
+        Reads only rows written since the checkpoint watermark; rows whose
+        result or features changed replace their cached version. Rows read
+        again with the version already cached (the watermark bound is
+        inclusive) are not new.
+        
+        Args:
+            state: Learning checkpoint
+            
+        Returns:
+            X, y, match_ids of the full cached matrix, the indices of new or
+            changed rows, and the new watermark
+        """
+        watermark = self.feature_store.training_watermark()
+        X_cached, y_cached, ids_cached, versions_cached = self._load_cache()
+        
+        since = state.get('watermark') if len(ids_cached) else None
+        X_new, y_new, ids_new, versions_new = self.feature_store.get_training_matrix(since=since, versions=True)
+        ids_new = np.array(ids_new, dtype=str)
+        versions_new = np.array(versions_new, dtype=str)
+        
+        # Skip rows already cached at the same version
+        cached = dict(zip(ids_cached.astype(str), versions_cached.astype(str)))
+        changed = np.array([cached.get(match_id) != version
+                            for match_id, version in zip(ids_new, versions_new)], dtype=bool)
+        X_new, y_new, ids_new, versions_new = X_new[changed], y_new[changed], ids_new[changed], versions_new[changed]
+        
+        # Drop cached versions of changed rows, append the new ones
+        keep = ~np.isin(ids_cached, ids_new)
+        X = np.concatenate([X_cached[keep], X_new])
+        y = np.concatenate([y_cached[keep], y_new])
+        match_ids = np.concatenate([ids_cached[keep].astype(str), ids_new])
+        versions = np.concatenate([versions_cached[keep].astype(str), versions_new])
+        new_index = np.arange(keep.sum(), len(match_ids))
+        
+        self._save_cache(X, y, match_ids, versions)
+        logger.info(f"📦 Training matrix: {len(match_ids)} rows ({len(ids_new)} new or changed)")
+        
+        return X, y, match_ids, new_index, watermark
+    
+    def load_training_matrix(self) -> Tuple[np.ndarray, np.ndarray, Dict]:
+        """
+        Up-to-date training matrix from the cache (for full retrains)
+        
+        Returns:
+            X, y and the watermark to pass to record_full_retrain
+        """
+        X, y, _, _, watermark = self.refresh_training_matrix(self._load_state())
+        return X, y, watermark
+    
+    def record_full_retrain(self, watermark: Dict, results: Dict[str, Dict[str, Any]]):
+        """
+        Checkpoint a full retrain so the next update only reads newer rows
+        
+        Args:
+            watermark: Watermark returned with the training matrix
+            results: Training results per model ('xgboost', 'lightgbm')
+        """
+        state = self._load_state()
+        state['watermark'] = watermark
+        state['last_full_retrain'] = datetime.now().isoformat()
+        state['incremental_updates'] = 0
+        baseline = state.setdefault('baseline_accuracy', {})
+        for name, result in results.items():
+            if result.get('success'):
+                baseline[name] = result['test_accuracy']
+        self._save_state(state)
+    
+    def _detect_drift(self, X_new: np.ndarray, y_new: np.ndarray, state: Dict[str, Any]) -> Optional[str]:
+        """
+        Check whether the current XGBoost model degraded on new rows
+        
+        Returns:
+            Reason string if drift was detected, else None
+        """
+        baseline = state.get('baseline_accuracy', {}).get('xgboost')
+        if baseline is None or len(y_new) < DRIFT_MIN_ROWS:
+            return None
+        
+        proba = self.xgboost_trainer.predict_proba_batch(X_new, self.feature_store.get_feature_names())
+        if proba is None:
+            return None
+        
+        accuracy = float(np.mean((proba > 0.5) == (y_new > 0.5)))
+        if accuracy < baseline - DRIFT_ACCURACY_DROP:
+            return f"accuracy on {len(y_new)} new rows {accuracy:.3f} vs {baseline:.3f} at last full retrain"
+        return None
+    
+    def update_models(self, force_full: bool = False) -> Dict[str, Any]:
+        """
+        Update XGBoost and LightGBM from rows added since the last checkpoint
+        
+        Appends boosting rounds to the existing boosters (warm start). A full
+        retrain on the cached matrix runs instead when forced, when no model
+        is trained, every FULL_RETRAIN_DAYS days, or when drift is detected.
+        
+        Args:
+            force_full: Always run a full retrain
+            
+        Returns:
+            Dictionary with update results
+        """
+        state = self._load_state()
+        X, y, match_ids, new_index, watermark = self.refresh_training_matrix(state)
+        X_new, y_new = X[new_index], y[new_index]
+        
+        # Decide between warm start and full retrain
+        reason = None
+        last_full = state.get('last_full_retrain')
+        if force_full:
+            reason = 'forced'
+        elif not (self.xgboost_trainer.is_trained and self.lightgbm_trainer.is_trained):
+            reason = 'no trained models'
+        elif not last_full or datetime.now() - datetime.fromisoformat(last_full) >= timedelta(days=FULL_RETRAIN_DAYS):
+            reason = f'scheduled (every {FULL_RETRAIN_DAYS} days)'
+        else:
+            reason = self._detect_drift(X_new, y_new, state)
+            if reason:
+                reason = f'drift: {reason}'
+        
+        results: Dict[str, Any] = {'new_rows': len(new_index), 'total_rows': len(match_ids)}
+        
+        if reason:
+            logger.info(f"🔁 Full retrain ({reason}) on {len(match_ids)} rows")
+            results['mode'] = 'full'
+            results['reason'] = reason
+            results['xgboost'] = self.xgboost_trainer.train(matrix=(X, y))
+            results['lightgbm'] = self.lightgbm_trainer.train(matrix=(X, y))
+            
+        elif len(new_index) >= MIN_NEW_ROWS:
+            logger.info(f"➕ Warm start on {len(new_index)} new rows")
+            results['mode'] = 'incremental'
+            results['xgboost'] = self.xgboost_trainer.train_incremental(X_new, y_new)
+            results['lightgbm'] = self.lightgbm_trainer.train_incremental(X_new)
+        else:
+            logger.info(f"✅ {len(new_index)} new rows (need {MIN_NEW_ROWS}) - models unchanged")
+            results['mode'] = 'none'
+        
+        results['success'] = all(
+            results.get(name, {}).get('success', True) for name in ('xgboost', 'lightgbm')
+        )
+        
+        # Warm starts are kept all-or-nothing: the rows are replayed next run,
+        # so a model that did take them is reset to its saved version
+        if results['mode'] == 'incremental' and not results['success']:
+            self.xgboost_trainer.load_model()
+            self.lightgbm_trainer.load_model()
+        
+        for name, trainer in (('xgboost', self.xgboost_trainer), ('lightgbm', self.lightgbm_trainer)):
+            if results.get(name, {}).get('success') and (results['success'] or results['mode'] == 'full'):
+                trainer.save_model()
+                trainer.export_arrays()
+                trainer.register_version(results[name], training_window={
+                    'mode': results['mode'],
+                    'samples': len(match_ids),
+                    'results_through': watermark.get('results')
+                })
+        
+        # Rows below MIN_NEW_ROWS stay pending until enough accumulate; after a
+        # failed update they stay pending so the next run trains on them again
+        if results['mode'] != 'none' and results['success']:
+            state['watermark'] = watermark
+            state['rows_seen'] = len(match_ids)
+            if results['mode'] == 'incremental':
+                state['incremental_updates'] = state.get('incremental_updates', 0) + 1
+        elif results['mode'] != 'none':
+            logger.warning(f"⚠️ {results['mode'].capitalize()} update failed - checkpoint not advanced")
+        state['updated_at'] = datetime.now().isoformat()
+        self._save_state(state)
+        
+        if results['mode'] == 'full' and results['success']:
+            self.record_full_retrain(watermark, {'xgboost': results['xgboost'], 'lightgbm': results['lightgbm']})
+        
+        return results
+    
     def learn_from_new_data(self, days_back: int = 7) -> Dict[str, Any]:
         """
         Learn from new match results
         
+        New rows are tracked by checkpoint (see update_models), so the cost
+        scales with the data added since the last run.
+        
         Args:
-            days_back: Number of days to look back for new results
+            days_back: Kept for compatibility (new rows come from the checkpoint)
             
         Returns:
             Dictionary with learning results
         """
-        logger.info(f"🧠 Learning from new data (last {days_back} days)...")
+        logger.info("🧠 Learning from new data...")
         
         try:
-            # Get matches with results from recent period
-            cutoff_date = (datetime.now() - timedelta(days=days_back)).date()
-            
-            training_data = self.db.get_training_data(limit=None)
-            
-            # Filter to recent matches
-            recent_matches = []
-            for match in training_data:
-                match_date_str = match.get('match_date')
-                if match_date_str:
-                    try:
-                        match_date = datetime.fromisoformat(match_date_str).date()
-                        if match_date >= cutoff_date:
-                            recent_matches.append(match)
-                    except:
-                        pass
-            
-            if not recent_matches:
-                logger.info("✅ No new matches to learn from")
-                return {
-                    'success': True,
-                    'new_matches': 0,
-                    'message': 'No new matches in period'
-                }
-            
-            logger.info(f"📊 Found {len(recent_matches)} recent matches with results")
-            
-            # For now, we'll just track that we have new data
-            # Full retraining happens weekly (see ml_weekly_retrain.py)
-            # This is a placeholder for future online learning implementation
+            update = self.update_models()
             
             # Update feature importance tracking
             self._update_feature_importance()
             
             return {
-                'success': True,
-                'new_matches': len(recent_matches),
+                'success': update.get('success', False),
+                'new_matches': update['new_rows'],
+                'mode': update['mode'],
+                'update': update,
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -118,12 +340,14 @@ class IncrementalLearner:
         # For now, it's a placeholder
         logger.debug("Updating feature importance tracking...")
     
-    def update_model_accuracies(self, window_days: int = 30) -> Dict[str, Any]:
+    def update_model_accuracies(self, window_days: int = 30, min_predictions: int = 10) -> Dict[str, Any]:
         """
-        Update model accuracies based on recent predictions
+        Update meta-learner weights from the scored prediction log
         
         Args:
             window_days: Time window for accuracy calculation
+            min_predictions: Minimum scored predictions for a model's accuracy
+                to be used (models below keep their current accuracy)
             
         Returns:
             Dictionary with accuracy update results
@@ -131,53 +355,47 @@ class IncrementalLearner:
         logger.info(f"⚖️ Updating model accuracies (last {window_days} days)...")
         
         try:
-            # Get recent matches with results
-            cutoff_date = (datetime.now() - timedelta(days=window_days)).date()
-            
-            training_data = self.db.get_training_data(limit=None)
+            windows = self.prediction_log.get_rolling_windows(
+                tuple(sorted(set(ROLLING_WINDOWS) | {window_days}))
+            )
+            metrics = windows[window_days]
             
-            recent_matches = []
-            for match in training_data:
-                match_date_str = match.get('match_date')
-                if match_date_str:
-                    try:
-                        match_date = datetime.fromisoformat(match_date_str).date()
-                        if match_date >= cutoff_date:
-                            recent_matches.append(match)
-                    except:
-                        pass
+            accuracies = {}
+            for model in self.meta_learner.weights:
+                model_metrics = metrics.get(model)
+                if model_metrics and model_metrics['predictions'] >= min_predictions:
+                    accuracies[model] = model_metrics['accuracy']
             
-            if len(recent_matches) < 10:
-                logger.warning(f"⚠️ Not enough recent matches for accuracy calculation: {len(recent_matches)}")
+            if not accuracies:
+                scored = sum(m['predictions'] for m in metrics.values())
+                logger.warning(f"⚠️ Not enough scored predictions for accuracy calculation: {scored}")
                 return {
                     'success': False,
-                    'error': f'Insufficient data: {len(recent_matches)} matches (need at least 10)'
+                    'error': f'Insufficient data: no model with {min_predictions}+ scored predictions '
+                             f'in the last {window_days} days',
+                    'rolling': windows
                 }
             
-            # Calculate accuracies (simplified - would need prediction history)
-            # For now, use baseline accuracies
-            xgboost_accuracy = 0.70  # Would calculate from actual predictions
-            lightgbm_accuracy = 0.60  # Would calculate from actual predictions
-            gpt4_accuracy = 0.65      # Would get from AI analyzer results
-            
-            # Update meta-learner weights
-            self.meta_learner.update_weights_from_accuracy('xgboost', xgboost_accuracy, window_days)
-            self.meta_learner.update_weights_from_accuracy('lightgbm', lightgbm_accuracy, window_days)
-            self.meta_learner.update_weights_from_accuracy('gpt4', gpt4_accuracy, window_days)
+            # Update meta-learner weights (fallback combination), then refit stacking
+            for model, accuracy in accuracies.items():
+                self.meta_learner.update_weights_from_accuracy(model, accuracy, window_days, save=False)
+            stacking = self.meta_learner.fit_stacking(self.prediction_log)
+            if not stacking.get('adopted'):
+                self.meta_learner.save_params()
             
             logger.info(f"✅ Updated model accuracies:")
-            logger.info(f"   XGBoost: {xgboost_accuracy:.3f}")
-            logger.info(f"   LightGBM: {lightgbm_accuracy:.3f}")
-            logger.info(f"   GPT-4: {gpt4_accuracy:.3f}")
+            for model, accuracy in accuracies.items():
+                m = metrics[model]
+                logger.info(f"   {model}: {accuracy:.3f} (Brier {m['brier']:.4f}, "
+                            f"log-loss {m['log_loss']:.4f}, {m['predictions']} predictions)")
             
             return {
                 'success': True,
-                'accuracies': {
-                    'xgboost': xgboost_accuracy,
-                    'lightgbm': lightgbm_accuracy,
-                    'gpt4': gpt4_accuracy
-                },
-                'matches_used': len(recent_matches),
+                'accuracies': accuracies,
+                'metrics': metrics,
+                'rolling': windows,
+                'stacking': stacking,
+                'predictions_used': sum(metrics[model]['predictions'] for model in accuracies),
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -189,7 +407,6 @@ class IncrementalLearner:
                 'timestamp': datetime.now().isoformat()
             }
 
-
 def main():
     """Test incremental learner"""
     print("\n" + "="*80)
@@ -73,10 +73,10 @@ class LearningLoop:
             synced_count = sync_result.get('synced', 0)
             logger.info(f"✅ Synced {synced_count} matches from Notion")
             
-            # Step 2: Get matches with results for training
-            logger.info("\n🔧 Step 2: Getting matches with results for training...")
-            matches_with_results = self.db.get_training_data(limit=None)
-            logger.info(f"✅ Found {len(matches_with_results)} matches with results")
+            # Step 2: Count matches with results (the learner reads only new rows)
+            logger.info("\n🔧 Step 2: Counting matches with results...")
+            matches_with_results = self.db.count_results()
+            logger.info(f"✅ Found {matches_with_results} matches with results")
             
             # Step 3: Incremental learning
             logger.info("\n🧠 Step 3: Running incremental learning...")
@@ -99,7 +99,7 @@ class LearningLoop:
             logger.info("✅ DAILY LEARNING LOOP COMPLETED")
             logger.info("=" * 80)
             logger.info(f"🔄 Matches synced from Notion: {synced_count}")
-            logger.info(f"📈 Matches with results: {len(matches_with_results)}")
+            logger.info(f"📈 Matches with results: {matches_with_results}")
             logger.info(f"🧠 Incremental learning: {'✅ Success' if learning_result.get('success') else '⚠️ Issues'}")
             logger.info(f"⚖️ Accuracy update: {'✅ Success' if accuracy_result.get('success') else '⚠️ Issues'}")
             logger.info(f"⏱️ Duration: {duration:.1f}s")
@@ -110,7 +110,7 @@ class LearningLoop:
                 'timestamp': end_time.isoformat(),
                 'duration_seconds': duration,
                 'matches_synced': synced_count,
-                'matches_with_results': len(matches_with_results),
+                'matches_with_results': matches_with_results,
                 'incremental_learning': learning_result,
                 'accuracy_update': accuracy_result
             }
@@ -64,36 +64,60 @@ class LightGBMTrainer:
         
         logger.info("✅ LightGBM Trainer initialized")
     
-    def prepare_training_data(self, limit: Optional[int] = None) -> Tuple[pd.DataFrame, pd.Series]:
+    def prepare_training_data(self,
+                              limit: Optional[int] = None,
+                              matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[pd.DataFrame, pd.Series]:
         """
         Prepare training data for screener (interesting vs not interesting)
         
         Args:
             limit: Maximum number of samples to use
+            matrix: Preloaded (X, y) training matrix, e.g. from a cache (optional)
             
         Returns:
             X (features), y (targets) as pandas DataFrame and Series
         """
         logger.info("📊 Preparing training data for screener...")
         
-        # Get training features
-        training_features = self.feature_store.get_training_features(limit=limit)
+        # Get training matrix (single join, float32, no per-row JSON parsing)
+        if matrix is not None:
+            X_matrix = matrix[0][:limit]
+        else:
+            X_matrix, _, _ = self.feature_store.get_training_matrix(limit=limit)
         
-        if not training_features:
+        if len(X_matrix) == 0:
             logger.warning("⚠️ No training data available")
             return pd.DataFrame(), pd.Series()
         
-        logger.info(f"✅ Found {len(training_features)} training samples")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(training_features)
+        logger.info(f"✅ Found {len(X_matrix)} training samples")
         
-        # Get feature names
+        # Get feature names (matrix column order)
         self.feature_names = self.feature_store.get_feature_names()
         
-        # Extract features
-        X = df[self.feature_names]
+        # Wrap features (no copy)
+        X = pd.DataFrame(X_matrix, columns=self.feature_names)
+        y = self._screener_target(X)
+        
+        # Remove any rows with NaN values
+        mask = ~(X.isna().any(axis=1) | y.isna())
+        X = X[mask]
+        y = y[mask]
+        
+        logger.info(f"✅ Prepared {len(X)} samples ({y.sum()} interesting, {len(y) - y.sum()} not interesting)")
+        
+        return X, y
+    
+    @staticmethod
+    def _screener_target(df: pd.DataFrame) -> pd.Series:
+        """
+        Binary "interesting" target derived from the features
         
+        Args:
+            df: Feature DataFrame
+            
+        Returns:
+            Series of 0/1 targets
+        """
         # Create binary target: interesting (1) vs not interesting (0)
         # A match is "interesting" if:
         # 1. Odds are in range 1.40-1.80 (value betting range)
@@ -119,16 +143,35 @@ class LightGBMTrainer:
         )
         
         # Target: interesting if odds in range AND ranking delta ok AND competitive
-        y = ((odds_in_range & ranking_delta_ok & competitive).astype(int))
-        
-        # Remove any rows with NaN values
-        mask = ~(X.isna().any(axis=1) | y.isna())
-        X = X[mask]
-        y = y[mask]
-        
-        logger.info(f"✅ Prepared {len(X)} samples ({y.sum()} interesting, {len(y) - y.sum()} not interesting)")
+        return (odds_in_range & ranking_delta_ok & competitive).astype(int)
+    
+    @staticmethod
+    def build_model(n_estimators: int = 50,
+                    max_depth: int = 5,
+                    learning_rate: float = 0.1,
+                    random_state: int = 42,
+                    n_jobs: int = -1):
+        """
+        Create an untrained LightGBM classifier (shared with hyperparameter search)
         
-        return X, y
+        Args:
+            n_estimators: Number of boosting rounds
+            max_depth: Maximum tree depth
+            learning_rate: Learning rate
+            random_state: Random seed
+            n_jobs: Threads (-1: all CPU cores)
+            
+        Returns:
+            LGBMClassifier
+        """
+        return lgb.LGBMClassifier(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            learning_rate=learning_rate,
+            random_state=random_state,
+            verbose=-1,
+            n_jobs=n_jobs
+        )
     
     def train(self,
               n_estimators: int = 50,
@@ -136,7 +179,8 @@ class LightGBMTrainer:
               learning_rate: float = 0.1,
               test_size: float = 0.2,
               random_state: int = 42,
-              limit: Optional[int] = None) -> Dict[str, Any]:
+              limit: Optional[int] = None,
+              matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[str, Any]:
         """
         Train LightGBM screener model
         
@@ -147,6 +191,7 @@ class LightGBMTrainer:
             test_size: Test set size
             random_state: Random seed
             limit: Maximum training samples
+            matrix: Preloaded (X, y) training matrix (optional)
             
         Returns:
             Training results dictionary
@@ -154,7 +199,7 @@ class LightGBMTrainer:
         logger.info("🚀 Training LightGBM screener model...")
         
         # Prepare data
-        X, y = self.prepare_training_data(limit=limit)
+        X, y = self.prepare_training_data(limit=limit, matrix=matrix)
         
         if len(X) == 0:
             return {
@@ -178,13 +223,11 @@ class LightGBMTrainer:
         logger.info(f"📊 Test set: {len(X_test)} samples")
         
         # Create LightGBM model (optimized for speed)
-        self.model = lgb.LGBMClassifier(
+        self.model = self.build_model(
             n_estimators=n_estimators,
             max_depth=max_depth,
             learning_rate=learning_rate,
-            random_state=random_state,
-            verbose=-1,
-            n_jobs=-1  # Use all CPU cores
+            random_state=random_state
         )
         
         # Train model
@@ -253,6 +296,80 @@ class LightGBMTrainer:
         
         return results
     
+    def search(self,
+               grid: Optional[Dict[str, List[Any]]] = None,
+               n_iter: Optional[int] = None,
+               n_folds: int = 5,
+               workers: Optional[int] = None,
+               limit: Optional[int] = None,
+               matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[str, Any]:
+        """
+        Walk-forward cross-validated hyperparameter search (see src.ml.hyperparameter_search)
+        
+        Args:
+            grid: Parameter grid of train() arguments (default: LIGHTGBM_GRID)
+            n_iter: Random-search budget (default: full grid)
+            n_folds: Walk-forward folds
+            workers: Worker processes (default: CPU count)
+            limit: Maximum training samples
+            matrix: Preloaded (X, y) training matrix (optional)
+            
+        Returns:
+            Search results with 'leaderboard' and 'best_params'
+        """
+        from src.ml.hyperparameter_search import HyperparameterSearch, LIGHTGBM_GRID
+        
+        X, y = self.prepare_training_data(limit=limit, matrix=matrix)
+        if len(X) < 50:
+            return {'success': False, 'error': f'Insufficient training data: {len(X)} samples (need at least 50)'}
+        
+        search = HyperparameterSearch('lightgbm', n_folds=n_folds, workers=workers)
+        return search.run(X.to_numpy(np.float32), y.to_numpy(np.int8), list(X.columns),
+                          grid or LIGHTGBM_GRID, n_iter=n_iter)
+    
+    def train_incremental(self, X_new: np.ndarray, n_rounds: int = 10) -> Dict[str, Any]:
+        """
+        Append boosting rounds to the trained screener using new rows only
+        
+        Args:
+            X_new: New feature rows (get_feature_names() order)
+            n_rounds: Boosting rounds to add
+            
+        Returns:
+            Training results dictionary
+        """
+        if not self.is_trained or self.model is None:
+            return {'success': False, 'error': 'No trained model to warm-start from'}
+        
+        X = pd.DataFrame(np.asarray(X_new, dtype=np.float32), columns=self.feature_names)
+        X = X[~X.isna().any(axis=1)]
+        y = self._screener_target(X)
+        
+        if y.nunique() < 2:
+            return {'success': False, 'error': f'New data has a single class ({len(y)} rows)'}
+        
+        try:
+            rounds_before = self.model.booster_.current_iteration()
+            self.model.set_params(n_estimators=n_rounds)
+            self.model.fit(X, y, init_model=self.model.booster_)
+            rounds_after = self.model.booster_.current_iteration()
+            
+            accuracy = accuracy_score(y, self.model.predict(X))
+            logger.info(f"✅ LightGBM warm start: {rounds_before} → {rounds_after} rounds on {len(X)} new rows "
+                        f"(accuracy {accuracy:.3f})")
+            
+            return {
+                'success': True,
+                'new_samples': len(X),
+                'rounds_before': rounds_before,
+                'rounds_after': rounds_after,
+                'train_accuracy': accuracy
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in incremental training: {e}")
+            return {'success': False, 'error': str(e)}
+    
     def predict(self, features: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Predict if match is interesting (fast screener)
@@ -298,6 +415,40 @@ class LightGBMTrainer:
             logger.error(f"Error making prediction: {e}")
             return None
     
+    def predict_proba_batch(self,
+                            X: np.ndarray,
+                            feature_names: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        """
+        Predict "interesting" probability for a whole feature matrix in one call
+        
+        Args:
+            X: Feature matrix, one row per match
+            feature_names: Column names of X (defaults to the training order)
+            
+        Returns:
+            Array of probabilities, one per row
+        """
+        if not self.is_trained or self.model is None:
+            logger.warning("⚠️ Model not trained yet")
+            return None
+        
+        try:
+            X = np.asarray(X, dtype=np.float32)
+            if feature_names is not None and list(feature_names) != list(self.feature_names):
+                # Reorder columns to the training order; missing features default to 0.0
+                index = {name: i for i, name in enumerate(feature_names)}
+                aligned = np.zeros((len(X), len(self.feature_names)), dtype=np.float32)
+                for j, name in enumerate(self.feature_names):
+                    if name in index:
+                        aligned[:, j] = X[:, index[name]]
+                X = aligned
+            
+            return self.model.predict_proba(pd.DataFrame(X, columns=self.feature_names))[:, 1]
+            
+        except Exception as e:
+            logger.error(f"Error making batch prediction: {e}")
+            return None
+    
     def save_model(self):
         """Save trained model to file"""
         if not self.is_trained or self.model is None:
@@ -321,6 +472,74 @@ class LightGBMTrainer:
             logger.error(f"Error saving model: {e}")
             return False
     
+    def export_arrays(self, path: Optional[str] = None) -> Optional[Path]:
+        """
+        Export the trained model as NumPy arrays for src.ml.tree_evaluator
+        
+        Args:
+            path: Destination .npz (defaults to the model path with .npz suffix)
+            
+        Returns:
+            Path written, or None on failure
+        """
+        if not self.is_trained or self.model is None:
+            logger.warning("⚠️ Model not trained - cannot export")
+            return None
+        
+        try:
+            from src.ml.tree_evaluator import TreeEnsemble
+            
+            path = Path(path) if path else self.model_path.with_suffix('.npz')
+            ensemble = TreeEnsemble.from_lightgbm(self.model, self.feature_names)
+            ensemble.save(path)
+            
+            logger.info(f"✅ Exported {ensemble.n_trees} trees to {path}")
+            return path
+            
+        except Exception as e:
+            logger.error(f"Error exporting model: {e}")
+            return None
+    
+    def register_version(self,
+                         results: Optional[Dict[str, Any]] = None,
+                         training_window: Optional[Dict[str, Any]] = None,
+                         registry=None,
+                         promote: bool = True) -> Optional[str]:
+        """
+        Store the trained model as a new version in the model registry
+        
+        Args:
+            results: Training results (accuracy / AUC / sample counts are kept)
+            training_window: Description of the training data
+            registry: ModelRegistry (default: data/models/registry)
+            promote: Make it the version served by PredictorEnsemble
+            
+        Returns:
+            Version label, or None on failure
+        """
+        if not self.is_trained or self.model is None:
+            logger.warning("⚠️ Model not trained - cannot register")
+            return None
+        
+        try:
+            from src.ml.model_registry import ModelRegistry
+            from src.ml.tree_evaluator import TreeEnsemble
+            
+            metrics = {
+                key: float(value) for key, value in (results or {}).items()
+                if key in ('train_accuracy', 'test_accuracy', 'train_auc', 'test_auc')
+            }
+            window = dict(training_window or {})
+            if results and 'train_samples' in results:
+                window.setdefault('samples', results['train_samples'] + results['test_samples'])
+            
+            ensemble = TreeEnsemble.from_lightgbm(self.model, self.feature_names)
+            return (registry or ModelRegistry()).register('lightgbm', ensemble, metrics, window, promote=promote)
+            
+        except Exception as e:
+            logger.error(f"Error registering model: {e}")
+            return None
+    
     def load_model(self) -> bool:
         """
         Load trained model from file
@@ -370,6 +589,8 @@ def main():
         
         if results.get('success'):
             trainer.save_model()
+            trainer.export_arrays()
+            trainer.register_version(results)
             print("\n✅ Model trained and saved!")
         else:
             print(f"\n❌ Training failed: {results.get('error')}")
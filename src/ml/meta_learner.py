@@ -8,14 +8,19 @@ Combines 3 models optimally:
 - XGBoost (fast, accurate, systematic) → all candidates
 - LightGBM (ultra-fast screener) → first filter
 
-Weights update automatically (accuracy-based).
-Agreement bonus when models agree.
+A logistic stacking layer fitted from resolved predictions (see
+src.ml.prediction_log) combines the models' log-odds, with a per-model
+term for missing predictions. Until enough predictions are resolved,
+accuracy-based weights with an agreement bonus are used instead.
+
+Parameters live in a versioned JSON file; every save writes a new version.
 
 This is Layer 4 of the Self-Learning AI Engine.
 """
 
 import logging
 import json
+import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
@@ -23,30 +28,48 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.ml.xgboost_trainer import XGBoostTrainer
-from src.ml.lightgbm_trainer import LightGBMTrainer
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Column order of the stacking inputs
+MODELS = ('gpt4', 'xgboost', 'lightgbm')
+
+PARAMS_FORMAT = 2
+
+# Probabilities are clipped before taking log-odds
+PROB_EPS = 1e-6
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, PROB_EPS, 1.0 - PROB_EPS)
+    return np.log(p / (1.0 - p))
+
+
+def _log_loss(p: np.ndarray, y: np.ndarray) -> float:
+    p = np.clip(p, PROB_EPS, 1.0 - PROB_EPS)
+    return float(-np.mean(y * np.log(p) + (1.0 - y) * np.log(1.0 - p)))
+
 
 class MetaLearner:
-    """Combines multiple models with dynamic weights"""
+    """Combines multiple models with a learned stacking layer"""
     
-    def __init__(self, weights_path: Optional[str] = None):
+    def __init__(self, params_path: Optional[str] = None):
         """
         Initialize meta-learner
         
         Args:
-            weights_path: Path to weights JSON file
+            params_path: Path to the current parameters JSON file (versions
+                are stored next to it)
         """
-        if weights_path is None:
-            weights_path = Path(__file__).parent.parent.parent / 'data' / 'models' / 'meta_learner_weights.json'
-        self.weights_path = Path(weights_path)
-        self.weights_path.parent.mkdir(parents=True, exist_ok=True)
+        models_dir = Path(__file__).parent.parent.parent / 'data' / 'models'
+        if params_path is None:
+            params_path = models_dir / 'meta_learner_params.json'
+        self.params_path = Path(params_path)
+        self.params_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Initialize model trainers
-        self.xgboost_trainer = XGBoostTrainer()
-        self.lightgbm_trainer = LightGBMTrainer()
+        # Pre-versioning weights file (read once if no parameters exist yet)
+        self.legacy_weights_path = self.params_path.parent / 'meta_learner_weights.json'
         
         # Default weights (will be updated based on accuracy)
         self.weights = {
@@ -65,48 +88,124 @@ class MetaLearner:
         # Agreement bonus multiplier
         self.agreement_bonus = 1.15  # 15% boost when all models agree
         
-        # Load weights if available
-        self.load_weights()
+        # Stacking layer (None until fitted): intercept, coef and missing_coef per model
+        self.stacking: Optional[Dict[str, Any]] = None
+        
+        self.version = 0
+        
+        # Load parameters if available
+        self.load_params()
         
         logger.info("✅ Meta-Learner initialized")
     
-    def load_weights(self):
-        """Load weights from file"""
-        if not self.weights_path.exists():
-            logger.info("No weights file found - using defaults")
-            return
+    @property
+    def method(self) -> str:
+        """'stacking' once a stacking layer is fitted, else 'weighted'"""
+        return 'stacking' if self.stacking else 'weighted'
+    
+    def _version_path(self, version: int) -> Path:
+        return self.params_path.with_name(f"{self.params_path.stem}_v{version}{self.params_path.suffix}")
+    
+    def load_params(self, version: Optional[int] = None) -> bool:
+        """
+        Load parameters from file
+        
+        Args:
+            version: Specific version to load (default: current)
+            
+        Returns:
+            True if parameters were loaded
+        """
+        path = self._version_path(version) if version else self.params_path
+        
+        if not path.exists():
+            if version:
+                logger.warning(f"⚠️ Meta-learner parameters v{version} not found")
+                return False
+            return self._load_legacy_weights()
         
         try:
-            with open(self.weights_path, 'r') as f:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            
+            self.weights = data.get('weights', self.weights)
+            self.accuracies = data.get('accuracies', self.accuracies)
+            self.agreement_bonus = data.get('agreement_bonus', self.agreement_bonus)
+            self.stacking = data.get('stacking')
+            self.version = data.get('version', 0)
+            
+            logger.info(f"✅ Loaded meta-learner parameters v{self.version} ({self.method}) from {path}")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Error loading parameters: {e} - using defaults")
+            return False
+    
+    def _load_legacy_weights(self) -> bool:
+        """Read the pre-versioning weights file"""
+        if not self.legacy_weights_path.exists():
+            logger.info("No parameters file found - using defaults")
+            return False
+        
+        try:
+            with open(self.legacy_weights_path, 'r') as f:
                 data = json.load(f)
                 self.weights = data.get('weights', self.weights)
                 self.accuracies = data.get('accuracies', self.accuracies)
                 self.agreement_bonus = data.get('agreement_bonus', self.agreement_bonus)
             
-            logger.info(f"✅ Loaded weights from {self.weights_path}")
+            logger.info(f"✅ Loaded weights from {self.legacy_weights_path}")
+            return True
             
         except Exception as e:
             logger.warning(f"Error loading weights: {e} - using defaults")
+            return False
     
-    def save_weights(self):
-        """Save weights to file"""
+    def save_params(self) -> bool:
+        """
+        Save parameters as a new version
+        
+        Writes meta_learner_params_v<N>.json and atomically replaces the
+        current parameters file with it.
+        
+        Returns:
+            True if successful
+        """
         try:
+            version = self.version + 1
             data = {
+                'format': PARAMS_FORMAT,
+                'version': version,
+                'method': self.method,
+                'models': list(MODELS),
                 'weights': self.weights,
                 'accuracies': self.accuracies,
                 'agreement_bonus': self.agreement_bonus,
+                'stacking': self.stacking,
                 'updated_at': datetime.now().isoformat()
             }
             
-            with open(self.weights_path, 'w') as f:
+            with open(self._version_path(version), 'w') as f:
                 json.dump(data, f, indent=2)
             
-            logger.info(f"✅ Saved weights to {self.weights_path}")
+            tmp_path = self.params_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.params_path)
+            
+            self.version = version
+            logger.info(f"✅ Saved meta-learner parameters v{version} to {self.params_path}")
+            return True
             
         except Exception as e:
-            logger.error(f"Error saving weights: {e}")
+            logger.error(f"Error saving parameters: {e}")
+            return False
     
-    def update_weights_from_accuracy(self, model_name: str, accuracy: float, window_days: int = 30):
+    def update_weights_from_accuracy(self,
+                                     model_name: str,
+                                     accuracy: float,
+                                     window_days: int = 30,
+                                     save: bool = True):
         """
         Update model weights based on recent accuracy
         
@@ -114,6 +213,7 @@ class MetaLearner:
             model_name: Model name ('gpt4', 'xgboost', 'lightgbm')
             accuracy: Recent accuracy (0-1)
             window_days: Time window for accuracy calculation
+            save: Save a new parameters version
         """
         if model_name not in self.weights:
             logger.warning(f"Unknown model: {model_name}")
@@ -135,14 +235,131 @@ class MetaLearner:
                 self.weights[model] = self.weights[model] / total_weight
         
         logger.info(f"✅ Updated weights: {self.weights}")
-        self.save_weights()
+        if save:
+            self.save_params()
+    
+    @staticmethod
+    def screener_win_probability(interesting_prob):
+        """
+        Player1 win probability the meta-learner derives from the LightGBM screener
+        
+        Args:
+            interesting_prob: "Interesting" probability (float or array)
+            
+        Returns:
+            Small adjustment around 0.5 (same type as the input)
+        """
+        # Use as confidence indicator, not direct win probability
+        # If interesting, slightly favor player1 (assuming better odds)
+        return 0.5 + (interesting_prob - 0.5) * 0.2  # Scale to small adjustment
+    
+    @staticmethod
+    def _stacking_features(predictions: np.ndarray, available: np.ndarray) -> np.ndarray:
+        """
+        Stacking design matrix: log-odds of each model (0 if missing) and availability flags
+        
+        Args:
+            predictions: (n_models, n) player1 win probabilities
+            available: (n_models, n) availability mask
+            
+        Returns:
+            (n, 2 * n_models) matrix
+        """
+        log_odds = np.where(available, _logit(np.where(available, predictions, 0.5)), 0.0)
+        return np.vstack([log_odds, available.astype(np.float64)]).T
+    
+    def _weighted_combination(self, values: np.ndarray, available: np.ndarray) -> np.ndarray:
+        """Accuracy-weighted average with agreement bonus (fallback without stacking)"""
+        # Normalize weights over the models available for each match
+        weights = np.array([self.weights[model] for model in MODELS])[:, None] * available
+        total_weight = weights.sum(axis=0)
+        weights = np.divide(weights, total_weight, out=weights, where=total_weight > 0)
+        
+        combined_prob = (values * weights).sum(axis=0)
+        
+        # Agreement bonus when at least two models agree on direction
+        n_models = available.sum(axis=0)
+        all_above_50 = np.all((values > 0.5) | ~available, axis=0) & (n_models >= 2)
+        all_below_50 = np.all((values < 0.5) | ~available, axis=0) & (n_models >= 2)
+        agreement_strength = np.where(available, np.abs(values - 0.5), np.inf).min(axis=0)
+        bonus = 1.0 + (self.agreement_bonus - 1.0) * np.where(np.isfinite(agreement_strength), agreement_strength, 0.0)
+        combined_prob = np.where(all_above_50, np.minimum(0.95, combined_prob * bonus), combined_prob)
+        combined_prob = np.where(all_below_50, np.maximum(0.05, combined_prob / bonus), combined_prob)
+        return combined_prob
+    
+    def _stacked_combination(self, values: np.ndarray, available: np.ndarray) -> np.ndarray:
+        """Logistic stacking layer"""
+        coef = np.array(
+            [self.stacking['coef'][model] for model in MODELS] +
+            [self.stacking['missing_coef'][model] for model in MODELS]
+        )
+        z = self.stacking['intercept'] + self._stacking_features(values, available) @ coef
+        return 1.0 / (1.0 + np.exp(-z))
+    
+    def combine_predictions_batch(self,
+                                  gpt4_probs: Optional[np.ndarray],
+                                  xgboost_probs: Optional[np.ndarray],
+                                  lightgbm_probs: Optional[np.ndarray],
+                                  gpt4_mask: Optional[np.ndarray] = None,
+                                  xgboost_mask: Optional[np.ndarray] = None,
+                                  lightgbm_mask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Combine predictions for many matches with array arithmetic
+        
+        A NaN, a False mask entry or a None array marks a model without a
+        prediction for that match. Uses the stacking layer when fitted,
+        otherwise accuracy-weighted averaging.
+        
+        Args:
+            gpt4_probs: GPT-4 player1 win probabilities
+            xgboost_probs: XGBoost player1 win probabilities
+            lightgbm_probs: LightGBM "interesting" probabilities
+            gpt4_mask: GPT-4 availability (optional)
+            xgboost_mask: XGBoost availability (optional)
+            lightgbm_mask: LightGBM availability (optional)
+            
+        Returns:
+            Dictionary of arrays: player1/player2 win probability, confidence,
+            and a boolean availability mask per model
+        """
+        sources = [(gpt4_probs, gpt4_mask), (xgboost_probs, xgboost_mask), (lightgbm_probs, lightgbm_mask)]
+        n = next((len(probs) for probs, _ in sources if probs is not None), 0)
+        
+        predictions = np.full((len(MODELS), n), np.nan)
+        for i, (probs, mask) in enumerate(sources):
+            if probs is not None:
+                predictions[i] = np.asarray(probs, dtype=np.float64)
+                if mask is not None:
+                    predictions[i][~np.asarray(mask, dtype=bool)] = np.nan
+        # LightGBM "interesting" probability -> small adjustment around 0.5
+        predictions[2] = self.screener_win_probability(predictions[2])
+        
+        available = ~np.isnan(predictions)
+        values = np.where(available, predictions, 0.0)
+        
+        if self.stacking:
+            combined_prob = self._stacked_combination(values, available)
+        else:
+            combined_prob = self._weighted_combination(values, available)
+        
+        # No predictions at all -> neutral
+        n_models = available.sum(axis=0)
+        combined_prob = np.where(n_models > 0, combined_prob, 0.5)
+        confidence = np.where(n_models > 0, np.abs(combined_prob - 0.5) * 2, 0.0)
+        
+        return {
+            'player1_win_probability': combined_prob,
+            'player2_win_probability': 1.0 - combined_prob,
+            'confidence': confidence,
+            'available': {model: available[i] for i, model in enumerate(MODELS)}
+        }
     
     def combine_predictions(self,
                            gpt4_pred: Optional[Dict[str, Any]],
                            xgboost_pred: Optional[Dict[str, Any]],
                            lightgbm_pred: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Combine predictions from all models
+        Combine predictions from all models (one match, see combine_predictions_batch)
         
         Args:
             gpt4_pred: GPT-4 prediction (optional)
@@ -152,30 +369,19 @@ class MetaLearner:
         Returns:
             Combined prediction dictionary
         """
-        predictions = []
-        weights = []
-        
-        # Collect available predictions
-        if gpt4_pred:
-            prob = gpt4_pred.get('player1_win_probability', 0.5)
-            predictions.append(prob)
-            weights.append(self.weights['gpt4'])
-        
-        if xgboost_pred:
-            prob = xgboost_pred.get('player1_win_probability', 0.5)
-            predictions.append(prob)
-            weights.append(self.weights['xgboost'])
-        
-        if lightgbm_pred:
-            # LightGBM gives "interesting" probability, convert to win probability
-            interesting_prob = lightgbm_pred.get('interesting_probability', 0.5)
-            # Use as confidence indicator, not direct win probability
-            # If interesting, slightly favor player1 (assuming better odds)
-            prob = 0.5 + (interesting_prob - 0.5) * 0.2  # Scale to small adjustment
-            predictions.append(prob)
-            weights.append(self.weights['lightgbm'])
-        
-        if not predictions:
+        def as_array(pred: Optional[Dict[str, Any]], key: str) -> np.ndarray:
+            return np.array([pred.get(key, 0.5) if pred else np.nan], dtype=np.float64)
+        
+        combined = self.combine_predictions_batch(
+            gpt4_probs=as_array(gpt4_pred, 'player1_win_probability'),
+            xgboost_probs=as_array(xgboost_pred, 'player1_win_probability'),
+            lightgbm_probs=as_array(lightgbm_pred, 'interesting_probability')
+        )
+        
+        # Determine which models contributed
+        contributing_models = [model for model in MODELS if combined['available'][model][0]]
+        
+        if not contributing_models:
             logger.warning("No predictions available")
             return {
                 'player1_win_probability': 0.5,
@@ -185,55 +391,109 @@ class MetaLearner:
                 'error': 'No predictions available'
             }
         
-        # Normalize weights
-        total_weight = sum(weights)
-        if total_weight > 0:
-            weights = [w / total_weight for w in weights]
-        
-        # Weighted average
-        combined_prob = sum(p * w for p, w in zip(predictions, weights))
-        
-        # Check for agreement (all predictions agree on direction)
-        if len(predictions) >= 2:
-            all_above_50 = all(p > 0.5 for p in predictions)
-            all_below_50 = all(p < 0.5 for p in predictions)
-            
-            if all_above_50 or all_below_50:
-                # Models agree - apply bonus
-                agreement_strength = min(abs(p - 0.5) for p in predictions)
-                bonus = 1.0 + (self.agreement_bonus - 1.0) * agreement_strength
-                
-                if all_above_50:
-                    combined_prob = min(0.95, combined_prob * bonus)
-                else:
-                    combined_prob = max(0.05, combined_prob / bonus)
-        
-        player2_prob = 1.0 - combined_prob
-        confidence = abs(combined_prob - 0.5) * 2
-        
-        # Determine which models contributed
-        contributing_models = []
-        if gpt4_pred:
-            contributing_models.append('gpt4')
-        if xgboost_pred:
-            contributing_models.append('xgboost')
-        if lightgbm_pred:
-            contributing_models.append('lightgbm')
+        combined_prob = float(combined['player1_win_probability'][0])
         
         return {
             'player1_win_probability': combined_prob,
-            'player2_win_probability': player2_prob,
+            'player2_win_probability': float(combined['player2_win_probability'][0]),
             'predicted_winner': 'player1' if combined_prob > 0.5 else 'player2',
-            'confidence': confidence,
+            'confidence': float(combined['confidence'][0]),
             'model': 'meta_learner',
+            'method': self.method,
             'contributing_models': contributing_models,
             'weights_used': {
-                'gpt4': self.weights['gpt4'] if gpt4_pred else 0,
-                'xgboost': self.weights['xgboost'] if xgboost_pred else 0,
-                'lightgbm': self.weights['lightgbm'] if lightgbm_pred else 0
+                model: self.weights[model] if model in contributing_models else 0
+                for model in MODELS
             }
         }
     
+    def fit_stacking(self,
+                     prediction_log,
+                     window_days: int = 180,
+                     min_samples: int = 200,
+                     holdout_fraction: float = 0.2,
+                     C: float = 1.0) -> Dict[str, Any]:
+        """
+        Fit the logistic stacking layer from resolved predictions
+        
+        The layer is adopted only if it beats the weighted combination on
+        the most recent holdout_fraction of matches; it is then refitted on
+        all of them and saved as a new parameters version.
+        
+        Args:
+            prediction_log: PredictionLog with scored predictions
+            window_days: Matches resolved in this many days
+            min_samples: Minimum matches with at least one model prediction
+            holdout_fraction: Share of latest matches for the comparison
+            C: Inverse L2 regularization strength
+            
+        Returns:
+            Dictionary with fit results
+        """
+        from sklearn.linear_model import LogisticRegression
+        
+        try:
+            # Logged LightGBM values are already screener_win_probability() outputs
+            P, y, _ = prediction_log.get_resolved_matrix(MODELS, window_days=window_days)
+            
+            available = ~np.isnan(P.T)
+            keep = available.any(axis=0)
+            P, y, available = P[keep], y[keep], available[:, keep]
+            
+            if len(y) < min_samples or len(np.unique(y)) < 2:
+                logger.info(f"⚠️ Not enough resolved predictions to fit stacking: {len(y)} (need {min_samples})")
+                return {'success': False, 'error': f'Insufficient data: {len(y)} matches (need {min_samples})'}
+            
+            values = np.where(available, P.T, 0.0)
+            X = self._stacking_features(values, available)
+            
+            # Time-ordered comparison against the weighted combination
+            split = int(len(y) * (1.0 - holdout_fraction))
+            model = LogisticRegression(C=C, max_iter=1000)
+            model.fit(X[:split], y[:split])
+            stacked_loss = _log_loss(model.predict_proba(X[split:])[:, 1], y[split:])
+            weighted_loss = _log_loss(self._weighted_combination(values[:, split:], available[:, split:]), y[split:])
+            
+            logger.info(f"📊 Holdout log-loss: stacking {stacked_loss:.4f} vs weighted {weighted_loss:.4f} "
+                        f"({len(y) - split} matches)")
+            
+            if stacked_loss >= weighted_loss:
+                return {
+                    'success': True,
+                    'adopted': False,
+                    'stacked_log_loss': stacked_loss,
+                    'weighted_log_loss': weighted_loss,
+                    'n_samples': len(y)
+                }
+            
+            model.fit(X, y)
+            n_models = len(MODELS)
+            self.stacking = {
+                'intercept': float(model.intercept_[0]),
+                'coef': {m: float(model.coef_[0][i]) for i, m in enumerate(MODELS)},
+                'missing_coef': {m: float(model.coef_[0][n_models + i]) for i, m in enumerate(MODELS)},
+                'n_samples': int(len(y)),
+                'holdout_log_loss': stacked_loss,
+                'weighted_log_loss': weighted_loss,
+                'window_days': window_days,
+                'fitted_at': datetime.now().isoformat()
+            }
+            self.save_params()
+            
+            logger.info(f"✅ Stacking layer fitted on {len(y)} matches (v{self.version})")
+            return {
+                'success': True,
+                'adopted': True,
+                'version': self.version,
+                'stacked_log_loss': stacked_loss,
+                'weighted_log_loss': weighted_loss,
+                'n_samples': len(y)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error fitting stacking layer: {e}")
+            return {'success': False, 'error': str(e)}
+    
     def get_recommendation(self, combined_pred: Dict[str, Any], odds: Optional[float] = None) -> str:
         """
         Get betting recommendation from combined prediction
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Model Registry
+==============
+
+Versioned store for exported tree models.
+
+Layout (under data/models/registry):
+
+    <name>/<version>/ensemble.json + *.npy    TreeEnsemble arrays
+    <name>/<version>/metadata.json            feature list, training window, metrics
+    <name>/CURRENT                            version currently served
+
+Only the newest `keep` versions plus the current one are kept; older
+version directories are pruned after each promotion.
+
+A version directory is written under a temporary name and renamed into
+place, and CURRENT is swapped with os.replace, so readers never see a
+partial model and a new version can be promoted while the scheduler runs.
+LazyModel loads arrays memory-mapped on first predict and reloads when
+CURRENT changes; worker processes serving the same version share pages.
+
+This is part of Layer 3: Multi-Model Ensemble.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+from src.ml.tree_evaluator import TreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = 'CURRENT'
+METADATA_FILE = 'metadata.json'
+
+# Versions kept per model (besides the current one); overridable per process
+DEFAULT_KEEP_VERSIONS = int(os.getenv('MODEL_REGISTRY_KEEP_VERSIONS', '5'))
+
+
+class ModelRegistry:
+    """Models keyed by name and version, with an atomically promoted current version"""
+
+    def __init__(self, root: Optional[str] = None, keep: Optional[int] = DEFAULT_KEEP_VERSIONS):
+        """
+        Initialize model registry
+
+        Args:
+            root: Registry directory
+            keep: Newest versions kept per model after a promotion, besides
+                the current one (None disables pruning)
+        """
+        if root is None:
+            root = Path(__file__).parent.parent.parent / 'data' / 'models' / 'registry'
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+
+    def _model_dir(self, name: str) -> Path:
+        return self.root / name
+
+    def _version_dir(self, name: str, version: str) -> Path:
+        return self.root / name / version
+
+    def register(self,
+                 name: str,
+                 ensemble: TreeEnsemble,
+                 metrics: Optional[Dict[str, Any]] = None,
+                 training_window: Optional[Dict[str, Any]] = None,
+                 version: Optional[str] = None,
+                 promote: bool = True) -> Optional[str]:
+        """
+        Store a new model version
+
+        Args:
+            name: Model name ('xgboost', 'lightgbm')
+            ensemble: Exported model arrays
+            metrics: Evaluation metrics (e.g. test accuracy / AUC)
+            training_window: Description of the training data (samples, dates)
+            version: Version label (default: timestamp)
+            promote: Make it the current version
+
+        Returns:
+            Version label, or None on failure
+        """
+        version = version or datetime.now().strftime('%Y%m%d%H%M%S%f')
+        final_dir = self._version_dir(name, version)
+        if final_dir.exists():
+            logger.error(f"Version {name}/{version} already registered")
+            return None
+
+        tmp_dir = self._model_dir(name) / f'.{version}.tmp'
+        try:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir)
+            ensemble.save_dir(tmp_dir)
+
+            metadata = {
+                'name': name,
+                'version': version,
+                'source': ensemble.source,
+                'feature_names': ensemble.feature_names,
+                'n_trees': ensemble.n_trees,
+                'training_window': training_window or {},
+                'metrics': metrics or {},
+                'created_at': datetime.now().isoformat()
+            }
+            with open(tmp_dir / METADATA_FILE, 'w') as f:
+                json.dump(metadata, f, indent=2, default=str)
+
+            # Publish the complete directory in one rename
+            os.rename(tmp_dir, final_dir)
+            logger.info(f"✅ Registered {name} version {version} ({ensemble.n_trees} trees)")
+
+        except Exception as e:
+            logger.error(f"Error registering {name} model: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None
+
+        if promote:
+            self.promote(name, version)
+        return version
+
+    def promote(self, name: str, version: str) -> bool:
+        """
+        Atomically make a registered version the current one
+
+        Args:
+            name: Model name
+            version: Version label
+
+        Returns:
+            True if successful
+        """
+        if not (self._version_dir(name, version) / METADATA_FILE).exists():
+            logger.error(f"Cannot promote unknown version {name}/{version}")
+            return False
+
+        try:
+            pointer = self._model_dir(name) / CURRENT_FILE
+            tmp_pointer = pointer.with_suffix('.tmp')
+            with open(tmp_pointer, 'w') as f:
+                f.write(version)
+            os.replace(tmp_pointer, pointer)
+
+            logger.info(f"✅ Promoted {name} version {version}")
+
+        except Exception as e:
+            logger.error(f"Error promoting {name}/{version}: {e}")
+            return False
+
+        if self.keep is not None:
+            self.prune(name, self.keep)
+        return True
+
+    def prune(self, name: str, keep: int) -> List[str]:
+        """
+        Delete all but the newest versions of a model
+
+        The current version is never deleted. Processes still serving a
+        deleted version keep their memory-mapped arrays until they switch.
+
+        Args:
+            name: Model name
+            keep: Newest versions to keep (the current one is kept in addition)
+
+        Returns:
+            Deleted version labels
+        """
+        stale = [
+            metadata['version'] for metadata in self.list_versions(name)[max(keep, 0):]
+            if not metadata['current']
+        ]
+        for version in stale:
+            try:
+                shutil.rmtree(self._version_dir(name, version))
+            except OSError as e:
+                logger.warning(f"⚠️ Could not delete {name}/{version}: {e}")
+        if stale:
+            logger.info(f"🧹 Pruned {len(stale)} old {name} versions (keeping {keep} + current)")
+        return stale
+
+    def current_version(self, name: str) -> Optional[str]:
+        """
+        Version currently served for a model
+
+        Args:
+            name: Model name
+
+        Returns:
+            Version label, or None if nothing is promoted
+        """
+        pointer = self._model_dir(name) / CURRENT_FILE
+        try:
+            return pointer.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def get_metadata(self, name: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Metadata of a version (default: current)
+
+        Args:
+            name: Model name
+            version: Version label
+
+        Returns:
+            Metadata dictionary, or None if not found
+        """
+        version = version or self.current_version(name)
+        if not version:
+            return None
+        try:
+            with open(self._version_dir(name, version) / METADATA_FILE, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Metadata of every registered version, newest first
+
+        Args:
+            name: Model name
+
+        Returns:
+            List of metadata dictionaries (with 'current' flag)
+        """
+        model_dir = self._model_dir(name)
+        if not model_dir.exists():
+            return []
+
+        current = self.current_version(name)
+        versions = []
+        for path in model_dir.iterdir():
+            if path.name.startswith('.') or not (path / METADATA_FILE).exists():
+                continue
+            with open(path / METADATA_FILE, 'r') as f:
+                metadata = json.load(f)
+            metadata['current'] = metadata['version'] == current
+            versions.append(metadata)
+        return sorted(versions, key=lambda m: m['created_at'], reverse=True)
+
+    def load(self, name: str, version: Optional[str] = None, mmap: bool = True) -> Optional[TreeEnsemble]:
+        """
+        Load a version's arrays (default: current)
+
+        Args:
+            name: Model name
+            version: Version label
+            mmap: Memory-map the arrays read-only
+
+        Returns:
+            TreeEnsemble, or None if not found
+        """
+        version = version or self.current_version(name)
+        if not version:
+            return None
+        try:
+            return TreeEnsemble.load_dir(self._version_dir(name, version), mmap=mmap)
+        except Exception as e:
+            logger.error(f"Error loading {name}/{version}: {e}")
+            return None
+
+    def get(self, name: str) -> 'LazyModel':
+        """
+        Lazy handle on the current version of a model
+
+        Args:
+            name: Model name
+
+        Returns:
+            LazyModel
+        """
+        return LazyModel(self, name)
+
+
+class LazyModel:
+    """Current version of a registered model, loaded on first use"""
+
+    def __init__(self, registry: ModelRegistry, name: str):
+        """
+        Initialize lazy model handle (nothing is read yet)
+
+        Args:
+            registry: Model registry
+            name: Model name
+        """
+        self.registry = registry
+        self.name = name
+        self.version: Optional[str] = None
+        self._ensemble: Optional[TreeEnsemble] = None
+        self._failed_version: Optional[str] = None
+
+    def _refresh(self) -> Optional[TreeEnsemble]:
+        """
+        Load the current version if it changed since the last call
+
+        A version that fails to load is remembered and not retried; the
+        previously loaded version (if any) keeps serving.
+        """
+        current = self.registry.current_version(self.name)
+        if current and current != self.version and current != self._failed_version:
+            ensemble = self.registry.load(self.name, current)
+            if ensemble is None:
+                logger.warning(f"⚠️ {self.name}: version {current} failed to load, not retrying")
+                self._failed_version = current
+            else:
+                if self.version:
+                    logger.info(f"🔄 {self.name}: switched from version {self.version} to {current}")
+                self._ensemble, self.version = ensemble, current
+        return self._ensemble
+
+    def is_available(self) -> bool:
+        """Whether a usable version is loaded or promoted (does not load it)"""
+        if self._ensemble is not None:
+            return True
+        current = self.registry.current_version(self.name)
+        return current is not None and current != self._failed_version
+
+    @property
+    def feature_names(self) -> Optional[List[str]]:
+        ensemble = self._refresh()
+        return ensemble.feature_names if ensemble else None
+
+    def predict_proba(self, X: np.ndarray, feature_names: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        """
+        Class-1 probability per row with the current version
+
+        Args:
+            X: Feature matrix, one row per match
+            feature_names: Column names of X
+
+        Returns:
+            Array of probabilities, or None if no version is available
+        """
+        ensemble = self._refresh()
+        if ensemble is None:
+            return None
+        return ensemble.predict_proba(X, feature_names)
+
+
+def main():
+    """List and promote registered models"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Model Registry')
+    parser.add_argument('--model', choices=('xgboost', 'lightgbm'), help='Only this model')
+    parser.add_argument('--promote', metavar='VERSION', help='Promote a version (requires --model)')
+    parser.add_argument('--keep', type=int, default=DEFAULT_KEEP_VERSIONS,
+                        help=f'Versions kept besides the current one (default: {DEFAULT_KEEP_VERSIONS})')
+    parser.add_argument('--prune', action='store_true', help='Delete versions beyond --keep')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(keep=args.keep)
+
+    if args.promote:
+        if not args.model:
+            parser.error('--promote requires --model')
+        if registry.promote(args.model, args.promote):
+            print(f"\n✅ {args.model} now serves version {args.promote}")
+        else:
+            print(f"\n❌ Could not promote {args.model} version {args.promote}")
+        return
+
+    if args.prune:
+        for name in [args.model] if args.model else ['xgboost', 'lightgbm']:
+            pruned = registry.prune(name, args.keep)
+            print(f"\n🧹 {name}: deleted {len(pruned)} versions")
+        return
+
+    for name in [args.model] if args.model else ['xgboost', 'lightgbm']:
+        versions = registry.list_versions(name)
+        print(f"\n📦 {name} ({len(versions)} versions)")
+        for metadata in versions:
+            marker = '➡️' if metadata['current'] else '  '
+            metrics = ', '.join(f"{k}={v:.3f}" for k, v in metadata['metrics'].items() if isinstance(v, float))
+            print(f"   {marker} {metadata['version']}  {metadata['n_trees']} trees  "
+                  f"{metadata['training_window'].get('samples', '?')} samples  {metrics}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
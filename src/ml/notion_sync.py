@@ -5,13 +5,21 @@ Notion to SQLite Sync
 
 Synchronizes match data from Notion Match Results DB to SQLite for ML training.
 Extracts only the 24 properties needed for ML (excludes AI predictions, betting info).
+
+Incremental syncs keep a cursor (the highest Notion last_edited_time
+written to SQLite) and query only pages edited since. Pages are streamed
+through Notion pagination; the next page of results is fetched while the
+current one is parsed by a thread pool, and each batch of matches, results
+and the advanced cursor commits in one transaction.
 """
 
 import os
 import sys
 import logging
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, Executor
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -38,17 +46,29 @@ from src.scrapers.sportbex_client import SportbexMatch
 
 logger = logging.getLogger(__name__)
 
+# Notion returns at most 100 pages per query
+NOTION_PAGE_SIZE = 100
+
+# Pages per SQLite transaction
+SYNC_BATCH_SIZE = 500
+
 
 class NotionToSQLiteSync:
     """Syncs match data from Notion to SQLite for ML training"""
     
-    def __init__(self, database_id: Optional[str] = None, db_path: Optional[str] = None):
+    def __init__(self,
+                 database_id: Optional[str] = None,
+                 db_path: Optional[str] = None,
+                 workers: int = 4,
+                 batch_size: int = SYNC_BATCH_SIZE):
         """
         Initialize Notion client and SQLite connection.
         
         Args:
             database_id: Notion Match Results database ID (optional, from env)
             db_path: Path to SQLite database (optional)
+            workers: Threads for page fetching and parsing
+            batch_size: Pages per SQLite transaction
         """
         self.notion = None
         self.notion_db_id = database_id or os.getenv('NOTION_MATCH_RESULTS_DB_ID')
@@ -58,6 +78,9 @@ class NotionToSQLiteSync:
         self.db_path = Path(db_path)
         
         self.sqlite_db = MatchResultsDB(db_path=str(self.db_path))
+        self.workers = max(2, workers)
+        self.batch_size = batch_size
+        self._init_state_table()
         
         if NOTION_AVAILABLE:
             notion_token = os.getenv('NOTION_API_KEY') or os.getenv('NOTION_TOKEN')
@@ -71,25 +94,123 @@ class NotionToSQLiteSync:
         if not self.notion_db_id:
             logger.warning("⚠️ NOTION_MATCH_RESULTS_DB_ID not set")
         
+    def _init_state_table(self):
+        """Create sync cursor table"""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS notion_sync_state (
+                database_id TEXT PRIMARY KEY,
+                last_edited_time TEXT NOT NULL,
+                pages_synced INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP
+            )
+        """)
+        conn.commit()
+        conn.close()
+    
+    def get_cursor(self) -> Optional[str]:
+        """
+        Highest Notion last_edited_time already synced
+        
+        Returns:
+            ISO timestamp, or None before the first sync
+        """
+        conn = sqlite3.connect(str(self.db_path))
+        row = conn.execute(
+            "SELECT last_edited_time FROM notion_sync_state WHERE database_id = ?",
+            (self.notion_db_id or '',)
+        ).fetchone()
+        conn.close()
+        return row[0] if row else None
+    
+    def reset_cursor(self):
+        """Forget the sync cursor (next incremental sync reads every page)"""
+        conn = sqlite3.connect(str(self.db_path))
+        with conn:
+            conn.execute("DELETE FROM notion_sync_state WHERE database_id = ?", (self.notion_db_id or '',))
+        conn.close()
+    
     def sync(self, full_sync: bool = False) -> Dict[str, Any]:
         """
         Main sync method - syncs Notion → SQLite
         
         Args:
-            full_sync: If True, sync all pages. If False, only sync recent changes.
+            full_sync: If True, sync all pages. If False, only pages edited
+                since the last sync (all pages on the first run).
             
         Returns:
             Dictionary with sync results
         """
-        return self.sync_recent_matches(days_back=7 if not full_sync else 365)
+        cursor = None if full_sync else self.get_cursor()
+        if cursor:
+            logger.info(f"🔄 Syncing pages edited since {cursor}...")
+            # Notion rounds last_edited_time to the minute; re-reading the
+            # boundary minute is harmless because writes are upserts
+            query_filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": cursor}
+            }
+        else:
+            logger.info("🔄 Full sync of all Notion pages...")
+            query_filter = None
+        
+        return self._sync_pages(query_filter)
     
     def sync_recent_matches(self, days_back: int = 7) -> Dict[str, Any]:
         """
-        Sync recent matches from Notion to SQLite
+        Sync matches scanned in the last days_back days from Notion to SQLite
         
         Args:
             days_back: How many days back to sync
             
+        Returns:
+            Dictionary with sync results
+        """
+        logger.info(f"🔄 Syncing matches from last {days_back} days...")
+        cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
+        # A window sync may skip older edits, so it leaves the cursor alone
+        return self._sync_pages({
+            "property": "Scan Date",
+            "date": {"on_or_after": cutoff_date}
+        }, advance_cursor=False)
+    
+    def _iter_pages(self, query_filter: Optional[Dict], executor: Executor) -> Iterator[Dict]:
+        """
+        Stream pages of a database query, oldest edit first
+        
+        The next result page is requested in the background while the
+        caller consumes the current one.
+        
+        Args:
+            query_filter: Notion filter (None for all pages)
+            executor: Executor for the background requests
+            
+        Yields:
+            Notion page objects
+        """
+        query = {
+            'database_id': self.notion_db_id,
+            'sorts': [{"timestamp": "last_edited_time", "direction": "ascending"}],
+            'page_size': NOTION_PAGE_SIZE
+        }
+        if query_filter:
+            query['filter'] = query_filter
+        
+        future = executor.submit(self.notion.databases.query, **query)
+        while future is not None:
+            response = future.result()
+            next_cursor = response.get('next_cursor') if response.get('has_more') else None
+            future = executor.submit(self.notion.databases.query, **query, start_cursor=next_cursor) if next_cursor else None
+            yield from response.get('results', [])
+    
+    def _sync_pages(self, query_filter: Optional[Dict], advance_cursor: bool = True) -> Dict[str, Any]:
+        """
+        Stream a query into SQLite in batches of batch_size pages
+        
+        Args:
+            query_filter: Notion filter (None for all pages)
+            advance_cursor: Move the sync cursor to the newest edit written
+            
         Returns:
             Dictionary with sync results
         """
@@ -100,68 +221,110 @@ class NotionToSQLiteSync:
                 'error': 'Notion client or DB ID not available'
             }
         
-        logger.info(f"🔄 Syncing matches from last {days_back} days...")
+        stats = {'synced': 0, 'results': 0, 'skipped': 0, 'errors': 0, 'total': 0}
         
         try:
-            # Query Notion for recent matches
-            from datetime import timedelta
-            cutoff_date = (datetime.now() - timedelta(days=days_back)).isoformat()
-            
-            response = self.notion.databases.query(
-                database_id=self.notion_db_id,
-                filter={
-                    "property": "Scan Date",
-                    "date": {"on_or_after": cutoff_date}
-                },
-                sorts=[{"property": "Match Date", "direction": "descending"}]
-            )
-            
-            matches = response.get('results', [])
-            logger.info(f"📊 Found {len(matches)} matches in Notion")
-            
-            synced_count = 0
-            skipped_count = 0
-            error_count = 0
-            
-            for page in matches:
-                try:
-                    match_data = self._parse_notion_page(page)
-                    sportbex_match = self._convert_to_sportbex_match(match_data)
-                    
-                    if sportbex_match:
-                        # Insert into SQLite
-                        if self.sqlite_db.insert_match(sportbex_match):
-                            synced_count += 1
-                            
-                            # If result available, insert result too
-                            if match_data.get('actual_winner'):
-                                self._insert_result(match_data)
-                        else:
-                            skipped_count += 1
-                    else:
-                        skipped_count += 1
-                
-                except Exception as e:
-                    logger.error(f"❌ Error syncing match: {e}")
-                    error_count += 1
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                batch: List[Dict] = []
+                for page in self._iter_pages(query_filter, executor):
+                    batch.append(page)
+                    if len(batch) >= self.batch_size:
+                        self._write_batch(batch, executor, stats, advance_cursor)
+                        batch = []
+                if batch:
+                    self._write_batch(batch, executor, stats, advance_cursor)
             
-            logger.info(f"✅ Sync complete: {synced_count} synced, {skipped_count} skipped, {error_count} errors")
+            logger.info(f"✅ Sync complete: {stats['synced']} synced ({stats['results']} new results), "
+                        f"{stats['skipped']} skipped, {stats['errors']} errors")
             
             return {
                 'success': True,
-                'synced': synced_count,
-                'skipped': skipped_count,
-                'errors': error_count,
-                'total': len(matches)
+                **stats,
+                'cursor': self.get_cursor()
             }
             
         except Exception as e:
             logger.error(f"❌ Sync failed: {e}")
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                **stats
             }
     
+    def _parse_page(self, page: Dict) -> Tuple[Optional[SportbexMatch], Optional[Tuple]]:
+        """
+        Parse a Notion page into a match and (if decided) a result row
+        
+        Returns:
+            SportbexMatch (None if the page has no usable ID) and a result
+            row for MatchResultsDB.upsert_results (None without a winner)
+        """
+        match_data = self._parse_notion_page(page)
+        match = self._convert_to_sportbex_match(match_data)
+        if match is None:
+            return None, None
+        return match, self._result_row(match.match_id, match_data)
+    
+    def _write_batch(self, pages: List[Dict], executor: Executor, stats: Dict[str, int], advance_cursor: bool = True):
+        """
+        Parse pages concurrently and write them in one transaction
+        
+        The cursor advances to the newest last_edited_time of the batch in
+        the same transaction, so an interrupted sync resumes after the last
+        committed batch.
+        
+        Args:
+            pages: Notion page objects
+            executor: Executor for parsing
+            stats: Running counters (updated in place)
+            advance_cursor: Move the sync cursor
+        """
+        matches: Dict[str, SportbexMatch] = {}
+        results: Dict[str, Tuple] = {}
+        for page, future in [(page, executor.submit(self._parse_page, page)) for page in pages]:
+            try:
+                match, result = future.result()
+            except Exception as e:
+                logger.error(f"❌ Error parsing page {page.get('id')}: {e}")
+                stats['errors'] += 1
+                continue
+            
+            if match is None:
+                stats['skipped'] += 1
+                continue
+            # Later edits of the same match win
+            matches[match.match_id] = match
+            if result:
+                results[match.match_id] = result
+        
+        edited = max((page['last_edited_time'] for page in pages if page.get('last_edited_time')), default=None)
+        
+        conn = sqlite3.connect(str(self.db_path))
+        cursor = conn.cursor()
+        try:
+            self.sqlite_db.upsert_matches(cursor, matches.values())
+            changed = self.sqlite_db.upsert_results(cursor, results.values())
+            if edited and advance_cursor:
+                cursor.execute("""
+                    INSERT INTO notion_sync_state (database_id, last_edited_time, pages_synced, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (database_id) DO UPDATE SET
+                        last_edited_time = MAX(last_edited_time, excluded.last_edited_time),
+                        pages_synced = pages_synced + excluded.pages_synced,
+                        updated_at = excluded.updated_at
+                """, (self.notion_db_id, edited, len(pages), datetime.now().isoformat()))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        stats['synced'] += len(matches)
+        stats['results'] += len(changed)
+        stats['total'] += len(pages)
+        logger.info(f"📊 {stats['total']} pages synced (through {edited})")
+    
     def _parse_notion_page(self, page: Dict) -> Dict[str, Any]:
         """Parse Notion page to match data dictionary"""
         props = page.get('properties', {})
@@ -223,61 +386,38 @@ class NotionToSQLiteSync:
             logger.error(f"Error converting to SportbexMatch: {e}")
             return None
     
-    def _insert_result(self, match_data: Dict[str, Any]):
-        """Insert match result into SQLite"""
-        try:
-            match_id = match_data.get('match_id')
-            if not match_id:
-                return
-            
-            winner = match_data.get('actual_winner')
-            score = match_data.get('actual_score', '')
-            result_date = match_data.get('result_date')
-            
-            if not winner:
-                return
-            
-            # Determine player1_won
-            player1_won = None
-            if winner == 'Player A':
-                player1_won = True
-            elif winner == 'Player B':
-                player1_won = False
-            
-            # Parse result_date
-            if isinstance(result_date, str):
-                try:
-                    result_date = datetime.fromisoformat(result_date.replace('Z', '+00:00'))
-                except:
-                    result_date = datetime.now()
-            elif result_date is None:
+    @staticmethod
+    def _result_row(match_id: str, match_data: Dict[str, Any]) -> Optional[Tuple]:
+        """Result row for MatchResultsDB.upsert_results, or None without a winner"""
+        winner = match_data.get('actual_winner')
+        if not winner:
+            return None
+        
+        # Determine player1_won
+        player1_won = None
+        if winner == 'Player A':
+            player1_won = True
+        elif winner == 'Player B':
+            player1_won = False
+        
+        # Parse result_date
+        result_date = match_data.get('result_date')
+        if isinstance(result_date, str):
+            try:
+                result_date = datetime.fromisoformat(result_date.replace('Z', '+00:00'))
+            except ValueError:
                 result_date = datetime.now()
-            
-            # Insert result
-            import sqlite3
-            conn = sqlite3.connect(str(self.sqlite_db.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO results (
-                    match_id, winner, score, result_date, player1_won, player2_won
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                match_id,
-                winner,
-                score,
-                result_date.isoformat() if isinstance(result_date, datetime) else result_date,
-                player1_won,
-                not player1_won if player1_won is not None else None
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            logger.error(f"Error inserting result: {e}")
-            if 'conn' in locals():
-                conn.close()
+        elif result_date is None:
+            result_date = datetime.now()
+        
+        return (
+            match_id,
+            winner,
+            match_data.get('actual_score') or '',
+            result_date.isoformat() if isinstance(result_date, datetime) else result_date,
+            player1_won,
+            not player1_won if player1_won is not None else None
+        )
     
     # Helper methods for Notion properties
     def _get_title_property(self, prop) -> str:
@@ -312,7 +452,9 @@ def main():
     
     parser = argparse.ArgumentParser(description='Sync Notion Match Results DB to SQLite')
     parser.add_argument('--full', action='store_true', help='Full sync (all pages)')
-    parser.add_argument('--days', type=int, default=7, help='Days back to sync (default: 7, ignored if --full)')
+    parser.add_argument('--days', type=int, help='Sync pages scanned in the last N days instead of using the edit cursor')
+    parser.add_argument('--reset-cursor', action='store_true', help='Forget the edit cursor before syncing')
+    parser.add_argument('--workers', type=int, default=4, help='Threads for fetching and parsing (default: 4)')
     parser.add_argument('--stats', action='store_true', help='Show database stats')
     args = parser.parse_args()
     
@@ -321,7 +463,7 @@ def main():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
     
-    sync = NotionToSQLiteSync()
+    sync = NotionToSQLiteSync(workers=args.workers)
     
     if args.stats:
         # Show stats
@@ -331,12 +473,18 @@ def main():
         print(f"\n📊 SQLite Database Stats")
         print(f"   Total matches: {total}")
         print(f"   With results: {results}")
+        print(f"   Notion cursor: {sync.get_cursor() or 'none (next sync is full)'}")
     else:
-        result = sync.sync(full_sync=args.full)
+        if args.reset_cursor:
+            sync.reset_cursor()
+        if args.days and not args.full:
+            result = sync.sync_recent_matches(days_back=args.days)
+        else:
+            result = sync.sync(full_sync=args.full)
         
         if result.get('success'):
             print(f"\n✅ Sync completed!")
-            print(f"   Synced: {result.get('synced', 0)}")
+            print(f"   Synced: {result.get('synced', 0)} ({result.get('results', 0)} new results)")
             print(f"   Skipped: {result.get('skipped', 0)}")
             print(f"   Errors: {result.get('errors', 0)}")
             sys.exit(0)
@@ -0,0 +1,760 @@
+#!/usr/bin/env python3
+"""
+Player Resolver
+===============
+
+One place to turn raw player names into canonical player IDs.
+
+Names arrive as "Jane Smith" (Odds API, Notion), "Smith J." (FlashScore),
+"J. Smith" (snippets) and with accents or typos. The resolver keeps:
+
+- players:         canonical player ID, name and Player Card page ID
+- player_aliases:  normalised raw name -> player ID (on disk, in the
+                   Match Results database)
+
+A lookup is an alias table hit for names seen before. New names are matched
+via blocking keys (initial + surname, surname) and, for typos, a trigram
+index over surnames. Hits of at least initial + surname confidence are
+written back as aliases, so each such raw name is scored once; all lookups
+are memoized in memory.
+
+Shared by the FlashScore odds join, the snippet parser, match linking and
+the Player Cards ELO updater.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from difflib import SequenceMatcher
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+logger = logging.getLogger(__name__)
+
+# Confidence per match level
+CONFIDENCE_EXACT = 1.0
+CONFIDENCE_INITIAL = 0.9
+CONFIDENCE_SURNAME = 0.8
+
+# Scale for surname similarity (typos), by initials agreeing
+FUZZY_WEIGHT = 0.85
+FUZZY_WEIGHT_INITIAL_MISMATCH = 0.5
+
+# Same surname, different first initial: most likely another player
+CONFIDENCE_INITIAL_MISMATCH = 0.4
+
+# Minimum confidence for a resolution (aliases are only stored from
+# CONFIDENCE_INITIAL up)
+MIN_CONFIDENCE = CONFIDENCE_SURNAME
+
+# Surnames sharing fewer trigrams than this (Dice) are not candidates
+MIN_TRIGRAM_DICE = 0.4
+
+# Notion Player Cards name properties
+CARD_NAME_PROPERTIES = ('Name', 'Player Name', 'Full Name')
+
+_PUNCTUATION = re.compile(r"[.,'`´’\-_/()]+")
+
+ALIAS_UPSERT_SQL = """
+    INSERT INTO player_aliases (alias, player_id, raw_name, source, confidence, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (alias) DO UPDATE SET
+        player_id = excluded.player_id,
+        raw_name = excluded.raw_name,
+        source = excluded.source,
+        confidence = excluded.confidence
+    WHERE excluded.confidence >= player_aliases.confidence
+"""
+
+PLAYER_UPSERT_SQL = """
+    INSERT INTO players (player_id, canonical_name, notion_page_id, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (player_id) DO UPDATE SET
+        canonical_name = excluded.canonical_name,
+        notion_page_id = COALESCE(excluded.notion_page_id, players.notion_page_id),
+        updated_at = excluded.updated_at
+"""
+
+
+@dataclass(frozen=True)
+class PlayerName:
+    """Normalised player name with its blocking keys"""
+    full: str
+    initial: str
+    surnames: Tuple[str, ...]
+    first: str = ''  # Full first name, '' when only an initial is given
+
+    @property
+    def initial_keys(self) -> Tuple[str, ...]:
+        """Initial + surname keys ('j smith')"""
+        if not self.initial:
+            return ()
+        return tuple(f"{self.initial} {surname}" for surname in self.surnames)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase ASCII name without punctuation or repeated spaces
+
+    Args:
+        name: Raw player name
+
+    Returns:
+        Normalised name ('' for empty input)
+    """
+    if not name:
+        return ''
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = _PUNCTUATION.sub(' ', text.lower())
+    return ' '.join(text.split())
+
+
+@lru_cache(maxsize=4096)
+def parse_name(name: str) -> PlayerName:
+    """
+    Parse a raw name into initial and surname candidates
+
+    Handles "First Last", "First Middle Last", "J. Smith" and FlashScore's
+    "Last F." / "Last Compound F. M." forms. Only "First Last" forms carry
+    a full first name.
+
+    Args:
+        name: Raw player name
+
+    Returns:
+        PlayerName
+    """
+    full = normalize_name(name)
+    tokens = full.split()
+    if not tokens:
+        return PlayerName(full='', initial='', surnames=())
+
+    # Trailing single letters are initials: surname comes first
+    n_initials = 0
+    while n_initials < len(tokens) - 1 and len(tokens[-1 - n_initials]) == 1:
+        n_initials += 1
+
+    first_name = ''
+    if n_initials:
+        surname_tokens = tokens[:-n_initials]
+        initial = tokens[-n_initials]
+    elif len(tokens) > 1:
+        # Leading initials ("j j schwaerzler") or first names
+        first = 0
+        while first < len(tokens) - 1 and len(tokens[first]) == 1:
+            first += 1
+        surname_tokens = tokens[max(first, 1):]
+        initial = tokens[0][0]
+        if len(tokens[0]) > 1:
+            first_name = tokens[0]
+    else:
+        surname_tokens = tokens
+        initial = ''
+
+    # Compound surnames also match on their first or last part
+    surnames = [' '.join(surname_tokens)]
+    for part in (surname_tokens[-1], surname_tokens[0]):
+        if part not in surnames and len(part) > 1:
+            surnames.append(part)
+
+    return PlayerName(full=full, initial=initial, surnames=tuple(surnames), first=first_name)
+
+
+def _trigrams(text: str) -> Counter:
+    padded = f"  {text} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _dice(a: Counter, b: Counter) -> float:
+    total = sum(a.values()) + sum(b.values())
+    return 2 * sum((a & b).values()) / total if total else 0.0
+
+
+def names_conflict(a: PlayerName, b: PlayerName) -> bool:
+    """
+    True if two names cannot be the same player: both give an initial and
+    they differ, or both give a full first name and neither is a short
+    form of the other ('alex' / 'alexander' agree, 'jane' / 'jana' do not)
+    """
+    if a.initial and b.initial and a.initial != b.initial:
+        return True
+    if a.first and b.first:
+        return not (a.first.startswith(b.first) or b.first.startswith(a.first))
+    return False
+
+
+def name_similarity(a: Union[str, PlayerName], b: Union[str, PlayerName]) -> float:
+    """
+    Confidence that two names belong to the same player (0-1)
+
+    Args:
+        a: Raw name or parsed name
+        b: Raw name or parsed name
+
+    Returns:
+        1.0 same name, 0.9 same initial + surname, 0.8 same surname (one
+        side without initial), lower for surname typos (sequence ratio)
+        or other initials / first names
+    """
+    a = a if isinstance(a, PlayerName) else parse_name(a)
+    b = b if isinstance(b, PlayerName) else parse_name(b)
+    if not a.full or not b.full:
+        return 0.0
+    if a.full == b.full:
+        return CONFIDENCE_EXACT
+    initials_agree = not names_conflict(a, b)
+    if set(a.initial_keys) & set(b.initial_keys):
+        return CONFIDENCE_INITIAL if initials_agree else CONFIDENCE_INITIAL_MISMATCH
+
+    if set(a.surnames) & set(b.surnames):
+        return CONFIDENCE_SURNAME if initials_agree else CONFIDENCE_INITIAL_MISMATCH
+
+    ratio = max(SequenceMatcher(None, x, y).ratio() for x in a.surnames for y in b.surnames)
+    return ratio * (FUZZY_WEIGHT if initials_agree else FUZZY_WEIGHT_INITIAL_MISMATCH)
+
+
+@dataclass(frozen=True)
+class PlayerMatch:
+    """Resolution of a raw name"""
+    player_id: str
+    canonical_name: str
+    confidence: float
+    method: str  # 'alias' or 'fuzzy'
+    notion_page_id: Optional[str] = None
+
+
+class PlayerResolver:
+    """Alias table + blocking/trigram index over known players"""
+
+    def __init__(self, db_path: Optional[str] = None, min_confidence: float = MIN_CONFIDENCE):
+        """
+        Initialize player resolver (loads the alias table into memory)
+
+        Args:
+            db_path: Path to Match Results database
+            min_confidence: Minimum confidence for resolve() to return a player
+        """
+        if db_path is None:
+            db_path = Path(__file__).parent.parent.parent / 'data' / 'match_results.db'
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.min_confidence = min_confidence
+
+        self._lock = threading.RLock()
+        self._players: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, Tuple[str, float]] = {}
+        self._parsed: Dict[str, PlayerName] = {}
+        self._blocking: Dict[str, Set[str]] = {}
+        self._trigram_index: Dict[str, Set[str]] = {}
+        self._surname_trigrams: Dict[str, Counter] = {}
+        self._memo: Dict[str, Optional[PlayerMatch]] = {}
+        self._notion_synced = False
+        self._pending: Optional[Tuple[List[Tuple], List[Tuple]]] = None
+
+        self.stats = {'memo_hits': 0, 'alias_hits': 0, 'fuzzy_hits': 0, 'misses': 0}
+
+        self._init_tables()
+        self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path))
+
+    def _init_tables(self):
+        """Create player and alias tables"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                player_id TEXT PRIMARY KEY,
+                canonical_name TEXT NOT NULL,
+                notion_page_id TEXT,
+                created_at TEXT,
+                updated_at TEXT
+            )
+        """)
+
+        # Normalised raw name -> player
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_aliases (
+                alias TEXT PRIMARY KEY,
+                player_id TEXT NOT NULL,
+                raw_name TEXT,
+                source TEXT,
+                confidence REAL,
+                created_at TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_player_aliases_player ON player_aliases(player_id)")
+
+        conn.commit()
+        conn.close()
+
+    def _load(self):
+        """Read players and aliases and build the in-memory index"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT player_id, canonical_name, notion_page_id FROM players")
+        for player_id, canonical_name, notion_page_id in cursor.fetchall():
+            self._players[player_id] = {'canonical_name': canonical_name, 'notion_page_id': notion_page_id}
+        cursor.execute("SELECT alias, player_id, confidence FROM player_aliases")
+        aliases = cursor.fetchall()
+        conn.close()
+
+        for alias, player_id, confidence in aliases:
+            if player_id in self._players:
+                self._index_alias(alias, player_id, confidence or CONFIDENCE_EXACT)
+
+        logger.info(f"✅ Player resolver: {len(self._players)} players, {len(self._aliases)} aliases")
+
+    def _index_alias(self, alias: str, player_id: str, confidence: float):
+        """Add a normalised alias to the lookup structures"""
+        self._aliases[alias] = (player_id, confidence)
+        if alias in self._parsed:
+            return
+        parsed = parse_name(alias)
+        self._parsed[alias] = parsed
+        for key in parsed.initial_keys + parsed.surnames:
+            self._blocking.setdefault(key, set()).add(alias)
+        for surname in parsed.surnames:
+            if surname not in self._surname_trigrams:
+                self._surname_trigrams[surname] = _trigrams(surname)
+                for gram in self._surname_trigrams[surname]:
+                    self._trigram_index.setdefault(gram, set()).add(surname)
+
+    def _write(self, player_rows: List[Tuple], alias_rows: List[Tuple]):
+        """Upsert rows now, or queue them inside bulk()"""
+        if self._pending is not None:
+            self._pending[0].extend(player_rows)
+            self._pending[1].extend(alias_rows)
+            return
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(PLAYER_UPSERT_SQL, player_rows)
+            cursor.executemany(ALIAS_UPSERT_SQL, alias_rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def bulk(self) -> Iterator['PlayerResolver']:
+        """
+        Defer writes and store them in one transaction on exit
+
+        The in-memory index is updated immediately, so lookups inside the
+        block already see new players and aliases.
+        """
+        with self._lock:
+            if self._pending is not None:
+                yield self
+                return
+            self._pending = ([], [])
+            try:
+                yield self
+            finally:
+                player_rows, alias_rows = self._pending
+                self._pending = None
+                try:
+                    self._write(player_rows, alias_rows)
+                except Exception as e:
+                    logger.error(f"Error storing {len(player_rows)} players / {len(alias_rows)} aliases: {e}")
+
+    def _new_player_id(self, canonical_name: str) -> str:
+        base = normalize_name(canonical_name).replace(' ', '-') or 'player'
+        player_id, n = base, 1
+        while player_id in self._players:
+            n += 1
+            player_id = f"{base}-{n}"
+        return player_id
+
+    def add_player(self,
+                   canonical_name: str,
+                   player_id: Optional[str] = None,
+                   notion_page_id: Optional[str] = None,
+                   aliases: Iterable[str] = (),
+                   source: str = 'manual') -> Optional[str]:
+        """
+        Register a player (or update one) with its names
+
+        Args:
+            canonical_name: Display name
+            player_id: Existing ID to update (default: new ID from the name)
+            notion_page_id: Player Card page ID
+            aliases: Other raw names of the player
+            source: Where the names come from
+
+        Returns:
+            Player ID, or None on failure
+        """
+        with self._lock:
+            player_id = player_id or self._new_player_id(canonical_name)
+            now = datetime.now().isoformat()
+            names = [canonical_name] + [a for a in aliases if a]
+            alias_rows = [(normalize_name(n), player_id, n, source, CONFIDENCE_EXACT, now)
+                          for n in names if normalize_name(n)]
+            try:
+                self._write([(player_id, canonical_name, notion_page_id, now, now)], alias_rows)
+            except Exception as e:
+                logger.error(f"Error adding player {canonical_name}: {e}")
+                return None
+
+            player = self._players.setdefault(player_id, {'canonical_name': canonical_name, 'notion_page_id': None})
+            player['canonical_name'] = canonical_name
+            player['notion_page_id'] = notion_page_id or player['notion_page_id']
+            for alias, *_ in alias_rows:
+                self._index_alias(alias, player_id, CONFIDENCE_EXACT)
+
+            # New names can change earlier answers
+            self._memo.clear()
+            return player_id
+
+    def add_alias(self, name: str, player_id: str, source: str = 'manual', confidence: float = CONFIDENCE_EXACT) -> bool:
+        """
+        Map a raw name to a player
+
+        Args:
+            name: Raw name
+            player_id: Canonical player ID
+            source: Where the mapping comes from
+            confidence: Confidence of the mapping
+
+        Returns:
+            True if stored
+        """
+        alias = normalize_name(name)
+        if not alias or player_id not in self._players:
+            logger.error(f"Cannot alias '{name}' to unknown player {player_id}")
+            return False
+
+        with self._lock:
+            try:
+                self._write([], [(alias, player_id, name, source, confidence, datetime.now().isoformat())])
+            except Exception as e:
+                logger.error(f"Error storing alias {name}: {e}")
+                return False
+
+            self._index_alias(alias, player_id, confidence)
+            self._memo.pop(alias, None)
+            return True
+
+    def _match(self, player_id: str, confidence: float, method: str) -> PlayerMatch:
+        player = self._players[player_id]
+        return PlayerMatch(player_id, player['canonical_name'], confidence, method, player['notion_page_id'])
+
+    def _candidates(self, parsed: PlayerName) -> Set[str]:
+        """Aliases sharing a blocking key, else a similar surname"""
+        aliases: Set[str] = set()
+        for key in parsed.initial_keys + parsed.surnames:
+            aliases |= self._blocking.get(key, set())
+        if aliases:
+            return aliases
+
+        # Typos: surnames sharing enough trigrams
+        for surname in parsed.surnames[:1]:
+            grams = _trigrams(surname)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._trigram_index.get(gram, ()))
+            for other, _ in shared.most_common(50):
+                if _dice(grams, self._surname_trigrams[other]) >= MIN_TRIGRAM_DICE:
+                    aliases |= self._blocking.get(other, set())
+        return aliases
+
+    def _score(self, name: str) -> Optional[PlayerMatch]:
+        """
+        Best player for an unseen name (None if none or ambiguous)
+
+        A player with any alias whose initial or first name conflicts with
+        the name is ruled out, however well its other aliases score.
+        """
+        parsed = parse_name(name)
+        best: Dict[str, float] = {}
+        vetoed: Set[str] = set()
+        for alias in self._candidates(parsed):
+            player_id = self._aliases[alias][0]
+            if player_id in vetoed:
+                continue
+            other = self._parsed[alias]
+            if names_conflict(parsed, other):
+                vetoed.add(player_id)
+                best.pop(player_id, None)
+                continue
+            score = name_similarity(parsed, other)
+            if score > best.get(player_id, 0.0):
+                best[player_id] = score
+        if not best:
+            return None
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        if len(ranked) > 1 and ranked[1][1] == ranked[0][1]:
+            logger.debug(f"⚠️ Ambiguous player name '{name}': {[p for p, _ in ranked[:3]]}")
+            return None
+        player_id, score = ranked[0]
+        return self._match(player_id, score, 'fuzzy') if score > 0 else None
+
+    def resolve(self, name: str, min_confidence: Optional[float] = None) -> Optional[PlayerMatch]:
+        """
+        Canonical player for a raw name
+
+        Fuzzy hits with an initial and at least initial + surname confidence
+        are stored as aliases, so later runs resolve the same raw name from
+        the alias table. Weaker hits (surname only) are returned but not
+        stored, as a later player with the same surname would change them.
+
+        Args:
+            name: Raw player name
+            min_confidence: Override of the resolver's minimum confidence
+
+        Returns:
+            PlayerMatch, or None if no player is confident enough
+        """
+        alias = normalize_name(name)
+        if not alias:
+            return None
+        threshold = self.min_confidence if min_confidence is None else min_confidence
+
+        with self._lock:
+            if alias in self._memo:
+                self.stats['memo_hits'] += 1
+                match = self._memo[alias]
+            elif alias in self._aliases:
+                self.stats['alias_hits'] += 1
+                match = self._memo[alias] = self._match(*self._aliases[alias], 'alias')
+            else:
+                match = self._memo[alias] = self._score(name)
+                if match and match.confidence >= self.min_confidence:
+                    self.stats['fuzzy_hits'] += 1
+                    if match.confidence >= CONFIDENCE_INITIAL and parse_name(name).initial:
+                        self.add_alias(name, match.player_id, source='fuzzy', confidence=match.confidence)
+                        self._memo[alias] = match
+                else:
+                    self.stats['misses'] += 1
+
+        return match if match and match.confidence >= threshold else None
+
+    def resolve_or_create(self, name: str, source: str = 'auto') -> Optional[str]:
+        """
+        Player ID for a raw name, registering a new player if unknown
+
+        Args:
+            name: Raw player name
+            source: Source recorded for a new player
+
+        Returns:
+            Player ID (None for an empty name)
+        """
+        match = self.resolve(name)
+        if match:
+            return match.player_id
+        if not normalize_name(name):
+            return None
+        return self.add_player(name.strip(), source=source)
+
+    def notion_page_id(self, name: str) -> Optional[str]:
+        """
+        Player Card page ID for a raw name
+
+        Args:
+            name: Raw player name
+
+        Returns:
+            Page ID, or None if the player has no known card
+        """
+        match = self.resolve(name)
+        return match.notion_page_id if match else None
+
+    def sync_notion_cards(self, client: Any, database_id: str, force: bool = False) -> int:
+        """
+        Register every Player Card (once per process unless forced)
+
+        One paginated scan of the database replaces a Notion query per
+        name lookup.
+
+        Args:
+            client: notion_client.Client
+            database_id: Player Cards database ID
+            force: Scan again even if already synced
+
+        Returns:
+            Number of cards registered
+        """
+        if self._notion_synced and not force:
+            return 0
+
+        count = 0
+        cursor = None
+        pages = {p['notion_page_id']: pid for pid, p in self._players.items() if p['notion_page_id']}
+        try:
+            with self.bulk():
+                while True:
+                    kwargs = {'database_id': database_id, 'page_size': 100}
+                    if cursor:
+                        kwargs['start_cursor'] = cursor
+                    response = client.databases.query(**kwargs)
+
+                    for page in response.get('results', []):
+                        names = self._card_names(page.get('properties', {}))
+                        if not names:
+                            continue
+                        player_id = pages.get(page['id']) or self._card_player(names)
+                        if self.add_player(names[0], player_id=player_id, notion_page_id=page['id'],
+                                           aliases=names[1:], source='notion'):
+                            count += 1
+
+                    if not response.get('has_more'):
+                        break
+                    cursor = response.get('next_cursor')
+
+        except Exception as e:
+            logger.error(f"Error syncing Player Cards: {e}")
+            return count
+
+        self._notion_synced = True
+        logger.info(f"✅ Synced {count} Player Cards into the player resolver")
+        return count
+
+    @staticmethod
+    def _card_names(properties: Dict[str, Any]) -> List[str]:
+        """Names on a Player Card (title first)"""
+        names = []
+        for prop_name in CARD_NAME_PROPERTIES:
+            prop = properties.get(prop_name, {})
+            texts = prop.get('title') or prop.get('rich_text') or []
+            name = ''.join(t.get('plain_text', '') for t in texts).strip()
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    def _card_player(self, names: List[str]) -> Optional[str]:
+        """Existing player without a card that has one of the card's names"""
+        for name in names:
+            player_id = self._aliases.get(normalize_name(name), (None,))[0]
+            if player_id and not self._players[player_id]['notion_page_id']:
+                return player_id
+        return None
+
+    def sync_match_players(self) -> int:
+        """
+        Register the players of the Match Results matches table
+
+        Returns:
+            Number of distinct names processed
+        """
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute("SELECT player1 FROM matches UNION SELECT player2 FROM matches")
+            names = [row[0] for row in cursor.fetchall() if row[0]]
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error reading match players: {e}")
+            return 0
+
+        with self.bulk():
+            for name in names:
+                self.resolve_or_create(name, source='matches')
+        return len(names)
+
+    def get_aliases(self, player_id: str) -> List[Dict[str, Any]]:
+        """
+        Stored aliases of a player
+
+        Args:
+            player_id: Canonical player ID
+
+        Returns:
+            List of alias dictionaries
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT alias, raw_name, source, confidence, created_at
+            FROM player_aliases
+            WHERE player_id = ?
+            ORDER BY confidence DESC, alias
+        """, (player_id,))
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return rows
+
+
+_shared_resolvers: Dict[str, PlayerResolver] = {}
+_shared_lock = threading.Lock()
+
+
+def get_resolver(db_path: Optional[str] = None) -> PlayerResolver:
+    """
+    Process-wide resolver per database (shares the memo and index)
+
+    Args:
+        db_path: Path to Match Results database
+
+    Returns:
+        PlayerResolver
+    """
+    key = str(db_path or '')
+    with _shared_lock:
+        if key not in _shared_resolvers:
+            _shared_resolvers[key] = PlayerResolver(db_path)
+        return _shared_resolvers[key]
+
+
+def main():
+    """Resolve names and maintain the alias table"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Player Resolver')
+    parser.add_argument('names', nargs='*', help='Raw names to resolve')
+    parser.add_argument('--sync-matches', action='store_true', help='Register players from the matches table')
+    parser.add_argument('--sync-notion', action='store_true', help='Register Player Cards from Notion')
+    parser.add_argument('--alias', metavar='PLAYER_ID', help='Store the given names as aliases of this player')
+    args = parser.parse_args()
+
+    resolver = PlayerResolver()
+
+    if args.sync_matches:
+        print(f"\n✅ Processed {resolver.sync_match_players()} match player names")
+
+    if args.sync_notion:
+        import os
+        from notion_client import Client
+
+        token = os.getenv('NOTION_API_KEY') or os.getenv('NOTION_TOKEN')
+        database_id = os.getenv('NOTION_ITF_PLAYER_CARDS_DB_ID') or os.getenv('PLAYER_CARDS_DB_ID')
+        if not token or not database_id:
+            print("\n❌ NOTION_API_KEY and NOTION_ITF_PLAYER_CARDS_DB_ID must be set")
+            return
+        print(f"\n✅ Synced {resolver.sync_notion_cards(Client(auth=token), database_id)} Player Cards")
+
+    for name in args.names:
+        if args.alias:
+            ok = resolver.add_alias(name, args.alias)
+            print(f"{'✅' if ok else '❌'} {name} -> {args.alias}")
+            continue
+        match = resolver.resolve(name, min_confidence=0.0)
+        if match:
+            print(f"🎾 {name} -> {match.canonical_name} [{match.player_id}] "
+                  f"({match.method}, confidence {match.confidence:.2f})")
+        else:
+            print(f"❌ {name}: no match")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Player Stats Index
+==================
+
+Precomputed player statistics from the Match Results database:
+- Rolling form over the last FORM_WINDOW matches
+- Win rate per surface
+- Head-to-head record keyed by a canonical player-pair id
+
+Maintained like the Elo engine: one replay of matches + results, then
+incremental updates inside MatchResultsDB.insert_result's transaction.
+Lookups are primary-key reads. A pre-match snapshot per match and a
+per-player results history support point-in-time queries, so training
+features never see results from after the match.
+
+This feeds Layer 2 (Feature Store) of the Self-Learning AI Engine.
+"""
+
+import logging
+import sqlite3
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.ml.elo_engine import normalize_surface
+from src.ml.result_index import ResultIndex
+from src.scrapers.sportbex_client import SportbexMatch
+
+logger = logging.getLogger(__name__)
+
+FORM_WINDOW = 10
+DEFAULT_FORM = 0.5
+DEFAULT_SURFACE_WIN_PCT = 0.5
+
+# SQLite caps host parameters per statement
+_SQL_CHUNK = 900
+
+# Results in the order they should be replayed (same order as the Elo engine)
+STATS_REPLAY_SQL = """
+    SELECT m.match_id, m.player1, m.player2, m.surface, r.player1_won,
+           COALESCE(m.commence_time, r.result_date) AS match_time
+    FROM results r
+    JOIN matches m ON m.match_id = r.match_id
+    WHERE r.player1_won IS NOT NULL
+    {where}
+    ORDER BY match_time, m.match_id
+"""
+
+FORM_UPSERT_SQL = """
+    INSERT INTO player_form (player, recent_results, updated_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT (player) DO UPDATE SET
+        recent_results = excluded.recent_results,
+        updated_at = excluded.updated_at
+"""
+
+SURFACE_UPSERT_SQL = """
+    INSERT INTO player_surface_stats (player, surface, wins, matches)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (player, surface) DO UPDATE SET
+        wins = excluded.wins,
+        matches = excluded.matches
+"""
+
+H2H_UPSERT_SQL = """
+    INSERT INTO head_to_head (pair_id, player_a, player_b, player_a_wins, player_b_wins)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (pair_id) DO UPDATE SET
+        player_a_wins = excluded.player_a_wins,
+        player_b_wins = excluded.player_b_wins
+"""
+
+HISTORY_INSERT_SQL = """
+    INSERT OR REPLACE INTO player_results (player, match_id, match_time, opponent, surface, won)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SNAPSHOT_INSERT_SQL = """
+    INSERT OR REPLACE INTO match_player_stats (
+        match_id, player1_recent_form, player2_recent_form,
+        player1_surface_win_pct, player2_surface_win_pct,
+        h2h_player1_wins, h2h_player2_wins, applied_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SNAPSHOT_COLUMNS = (
+    'player1_recent_form', 'player2_recent_form',
+    'player1_surface_win_pct', 'player2_surface_win_pct',
+    'h2h_player1_wins', 'h2h_player2_wins'
+)
+
+
+def pair_id(player1: str, player2: str) -> str:
+    """Canonical id for a player pair (independent of order)"""
+    a, b = sorted((player1, player2))
+    return f"{a}|{b}"
+
+
+def _form(recent: Optional[str]) -> float:
+    if not recent:
+        return DEFAULT_FORM
+    return recent.count('1') / len(recent)
+
+
+def _win_pct(wins_matches: Optional[List[int]]) -> float:
+    if not wins_matches or not wins_matches[1]:
+        return DEFAULT_SURFACE_WIN_PCT
+    return wins_matches[0] / wins_matches[1]
+
+
+class _StatsState:
+    """In-memory slice of the index that results are applied to"""
+
+    def __init__(self):
+        self.form: Dict[str, deque] = {}
+        self.surface: Dict[Tuple[str, str], List[int]] = {}
+        self.h2h: Dict[str, List] = {}
+
+    def recent(self, player: str) -> deque:
+        return self.form.setdefault(player, deque(maxlen=FORM_WINDOW))
+
+    def apply(self, match_id: str, player1: str, player2: str,
+              surface: Optional[str], player1_won: bool) -> Tuple:
+        """Apply one result; returns the match_player_stats row (pre-match values)"""
+        recent1, recent2 = self.recent(player1), self.recent(player2)
+        key = pair_id(player1, player2)
+        h2h = self.h2h.setdefault(key, [*sorted((player1, player2)), 0, 0])
+        player1_is_a = h2h[0] == player1
+
+        surface1 = self.surface.setdefault((player1, surface), [0, 0]) if surface else None
+        surface2 = self.surface.setdefault((player2, surface), [0, 0]) if surface else None
+
+        snapshot = (
+            match_id,
+            _form(''.join(recent1)),
+            _form(''.join(recent2)),
+            _win_pct(surface1),
+            _win_pct(surface2),
+            h2h[2] if player1_is_a else h2h[3],
+            h2h[3] if player1_is_a else h2h[2],
+            datetime.now().isoformat()
+        )
+
+        recent1.append('1' if player1_won else '0')
+        recent2.append('0' if player1_won else '1')
+        if surface:
+            surface1[0] += int(player1_won)
+            surface1[1] += 1
+            surface2[0] += int(not player1_won)
+            surface2[1] += 1
+        h2h[2 if player1_won == player1_is_a else 3] += 1
+
+        return snapshot
+
+    def write(self, cursor: sqlite3.Cursor):
+        now = datetime.now().isoformat()
+        cursor.executemany(FORM_UPSERT_SQL, [
+            (player, ''.join(recent), now) for player, recent in self.form.items()
+        ])
+        cursor.executemany(SURFACE_UPSERT_SQL, [
+            (player, surface, wins, matches)
+            for (player, surface), (wins, matches) in self.surface.items()
+        ])
+        cursor.executemany(H2H_UPSERT_SQL, [
+            (key, a, b, a_wins, b_wins) for key, (a, b, a_wins, b_wins) in self.h2h.items()
+        ])
+
+
+class PlayerStatsIndex(ResultIndex):
+    """Form, surface and head-to-head index over MatchResultsDB"""
+
+    REPLAY_SQL = STATS_REPLAY_SQL
+    SNAPSHOT_TABLE = 'match_player_stats'
+    LABEL = 'player stats'
+
+    def _init_tables(self):
+        """Create index tables"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        # Last FORM_WINDOW results per player as a '1'/'0' string, oldest first
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_form (
+                player TEXT PRIMARY KEY,
+                recent_results TEXT NOT NULL,
+                updated_at TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_surface_stats (
+                player TEXT NOT NULL,
+                surface TEXT NOT NULL,
+                wins INTEGER NOT NULL DEFAULT 0,
+                matches INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (player, surface)
+            )
+        """)
+
+        # player_a < player_b; pair_id = "player_a|player_b"
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS head_to_head (
+                pair_id TEXT PRIMARY KEY,
+                player_a TEXT NOT NULL,
+                player_b TEXT NOT NULL,
+                player_a_wins INTEGER NOT NULL DEFAULT 0,
+                player_b_wins INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Per-player results history for as-of queries
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_results (
+                player TEXT NOT NULL,
+                match_id TEXT NOT NULL,
+                match_time TIMESTAMP,
+                opponent TEXT,
+                surface TEXT,
+                won BOOLEAN,
+                PRIMARY KEY (player, match_id)
+            )
+        """)
+
+        # Pre-match values per indexed match
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS match_player_stats (
+                match_id TEXT PRIMARY KEY,
+                player1_recent_form REAL,
+                player2_recent_form REAL,
+                player1_surface_win_pct REAL,
+                player2_surface_win_pct REAL,
+                h2h_player1_wins INTEGER,
+                h2h_player2_wins INTEGER,
+                applied_at TIMESTAMP,
+                FOREIGN KEY (match_id) REFERENCES matches(match_id)
+            )
+        """)
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_player_results_time ON player_results(player, match_time)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_player_results_opponent ON player_results(player, opponent, match_time)")
+
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _history_rows(match_id: str, player1: str, player2: str, surface: Optional[str],
+                      player1_won: bool, match_time: Optional[str]) -> List[Tuple]:
+        return [
+            (player1, match_id, match_time, player2, surface, bool(player1_won)),
+            (player2, match_id, match_time, player1, surface, not player1_won)
+        ]
+
+    def _apply_row(self, cursor: sqlite3.Cursor, row: Tuple):
+        """Index one result against the stored form, surface and H2H rows"""
+        match_id, player1, player2, surface, player1_won, match_time = row
+        surface = normalize_surface(surface)
+        state = _StatsState()
+
+        # Load the affected rows
+        cursor.execute("SELECT player, recent_results FROM player_form WHERE player IN (?, ?)", (player1, player2))
+        for player, recent in cursor.fetchall():
+            state.recent(player).extend(recent)
+        if surface:
+            cursor.execute("""
+                SELECT player, wins, matches FROM player_surface_stats
+                WHERE player IN (?, ?) AND surface = ?
+            """, (player1, player2, surface))
+            for player, wins, matches in cursor.fetchall():
+                state.surface[(player, surface)] = [wins, matches]
+        cursor.execute("""
+            SELECT pair_id, player_a, player_b, player_a_wins, player_b_wins
+            FROM head_to_head WHERE pair_id = ?
+        """, (pair_id(player1, player2),))
+        for key, *record in cursor.fetchall():
+            state.h2h[key] = list(record)
+
+        snapshot = state.apply(match_id, player1, player2, surface, bool(player1_won))
+
+        state.write(cursor)
+        cursor.executemany(HISTORY_INSERT_SQL, self._history_rows(
+            match_id, player1, player2, surface, bool(player1_won), match_time
+        ))
+        cursor.execute(SNAPSHOT_INSERT_SQL, snapshot)
+
+    def _replay(self, cursor: sqlite3.Cursor, rows: List[Tuple]) -> int:
+        """Recompute the whole index from the full result history"""
+        state = _StatsState()
+        snapshots = []
+        history = []
+
+        for match_id, player1, player2, surface, player1_won, match_time in rows:
+            surface = normalize_surface(surface)
+            snapshots.append(state.apply(match_id, player1, player2, surface, bool(player1_won)))
+            history.extend(self._history_rows(
+                match_id, player1, player2, surface, bool(player1_won), match_time
+            ))
+
+        for table in ('player_form', 'player_surface_stats', 'head_to_head',
+                      'player_results', 'match_player_stats'):
+            cursor.execute(f"DELETE FROM {table}")
+        state.write(cursor)
+        cursor.executemany(HISTORY_INSERT_SQL, history)
+        cursor.executemany(SNAPSHOT_INSERT_SQL, snapshots)
+        return len(state.form)
+
+    def get_match_stats_batch(self, matches: List[SportbexMatch]) -> List[Dict[str, Any]]:
+        """
+        Form, surface and H2H features for many matches
+
+        Indexed (finished) matches use their pre-match snapshot; upcoming
+        matches use current values.
+
+        Args:
+            matches: SportbexMatch objects
+
+        Returns:
+            One match_data dictionary per match (FeatureStore keys)
+        """
+        if not matches:
+            return []
+
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        snapshots = {}
+        match_ids = [m.match_id for m in matches]
+        for i in range(0, len(match_ids), _SQL_CHUNK):
+            chunk = match_ids[i:i + _SQL_CHUNK]
+            cursor.execute(f"""
+                SELECT match_id, {', '.join(SNAPSHOT_COLUMNS)} FROM match_player_stats
+                WHERE match_id IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for match_id, *values in cursor.fetchall():
+                snapshots[match_id] = dict(zip(SNAPSHOT_COLUMNS, values))
+
+        upcoming = [m for m in matches if m.match_id not in snapshots]
+        players = list({p for m in upcoming for p in (m.player1, m.player2)})
+        pairs = list({pair_id(m.player1, m.player2) for m in upcoming})
+
+        form, surface_stats, h2h = {}, {}, {}
+        for i in range(0, len(players), _SQL_CHUNK):
+            chunk = players[i:i + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"SELECT player, recent_results FROM player_form WHERE player IN ({placeholders})", chunk)
+            form.update(cursor.fetchall())
+            cursor.execute(f"""
+                SELECT player, surface, wins, matches FROM player_surface_stats
+                WHERE player IN ({placeholders})
+            """, chunk)
+            for player, surface, wins, matches_played in cursor.fetchall():
+                surface_stats[(player, surface)] = [wins, matches_played]
+        for i in range(0, len(pairs), _SQL_CHUNK):
+            chunk = pairs[i:i + _SQL_CHUNK]
+            cursor.execute(f"""
+                SELECT pair_id, player_a, player_a_wins, player_b_wins FROM head_to_head
+                WHERE pair_id IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for key, player_a, a_wins, b_wins in cursor.fetchall():
+                h2h[key] = (player_a, a_wins, b_wins)
+        conn.close()
+
+        results = []
+        for m in matches:
+            if m.match_id in snapshots:
+                results.append(snapshots[m.match_id])
+                continue
+
+            surface = normalize_surface(m.surface)
+            player_a, a_wins, b_wins = h2h.get(pair_id(m.player1, m.player2), (m.player1, 0, 0))
+            results.append({
+                'player1_recent_form': _form(form.get(m.player1)),
+                'player2_recent_form': _form(form.get(m.player2)),
+                'player1_surface_win_pct': _win_pct(surface_stats.get((m.player1, surface))),
+                'player2_surface_win_pct': _win_pct(surface_stats.get((m.player2, surface))),
+                'h2h_player1_wins': a_wins if player_a == m.player1 else b_wins,
+                'h2h_player2_wins': b_wins if player_a == m.player1 else a_wins
+            })
+        return results
+
+    def get_player_stats(self, player: str, surface: Optional[str] = None,
+                         as_of: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Form and surface win rate of one player
+
+        Args:
+            player: Player name as stored in matches
+            surface: Surface label (optional)
+            as_of: Only count results from before this time (optional)
+
+        Returns:
+            Dictionary with 'recent_form', 'surface_win_pct', 'matches'
+        """
+        surface = normalize_surface(surface)
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        if as_of is None:
+            cursor.execute("SELECT recent_results FROM player_form WHERE player = ?", (player,))
+            row = cursor.fetchone()
+            recent = row[0] if row else ''
+            cursor.execute(
+                "SELECT wins, matches FROM player_surface_stats WHERE player = ? AND surface = ?",
+                (player, surface)
+            )
+            row = cursor.fetchone()
+            surface_record = list(row) if row else None
+            cursor.execute("SELECT COUNT(*) FROM player_results WHERE player = ?", (player,))
+        else:
+            as_of = as_of.isoformat()
+            cursor.execute("""
+                SELECT won FROM player_results
+                WHERE player = ? AND match_time < ?
+                ORDER BY match_time DESC
+                LIMIT ?
+            """, (player, as_of, FORM_WINDOW))
+            recent = ''.join('1' if won else '0' for (won,) in reversed(cursor.fetchall()))
+            cursor.execute("""
+                SELECT COALESCE(SUM(won), 0), COUNT(*) FROM player_results
+                WHERE player = ? AND surface = ? AND match_time < ?
+            """, (player, surface, as_of))
+            surface_record = list(cursor.fetchone())
+            cursor.execute("SELECT COUNT(*) FROM player_results WHERE player = ? AND match_time < ?", (player, as_of))
+
+        matches_played = cursor.fetchone()[0]
+        conn.close()
+
+        return {
+            'recent_form': _form(recent),
+            'surface_win_pct': _win_pct(surface_record),
+            'matches': matches_played
+        }
+
+    def get_h2h(self, player1: str, player2: str, as_of: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Head-to-head wins (player1 wins, player2 wins)
+
+        Args:
+            player1: First player
+            player2: Second player
+            as_of: Only count results from before this time (optional)
+
+        Returns:
+            Tuple of win counts
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        if as_of is None:
+            cursor.execute(
+                "SELECT player_a, player_a_wins, player_b_wins FROM head_to_head WHERE pair_id = ?",
+                (pair_id(player1, player2),)
+            )
+            row = cursor.fetchone()
+            conn.close()
+            if not row:
+                return 0, 0
+            player_a, a_wins, b_wins = row
+            return (a_wins, b_wins) if player_a == player1 else (b_wins, a_wins)
+
+        cursor.execute("""
+            SELECT COALESCE(SUM(won), 0), COUNT(*) FROM player_results
+            WHERE player = ? AND opponent = ? AND match_time < ?
+        """, (player1, player2, as_of.isoformat()))
+        wins, total = cursor.fetchone()
+        conn.close()
+        return wins, total - wins
+
+
+def main():
+    """Rebuild and show player stats"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Player Stats Index')
+    parser.add_argument('--rebuild', action='store_true', help='Replay all results from scratch')
+    parser.add_argument('--player', help='Show stats for a player')
+    parser.add_argument('--opponent', help='Show head-to-head against this opponent')
+    parser.add_argument('--surface', help='Surface for win rate')
+    args = parser.parse_args()
+
+    index = PlayerStatsIndex()
+
+    if args.rebuild:
+        print(f"\n✅ Replayed {index.rebuild()} results")
+
+    if args.player:
+        stats = index.get_player_stats(args.player, surface=args.surface)
+        print(f"\n🎾 {args.player} ({stats['matches']} matches)")
+        print(f"   Form (last {FORM_WINDOW}): {stats['recent_form']:.2f}")
+        print(f"   {args.surface or 'Surface'} win rate: {stats['surface_win_pct']:.2f}")
+        if args.opponent:
+            wins, losses = index.get_h2h(args.player, args.opponent)
+            print(f"   H2H vs {args.opponent}: {wins}-{losses}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Prediction Log
+==============
+
+Stores every model prediction (one row per match, model and model version)
+and scores it when the match result lands.
+
+Scoring runs inside MatchResultsDB.insert_result's transaction and adds the
+prediction's accuracy, Brier score and log-loss to a daily bucket per model,
+so rolling 7/30/90-day metrics are a sum over at most that many buckets
+instead of a scan of the prediction history.
+
+This feeds Layer 4 (Meta-Learner) and Layer 5 (Continuous Learning) of the
+Self-Learning AI Engine.
+"""
+
+import logging
+import math
+import sqlite3
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+from src.ml.data_collector import MatchResultsDB
+
+logger = logging.getLogger(__name__)
+
+ROLLING_WINDOWS = (7, 30, 90)
+
+# Probabilities are clipped before log-loss
+LOG_LOSS_EPS = 1e-15
+
+# SQLite caps host parameters per statement
+_SQL_CHUNK = 900
+
+PREDICTION_UPSERT_SQL = """
+    INSERT INTO prediction_log (match_id, model, model_version, probability, predicted_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (match_id, model, model_version) DO UPDATE SET
+        probability = excluded.probability,
+        predicted_at = excluded.predicted_at
+"""
+
+BUCKET_UPSERT_SQL = """
+    INSERT INTO prediction_daily_stats (model, day, predictions, correct, brier_sum, log_loss_sum)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (model, day) DO UPDATE SET
+        predictions = predictions + excluded.predictions,
+        correct = correct + excluded.correct,
+        brier_sum = brier_sum + excluded.brier_sum,
+        log_loss_sum = log_loss_sum + excluded.log_loss_sum
+"""
+
+# Attach the stored result (if any) to logged predictions
+RESOLVE_SQL = """
+    UPDATE prediction_log
+    SET player1_won = (SELECT r.player1_won FROM results r WHERE r.match_id = prediction_log.match_id),
+        resolved_day = (SELECT DATE(r.result_date) FROM results r WHERE r.match_id = prediction_log.match_id)
+    WHERE match_id IN ({placeholders})
+"""
+
+
+def score_prediction(probability: float, player1_won: bool) -> Tuple[int, float, float]:
+    """
+    Score one player-1 win probability against the result
+
+    Args:
+        probability: Predicted probability that player 1 wins
+        player1_won: Whether player 1 won
+
+    Returns:
+        (correct, Brier score, log-loss)
+    """
+    outcome = 1.0 if player1_won else 0.0
+    correct = int((probability > 0.5) == bool(player1_won))
+    clipped = min(max(probability, LOG_LOSS_EPS), 1.0 - LOG_LOSS_EPS)
+    log_loss = -(outcome * math.log(clipped) + (1.0 - outcome) * math.log(1.0 - clipped))
+    return correct, (probability - outcome) ** 2, log_loss
+
+
+class PredictionLog:
+    """Prediction history with daily per-model accuracy buckets"""
+
+    def __init__(self, db_path: Optional[str] = None, db: Optional[MatchResultsDB] = None):
+        """
+        Initialize prediction log
+
+        Registers a result listener on the database so predictions are scored
+        as results are stored, and scores results stored elsewhere since.
+
+        Args:
+            db_path: Path to Match Results database
+            db: Existing MatchResultsDB to attach to (takes precedence)
+        """
+        self.db = db or MatchResultsDB(db_path)
+        self._init_tables()
+        self.db.add_result_listener(self.apply_result)
+        self.catch_up()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db.db_path))
+
+    def _init_tables(self):
+        """Create prediction log tables"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        # One row per prediction; latest probability wins for the same model version
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS prediction_log (
+                match_id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                probability REAL NOT NULL,
+                predicted_at TIMESTAMP,
+                player1_won BOOLEAN,
+                resolved_day DATE,
+                PRIMARY KEY (match_id, model, model_version),
+                FOREIGN KEY (match_id) REFERENCES matches(match_id)
+            )
+        """)
+
+        # Sums per model and resolution day (rolling windows add these up)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS prediction_daily_stats (
+                model TEXT NOT NULL,
+                day DATE NOT NULL,
+                predictions INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                brier_sum REAL NOT NULL DEFAULT 0,
+                log_loss_sum REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (model, day)
+            )
+        """)
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_prediction_log_resolved ON prediction_log(resolved_day, model)")
+
+        conn.commit()
+        conn.close()
+
+    def _add_to_buckets(self, cursor: sqlite3.Cursor, match_ids: List[str], sign: int):
+        """
+        Add (sign=1) or remove (sign=-1) the scored predictions of matches
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            match_ids: Match IDs
+            sign: 1 to add, -1 to remove
+        """
+        buckets: Dict[Tuple[str, str], List[float]] = {}
+        for i in range(0, len(match_ids), _SQL_CHUNK):
+            chunk = match_ids[i:i + _SQL_CHUNK]
+            cursor.execute(f"""
+                SELECT model, resolved_day, probability, player1_won FROM prediction_log
+                WHERE match_id IN ({','.join('?' * len(chunk))})
+                AND player1_won IS NOT NULL AND resolved_day IS NOT NULL
+            """, chunk)
+            for model, day, probability, player1_won in cursor.fetchall():
+                correct, brier, log_loss = score_prediction(probability, bool(player1_won))
+                bucket = buckets.setdefault((model, day), [0, 0, 0.0, 0.0])
+                bucket[0] += 1
+                bucket[1] += correct
+                bucket[2] += brier
+                bucket[3] += log_loss
+
+        cursor.executemany(BUCKET_UPSERT_SQL, [
+            (model, day, sign * n, sign * correct, sign * brier, sign * log_loss)
+            for (model, day), (n, correct, brier, log_loss) in buckets.items()
+        ])
+
+    @staticmethod
+    def _attach_results(cursor: sqlite3.Cursor, match_ids: List[str]):
+        """Copy the current results onto the logged predictions of matches"""
+        for i in range(0, len(match_ids), _SQL_CHUNK):
+            chunk = match_ids[i:i + _SQL_CHUNK]
+            cursor.execute(RESOLVE_SQL.format(placeholders=','.join('?' * len(chunk))), chunk)
+
+    def _resolve(self, cursor: sqlite3.Cursor, match_ids: List[str]):
+        """Re-score the predictions of matches from the current results"""
+        self._add_to_buckets(cursor, match_ids, -1)
+        self._attach_results(cursor, match_ids)
+        self._add_to_buckets(cursor, match_ids, 1)
+
+    def apply_result(self, cursor: sqlite3.Cursor, match_id: str) -> bool:
+        """
+        Score predictions for a newly stored result (MatchResultsDB result listener)
+
+        Runs on the caller's cursor so the buckets commit with the result. A
+        corrected result replaces the earlier scoring.
+
+        Args:
+            cursor: Cursor inside the insert_result transaction
+            match_id: Match ID
+
+        Returns:
+            True if any prediction was scored
+        """
+        cursor.execute("SELECT 1 FROM prediction_log WHERE match_id = ? LIMIT 1", (match_id,))
+        if not cursor.fetchone():
+            return False
+
+        self._resolve(cursor, [match_id])
+        return True
+
+    def catch_up(self) -> int:
+        """
+        Score predictions whose result was stored without going through insert_result
+
+        Returns:
+            Number of matches scored
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT DISTINCT p.match_id FROM prediction_log p
+                JOIN results r ON r.match_id = p.match_id
+                WHERE p.resolved_day IS NULL AND r.player1_won IS NOT NULL
+            """)
+            pending = [row[0] for row in cursor.fetchall()]
+            if pending:
+                self._resolve(cursor, pending)
+                conn.commit()
+                logger.info(f"✅ Scored predictions for {len(pending)} pending results")
+            return len(pending)
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error scoring pending results: {e}")
+            return 0
+
+        finally:
+            conn.close()
+
+    def log_predictions(self, predictions: Iterable[Tuple[str, str, str, float]]) -> int:
+        """
+        Store predictions in one transaction
+
+        Predictions for matches that already have a result are scored
+        immediately.
+
+        Args:
+            predictions: (match_id, model, model_version, player1 win probability) tuples
+
+        Returns:
+            Number of predictions stored
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (match_id, model, model_version, float(probability), now)
+            for match_id, model, model_version, probability in predictions
+            if probability is not None and not math.isnan(probability)
+        ]
+        if not rows:
+            return 0
+
+        match_ids = list({row[0] for row in rows})
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            # Replacing a scored prediction must take its old score out first
+            self._add_to_buckets(cursor, match_ids, -1)
+            cursor.executemany(PREDICTION_UPSERT_SQL, rows)
+            self._attach_results(cursor, match_ids)
+            self._add_to_buckets(cursor, match_ids, 1)
+            conn.commit()
+            return len(rows)
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error logging predictions: {e}")
+            return 0
+
+        finally:
+            conn.close()
+
+    def rebuild(self) -> int:
+        """
+        Re-score every logged prediction and recompute the daily buckets
+
+        Returns:
+            Number of scored predictions
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT DISTINCT match_id FROM prediction_log")
+            match_ids = [row[0] for row in cursor.fetchall()]
+
+            cursor.execute("DELETE FROM prediction_daily_stats")
+            self._attach_results(cursor, match_ids)
+            self._add_to_buckets(cursor, match_ids, 1)
+            conn.commit()
+
+            cursor.execute("SELECT COALESCE(SUM(predictions), 0) FROM prediction_daily_stats")
+            scored = cursor.fetchone()[0]
+            logger.info(f"✅ Prediction buckets rebuilt from {scored} scored predictions")
+            return scored
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error rebuilding prediction buckets: {e}")
+            return 0
+
+        finally:
+            conn.close()
+
+    def get_resolved_matrix(self,
+                            models: Tuple[str, ...],
+                            window_days: Optional[int] = None,
+                            as_of: Optional[date] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Scored predictions as aligned arrays, one row per match
+
+        The latest prediction per (match, model) is used across versions.
+
+        Args:
+            models: Column order
+            window_days: Only matches resolved in this many days up to as_of (default: all)
+            as_of: Last resolution day (default: today)
+
+        Returns:
+            P (n_matches, len(models)) float64 with NaN for missing predictions,
+            y (n_matches,) 1.0 if player 1 won, and match IDs, in resolution order
+        """
+        query = f"""
+            SELECT match_id, model, probability, player1_won FROM prediction_log
+            WHERE resolved_day IS NOT NULL AND player1_won IS NOT NULL
+            AND model IN ({','.join('?' * len(models))})
+        """
+        params: Tuple = tuple(models)
+        if window_days:
+            as_of = as_of or datetime.now().date()
+            query += " AND resolved_day BETWEEN ? AND ?"
+            params += ((as_of - timedelta(days=window_days - 1)).isoformat(), as_of.isoformat())
+        query += " ORDER BY resolved_day, match_id, predicted_at"
+
+        conn = self._connect()
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+
+        column = {model: j for j, model in enumerate(models)}
+        row_of: Dict[str, int] = {}
+        outcomes: List[float] = []
+        cells: List[Tuple[int, int, float]] = []
+        for match_id, model, probability, player1_won in rows:
+            if match_id not in row_of:
+                row_of[match_id] = len(outcomes)
+                outcomes.append(1.0 if player1_won else 0.0)
+            # Later predictions overwrite earlier ones
+            cells.append((row_of[match_id], column[model], probability))
+
+        P = np.full((len(outcomes), len(models)), np.nan)
+        if cells:
+            i, j, values = zip(*cells)
+            P[list(i), list(j)] = values
+        return P, np.array(outcomes), list(row_of)
+
+    def get_rolling_metrics(self,
+                            window_days: int = 30,
+                            as_of: Optional[date] = None,
+                            model: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Accuracy, Brier score and log-loss over the last window_days days
+
+        Args:
+            window_days: Window length in days (including as_of)
+            as_of: Last day of the window (default: today)
+            model: Only this model (default: all models)
+
+        Returns:
+            Dictionary of model -> {'predictions', 'accuracy', 'brier', 'log_loss'}
+        """
+        as_of = as_of or datetime.now().date()
+        start = as_of - timedelta(days=window_days - 1)
+
+        query = """
+            SELECT model, SUM(predictions), SUM(correct), SUM(brier_sum), SUM(log_loss_sum)
+            FROM prediction_daily_stats
+            WHERE day BETWEEN ? AND ?
+        """
+        params: Tuple = (start.isoformat(), as_of.isoformat())
+        if model:
+            query += " AND model = ?"
+            params += (model,)
+        query += " GROUP BY model"
+
+        conn = self._connect()
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+
+        metrics = {}
+        for name, n, correct, brier_sum, log_loss_sum in rows:
+            if not n:
+                continue
+            metrics[name] = {
+                'predictions': n,
+                'accuracy': correct / n,
+                'brier': brier_sum / n,
+                'log_loss': log_loss_sum / n
+            }
+        return metrics
+
+    def get_rolling_windows(self,
+                            windows: Tuple[int, ...] = ROLLING_WINDOWS,
+                            as_of: Optional[date] = None) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """
+        Rolling metrics for several windows (see get_rolling_metrics)
+
+        Args:
+            windows: Window lengths in days
+            as_of: Last day of the windows (default: today)
+
+        Returns:
+            Dictionary of window_days -> model -> metrics
+        """
+        return {days: self.get_rolling_metrics(days, as_of) for days in windows}
+
+
+def main():
+    """Show rolling prediction accuracy"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Prediction Log')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute daily buckets from the log')
+    args = parser.parse_args()
+
+    log = PredictionLog()
+
+    if args.rebuild:
+        scored = log.rebuild()
+        print(f"\n✅ Re-scored {scored} predictions")
+
+    for days, metrics in log.get_rolling_windows().items():
+        print(f"\n📊 Last {days} days")
+        if not metrics:
+            print("   No scored predictions")
+        for model, m in sorted(metrics.items()):
+            print(f"   {model:14} {m['accuracy']:.3f} accuracy  {m['brier']:.4f} Brier  "
+                  f"{m['log_loss']:.4f} log-loss  ({m['predictions']} predictions)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
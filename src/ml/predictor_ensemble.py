@@ -13,156 +13,335 @@ This is the main API for making predictions in the Self-Learning AI Engine.
 """
 
 import logging
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import numpy as np
+
 from src.ml.meta_learner import MetaLearner
-from src.ml.xgboost_trainer import XGBoostTrainer
-from src.ml.lightgbm_trainer import LightGBMTrainer
 from src.ml.feature_store import FeatureStore
+from src.ml.model_registry import ModelRegistry
+from src.ml.prediction_log import PredictionLog
 from src.scrapers.sportbex_client import SportbexMatch
 
 logger = logging.getLogger(__name__)
 
+TREE_MODELS = ('xgboost', 'lightgbm')
+
 
 class PredictorEnsemble:
     """Unified prediction interface for all models"""
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self,
+                 db_path: Optional[str] = None,
+                 registry: Optional[ModelRegistry] = None,
+                 log_predictions: bool = False):
         """
         Initialize predictor ensemble
         
+        The database, meta-learner and models are opened on first use. Tree
+        models are served from the model registry (memory-mapped, switching
+        when a new version is promoted), with the trainers' pickles as
+        fallback for models not registered yet.
+        
+        Predictions are only written to the prediction log (which trains the
+        meta-learner) when asked for; the log is then opened here, not on
+        the first prediction.
+        
         Args:
             db_path: Path to Match Results database
+            registry: Model registry (default: data/models/registry)
+            log_predictions: Log predictions by default (scheduled pipeline
+                only; what-if and debugging predictions must not be logged)
         """
-        self.feature_store = FeatureStore(db_path)
-        self.meta_learner = MetaLearner()
+        self.db_path = db_path
+        self.registry = registry or ModelRegistry()
+        self.models = {name: self.registry.get(name) for name in TREE_MODELS}
+        self.log_predictions = log_predictions
         
-        # Load models
-        self.xgboost_trainer = XGBoostTrainer(db_path=db_path)
-        self.lightgbm_trainer = LightGBMTrainer(db_path=db_path)
+        # Created on first use
+        self._feature_store: Optional[FeatureStore] = None
+        self._meta_learner: Optional[MetaLearner] = None
+        self._prediction_log: Optional[PredictionLog] = None
+        self._trainers: Dict[str, Any] = {}
         
-        # Try to load trained models
-        self.xgboost_loaded = self.xgboost_trainer.load_model()
-        self.lightgbm_loaded = self.lightgbm_trainer.load_model()
-        
-        if not self.xgboost_loaded:
-            logger.warning("⚠️ XGBoost model not loaded - predictions may be limited")
-        if not self.lightgbm_loaded:
-            logger.warning("⚠️ LightGBM model not loaded - predictions may be limited")
+        if log_predictions:
+            self._prediction_log = PredictionLog(db=self.feature_store.db)
         
         logger.info("✅ Predictor Ensemble initialized")
     
+    @property
+    def feature_store(self) -> FeatureStore:
+        if self._feature_store is None:
+            self._feature_store = FeatureStore(self.db_path)
+        return self._feature_store
+    
+    @property
+    def meta_learner(self) -> MetaLearner:
+        if self._meta_learner is None:
+            self._meta_learner = MetaLearner()
+        return self._meta_learner
+    
+    @property
+    def prediction_log(self) -> PredictionLog:
+        if self._prediction_log is None:
+            self._prediction_log = PredictionLog(db=self.feature_store.db)
+        return self._prediction_log
+    
+    def _trainer(self, name: str):
+        """Trainer with its pickled model (fallback for unregistered models), or None"""
+        if name not in self._trainers:
+            if name == 'xgboost':
+                from src.ml.xgboost_trainer import XGBoostTrainer
+                trainer = XGBoostTrainer(db_path=self.db_path)
+            else:
+                from src.ml.lightgbm_trainer import LightGBMTrainer
+                trainer = LightGBMTrainer(db_path=self.db_path)
+            
+            if trainer.load_model():
+                self._trainers[name] = trainer
+            else:
+                logger.warning(f"⚠️ {name} model not loaded - predictions may be limited")
+                self._trainers[name] = None
+        return self._trainers[name]
+    
+    def is_loaded(self, name: str) -> bool:
+        """Whether a model can be used (registered version or pickle)"""
+        return self.models[name].is_available() or self._trainer(name) is not None
+    
+    @property
+    def xgboost_loaded(self) -> bool:
+        return self.is_loaded('xgboost')
+    
+    @property
+    def lightgbm_loaded(self) -> bool:
+        return self.is_loaded('lightgbm')
+    
+    def _predict_proba(self, name: str, X: np.ndarray, feature_names: List[str]) -> Optional[np.ndarray]:
+        """Class-1 probabilities of a tree model for a feature matrix, or None
+        
+        Uses the registry's current version, falling back to the trainer's
+        pickle when no version is registered or it fails to load.
+        """
+        try:
+            if self.models[name].is_available():
+                proba = self.models[name].predict_proba(X, feature_names)
+                if proba is not None:
+                    return proba
+            trainer = self._trainer(name)
+            return trainer.predict_proba_batch(X, feature_names) if trainer else None
+        except Exception as e:
+            logger.warning(f"{name} prediction failed: {e}")
+            return None
+    
+    @staticmethod
+    def _file_version(path: Path) -> str:
+        """Version label of a model file (its modification time)"""
+        if not path.exists():
+            return 'none'
+        return datetime.fromtimestamp(path.stat().st_mtime).strftime('%Y%m%d%H%M%S')
+    
+    def _model_version(self, name: str) -> str:
+        """Version label of a tree model as last used"""
+        if self.models[name].version:
+            return self.models[name].version
+        trainer = self._trainers.get(name)
+        return self._file_version(trainer.model_path) if trainer else 'none'
+    
+    def _model_versions(self) -> Dict[str, str]:
+        """Version label per logged model"""
+        return {
+            'gpt4': 'gpt4',
+            'xgboost': self._model_version('xgboost'),
+            'lightgbm': self._model_version('lightgbm'),
+            'meta_learner': f"v{self.meta_learner.version}"
+        }
+    
+    def _log_predictions(self, rows: List[tuple]):
+        """Store (match_id, model, player1 win probability) rows in the prediction log"""
+        versions = self._model_versions()
+        self.prediction_log.log_predictions(
+            (match_id, model, versions[model], probability) for match_id, model, probability in rows
+        )
+    
+    def _log_rows(self,
+                  matches: List[SportbexMatch],
+                  kept: np.ndarray,
+                  lightgbm_probs: Optional[np.ndarray],
+                  gpt4_probs: Optional[np.ndarray],
+                  xgboost_probs: Optional[np.ndarray],
+                  combined: Dict[str, Any]) -> List[tuple]:
+        """(match_id, model, player1 win probability) rows for one predict_batch call"""
+        log_rows = []
+        if lightgbm_probs is not None:
+            screener_probs = self.meta_learner.screener_win_probability(lightgbm_probs)
+            log_rows += [(m.match_id, 'lightgbm', float(p)) for m, p in zip(matches, screener_probs)]
+        if gpt4_probs is not None:
+            log_rows += [(matches[i].match_id, 'gpt4', float(p)) for i, p in zip(kept, gpt4_probs) if not np.isnan(p)]
+        if xgboost_probs is not None:
+            log_rows += [(matches[i].match_id, 'xgboost', float(p)) for i, p in zip(kept, xgboost_probs)]
+        any_available = np.zeros(len(kept), dtype=bool)
+        for available in combined['available'].values():
+            any_available |= available
+        log_rows += [
+            (matches[i].match_id, 'meta_learner', float(p))
+            for i, p, ok in zip(kept, combined['player1_win_probability'], any_available) if ok
+        ]
+        return log_rows
+    
     def predict(self,
                 match: SportbexMatch,
                 gpt4_pred: Optional[Dict[str, Any]] = None,
-                use_lightgbm_screener: bool = True) -> Dict[str, Any]:
+                use_lightgbm_screener: bool = True,
+                log_predictions: Optional[bool] = None) -> Dict[str, Any]:
         """
-        Make prediction for a match using ensemble
+        Make prediction for a match using ensemble (see predict_batch)
         
         Args:
             match: SportbexMatch object
             gpt4_pred: GPT-4 prediction (optional, from AI analyzer)
             use_lightgbm_screener: Whether to use LightGBM as screener first
+            log_predictions: Write to the prediction log (default: as set
+                on the ensemble)
             
         Returns:
             Combined prediction dictionary
         """
-        # Step 1: LightGBM screener (fast filter)
-        lightgbm_pred = None
-        if use_lightgbm_screener and self.lightgbm_loaded:
-            try:
-                features = self.feature_store.extract_features(match)
-                lightgbm_pred = self.lightgbm_trainer.predict(features)
-                
-                # If not interesting, return early (fast rejection)
-                if lightgbm_pred and not lightgbm_pred.get('is_interesting', True):
-                    logger.debug(f"Match {match.match_id} filtered by LightGBM screener")
-                    return {
-                        'player1_win_probability': 0.5,
-                        'player2_win_probability': 0.5,
-                        'confidence': 0.0,
-                        'model': 'lightgbm_screener',
-                        'filtered': True,
-                        'reason': 'Not interesting according to LightGBM screener'
-                    }
-            except Exception as e:
-                logger.warning(f"LightGBM prediction failed: {e}")
-        
-        # Step 2: Extract features
-        try:
-            features = self.feature_store.extract_features(match)
-        except Exception as e:
-            logger.error(f"Feature extraction failed: {e}")
-            return {
-                'player1_win_probability': 0.5,
-                'player2_win_probability': 0.5,
-                'confidence': 0.0,
-                'model': 'ensemble',
-                'error': f'Feature extraction failed: {e}'
-            }
-        
-        # Step 3: XGBoost prediction
-        xgboost_pred = None
-        if self.xgboost_loaded:
-            try:
-                xgboost_pred = self.xgboost_trainer.predict(features)
-            except Exception as e:
-                logger.warning(f"XGBoost prediction failed: {e}")
-        
-        # Step 4: Combine all predictions with meta-learner
-        combined_pred = self.meta_learner.combine_predictions(
-            gpt4_pred=gpt4_pred,
-            xgboost_pred=xgboost_pred,
-            lightgbm_pred=lightgbm_pred
-        )
-        
-        # Add match information
-        combined_pred['match_id'] = match.match_id
-        combined_pred['player1'] = match.player1
-        combined_pred['player2'] = match.player2
-        combined_pred['tournament'] = match.tournament
-        
-        # Add recommendation if odds available
-        if match.player1_odds:
-            combined_pred['recommendation'] = self.meta_learner.get_recommendation(
-                combined_pred, odds=match.player1_odds
-            )
-        elif match.player2_odds:
-            # Use player2 odds as proxy
-            combined_pred['recommendation'] = self.meta_learner.get_recommendation(
-                combined_pred, odds=match.player2_odds
-            )
-        
-        return combined_pred
+        gpt4_predictions = {match.match_id: gpt4_pred} if gpt4_pred else None
+        return self.predict_batch([match], gpt4_predictions, use_lightgbm_screener, log_predictions)[0]
     
     def predict_batch(self,
                       matches: List[SportbexMatch],
                       gpt4_predictions: Optional[Dict[str, Dict[str, Any]]] = None,
-                      use_lightgbm_screener: bool = True) -> List[Dict[str, Any]]:
+                      use_lightgbm_screener: bool = True,
+                      log_predictions: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
         Make predictions for multiple matches
         
+        Features are extracted as one matrix, each model runs a single
+        predict_proba over it and the meta-learner combines the results as
+        arrays. Results match predict() called per match (to float32
+        precision).
+        
         Args:
             matches: List of SportbexMatch objects
             gpt4_predictions: Dictionary mapping match_id to GPT-4 prediction
             use_lightgbm_screener: Whether to use LightGBM screener
+            log_predictions: Write to the prediction log (default: as set
+                on the ensemble)
             
         Returns:
             List of prediction dictionaries
         """
-        predictions = []
+        if not matches:
+            return []
+        if log_predictions is None:
+            log_predictions = self.log_predictions
+        
+        gpt4_predictions = gpt4_predictions or {}
+        n = len(matches)
         
-        for match in matches:
-            gpt4_pred = None
-            if gpt4_predictions and match.match_id in gpt4_predictions:
-                gpt4_pred = gpt4_predictions[match.match_id]
+        # Step 1: Feature matrix for the whole slate
+        try:
+            X = self.feature_store.extract_features_batch(matches)
+        except Exception as e:
+            logger.error(f"Feature extraction failed: {e}")
+            return [{
+                'player1_win_probability': 0.5,
+                'player2_win_probability': 0.5,
+                'confidence': 0.0,
+                'model': 'ensemble',
+                'error': f'Feature extraction failed: {e}'
+            } for _ in matches]
+        feature_names = self.feature_store.get_feature_names()
+        
+        # Step 2: LightGBM screener mask
+        lightgbm_probs = None
+        keep = np.ones(n, dtype=bool)
+        if use_lightgbm_screener:
+            lightgbm_probs = self._predict_proba('lightgbm', X, feature_names)
+            if lightgbm_probs is not None:
+                keep = lightgbm_probs > 0.5
+        
+        # Step 3: XGBoost on the matches that passed the screener
+        kept = np.flatnonzero(keep)
+        xgboost_probs = None
+        if len(kept):
+            xgboost_probs = self._predict_proba('xgboost', X[kept], feature_names)
+        
+        # Step 4: Meta-learner combination as array arithmetic
+        gpt4_probs = None
+        if gpt4_predictions:
+            gpt4_probs = np.array([
+                gpt4_predictions[matches[i].match_id].get('player1_win_probability', 0.5)
+                if gpt4_predictions.get(matches[i].match_id) else np.nan
+                for i in kept
+            ], dtype=np.float64)
+        combined = self.meta_learner.combine_predictions_batch(
+            gpt4_probs=gpt4_probs,
+            xgboost_probs=xgboost_probs,
+            lightgbm_probs=lightgbm_probs[kept] if lightgbm_probs is not None else None
+        )
+        
+        # Log every model's player1 win probability in one transaction
+        if log_predictions:
+            self._log_predictions(self._log_rows(matches, kept, lightgbm_probs, gpt4_probs, xgboost_probs, combined))
+        
+        predictions: List[Dict[str, Any]] = [{
+            'player1_win_probability': 0.5,
+            'player2_win_probability': 0.5,
+            'confidence': 0.0,
+            'model': 'lightgbm_screener',
+            'filtered': True,
+            'reason': 'Not interesting according to LightGBM screener'
+        } for _ in matches]
+        
+        for row, i in enumerate(kept):
+            match = matches[i]
+            prob = float(combined['player1_win_probability'][row])
+            contributing_models = [
+                model for model, available in combined['available'].items() if available[row]
+            ]
+            
+            if contributing_models:
+                pred = {
+                    'player1_win_probability': prob,
+                    'player2_win_probability': float(combined['player2_win_probability'][row]),
+                    'predicted_winner': 'player1' if prob > 0.5 else 'player2',
+                    'confidence': float(combined['confidence'][row]),
+                    'model': 'meta_learner',
+                    'method': self.meta_learner.method,
+                    'contributing_models': contributing_models,
+                    'weights_used': {
+                        model: self.meta_learner.weights[model] if model in contributing_models else 0
+                        for model in ('gpt4', 'xgboost', 'lightgbm')
+                    }
+                }
+            else:
+                pred = {
+                    'player1_win_probability': 0.5,
+                    'player2_win_probability': 0.5,
+                    'confidence': 0.0,
+                    'model': 'meta_learner',
+                    'error': 'No predictions available'
+                }
+            
+            # Add match information
+            pred['match_id'] = match.match_id
+            pred['player1'] = match.player1
+            pred['player2'] = match.player2
+            pred['tournament'] = match.tournament
             
-            pred = self.predict(match, gpt4_pred=gpt4_pred, use_lightgbm_screener=use_lightgbm_screener)
-            predictions.append(pred)
+            # Add recommendation if odds available
+            odds = match.player1_odds or match.player2_odds
+            if odds:
+                pred['recommendation'] = self.meta_learner.get_recommendation(pred, odds=odds)
+            
+            predictions[i] = pred
         
         return predictions
     
@@ -173,15 +352,19 @@ class PredictorEnsemble:
         Returns:
             Dictionary with model status
         """
+        status = {}
+        for name in TREE_MODELS:
+            metadata = self.registry.get_metadata(name)
+            status[name] = {
+                'loaded': self.is_loaded(name),
+                'trained': self.is_loaded(name),
+                'source': 'registry' if metadata else 'pickle',
+                'version': metadata['version'] if metadata else None,
+                'metrics': metadata['metrics'] if metadata else {}
+            }
+        
         return {
-            'xgboost': {
-                'loaded': self.xgboost_loaded,
-                'trained': self.xgboost_trainer.is_trained
-            },
-            'lightgbm': {
-                'loaded': self.lightgbm_loaded,
-                'trained': self.lightgbm_trainer.is_trained
-            },
+            **status,
             'meta_learner': {
                 'weights': self.meta_learner.weights,
                 'accuracies': self.meta_learner.accuracies
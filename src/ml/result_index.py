@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Result Index
+============
+
+Shared bookkeeping for indexes derived from the Match Results database
+(Elo ratings, player stats).
+
+An index replays matches + results once, then applies each new result
+inside MatchResultsDB.insert_result's transaction. Every applied match
+gets a row in the index's snapshot table; results stored without going
+through insert_result are picked up by catch_up() with an anti-join on
+that table.
+
+Subclasses provide the replay query, the snapshot table and two hooks:
+_apply_row() for one result against the stored index and _replay() for a
+full rebuild.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.ml.data_collector import MatchResultsDB
+
+logger = logging.getLogger(__name__)
+
+
+class ResultIndex:
+    """Base class for indexes maintained from stored results"""
+
+    # Results in replay order; first column is match_id, {where} extends the filter
+    REPLAY_SQL = ""
+    # One row per applied match (keyed by match_id)
+    SNAPSHOT_TABLE = ""
+    # Name used in log messages
+    LABEL = ""
+
+    def __init__(self, db_path: Optional[str] = None, db: Optional[MatchResultsDB] = None):
+        """
+        Initialize index
+
+        Registers a result listener on the database and applies any results
+        not yet indexed (a full replay if the index is empty).
+
+        Args:
+            db_path: Path to Match Results database
+            db: Existing MatchResultsDB to attach to (takes precedence)
+        """
+        self.db = db or MatchResultsDB(db_path)
+        self._init_tables()
+        self.db.add_result_listener(self.apply_result)
+        self.catch_up()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db.db_path))
+
+    def _init_tables(self):
+        """Create index tables"""
+        raise NotImplementedError
+
+    def _apply_row(self, cursor: sqlite3.Cursor, row: Tuple):
+        """
+        Apply one REPLAY_SQL row to the stored index
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            row: Result row as selected by REPLAY_SQL
+        """
+        raise NotImplementedError
+
+    def _replay(self, cursor: sqlite3.Cursor, rows: List[Tuple]) -> int:
+        """
+        Replace the stored index with a replay of all rows
+
+        Args:
+            cursor: Cursor inside the rebuild transaction
+            rows: Every result row in replay order
+
+        Returns:
+            Number of players in the rebuilt index
+        """
+        raise NotImplementedError
+
+    def apply_result(self, cursor: sqlite3.Cursor, match_id: str) -> bool:
+        """
+        Apply a newly stored result (MatchResultsDB result listener)
+
+        Runs on the caller's cursor so the index commits with the result. A
+        result that was already indexed is skipped; corrections need rebuild().
+
+        Args:
+            cursor: Cursor inside the insert_result transaction
+            match_id: Match ID
+
+        Returns:
+            True if the index was updated
+        """
+        cursor.execute(f"SELECT 1 FROM {self.SNAPSHOT_TABLE} WHERE match_id = ?", (match_id,))
+        if cursor.fetchone():
+            logger.debug(f"Result for {match_id} already in {self.LABEL} - run rebuild() to apply corrections")
+            return False
+
+        cursor.execute(self.REPLAY_SQL.format(where="AND m.match_id = ?"), (match_id,))
+        row = cursor.fetchone()
+        if not row:
+            return False
+
+        self._apply_row(cursor, row)
+        return True
+
+    def rebuild(self) -> int:
+        """
+        Replay every result from scratch in chronological order
+
+        Returns:
+            Number of results applied
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(self.REPLAY_SQL.format(where=""))
+            rows = cursor.fetchall()
+            players = self._replay(cursor, rows)
+            conn.commit()
+
+            logger.info(f"✅ Rebuilt {self.LABEL} from {len(rows)} results ({players} players)")
+            return len(rows)
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error rebuilding {self.LABEL}: {e}")
+            return 0
+
+        finally:
+            conn.close()
+
+    def catch_up(self) -> int:
+        """
+        Apply results stored without going through insert_result
+
+        Returns:
+            Number of results applied
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {self.SNAPSHOT_TABLE})")
+            if not cursor.fetchone()[0]:
+                conn.close()
+                return self.rebuild()
+
+            cursor.execute(self.REPLAY_SQL.format(
+                where=f"AND NOT EXISTS (SELECT 1 FROM {self.SNAPSHOT_TABLE} s WHERE s.match_id = m.match_id)"
+            ))
+            pending = cursor.fetchall()
+
+            for row in pending:
+                self._apply_row(cursor, row)
+            conn.commit()
+
+            if pending:
+                logger.info(f"✅ Applied {len(pending)} pending results to {self.LABEL}")
+            return len(pending)
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error applying pending results to {self.LABEL}: {e}")
+            return 0
+
+        finally:
+            conn.close()
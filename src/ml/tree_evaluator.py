@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Tree Evaluator
+==============
+
+Dependency-free scoring of exported XGBoost / LightGBM models.
+
+Trained boosters are flattened into plain NumPy arrays (split feature,
+threshold, children, default direction, leaf value) and saved as .npz.
+Prediction scripts load those arrays and score a whole feature matrix with
+vectorized NumPy, without importing xgboost, lightgbm or pandas.
+
+This is part of Layer 3: Multi-Model Ensemble.
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# LightGBM treats |x| <= kZeroThreshold as zero for missing_type=Zero
+LIGHTGBM_ZERO_THRESHOLD = 1e-35
+
+# Missing-value handling per split node
+MISSING_NAN = 0     # NaN follows the default direction
+MISSING_ZERO = 1    # NaN and zero follow the default direction (LightGBM)
+MISSING_NONE = 2    # NaN is treated as 0.0 and compared (LightGBM)
+
+# Node arrays of a TreeEnsemble (saved under these names)
+ARRAY_FIELDS = ('feature', 'threshold', 'left', 'right', 'default_left',
+                'missing_type', 'leaf_value', 'tree_roots')
+
+
+class TreeEnsemble:
+    """Flattened binary-logistic tree ensemble
+
+    All trees share one set of node arrays; tree_roots holds the index of
+    each tree's root. Leaves have feature == -1 and carry their value in
+    leaf_value.
+    """
+
+    def __init__(self,
+                 feature: np.ndarray,
+                 threshold: np.ndarray,
+                 left: np.ndarray,
+                 right: np.ndarray,
+                 default_left: np.ndarray,
+                 missing_type: np.ndarray,
+                 leaf_value: np.ndarray,
+                 tree_roots: np.ndarray,
+                 feature_names: List[str],
+                 base_margin: float = 0.0,
+                 sigmoid_scale: float = 1.0,
+                 split_le: bool = False,
+                 source: str = ''):
+        """
+        Initialize tree ensemble
+
+        Args:
+            feature: Split feature index per node (-1 for leaves)
+            threshold: Split threshold per node
+            left: Child taken when the comparison holds
+            right: Child taken otherwise
+            default_left: Whether missing values go to the left child
+            missing_type: MISSING_NAN / MISSING_ZERO / MISSING_NONE per node
+            leaf_value: Leaf output per node (0 for internal nodes)
+            tree_roots: Root node index of each tree
+            feature_names: Feature order expected in the input matrix
+            base_margin: Raw score added before the sigmoid
+            sigmoid_scale: Multiplier applied to the raw score in the sigmoid
+            split_le: True for x <= threshold (LightGBM), False for x < threshold (XGBoost)
+            source: Originating library ('xgboost' or 'lightgbm')
+        """
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.missing_type = np.asarray(missing_type, dtype=np.int8)
+        self.leaf_value = np.asarray(leaf_value, dtype=np.float64)
+        self.tree_roots = np.asarray(tree_roots, dtype=np.int32)
+        self.feature_names = list(feature_names)
+        self.base_margin = float(base_margin)
+        self.sigmoid_scale = float(sigmoid_scale)
+        self.split_le = bool(split_le)
+        self.source = source
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_roots)
+
+    def predict_margin(self, X: np.ndarray, feature_names: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Raw (pre-sigmoid) score for each row
+
+        Args:
+            X: Feature matrix, one row per match
+            feature_names: Column names of X (defaults to the export order)
+
+        Returns:
+            Array of margins
+        """
+        X = self._align(X, feature_names)
+        n = len(X)
+        if n == 0 or self.n_trees == 0:
+            return np.full(n, self.base_margin)
+
+        rows = np.arange(n)[:, None]
+        nodes = np.broadcast_to(self.tree_roots, (n, self.n_trees)).copy()
+
+        # Descend all (row, tree) pairs one level per iteration
+        while True:
+            feat = self.feature[nodes]
+            active = feat >= 0
+            if not active.any():
+                break
+
+            active_nodes = nodes[active]
+            x = X[np.broadcast_to(rows, nodes.shape)[active], feat[active]]
+            missing_type = self.missing_type[active_nodes]
+
+            is_nan = np.isnan(x)
+            x = np.where(is_nan & (missing_type == MISSING_NONE), 0.0, x)
+            missing = np.where(
+                missing_type == MISSING_ZERO,
+                is_nan | (np.abs(np.nan_to_num(x)) <= LIGHTGBM_ZERO_THRESHOLD),
+                is_nan & (missing_type == MISSING_NAN)
+            )
+
+            threshold = self.threshold[active_nodes]
+            with np.errstate(invalid='ignore'):
+                go_left = x <= threshold if self.split_le else x < threshold
+            go_left = np.where(missing, self.default_left[active_nodes], go_left)
+
+            nodes[active] = np.where(go_left, self.left[active_nodes], self.right[active_nodes])
+
+        return self.base_margin + self.leaf_value[nodes].sum(axis=1)
+
+    def predict_proba(self, X: np.ndarray, feature_names: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Class-1 probability for each row (same as native predict_proba[:, 1])
+
+        Args:
+            X: Feature matrix, one row per match
+            feature_names: Column names of X (defaults to the export order)
+
+        Returns:
+            Array of probabilities
+        """
+        margin = self.predict_margin(X, feature_names)
+        return 1.0 / (1.0 + np.exp(-self.sigmoid_scale * margin))
+
+    def _align(self, X: np.ndarray, feature_names: Optional[List[str]]) -> np.ndarray:
+        # XGBoost compares in float32, LightGBM in float64
+        X = np.asarray(X, dtype=np.float32 if self.source == 'xgboost' else np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        if feature_names is None or list(feature_names) == self.feature_names:
+            return X
+
+        # Reorder columns to the export order; missing features default to 0.0
+        index = {name: i for i, name in enumerate(feature_names)}
+        aligned = np.zeros((len(X), len(self.feature_names)), dtype=X.dtype)
+        for j, name in enumerate(self.feature_names):
+            if name in index:
+                aligned[:, j] = X[:, index[name]]
+        return aligned
+
+    def save(self, path) -> Path:
+        """
+        Save arrays to an .npz file
+
+        Args:
+            path: Destination path
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                **{name: getattr(self, name) for name in ARRAY_FIELDS},
+                meta=np.array(json.dumps(self._meta()))
+            )
+        return path
+
+    @classmethod
+    def load(cls, path) -> 'TreeEnsemble':
+        """
+        Load arrays saved by save()
+
+        Args:
+            path: .npz file
+
+        Returns:
+            TreeEnsemble instance
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(**{name: data[name] for name in ARRAY_FIELDS}, **meta)
+
+    def _meta(self) -> Dict[str, Any]:
+        return {
+            'feature_names': self.feature_names,
+            'base_margin': self.base_margin,
+            'sigmoid_scale': self.sigmoid_scale,
+            'split_le': self.split_le,
+            'source': self.source
+        }
+
+    def save_dir(self, directory) -> Path:
+        """
+        Save each array as its own .npy file (memory-mappable, unlike .npz)
+
+        Args:
+            directory: Destination directory
+
+        Returns:
+            Directory written
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_FIELDS:
+            np.save(directory / f'{name}.npy', getattr(self, name))
+        with open(directory / 'ensemble.json', 'w') as f:
+            json.dump(self._meta(), f)
+        return directory
+
+    @classmethod
+    def load_dir(cls, directory, mmap: bool = True) -> 'TreeEnsemble':
+        """
+        Load arrays saved by save_dir()
+
+        Args:
+            directory: Directory with the .npy files
+            mmap: Memory-map the arrays read-only (processes share the pages)
+
+        Returns:
+            TreeEnsemble instance
+        """
+        directory = Path(directory)
+        with open(directory / 'ensemble.json', 'r') as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(directory / f'{name}.npy', mmap_mode='r' if mmap else None, allow_pickle=False)
+            for name in ARRAY_FIELDS
+        }
+        return cls(**arrays, **meta)
+
+    @classmethod
+    def from_xgboost(cls, model: Any, feature_names: List[str]) -> 'TreeEnsemble':
+        """
+        Flatten an XGBoost binary:logistic model
+
+        Args:
+            model: xgb.XGBClassifier or xgb.Booster
+            feature_names: Feature order used in training
+
+        Returns:
+            TreeEnsemble instance
+        """
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        config = json.loads(booster.save_config())
+        objective = config['learner']['objective']['name']
+        if objective != 'binary:logistic':
+            raise ValueError(f"Unsupported XGBoost objective: {objective}")
+
+        base_score = config['learner']['learner_model_param']['base_score']
+        base_score = float(str(base_score).strip('[]'))
+        base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+        dump = booster.get_dump(dump_format='json')
+        best_iteration = booster.attr('best_iteration')
+        if best_iteration is not None:
+            dump = dump[:int(best_iteration) + 1]
+
+        name_index = {name: i for i, name in enumerate(feature_names)}
+
+        def feature_index(split: str) -> int:
+            if split in name_index:
+                return name_index[split]
+            return int(split.lstrip('f'))
+
+        builder = _NodeBuilder()
+        for tree_json in dump:
+            tree = json.loads(tree_json)
+
+            def add(node: Dict) -> int:
+                if 'leaf' in node:
+                    return builder.leaf(node['leaf'])
+                index = builder.split(
+                    feature_index(node['split']), float(np.float32(node['split_condition'])),
+                    default_left=node['missing'] == node['yes'], missing_type=MISSING_NAN
+                )
+                children = {child['nodeid']: child for child in node['children']}
+                builder.set_children(index, add(children[node['yes']]), add(children[node['no']]))
+                return index
+
+            builder.roots.append(add(tree))
+
+        return builder.build(feature_names, base_margin=base_margin, sigmoid_scale=1.0,
+                             split_le=False, source='xgboost')
+
+    @classmethod
+    def from_lightgbm(cls, model: Any, feature_names: List[str]) -> 'TreeEnsemble':
+        """
+        Flatten a LightGBM binary model (numerical splits)
+
+        Args:
+            model: lgb.LGBMClassifier or lgb.Booster
+            feature_names: Feature order used in training
+
+        Returns:
+            TreeEnsemble instance
+        """
+        booster = model.booster_ if hasattr(model, 'booster_') else model
+        dump = booster.dump_model()
+
+        objective = dump.get('objective', '')
+        if not objective.startswith('binary'):
+            raise ValueError(f"Unsupported LightGBM objective: {objective}")
+        sigmoid_scale = 1.0
+        for part in objective.split():
+            if part.startswith('sigmoid:'):
+                sigmoid_scale = float(part.split(':', 1)[1])
+
+        # Map LightGBM's feature order onto ours
+        dump_names = dump.get('feature_names') or feature_names
+        name_index = {name: i for i, name in enumerate(feature_names)}
+        feature_map = [name_index.get(name, i) for i, name in enumerate(dump_names)]
+        missing_types = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+
+        builder = _NodeBuilder()
+        for tree_info in dump['tree_info']:
+            def add(node: Dict) -> int:
+                if 'leaf_value' in node:
+                    return builder.leaf(node['leaf_value'])
+                if node.get('decision_type', '<=') != '<=':
+                    raise ValueError("Categorical LightGBM splits are not supported")
+                index = builder.split(
+                    feature_map[node['split_feature']], float(node['threshold']),
+                    default_left=bool(node.get('default_left', True)),
+                    missing_type=missing_types.get(node.get('missing_type', 'None'), MISSING_NONE)
+                )
+                builder.set_children(index, add(node['left_child']), add(node['right_child']))
+                return index
+
+            builder.roots.append(add(tree_info['tree_structure']))
+
+        return builder.build(feature_names, base_margin=0.0, sigmoid_scale=sigmoid_scale,
+                             split_le=True, source='lightgbm')
+
+
+class _NodeBuilder:
+    """Accumulates flattened nodes while walking dumped trees"""
+
+    def __init__(self):
+        self.feature: List[int] = []
+        self.threshold: List[float] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.default_left: List[bool] = []
+        self.missing_type: List[int] = []
+        self.leaf_value: List[float] = []
+        self.roots: List[int] = []
+
+    def _append(self, feature: int, threshold: float, default_left: bool,
+                missing_type: int, leaf_value: float) -> int:
+        index = len(self.feature)
+        self.feature.append(feature)
+        self.threshold.append(threshold)
+        self.left.append(index)
+        self.right.append(index)
+        self.default_left.append(default_left)
+        self.missing_type.append(missing_type)
+        self.leaf_value.append(leaf_value)
+        return index
+
+    def leaf(self, value: float) -> int:
+        return self._append(-1, 0.0, True, MISSING_NAN, float(value))
+
+    def split(self, feature: int, threshold: float, default_left: bool, missing_type: int) -> int:
+        return self._append(feature, threshold, default_left, missing_type, 0.0)
+
+    def set_children(self, index: int, left: int, right: int):
+        self.left[index] = left
+        self.right[index] = right
+
+    def build(self, feature_names: List[str], **kwargs) -> TreeEnsemble:
+        return TreeEnsemble(
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            default_left=self.default_left,
+            missing_type=self.missing_type,
+            leaf_value=self.leaf_value,
+            tree_roots=self.roots,
+            feature_names=feature_names,
+            **kwargs
+        )
+
+
+def load_exported_models(model_dir: Optional[str] = None) -> Dict[str, TreeEnsemble]:
+    """
+    Load every exported model found in the model directory
+
+    Args:
+        model_dir: Directory with xgboost_model.npz / lightgbm_model.npz
+
+    Returns:
+        Dictionary mapping model name ('xgboost', 'lightgbm') to TreeEnsemble
+    """
+    if model_dir is None:
+        model_dir = Path(__file__).parent.parent.parent / 'data' / 'models'
+    model_dir = Path(model_dir)
+
+    models = {}
+    for name in ('xgboost', 'lightgbm'):
+        path = model_dir / f'{name}_model.npz'
+        if not path.exists():
+            continue
+        try:
+            models[name] = TreeEnsemble.load(path)
+        except Exception as e:
+            logger.error(f"Error loading exported {name} model: {e}")
+    return models
+
+
+def main():
+    """Load exported models and time a batch of predictions"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='NumPy Tree Evaluator')
+    parser.add_argument('--model-dir', help='Directory with exported .npz models')
+    parser.add_argument('--rows', type=int, default=10000, help='Rows in the synthetic batch')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    models = load_exported_models(args.model_dir)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    if not models:
+        print("❌ No exported models found. Run ml_weekly_retrain.py or a trainer with --train first")
+        return
+
+    print(f"\n✅ Loaded {', '.join(models)} in {load_ms:.1f} ms")
+    rng = np.random.default_rng(42)
+    for name, ensemble in models.items():
+        X = rng.uniform(0, 10, size=(args.rows, len(ensemble.feature_names)))
+        start = time.perf_counter()
+        proba = ensemble.predict_proba(X)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"   {name}: {ensemble.n_trees} trees, {args.rows} rows in {elapsed_ms:.1f} ms "
+              f"(mean p={proba.mean():.3f})")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    main()
@@ -369,9 +369,9 @@ class ITFNotionPipeline:
                         round=match_dict.get('round'),
                         match_status=match_dict.get('match_status', 'not_started'),
                         live_score=match_dict.get('live_score'),
-                        set1_score=None,  # Would need to parse from live_score
-                        scheduled_time=None,
-                        match_url=None,
+                        set1_score=match_dict.get('set1_score'),  # Feed matches only
+                        scheduled_time=datetime.fromisoformat(match_dict['scheduled_time']) if match_dict.get('scheduled_time') else None,
+                        match_url=match_dict.get('match_url'),
                         scraped_at=datetime.fromisoformat(match_dict.get('scraped_at', datetime.now().isoformat())),
                         player1_odds=match_dict.get('player_a_odds'),
                         player2_odds=match_dict.get('player_b_odds')
@@ -16,16 +16,18 @@ from datetime import datetime
 from pathlib import Path
 from bs4 import BeautifulSoup
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.scrapers.browser_pool import get_pool
+
 logger = logging.getLogger(__name__)
 
 # Try to import Selenium
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
@@ -41,7 +43,8 @@ class BetExplorerScraper:
     BetExplorer scraper for ITF Women matches with odds comparison.
     
     Features:
-    - Selenium for dynamic content
+    - Selenium for dynamic content (shared browser pool)
+    - Tournaments scraped in parallel (one browser tab each)
     - Tournament filtering (W15/W25 focus)
     - Odds comparison scraping (20+ bookmakers)
     - Best odds selection
@@ -61,69 +64,68 @@ class BetExplorerScraper:
         """
         self.config = config or {}
         self.use_selenium = use_selenium and SELENIUM_AVAILABLE
-        self.driver = None
         self.last_request_time = 0
+        self._rate_lock = threading.Lock()
         self.request_delay = self.config.get('request_delay', 2.0)
         self.max_retries = self.config.get('max_retries', 3)
         self.timeout = self.config.get('timeout', 30)
-        
-        if self.use_selenium:
-            self._init_selenium()
+        self.user_agent = self.config.get('user_agent')
+        self.pool = get_pool(user_agent=self.user_agent)
         
         logger.info(f"🎾 BetExplorer Scraper initialized (Selenium: {self.use_selenium})")
     
-    def _init_selenium(self):
-        """Initialize Selenium WebDriver with anti-detection (reused from FlashScore)"""
-        if not SELENIUM_AVAILABLE:
-            logger.warning("⚠️ Selenium not available")
-            return
-        
-        try:
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            user_agent = self.config.get('user_agent', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-            options.add_argument(f'user-agent={user_agent}')
-            
-            # Anti-detection
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            self.driver = webdriver.Chrome(options=options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            logger.info("✅ Selenium WebDriver initialized")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Selenium: {e}")
-            self.driver = None
-            self.use_selenium = False
-    
     def _rate_limit(self):
-        """Apply rate limiting (reused from FlashScore pattern)"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.request_delay:
-            sleep_time = self.request_delay - elapsed + random.uniform(0, 1)
+        """Apply rate limiting (reused from FlashScore pattern; shared by worker threads)"""
+        with self._rate_lock:
+            now = time.time()
+            sleep_time = self.last_request_time + self.request_delay - now
+            if sleep_time > 0:
+                sleep_time += random.uniform(0, 1)
+            # Reserve the slot before sleeping so other threads queue behind it
+            self.last_request_time = now + max(sleep_time, 0)
+        if sleep_time > 0:
             time.sleep(sleep_time)
-        self.last_request_time = time.time()
     
-    def _handle_cloudflare(self):
+    def _handle_cloudflare(self, driver):
         """Handle Cloudflare challenge if detected"""
         try:
-            if "Checking your browser" in self.driver.page_source or "Just a moment" in self.driver.page_source:
+            if "Checking your browser" in driver.page_source or "Just a moment" in driver.page_source:
                 logger.info("⏳ Cloudflare challenge detected, waiting...")
                 time.sleep(5)
                 # Wait for challenge to complete
-                WebDriverWait(self.driver, 30).until(
+                WebDriverWait(driver, 30).until(
                     lambda d: "Checking your browser" not in d.page_source
                 )
                 logger.info("✅ Cloudflare challenge passed")
         except TimeoutException:
             logger.warning("⚠️ Cloudflare challenge timeout")
     
+    def _fetch_html(self, url: str) -> str:
+        """
+        Load a page in a browser tab from the shared pool
+        
+        Args:
+            url: Page URL
+            
+        Returns:
+            Rendered HTML
+        """
+        self._rate_limit()
+        with self.pool.lease(user_agent=self.user_agent) as driver:
+            driver.get(url)
+            
+            # Handle Cloudflare if present
+            self._handle_cloudflare(driver)
+            
+            # Wait for page to load
+            wait = WebDriverWait(driver, self.timeout)
+            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            
+            # Additional wait for dynamic content
+            time.sleep(2)
+            
+            return driver.page_source
+    
     def get_w15_tournaments(self) -> List[Dict[str, str]]:
         """
         Get all W15/W25 tournament links from ITF Women page
@@ -131,7 +133,7 @@ class BetExplorerScraper:
         Returns:
             List of tournament dictionaries with name, url, tier, location, surface
         """
-        if not self.driver:
+        if not self.use_selenium:
             logger.error("❌ Selenium driver not available")
             return []
         
@@ -139,21 +141,7 @@ class BetExplorerScraper:
         
         try:
             logger.info(f"🌐 Loading ITF Women page: {self.ITF_WOMEN_URL}")
-            self._rate_limit()
-            self.driver.get(self.ITF_WOMEN_URL)
-            
-            # Handle Cloudflare if present
-            self._handle_cloudflare()
-            
-            # Wait for page to load
-            wait = WebDriverWait(self.driver, self.timeout)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # Additional wait for dynamic content
-            time.sleep(2)
-            
-            # Get page HTML
-            html = self.driver.page_source
+            html = self._fetch_html(self.ITF_WOMEN_URL)
             soup = BeautifulSoup(html, 'html.parser')
             
             # Find tournament links - BetExplorer structure
@@ -249,25 +237,14 @@ class BetExplorerScraper:
         Returns:
             List of match dictionaries with player names, time, odds link
         """
-        if not self.driver:
+        if not self.use_selenium:
             return []
         
         matches = []
         
         try:
             logger.info(f"🌐 Loading tournament page: {tournament_url}")
-            self._rate_limit()
-            self.driver.get(tournament_url)
-            
-            # Handle Cloudflare
-            self._handle_cloudflare()
-            
-            # Wait for page to load
-            wait = WebDriverWait(self.driver, self.timeout)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(2)
-            
-            html = self.driver.page_source
+            html = self._fetch_html(tournament_url)
             soup = BeautifulSoup(html, 'html.parser')
             
             # Find match rows - BetExplorer structure
@@ -354,25 +331,14 @@ class BetExplorerScraper:
         Returns:
             List of bookmaker odds dictionaries
         """
-        if not self.driver or not odds_url:
+        if not self.use_selenium or not odds_url:
             return []
         
         odds_data = []
         
         try:
             logger.debug(f"🌐 Loading odds page: {odds_url}")
-            self._rate_limit()
-            self.driver.get(odds_url)
-            
-            # Handle Cloudflare
-            self._handle_cloudflare()
-            
-            # Wait for page to load
-            wait = WebDriverWait(self.driver, self.timeout)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(2)
-            
-            html = self.driver.page_source
+            html = self._fetch_html(odds_url)
             soup = BeautifulSoup(html, 'html.parser')
             
             # Find odds table - BetExplorer structure
@@ -498,6 +464,49 @@ class BetExplorerScraper:
         
         return True
     
+    def _scrape_tournament(self, tournament: Dict[str, str]) -> List[Dict]:
+        """
+        Scrape a tournament's matches and their odds
+        
+        Args:
+            tournament: Tournament dictionary from get_w15_tournaments
+            
+        Returns:
+            List of match dictionaries with odds data
+        """
+        logger.info(f"🎾 Scraping tournament: {tournament['name']}")
+        
+        matches_with_odds = []
+        matches = self.scrape_tournament_matches(tournament['url'])
+        
+        # Step 3: For each match, scrape odds
+        for match in matches:
+            if match.get('odds_url'):
+                odds_data = self.scrape_match_odds(match['odds_url'])
+                best_odds = self.find_best_odds(odds_data)
+                
+                # Add tournament and odds info to match
+                match['tournament'] = tournament['name']
+                match['tier'] = tournament['tier']
+                match['location'] = tournament['location']
+                match['surface'] = tournament['surface']
+                match['best_odds_p1'] = best_odds['player_1']['odds']
+                match['bookmaker_p1'] = best_odds['player_1']['bookmaker']
+                match['best_odds_p2'] = best_odds['player_2']['odds']
+                match['bookmaker_p2'] = best_odds['player_2']['bookmaker']
+                match['odds_count'] = len(odds_data)
+                match['scraped_at'] = datetime.now().isoformat()
+                match['data_source'] = 'BetExplorer'
+                
+                matches_with_odds.append(match)
+                
+                # Rate limiting between matches
+                time.sleep(random.uniform(1, 2))
+            else:
+                logger.debug(f"⚠️ No odds URL for match: {match.get('player1')} vs {match.get('player2')}")
+        
+        return matches_with_odds
+    
     def scrape(self, tiers: List[str] = None) -> List[Dict]:
         """
         Main scrape method
@@ -525,40 +534,12 @@ class BetExplorerScraper:
             
             logger.info(f"📊 Scraping {len(filtered_tournaments)} tournaments (tiers: {tiers})")
             
-            # Step 2: For each tournament, scrape matches
-            for tournament in filtered_tournaments:
-                logger.info(f"🎾 Scraping tournament: {tournament['name']}")
-                
-                matches = self.scrape_tournament_matches(tournament['url'])
-                
-                # Step 3: For each match, scrape odds
-                for match in matches:
-                    if match.get('odds_url'):
-                        odds_data = self.scrape_match_odds(match['odds_url'])
-                        best_odds = self.find_best_odds(odds_data)
-                        
-                        # Add tournament and odds info to match
-                        match['tournament'] = tournament['name']
-                        match['tier'] = tournament['tier']
-                        match['location'] = tournament['location']
-                        match['surface'] = tournament['surface']
-                        match['best_odds_p1'] = best_odds['player_1']['odds']
-                        match['bookmaker_p1'] = best_odds['player_1']['bookmaker']
-                        match['best_odds_p2'] = best_odds['player_2']['odds']
-                        match['bookmaker_p2'] = best_odds['player_2']['bookmaker']
-                        match['odds_count'] = len(odds_data)
-                        match['scraped_at'] = datetime.now().isoformat()
-                        match['data_source'] = 'BetExplorer'
-                        
-                        all_matches.append(match)
-                        
-                        # Rate limiting between matches
-                        time.sleep(random.uniform(1, 2))
-                    else:
-                        logger.debug(f"⚠️ No odds URL for match: {match.get('player1')} vs {match.get('player2')}")
-                
-                # Rate limiting between tournaments
-                time.sleep(random.uniform(2, 3))
+            # Step 2: Scrape tournaments in parallel (one browser each)
+            if filtered_tournaments:
+                workers = min(self.pool.size, len(filtered_tournaments))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for matches in executor.map(self._scrape_tournament, filtered_tournaments):
+                        all_matches.extend(matches)
             
             logger.info(f"✅ Scraped {len(all_matches)} matches with odds data")
             
@@ -569,13 +550,6 @@ class BetExplorerScraper:
         
         return all_matches
     
-    def __del__(self):
-        """Cleanup Selenium driver (reused from FlashScore)"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
 
 
 # USAGE EXAMPLE
@@ -611,5 +585,5 @@ if __name__ == "__main__":
             print("\n⚠️ No matches found")
     
     finally:
-        del scraper
+        scraper.pool.close()
 
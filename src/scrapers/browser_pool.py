@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+🌐 HEADLESS BROWSER POOL
+========================
+
+Shared pool of warm headless Chrome instances for the Selenium scrapers
+(FlashScore, BetExplorer, TennisExplorer).
+
+- At most `size` browsers exist at once (fixed memory budget); they are
+  started on first lease (or up front with warm()) and reused across
+  scrapers in the same process instead of paying a cold start each.
+- Each lease opens a fresh tab and closes it on return, so tasks never
+  see each other's page state; cookies are shared per browser (this keeps
+  Cloudflare clearance between pages).
+- A lease can ask for its own user agent; it is set on the leased tab
+  over CDP, so scrapers sharing a pool keep their configured agents.
+- A browser is health-checked before it is leased and restarted when it
+  stopped responding or has served `max_pages` leases.
+
+Usage:
+    pool = get_pool()
+    with pool.lease(user_agent=ua) as driver:
+        driver.get(url)
+        html = driver.page_source
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import Selenium
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+    logger.warning("⚠️ Selenium not available")
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+# Pool defaults (overridable per process with environment variables)
+DEFAULT_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '2'))
+DEFAULT_MAX_PAGES = int(os.getenv('BROWSER_POOL_MAX_PAGES', '50'))
+
+
+def create_chrome_driver(user_agent: Optional[str] = None):
+    """
+    Start headless Chrome with the scrapers' anti-detection settings
+
+    Args:
+        user_agent: User agent string
+
+    Returns:
+        webdriver.Chrome instance
+    """
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument(f'user-agent={user_agent or DEFAULT_USER_AGENT}')
+
+    # Anti-detection
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    driver = webdriver.Chrome(options=options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+class _Browser:
+    """One pooled browser and its usage count"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.home_handle = driver.current_window_handle
+        self.pages = 0
+
+
+class BrowserPool:
+    """Fixed-size pool of reusable headless browsers"""
+
+    def __init__(self,
+                 size: int = DEFAULT_POOL_SIZE,
+                 max_pages: int = DEFAULT_MAX_PAGES,
+                 user_agent: Optional[str] = None,
+                 driver_factory: Optional[Callable] = None):
+        """
+        Initialize browser pool (no browser is started yet)
+
+        Args:
+            size: Maximum number of browsers
+            max_pages: Leases served by a browser before it is restarted
+            user_agent: User agent for new browsers
+            driver_factory: Callable returning a new WebDriver
+                (default: create_chrome_driver)
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.user_agent = user_agent
+        self._custom_factory = driver_factory is not None
+        self.driver_factory = driver_factory or (lambda: create_chrome_driver(self.user_agent))
+
+        # One slot per concurrent lease; browsers never outnumber slots
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: "queue.LifoQueue[_Browser]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._running = 0
+        self._closed = False
+
+        self.stats = {'started': 0, 'recycled': 0, 'failed_health_checks': 0, 'leases': 0}
+
+    @property
+    def available(self) -> bool:
+        """Whether browsers can be started"""
+        return SELENIUM_AVAILABLE or self._custom_factory
+
+    def _start_browser(self) -> _Browser:
+        """Start a browser (caller holds a slot)"""
+        start = time.perf_counter()
+        browser = _Browser(self.driver_factory())
+        self.stats['started'] += 1
+        logger.info(f"✅ Browser started in {time.perf_counter() - start:.1f}s "
+                    f"({self._running}/{self.size} in pool)")
+        return browser
+
+    @staticmethod
+    def _quit(browser: _Browser):
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+    def _is_healthy(self, browser: _Browser) -> bool:
+        """Whether the browser still answers commands"""
+        try:
+            browser.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Browser failed health check: {e}")
+            self.stats['failed_health_checks'] += 1
+            return False
+
+    def _take_browser(self) -> _Browser:
+        """Idle healthy browser, or a new one (caller holds a slot)"""
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_healthy(browser):
+                return browser
+            self._discard(browser)
+
+        with self._lock:
+            self._running += 1
+        try:
+            return self._start_browser()
+        except Exception:
+            with self._lock:
+                self._running -= 1
+            raise
+
+    def _discard(self, browser: _Browser):
+        """Quit a browser"""
+        self._quit(browser)
+        with self._lock:
+            self._running -= 1
+
+    def _release(self, browser: _Browser):
+        """Return a browser to the pool, restarting it if worn out"""
+        if self._closed:
+            self._discard(browser)
+        elif browser.pages >= self.max_pages:
+            logger.info(f"♻️ Recycling browser after {browser.pages} pages")
+            self.stats['recycled'] += 1
+            self._discard(browser)
+        else:
+            self._idle.put(browser)
+
+    def _set_user_agent(self, driver, user_agent: Optional[str]):
+        """Override the user agent of the current tab if it differs from the pool's"""
+        if not user_agent or user_agent == (self.user_agent or DEFAULT_USER_AGENT):
+            return
+        try:
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
+        except Exception as e:
+            logger.warning(f"⚠️ Could not set user agent on leased tab: {e} - using the pool's")
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = 120, user_agent: Optional[str] = None) -> Iterator:
+        """
+        Borrow a browser with a fresh tab
+
+        Args:
+            timeout: Seconds to wait for a free browser (None waits forever)
+            user_agent: User agent for this tab (default: the pool's)
+
+        Yields:
+            WebDriver switched to a new tab (closed again on exit)
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser free within {timeout}s (pool size {self.size})")
+
+        try:
+            browser = self._take_browser()
+            driver = browser.driver
+            try:
+                driver.switch_to.new_window('tab')
+            except Exception as e:
+                logger.warning(f"⚠️ Could not open tab: {e} - discarding browser")
+                self._discard(browser)
+                raise
+
+            browser.pages += 1
+            self.stats['leases'] += 1
+            try:
+                self._set_user_agent(driver, user_agent)
+                yield driver
+            finally:
+                try:
+                    driver.close()
+                    driver.switch_to.window(browser.home_handle)
+                    self._release(browser)
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not close tab: {e} - discarding browser")
+                    self._discard(browser)
+        finally:
+            self._slots.release()
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Start browsers ahead of use
+
+        Args:
+            count: Browsers to have running (default: pool size)
+
+        Returns:
+            Number of browsers running
+        """
+        count = min(count or self.size, self.size)
+        while self._running < count:
+            if not self._slots.acquire(blocking=False):
+                break
+            try:
+                with self._lock:
+                    self._running += 1
+                try:
+                    self._idle.put(self._start_browser())
+                except Exception as e:
+                    with self._lock:
+                        self._running -= 1
+                    logger.error(f"❌ Failed to warm browser pool: {e}")
+                    break
+            finally:
+                self._slots.release()
+        return self._running
+
+    @property
+    def running(self) -> int:
+        """Number of live browsers"""
+        return self._running
+
+    def close(self):
+        """Quit all idle browsers; leased ones quit when returned"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_shared_pool: Optional[BrowserPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_pool(size: Optional[int] = None, user_agent: Optional[str] = None) -> BrowserPool:
+    """
+    Process-wide browser pool shared by all scrapers
+
+    Only the first call creates the pool; pass a per-scraper user agent to
+    lease() instead of relying on the one given here.
+
+    Args:
+        size: Pool size if the pool is created by this call
+        user_agent: Default user agent if the pool is created by this call
+
+    Returns:
+        BrowserPool (closed automatically at exit)
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None or _shared_pool._closed:
+            _shared_pool = BrowserPool(size=size or DEFAULT_POOL_SIZE, user_agent=user_agent)
+            atexit.register(_shared_pool.close)
+        elif size and size != _shared_pool.size:
+            logger.warning(f"⚠️ Browser pool already running with size {_shared_pool.size} - "
+                           f"ignoring requested size {size}")
+        return _shared_pool
@@ -40,8 +40,10 @@ Multi-strategy approach:
 """
 
 import asyncio
+import codecs
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -51,13 +53,14 @@ import sys
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.scrapers.browser_pool import get_pool
+from src.scrapers.odds_join import OddsJoinIndex, MIN_JOIN_CONFIDENCE
+from src.ml.player_resolver import get_resolver
+
 logger = logging.getLogger(__name__)
 
 # Try to import Selenium
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
@@ -73,11 +76,104 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+# lxml tree builder for BeautifulSoup (faster than html.parser)
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# FlashScore data feed (what the page's JavaScript renders from):
+# f_<sport>_<day offset>_<utc offset>_<lang>_1, sport 2 = tennis
+FEED_URL = 'https://2.flashscore.ninja/2/x/feed/f_2_{day}_{tz}_en_1'
+FEED_SIGN = 'SW9D1eZo'
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Records are separated by ~, fields by ¬, key and value by ÷
+FEED_RECORD_SEP = '~'
+FEED_FIELD_SEP = '¬'
+FEED_VALUE_SEP = '÷'
+
+# AB (status) and AC (stage) codes
+FEED_STATUS = {'1': 'Upcoming', '2': 'Live', '3': 'Completed'}
+FEED_STAGE_STATUS = {'4': 'Postponed', '5': 'Cancelled'}
+
+# Games per set, home/away keys
+FEED_SET_KEYS = (('BA', 'BB'), ('BC', 'BD'), ('BE', 'BF'), ('BG', 'BH'), ('BI', 'BJ'))
+
+
+class FlashScoreFeedParser:
+    """
+    Incremental parser for the FlashScore data feed
+    
+    Feed text can be passed in arbitrary chunks; complete event records are
+    returned as soon as their terminating separator arrives, tagged with the
+    tournament header (ZA record) that precedes them.
+    """
+    
+    def __init__(self):
+        self._buffer = ""
+        self._tournament = ""
+    
+    @staticmethod
+    def _fields(record: str) -> Dict[str, str]:
+        fields = {}
+        for field in record.split(FEED_FIELD_SEP):
+            key, sep, value = field.partition(FEED_VALUE_SEP)
+            if sep:
+                fields[key] = value
+        return fields
+    
+    def _event(self, record: str) -> Optional[Dict[str, str]]:
+        fields = self._fields(record)
+        if 'ZA' in fields:
+            self._tournament = fields['ZA']
+            return None
+        if 'AA' in fields:
+            fields['tournament'] = self._tournament
+            return fields
+        return None
+    
+    def feed(self, text: str) -> List[Dict[str, str]]:
+        """
+        Consume a chunk of feed text
+        
+        Args:
+            text: Next part of the feed
+            
+        Returns:
+            Event records completed by this chunk
+        """
+        *records, self._buffer = (self._buffer + text).split(FEED_RECORD_SEP)
+        events = []
+        for record in records:
+            event = self._event(record)
+            if event:
+                events.append(event)
+        return events
+    
+    def close(self) -> List[Dict[str, str]]:
+        """Flush the last record (the feed need not end with a separator)"""
+        record, self._buffer = self._buffer, ""
+        event = self._event(record) if record else None
+        return [event] if event else []
+
+
+def _run_async(coro):
+    """Run a coroutine from sync code, also when called inside an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 
 class FlashScoreITFScraperEnhanced:
     """
     Enhanced scraper with:
-    - Selenium for dynamic content
+    - FlashScore data feed over aiohttp (no browser)
+    - Selenium for dynamic content (fallback, from the shared browser pool)
     - Multiple CSS selector strategies
     - Fallback mechanisms
     - Extensive logging
@@ -99,122 +195,104 @@ class FlashScoreITFScraperEnhanced:
         Initialize enhanced scraper
         
         Args:
-            config: Configuration dictionary
-            use_selenium: Whether to use Selenium (recommended)
+            config: Configuration dictionary ('use_feed': False skips the
+                data feed and always renders the page)
+            use_selenium: Whether Selenium may be used (started only when
+                the data feed is unavailable)
         """
         self.config = config or {}
         self.use_selenium = use_selenium and SELENIUM_AVAILABLE
-        self.driver = None
-        
-        if self.use_selenium:
-            self._init_selenium()
+        self.use_feed = self.config.get('use_feed', True) and REQUESTS_AVAILABLE
+        self.user_agent = self.config.get('user_agent')
+        self.pool = get_pool(user_agent=self.user_agent)
         
-        logger.info(f"🎾 Enhanced FlashScore Scraper initialized (Selenium: {self.use_selenium})")
+        logger.info(f"🎾 Enhanced FlashScore Scraper initialized (feed: {self.use_feed}, Selenium: {self.use_selenium})")
     
-    def _init_selenium(self):
-        """Initialize Selenium WebDriver with anti-detection"""
-        if not SELENIUM_AVAILABLE:
-            logger.warning("⚠️ Selenium not available")
-            return
+    def _load_page(self, driver, url: str) -> str:
+        """
+        Load a page in a leased browser tab and return the rendered HTML
         
-        try:
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            user_agent = self.config.get('user_agent', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-            options.add_argument(f'user-agent={user_agent}')
-            
-            # Anti-detection
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            self.driver = webdriver.Chrome(options=options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            logger.info("✅ Selenium WebDriver initialized")
+        Args:
+            driver: WebDriver from the browser pool
+            url: Page URL
             
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Selenium: {e}")
-            self.driver = None
-            self.use_selenium = False
+        Returns:
+            Rendered HTML
+        """
+        driver.get(url)
+        
+        # Wait for page to load using WebDriverWait instead of blocking sleep
+        wait = WebDriverWait(driver, 15)
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        
+        # Try to find and click ITF Women filter if available
+        try:
+            # Look for ITF Women link/button with wait
+            itf_link = wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "ITF")))
+            if itf_link:
+                itf_link.click()
+                # Wait for filter to apply (non-blocking wait)
+                wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        except:
+            logger.debug("Could not find ITF filter, continuing...")
+        
+        # Wait for matches to load (max 15s) - already initialized above
+        
+        # Multiple selector strategies
+        selectors = [
+            (By.CLASS_NAME, "event__match"),
+            (By.CSS_SELECTOR, "div[id^='g_1']"),  # FlashScore match rows
+            (By.CSS_SELECTOR, ".event__match"),
+            (By.XPATH, "//div[contains(@class, 'event__match')]"),
+            (By.CSS_SELECTOR, "[class*='event']")
+        ]
+        
+        found = False
+        for by, selector in selectors:
+            try:
+                wait.until(EC.presence_of_element_located((by, selector)))
+                logger.info(f"✅ Found matches with selector: {selector}")
+                found = True
+                break
+            except:
+                continue
+        
+        if not found:
+            logger.warning("⚠️ No matches found with standard selectors, trying fallback...")
+            # Wait for content to load using explicit wait instead of blocking sleep
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        
+        # Scroll to load lazy content - optimized with async-like waits
+        for i in range(5):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            # Use WebDriverWait for shorter, non-blocking waits
+            WebDriverWait(driver, 1).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        
+        # Get rendered HTML
+        return driver.page_source
     
-    def scrape_with_selenium(self, url: str, tier: str) -> List[Dict]:
+    def _render_page(self, url: str, tier: str) -> Optional[str]:
         """
-        Scrape with Selenium (wait for JS to load)
+        Render a page with a browser from the shared pool
         
-        FlashScore loads matches dynamically via JavaScript.
-        Strategy:
-        1. Load main tennis page
-        2. Filter for ITF Women tournaments
-        3. Wait for match rows to appear
-        4. Scroll down (lazy loading)
-        5. Extract HTML
-        6. Parse with BeautifulSoup
+        Args:
+            url: Page URL
+            tier: Tier label (for logging and the debug file name)
+            
+        Returns:
+            Rendered HTML, or None on failure
         """
-        if not self.driver:
+        if not self.use_selenium:
             logger.error("❌ Selenium driver not available")
-            return []
+            return None
         
         logger.info(f"🌐 Loading tennis page with Selenium: {url}")
-        logger.info(f"   Filtering for {tier} tournaments...")
         
         try:
-            self.driver.get(url)
-            
-            # Wait for page to load using WebDriverWait instead of blocking sleep
-            wait = WebDriverWait(self.driver, 15)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # Try to find and click ITF Women filter if available
-            try:
-                # Look for ITF Women link/button with wait
-                itf_link = wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "ITF")))
-                if itf_link:
-                    itf_link.click()
-                    # Wait for filter to apply (non-blocking wait)
-                    wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-            except:
-                logger.debug("Could not find ITF filter, continuing...")
-            
-            # Wait for matches to load (max 15s) - already initialized above
-            
-            # Multiple selector strategies
-            selectors = [
-                (By.CLASS_NAME, "event__match"),
-                (By.CSS_SELECTOR, "div[id^='g_1']"),  # FlashScore match rows
-                (By.CSS_SELECTOR, ".event__match"),
-                (By.XPATH, "//div[contains(@class, 'event__match')]"),
-                (By.CSS_SELECTOR, "[class*='event']")
-            ]
-            
-            found = False
-            for by, selector in selectors:
-                try:
-                    wait.until(EC.presence_of_element_located((by, selector)))
-                    logger.info(f"✅ Found matches with selector: {selector}")
-                    found = True
-                    break
-                except:
-                    continue
-            
-            if not found:
-                logger.warning("⚠️ No matches found with standard selectors, trying fallback...")
-                # Wait for content to load using explicit wait instead of blocking sleep
-                wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-            
-            # Scroll to load lazy content - optimized with async-like waits
-            for i in range(5):
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                # Use WebDriverWait for shorter, non-blocking waits
-                WebDriverWait(self.driver, 1).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-            
-            # Get rendered HTML
-            html = self.driver.page_source
+            with self.pool.lease(user_agent=self.user_agent) as driver:
+                html = self._load_page(driver, url)
             
             # Save for debugging (optional)
             if self.config.get('save_debug_html'):
@@ -224,39 +302,120 @@ class FlashScoreITFScraperEnhanced:
                     f.write(html)
                 logger.info(f"💾 Saved debug HTML to {debug_path}")
             
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Parse matches and filter by tier
-            all_matches = self._parse_matches_enhanced(soup, tier)
-            
-            # Filter matches by tier AND exclude Men tournaments
-            matches = []
-            for m in all_matches:
-                tournament = m.get('tournament', '').upper()
-                
-                # Exclude Men tournaments explicitly
-                if 'MEN' in tournament and 'WOMEN' not in tournament:
-                    continue
-                if ' M15' in tournament or ' M25' in tournament or ' M35' in tournament:
-                    continue
-                
-                # Check for ITF Women with specific tier (W15, W25, W35, W50)
-                # Must have: ITF + WOMEN + tier number
-                has_itf = 'ITF' in tournament
-                has_women = 'WOMEN' in tournament
-                has_tier = tier in tournament or f'W{tier[1:]}' in tournament
-                
-                if has_itf and has_women and has_tier:
-                    matches.append(m)
-            
-            logger.info(f"📊 {tier}: Found {len(matches)} ITF Women matches (from {len(all_matches)} total)")
-            return matches
+            return html
             
         except Exception as e:
             logger.error(f"❌ Selenium scrape failed: {e}")
             import traceback
             traceback.print_exc()
+            return None
+    
+    def scrape_with_selenium(self, url: str, tier: str) -> List[Dict]:
+        """
+        Scrape with Selenium (wait for JS to load)
+        
+        FlashScore loads matches dynamically via JavaScript.
+        Strategy:
+        1. Lease a browser tab from the shared pool
+        2. Load main tennis page and filter for ITF Women tournaments
+        3. Wait for match rows to appear
+        4. Scroll down (lazy loading)
+        5. Extract HTML
+        6. Parse with BeautifulSoup
+        """
+        html = self._render_page(url, tier)
+        if html is None:
             return []
+        return self._matches_from_html(html, tier)
+    
+    def _matches_from_html(self, html: str, tier: str) -> List[Dict]:
+        """Parse a rendered page and keep the tier's matches"""
+        all_matches = self.parse_html(html, tier)
+        matches = self._filter_tier(all_matches, tier)
+        
+        logger.info(f"📊 {tier}: Found {len(matches)} ITF Women matches (from {len(all_matches)} total)")
+        return matches
+    
+    @staticmethod
+    def _is_tier_tournament(tournament: str, tier: str) -> bool:
+        """Whether a tournament name is an ITF Women event of the tier"""
+        tournament = tournament.upper()
+        
+        # Exclude Men tournaments explicitly
+        if 'MEN' in tournament and 'WOMEN' not in tournament:
+            return False
+        if ' M15' in tournament or ' M25' in tournament or ' M35' in tournament:
+            return False
+        
+        # Check for ITF Women with specific tier (W15, W25, W35, W50)
+        # Must have: ITF + WOMEN + tier number
+        has_itf = 'ITF' in tournament
+        has_women = 'WOMEN' in tournament
+        has_tier = tier in tournament or f'W{tier[1:]}' in tournament
+        return has_itf and has_women and has_tier
+    
+    def _filter_tier(self, matches: List[Dict], tier: str) -> List[Dict]:
+        """Matches of ITF Women tournaments of the tier"""
+        return [m for m in matches if self._is_tier_tournament(m.get('tournament', ''), tier)]
+    
+    def parse_html(self, html: str, tier: str) -> List[Dict]:
+        """
+        Parse a rendered FlashScore page into match dictionaries
+        
+        Uses the single-pass parser unless config 'parser_mode' is 'enhanced'.
+        
+        Args:
+            html: Page source
+            tier: Tier label (W15, W25, ...)
+            
+        Returns:
+            List of validated match dictionaries (not yet filtered by tier)
+        """
+        if self.config.get('parser_mode') == 'enhanced':
+            return self._parse_matches_enhanced(BeautifulSoup(html, 'html.parser'), tier)
+        return self._parse_matches_linear(BeautifulSoup(html, HTML_PARSER), tier)
+    
+    @staticmethod
+    def _is_event_node(tag) -> bool:
+        """Tournament header or match row"""
+        if tag.name != 'div':
+            return False
+        classes = tag.get('class') or ()
+        return 'headerLeague' in classes or 'event__match' in classes
+    
+    def _parse_matches_linear(self, soup: BeautifulSoup, tier: str) -> List[Dict]:
+        """
+        Single-pass match parsing
+        
+        Walks headers and match rows once in document order, carrying the
+        current headerLeague, so each tournament name is resolved once
+        instead of searching backwards from every row. Produces the same
+        matches as _parse_matches_enhanced; pages without event__match rows
+        fall back to it.
+        """
+        matches = []
+        header_name = ""
+        rows = 0
+        
+        for node in soup.find_all(self._is_event_node):
+            if 'headerLeague' in node['class']:
+                header_name = self._tournament_from_header(node)
+                continue
+            
+            rows += 1
+            # Rows before any named header use the full lookup
+            tournament = header_name if len(header_name) > 3 else self._find_tournament_name(node)
+            match = self._extract_match_data(node, tier, tournament=tournament)
+            
+            if match and self._validate_match(match):
+                matches.append(match)
+        
+        logger.info(f"Single pass: Found {rows} match rows")
+        
+        if not rows:
+            return self._parse_matches_enhanced(soup, tier)
+        
+        return matches
     
     def _parse_matches_enhanced(self, soup: BeautifulSoup, tier: str) -> List[Dict]:
         """
@@ -297,15 +456,21 @@ class FlashScoreITFScraperEnhanced:
         
         return matches
     
-    def _extract_match_data(self, row, tier: str) -> Optional[Dict]:
+    def _extract_match_data(self, row, tier: str, tournament: Optional[str] = None) -> Optional[Dict]:
         """
         Extract match data from row element
         
         Try multiple extraction strategies
+        
+        Args:
+            row: Match row element
+            tier: Tier label
+            tournament: Tournament name if already known (else looked up)
         """
         try:
             # Extract tournament (look up in DOM tree)
-            tournament = self._find_tournament_name(row)
+            if tournament is None:
+                tournament = self._find_tournament_name(row)
             
             # Extract players
             player_a, player_b = self._extract_players(row)
@@ -512,55 +677,7 @@ class FlashScoreITFScraperEnhanced:
                 break
         
         if header_league:
-            # Get tournament name - try multiple strategies
-            name_span = header_league.find('span', class_='headerLeague__name')
-            category_span = header_league.find('span', class_='headerLeague__category')
-            
-            # Strategy 1: Use name span
-            name = ""
-            if name_span:
-                name = name_span.get_text(strip=True)
-            
-            # Strategy 2: Extract from link (FlashScore stores tournament name in link)
-            link = header_league.find('a')
-            if link:
-                link_text = link.get_text(strip=True)
-                if link_text and len(link_text) > 3:
-                    name = link_text
-            
-            # Strategy 3: Extract from all text (filter out category)
-            if not name or len(name) < 3:
-                all_text = header_league.get_text(separator=' ', strip=True)
-                # Remove category text
-                if category_span:
-                    cat_text = category_span.get_text(strip=True)
-                    all_text = all_text.replace(cat_text, '').strip()
-                # Remove colon and extra spaces
-                all_text = all_text.replace(':', '').strip()
-                # Take first reasonable chunk (tournament name is usually first)
-                words = all_text.split()
-                if words:
-                    # Find where tournament name ends (usually before location)
-                    name_parts = []
-                    for word in words:
-                        if word.lower() in ['hard', 'clay', 'grass'] or '(' in word:
-                            break
-                        name_parts.append(word)
-                    if name_parts:
-                        name = ' '.join(name_parts)
-            
-            category = category_span.get_text(strip=True) if category_span else ""
-            
-            # Combine name and category
-            if name and category:
-                full_name = f"{name} - {category}"
-            elif name:
-                full_name = name
-            elif category:
-                full_name = category
-            else:
-                full_name = ""
-            
+            full_name = self._tournament_from_header(header_league)
             if full_name and len(full_name) > 3:
                 return full_name
         
@@ -618,9 +735,71 @@ class FlashScoreITFScraperEnhanced:
         
         return "Unknown Tournament"
     
+    def _tournament_from_header(self, header_league) -> str:
+        """
+        Tournament name of a headerLeague element
+        
+        Returns:
+            "Name - CATEGORY" (or whichever part is present), "" if none
+        """
+        name_span = header_league.find('span', class_='headerLeague__name')
+        category_span = header_league.find('span', class_='headerLeague__category')
+        
+        # Strategy 1: Use name span
+        name = ""
+        if name_span:
+            name = name_span.get_text(strip=True)
+        
+        # Strategy 2: Extract from link (FlashScore stores tournament name in link)
+        link = header_league.find('a')
+        if link:
+            link_text = link.get_text(strip=True)
+            if link_text and len(link_text) > 3:
+                name = link_text
+        
+        # Strategy 3: Extract from all text (filter out category)
+        if not name or len(name) < 3:
+            all_text = header_league.get_text(separator=' ', strip=True)
+            # Remove category text
+            if category_span:
+                cat_text = category_span.get_text(strip=True)
+                all_text = all_text.replace(cat_text, '').strip()
+            # Remove colon and extra spaces
+            all_text = all_text.replace(':', '').strip()
+            # Take first reasonable chunk (tournament name is usually first)
+            words = all_text.split()
+            if words:
+                # Find where tournament name ends (usually before location)
+                name_parts = []
+                for word in words:
+                    if word.lower() in ['hard', 'clay', 'grass'] or '(' in word:
+                        break
+                    name_parts.append(word)
+                if name_parts:
+                    name = ' '.join(name_parts)
+        
+        category = category_span.get_text(strip=True) if category_span else ""
+        
+        # Combine name and category
+        if name and category:
+            full_name = f"{name} - {category}"
+        elif name:
+            full_name = name
+        elif category:
+            full_name = category
+        else:
+            full_name = ""
+        
+        return full_name
+    
     def _extract_surface(self, tournament_name: str, row) -> str:
         """Extract court surface from tournament name or row"""
-        text = (tournament_name + " " + row.get_text()).lower()
+        return self._surface_from_text(tournament_name + " " + row.get_text())
+    
+    @staticmethod
+    def _surface_from_text(text: str) -> str:
+        """Court surface mentioned in text (Hard if none)"""
+        text = text.lower()
         
         if 'hard' in text or 'hardcourt' in text:
             return 'Hard'
@@ -666,6 +845,132 @@ class FlashScoreITFScraperEnhanced:
         
         return True
     
+    @staticmethod
+    def _feed_timezone() -> int:
+        """Local UTC offset in hours (feed day boundaries follow it)"""
+        offset = datetime.now().astimezone().utcoffset()
+        return round(offset.total_seconds() / 3600) if offset else 0
+    
+    async def fetch_feed(self, day: int = 0) -> List[Dict[str, str]]:
+        """
+        Download and parse one day of the FlashScore tennis feed
+        
+        The response is parsed as it streams in.
+        
+        Args:
+            day: Day offset from today
+            
+        Returns:
+            Event records (feed fields plus 'tournament')
+        """
+        url = self.config.get('feed_url', FEED_URL).format(day=day, tz=self._feed_timezone())
+        headers = {
+            'x-fsign': self.config.get('feed_sign', FEED_SIGN),
+            'User-Agent': self.config.get('user_agent', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'),
+            'Referer': 'https://www.flashscore.com/'
+        }
+        timeout = aiohttp.ClientTimeout(total=self.config.get('feed_timeout', 10))
+        
+        parser = FlashScoreFeedParser()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        events = []
+        
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(FEED_CHUNK_SIZE):
+                    events.extend(parser.feed(decoder.decode(chunk)))
+        
+        events.extend(parser.feed(decoder.decode(b'', final=True)))
+        events.extend(parser.close())
+        return events
+    
+    async def _fetch_feed_days(self) -> List[Dict[str, str]]:
+        """Feed events of all configured days, fetched concurrently"""
+        days = self.config.get('feed_days', [0])
+        results = await asyncio.gather(*(self.fetch_feed(day) for day in days))
+        return [event for events in results for event in events]
+    
+    def _feed_events(self) -> Optional[List[Dict[str, str]]]:
+        """
+        Feed events for this scrape
+        
+        Returns:
+            Event records, or None if the feed could not be fetched or parsed
+            (the caller falls back to Selenium)
+        """
+        if not self.use_feed:
+            return None
+        
+        start = time.perf_counter()
+        try:
+            events = _run_async(self._fetch_feed_days())
+        except Exception as e:
+            logger.warning(f"⚠️ FlashScore feed failed: {e} - falling back to page rendering")
+            return None
+        
+        if not events:
+            logger.warning("⚠️ FlashScore feed returned no events - falling back to page rendering")
+            return None
+        
+        logger.info(f"⚡ FlashScore feed: {len(events)} events in {time.perf_counter() - start:.2f}s")
+        return events
+    
+    def _feed_match(self, event: Dict[str, str], tier: str) -> Dict:
+        """
+        Match dictionary of a feed event (same keys as the HTML parser)
+        
+        Args:
+            event: Feed record
+            tier: Tier label
+        """
+        # ZA is "CATEGORY: Name"; the page header renders as "Name - CATEGORY:"
+        category, _, name = event['tournament'].partition(': ')
+        tournament = f"{name} - {category}:" if name else category
+        
+        stage = event.get('AC', '')
+        status = FEED_STAGE_STATUS.get(stage) or FEED_STATUS.get(event.get('AB', ''), 'Upcoming')
+        
+        sets = [f"{event[home]}-{event[away]}" for home, away in FEED_SET_KEYS
+                if event.get(home) and event.get(away)]
+        
+        scheduled = None
+        if event.get('AD', '').isdigit():
+            scheduled = datetime.fromtimestamp(int(event['AD']))
+        
+        player_a = event.get('AE', '')
+        player_b = event.get('AF', '')
+        
+        return {
+            'match_id': f"{tier}_{player_a}_{player_b}_{event['AA']}",
+            'flashscore_id': event['AA'],
+            'tournament': tournament,
+            'tier': tier,
+            'surface': self._surface_from_text(tournament),
+            'player_a': player_a,
+            'player_b': player_b,
+            'live_score': ', '.join(sets),
+            'set1_score': sets[0] if sets else None,
+            'match_status': status,
+            'match_time': scheduled.strftime('%H:%M') if scheduled else '',
+            'scheduled_time': scheduled.isoformat() if scheduled else None,
+            'round': event.get('ER') or None,
+            'match_url': f"https://www.flashscore.com/match/{event['AA']}/#/match-summary",
+            'scraped_at': datetime.now().isoformat(),
+            'source': 'FlashScore'
+        }
+    
+    def _feed_matches(self, events: List[Dict[str, str]], tier: str) -> List[Dict]:
+        """Validated matches of a tier from feed events"""
+        matches = []
+        for event in events:
+            if not self._is_tier_tournament(event['tournament'], tier):
+                continue
+            match = self._feed_match(event, tier)
+            if self._validate_match(match):
+                matches.append(match)
+        return matches
+    
     async def fetch_odds_for_matches(self, matches: List[Dict]) -> List[Dict]:
         """
         Fetch odds for scraped matches using Odds API
@@ -691,7 +996,14 @@ class FlashScoreITFScraperEnhanced:
                 
                 logger.info(f"📊 Fetched {len(odds_matches)} matches from Odds API")
                 
-                # Match scraped matches with odds matches by player names
+                # Join scraped matches to odds events by player names
+                # (known aliases via the shared player resolver)
+                try:
+                    resolver = get_resolver()
+                except Exception as e:
+                    logger.warning(f"⚠️ Player resolver not available: {e}")
+                    resolver = None
+                index = OddsJoinIndex(odds_matches, resolver=resolver)
                 for match in matches:
                     player_a = match.get('player_a', '').strip()
                     player_b = match.get('player_b', '').strip()
@@ -699,56 +1011,14 @@ class FlashScoreITFScraperEnhanced:
                     if not player_a or not player_b:
                         continue
                     
-                    # Try to find matching odds match
-                    best_match = None
-                    best_score = 0.0
-                    
-                    for odds_match in odds_matches:
-                        home_team = odds_match.home_team.strip()
-                        away_team = odds_match.away_team.strip()
-                        
-                        # Calculate name similarity score
-                        score = 0.0
-                        
-                        # Exact match
-                        if (player_a.lower() == home_team.lower() and 
-                            player_b.lower() == away_team.lower()):
-                            score = 1.0
-                        elif (player_a.lower() == away_team.lower() and 
-                              player_b.lower() == home_team.lower()):
-                            score = 1.0
-                        # Partial match (last name)
-                        elif (player_a.split()[-1].lower() == home_team.split()[-1].lower() and
-                              player_b.split()[-1].lower() == away_team.split()[-1].lower()):
-                            score = 0.8
-                        elif (player_a.split()[-1].lower() == away_team.split()[-1].lower() and
-                              player_b.split()[-1].lower() == home_team.split()[-1].lower()):
-                            score = 0.8
-                        
-                        if score > best_score:
-                            best_score = score
-                            best_match = odds_match
-                    
-                    # If we found a good match, add odds
-                    if best_match and best_score >= 0.8:
-                        player_a_odds, player_b_odds = best_match.get_best_odds()
-                        
-                        # Determine which player corresponds to which odds
-                        home_team = best_match.home_team.strip()
-                        away_team = best_match.away_team.strip()
+                    result = index.resolve(player_a, player_b)
+                    if result and result.confidence >= MIN_JOIN_CONFIDENCE:
+                        match['player_a_odds'], match['player_b_odds'] = result.odds()
+                        match['odds_confidence'] = result.confidence
                         
-                        if player_a.lower() == home_team.lower():
-                            match['player_a_odds'] = player_a_odds
-                            match['player_b_odds'] = player_b_odds
-                        elif player_a.lower() == away_team.lower():
-                            match['player_a_odds'] = player_b_odds
-                            match['player_b_odds'] = player_a_odds
-                        else:
-                            # Default: assume player_a is home
-                            match['player_a_odds'] = player_a_odds
-                            match['player_b_odds'] = player_b_odds
-                        
-                        logger.debug(f"✅ Matched odds for {player_a} vs {player_b}: {match.get('player_a_odds')} / {match.get('player_b_odds')}")
+                        logger.debug(f"✅ Matched odds for {player_a} vs {player_b} "
+                                     f"(confidence {result.confidence:.1f}{', swapped' if result.swapped else ''}): "
+                                     f"{match.get('player_a_odds')} / {match.get('player_b_odds')}")
                 
                 matched_count = sum(1 for m in matches if m.get('player_a_odds'))
                 logger.info(f"✅ Matched odds for {matched_count}/{len(matches)} matches")
@@ -778,6 +1048,28 @@ class FlashScoreITFScraperEnhanced:
         
         all_matches = []
         
+        # One feed download covers every tier
+        events = self._feed_events()
+        feed_matches = {}
+        if events is not None:
+            feed_matches = {tier: self._feed_matches(events, tier) for tier in tiers if tier in self.BASE_URLS}
+            if not any(feed_matches.values()):
+                # Events parsed but none passed the tier filter: the feed format
+                # may have drifted, so let the rendered pages decide
+                logger.warning(f"⚠️ FlashScore feed: {len(events)} events but no {'/'.join(tiers)} matches "
+                               f"- falling back to page rendering")
+                events = None
+                feed_matches = {}
+        
+        # Without the feed, render each distinct page once, in parallel
+        # on the shared browser pool
+        pages = {}
+        if events is None and self.use_selenium:
+            urls = list(dict.fromkeys(self.BASE_URLS[t] for t in tiers if t in self.BASE_URLS))
+            if urls:
+                with ThreadPoolExecutor(max_workers=min(self.pool.size, len(urls))) as executor:
+                    pages = dict(zip(urls, executor.map(lambda u: self._render_page(u, '_'.join(tiers)), urls)))
+        
         for tier in tiers:
             url = self.BASE_URLS.get(tier)
             if not url:
@@ -786,43 +1078,40 @@ class FlashScoreITFScraperEnhanced:
             
             logger.info(f"📊 Scraping {tier}...")
             
-            if self.use_selenium:
-                matches = self.scrape_with_selenium(url, tier)
+            if events is not None:
+                matches = feed_matches[tier]
+            elif pages.get(url) is not None:
+                matches = self._matches_from_html(pages[url], tier)
             else:
-                # Fallback to requests (less reliable)
-                matches = self.scrape_with_requests(url, tier)
+                matches = []
             
             logger.info(f"✅ {tier}: {len(matches)} matches found")
             all_matches.extend(matches)
-            
-            # Rate limiting - only wait if needed (configurable)
-            request_delay = self.config.get('request_delay', 2)
-            if request_delay > 0:
-                time.sleep(request_delay)
         
         # Fetch odds if requested (async)
         if fetch_odds and all_matches:
             try:
                 # Run async odds fetching
-                all_matches = asyncio.run(self.fetch_odds_for_matches(all_matches))
+                all_matches = _run_async(self.fetch_odds_for_matches(all_matches))
             except Exception as e:
                 logger.error(f"❌ Error fetching odds: {e}")
         
         return all_matches
     
     def scrape_with_requests(self, url: str, tier: str) -> List[Dict]:
-        """Fallback scraping with requests (less reliable for dynamic content)"""
-        logger.warning("⚠️ Using requests fallback (may not work for dynamic content)")
-        # This would need aiohttp implementation
-        return []
-    
-    def __del__(self):
-        """Cleanup Selenium driver"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+        """
+        Scrape one tier from the FlashScore data feed (no browser)
+        
+        Args:
+            url: Page URL (unused; the feed covers all tennis)
+            tier: Tier to keep
+            
+        Returns:
+            List of match dictionaries (empty if the feed is unavailable)
+        """
+        events = self._feed_events()
+        return self._feed_matches(events, tier) if events else []
+    
 
 
 # USAGE EXAMPLE:
@@ -835,7 +1124,6 @@ if __name__ == "__main__":
     
     config = {
         'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-        'request_delay': 2,
         'save_debug_html': True  # Save HTML for debugging
     }
     
@@ -860,5 +1148,5 @@ if __name__ == "__main__":
             print("💡 Inspect FlashScore page structure in Chrome DevTools")
     
     finally:
-        del scraper
+        scraper.pool.close()
 
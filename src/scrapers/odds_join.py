@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+🔗 ODDS JOIN
+============
+
+Joins scraped matches to Odds API events by player names.
+
+Names are normalised once (accents, case, punctuation) and parsed into
+initial + surname, so FlashScore's "Lopez Garcia A." meets the Odds API's
+"Ana Lopez Garcia". Odds events are indexed by blocking keys:
+
+- full name pair          (exact, confidence 1.0)
+- initial + surname pair  (confidence 0.9)
+- surname pair            (confidence 0.8)
+
+With a PlayerResolver, names are also keyed by canonical player ID, so
+known aliases match exactly whatever their spelling.
+
+Pairs are unordered, so a match is found whichever player the Odds API
+lists as home; the result says whether the sides are swapped. Resolving a
+match is a few dictionary lookups instead of a scan over all events.
+
+Usage:
+    index = OddsJoinIndex(odds_matches)
+    result = index.resolve('Smith J.', 'Lopez Garcia A.')
+    if result and result.confidence >= MIN_JOIN_CONFIDENCE:
+        home_odds, away_odds = result.event.get_best_odds()
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.ml.player_resolver import (
+    PlayerName, parse_name, name_similarity, CONFIDENCE_EXACT, CONFIDENCE_SURNAME
+)
+
+logger = logging.getLogger(__name__)
+
+# Default threshold for using a join result (same as the old name matching)
+MIN_JOIN_CONFIDENCE = CONFIDENCE_SURNAME
+
+
+@dataclass
+class OddsJoinResult:
+    """Odds event matched to a scraped match"""
+    event: Any
+    confidence: float
+    swapped: bool  # True when player_a is the event's away side
+
+    def odds(self) -> Tuple[float, float]:
+        """Best odds as (player_a, player_b)"""
+        home_odds, away_odds = self.event.get_best_odds()
+        return (away_odds, home_odds) if self.swapped else (home_odds, away_odds)
+
+
+class OddsJoinIndex:
+    """Blocking-key index over Odds API events"""
+
+    def __init__(self, events: List[Any], resolver: Optional[Any] = None):
+        """
+        Index events (anything with home_team / away_team)
+
+        Args:
+            events: Odds API events (TennisMatch)
+            resolver: PlayerResolver; names resolving to the same canonical
+                player match exactly, whatever their spelling
+        """
+        self.events = list(events)
+        self.resolver = resolver
+        self._index: Dict[FrozenSet[str], List[int]] = {}
+        self._players: List[Tuple[Tuple[PlayerName, Optional[str]], Tuple[PlayerName, Optional[str]]]] = []
+
+        for i, event in enumerate(self.events):
+            home = self._player(event.home_team or '')
+            away = self._player(event.away_team or '')
+            self._players.append((home, away))
+            for key in self._pair_keys(home, away):
+                self._index.setdefault(key, []).append(i)
+
+        logger.debug(f"🔗 Indexed {len(self.events)} odds events under {len(self._index)} keys")
+
+    def _player(self, name: str) -> Tuple[PlayerName, Optional[str]]:
+        """Parsed name and canonical player ID (if a resolver is set)"""
+        match = self.resolver.resolve(name) if self.resolver and name else None
+        return parse_name(name), match.player_id if match else None
+
+    @staticmethod
+    def _pair_keys(a: Tuple[PlayerName, Optional[str]], b: Tuple[PlayerName, Optional[str]]) -> set:
+        """Unordered blocking keys of a player pair (prefixed per level)"""
+        (a_name, a_id), (b_name, b_id) = a, b
+        if not a_name.full or not b_name.full:
+            return set()
+        keys = {frozenset({'=' + a_name.full, '=' + b_name.full})}
+        if a_id and b_id:
+            keys.add(frozenset({'#' + a_id, '#' + b_id}))
+        keys.update(frozenset({'i' + x, 'i' + y}) for x in a_name.initial_keys for y in b_name.initial_keys)
+        keys.update(frozenset({'s' + x, 's' + y}) for x in a_name.surnames for y in b_name.surnames)
+        return keys
+
+    @staticmethod
+    def _side_score(scraped: Tuple[PlayerName, Optional[str]], listed: Tuple[PlayerName, Optional[str]]) -> float:
+        """Confidence that two names are the same player"""
+        if scraped[1] and scraped[1] == listed[1]:
+            return CONFIDENCE_EXACT
+        return name_similarity(scraped[0], listed[0])
+
+    def resolve(self, player_a: str, player_b: str) -> Optional[OddsJoinResult]:
+        """
+        Find the odds event of a scraped match
+
+        Args:
+            player_a: First player as scraped
+            player_b: Second player as scraped
+
+        Returns:
+            OddsJoinResult, or None if no event matches (or two events
+            match equally well)
+        """
+        a, b = self._player(player_a), self._player(player_b)
+
+        candidates = set()
+        for key in self._pair_keys(a, b):
+            candidates.update(self._index.get(key, ()))
+        if not candidates:
+            return None
+
+        best: Optional[OddsJoinResult] = None
+        tied = False
+        for i in sorted(candidates):
+            home, away = self._players[i]
+            straight = min(self._side_score(a, home), self._side_score(b, away))
+            swapped = min(self._side_score(a, away), self._side_score(b, home))
+            confidence = max(straight, swapped)
+            if confidence == 0.0:
+                continue
+            if best is None or confidence > best.confidence:
+                best = OddsJoinResult(self.events[i], confidence, swapped > straight)
+                tied = False
+            elif confidence == best.confidence:
+                tied = True
+
+        if tied:
+            logger.debug(f"⚠️ Ambiguous odds match for {player_a} vs {player_b}")
+            return None
+        return best
@@ -50,12 +50,14 @@ class SportbexClient:
     
     BASE_URL = "https://trial-api.sportbex.com/api"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, database=None):
         """
         Initialize Sportbex API client
         
         Args:
             api_key: Sportbex API key (defaults to env var SPORTBEX_API_KEY)
+            database: Optional AsyncOddsDatabase; odds of fetched matches are
+                stored through its awaitable API, off the event loop
         """
         # Try to get API key from environment or use default trial key
         self.api_key = api_key or os.getenv('SPORTBEX_API_KEY') or 'Fbmm5Xt57NzVjdKdGwPIQY7EXKOmYAt2MfFWXVCb'
@@ -64,6 +66,7 @@ class SportbexClient:
         self.min_request_delay = 0.2  # 200ms between requests (500 requests/day = ~1 req/3 min)
         self.request_count = 0
         self.max_requests_per_day = 500
+        self.database = database
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -218,8 +221,39 @@ class SportbexClient:
                 matches.extend(comp_matches)
         
         logger.info(f"✅ Found {len(matches)} total matches")
+        
+        if self.database:
+            await self._store_odds(matches)
         return matches
     
+    async def _store_odds(self, matches: List[SportbexMatch]):
+        """Store odds snapshots of matches with both prices via the async database"""
+        from monitors.odds_tracker import OddsSnapshot
+        
+        now = datetime.now()
+        snapshots = [
+            OddsSnapshot(
+                match_id=match.match_id,
+                home_team=match.player1,
+                away_team=match.player2,
+                home_odds=match.player1_odds,
+                away_odds=match.player2_odds,
+                timestamp=now,
+                league=match.tournament,
+                commence_time=match.commence_time,
+                bookmaker='sportbex'
+            )
+            for match in matches
+            if match.player1_odds and match.player2_odds and match.commence_time
+        ]
+        if not snapshots:
+            return
+        
+        try:
+            await self.database.store_many(snapshots)
+        except Exception as e:
+            logger.error(f"Error storing Sportbex odds: {e}")
+    
     async def _parse_events(self, events_data: Any, competition_name: str, competition_id: str) -> List[SportbexMatch]:
         """
         Parse events (matches) from Sportbex API response and fetch odds
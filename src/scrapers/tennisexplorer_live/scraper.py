@@ -36,6 +36,8 @@ if env_path.exists():
 
 from bs4 import BeautifulSoup
 
+from src.scrapers.browser_pool import get_pool
+
 # Import local modules (handle both module and script execution)
 try:
     from .parser import TennisExplorerParser
@@ -50,8 +52,6 @@ logger = logging.getLogger(__name__)
 
 # Try to import Selenium
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
@@ -108,7 +108,7 @@ class TennisExplorerLiveScraper:
         
         # Initialize components
         self.parser = TennisExplorerParser()
-        self.driver = None
+        self.pool = None
         self.session = None
         self.last_request_time = 0
         
@@ -117,9 +117,10 @@ class TennisExplorerLiveScraper:
         self.notion_db_id = None
         self._init_notion()
         
-        # Initialize browser/session
+        # Browsers come from the shared pool (started on first fetch)
         if self.use_selenium:
-            self._init_selenium()
+            self.user_agent = scraper_config.get('user_agent')
+            self.pool = get_pool(user_agent=self.user_agent)
         elif REQUESTS_AVAILABLE:
             self._init_requests()
         
@@ -136,39 +137,6 @@ class TennisExplorerLiveScraper:
                 logger.warning(f"⚠️ Could not load config file: {e}")
         return {}
     
-    def _init_selenium(self):
-        """Initialize Selenium WebDriver with anti-detection"""
-        if not SELENIUM_AVAILABLE:
-            logger.warning("⚠️ Selenium not available")
-            return
-        
-        try:
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            # User agent
-            user_agent = self.config.get('scraper', {}).get('user_agent')
-            if not user_agent:
-                user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            options.add_argument(f'user-agent={user_agent}')
-            
-            # Anti-detection
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            self.driver = webdriver.Chrome(options=options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            logger.info("✅ Selenium WebDriver initialized")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize Selenium: {e}")
-            self.driver = None
-            self.use_selenium = False
-    
     def _init_requests(self):
         """Initialize requests session"""
         if not REQUESTS_AVAILABLE:
@@ -240,18 +208,19 @@ class TennisExplorerLiveScraper:
         
         for attempt in range(self.max_retries):
             try:
-                if self.use_selenium and self.driver:
+                if self.use_selenium and self.pool:
                     logger.debug(f"🌐 Fetching with Selenium: {url}")
-                    self.driver.get(url)
-                    
-                    # Wait for page to load
-                    wait = WebDriverWait(self.driver, self.timeout)
-                    wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    
-                    # Additional wait for dynamic content
-                    time.sleep(3)
-                    
-                    html = self.driver.page_source
+                    with self.pool.lease(user_agent=self.user_agent) as driver:
+                        driver.get(url)
+                        
+                        # Wait for page to load
+                        wait = WebDriverWait(driver, self.timeout)
+                        wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                        
+                        # Additional wait for dynamic content
+                        time.sleep(3)
+                        
+                        html = driver.page_source
                     logger.debug(f"✅ Page loaded, HTML length: {len(html)}")
                     return html
                     
@@ -466,13 +435,6 @@ class TennisExplorerLiveScraper:
                 "errors": errors
             }
     
-    def __del__(self):
-        """Cleanup resources"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
 
 
 # Main execution
@@ -5,12 +5,13 @@ Provides insights, trends, and optimization recommendations
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, Union
 import statistics
 import json
+import csv
+import gzip
 
 from storage.odds_database import OddsDatabase, PerformanceRecord
-from monitors.value_detector import ValueOpportunity
 from config.live_config import LiveMonitoringConfig
 
 logger = logging.getLogger(__name__)
@@ -29,17 +30,17 @@ class LiveAnalytics:
             # Get basic performance summary
             summary = self.db.get_performance_summary(days)
             
-            # Get recent opportunities for analysis
-            opportunities = self.db.get_recent_opportunities(hours=days * 24)
+            # Get opportunity aggregates for analysis
+            opportunities = self.db.get_opportunity_aggregates(hours=days * 24)
             
             # Calculate advanced metrics
             advanced_metrics = self._calculate_advanced_metrics(opportunities, days)
             
             # Get trend analysis
-            trends = self._analyze_trends(days)
+            trends = self._analyze_trends(days, summary)
             
             # Get league performance breakdown
-            league_analysis = self._analyze_league_performance(days)
+            league_analysis = self._analyze_league_performance(days, summary)
             
             # Get timing analysis
             timing_analysis = self._analyze_timing_patterns(opportunities)
@@ -64,95 +65,93 @@ class LiveAnalytics:
             logger.error(f"Failed to generate performance report: {e}")
             return {}
     
-    def _calculate_advanced_metrics(self, opportunities: List[ValueOpportunity], days: int) -> Dict:
-        """Calculate advanced performance metrics"""
+    def _calculate_advanced_metrics(self, opportunities: List[Dict], days: int) -> Dict:
+        """Calculate advanced performance metrics from opportunity aggregates"""
         
-        if not opportunities:
+        total = sum(row['opportunities'] for row in opportunities)
+        if not total:
             return {}
         
-        # Opportunity quality metrics
-        edge_estimates = [opp.edge_estimate for opp in opportunities]
-        priority_scores = [opp.priority_score for opp in opportunities]
-        time_sensitivities = [opp.time_sensitivity for opp in opportunities]
-        
         # Urgency distribution
         urgency_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-        for opp in opportunities:
-            urgency_counts[opp.urgency_level] += 1
+        for row in opportunities:
+            urgency_counts[row['urgency_level']] += row['opportunities']
         
         # Movement analysis
-        entering_count = sum(1 for opp in opportunities if opp.movement_direction == 'entering')
-        stable_count = sum(1 for opp in opportunities if opp.movement_direction == 'stable')
+        entering_count = sum(row['opportunities'] for row in opportunities
+                             if row['movement_direction'] == 'entering')
+        stable_count = sum(row['opportunities'] for row in opportunities
+                           if row['movement_direction'] == 'stable')
         
         # League tier distribution
         tier_counts = {1: 0, 2: 0, 3: 0}
-        for opp in opportunities:
-            tier = self.config.get_league_tier(opp.league)
-            tier_counts[tier] += 1
+        for row in opportunities:
+            tier = self.config.get_league_tier(row['league'])
+            tier_counts[tier] += row['opportunities']
         
         return {
-            'total_opportunities': len(opportunities),
-            'opportunities_per_day': round(len(opportunities) / days, 2),
-            'avg_edge_estimate': round(statistics.mean(edge_estimates), 2),
-            'median_edge_estimate': round(statistics.median(edge_estimates), 2),
-            'avg_priority_score': round(statistics.mean(priority_scores), 2),
-            'avg_time_sensitivity': round(statistics.mean(time_sensitivities), 2),
+            'total_opportunities': total,
+            'opportunities_per_day': round(total / days, 2),
+            'avg_edge_estimate': round(sum(row['sum_edge'] for row in opportunities) / total, 2),
+            'avg_priority_score': round(sum(row['sum_priority'] for row in opportunities) / total, 2),
+            'avg_time_sensitivity': round(sum(row['sum_time_sensitivity'] for row in opportunities) / total, 2),
             'urgency_distribution': urgency_counts,
             'urgency_percentage': {
-                level: round((count / len(opportunities)) * 100, 1)
+                level: round((count / total) * 100, 1)
                 for level, count in urgency_counts.items()
             },
             'movement_analysis': {
                 'entering_range': entering_count,
                 'stable_in_range': stable_count,
-                'entering_percentage': round((entering_count / len(opportunities)) * 100, 1)
+                'entering_percentage': round((entering_count / total) * 100, 1)
             },
             'league_tier_distribution': tier_counts,
             'quality_score': self._calculate_quality_score(opportunities)
         }
     
-    def _calculate_quality_score(self, opportunities: List[ValueOpportunity]) -> float:
-        """Calculate overall quality score (0-100)"""
+    def _calculate_quality_score(self, opportunities: List[Dict]) -> float:
+        """Calculate overall quality score (0-100) from opportunity aggregates"""
         
-        if not opportunities:
+        total = sum(row['opportunities'] for row in opportunities)
+        if not total:
             return 0.0
         
         score = 0.0
         
         # Edge quality (0-40 points)
-        avg_edge = statistics.mean([opp.edge_estimate for opp in opportunities])
+        avg_edge = sum(row['sum_edge'] for row in opportunities) / total
         edge_score = min(avg_edge * 8, 40)  # Max 40 points for 5%+ edge
         score += edge_score
         
         # Urgency quality (0-30 points)
-        high_urgency_pct = sum(1 for opp in opportunities 
-                              if opp.urgency_level in ['HIGH', 'CRITICAL']) / len(opportunities)
+        high_urgency_pct = sum(row['opportunities'] for row in opportunities
+                               if row['urgency_level'] in ['HIGH', 'CRITICAL']) / total
         urgency_score = high_urgency_pct * 30
         score += urgency_score
         
         # League quality (0-20 points)
-        tier1_pct = sum(1 for opp in opportunities 
-                       if self.config.get_league_tier(opp.league) == 1) / len(opportunities)
+        tier1_pct = sum(row['opportunities'] for row in opportunities
+                        if self.config.get_league_tier(row['league']) == 1) / total
         league_score = tier1_pct * 20
         score += league_score
         
         # Movement quality (0-10 points)
-        entering_pct = sum(1 for opp in opportunities 
-                          if opp.movement_direction == 'entering') / len(opportunities)
+        entering_pct = sum(row['opportunities'] for row in opportunities
+                           if row['movement_direction'] == 'entering') / total
         movement_score = entering_pct * 10
         score += movement_score
         
         return round(score, 1)
     
-    def _analyze_trends(self, days: int) -> Dict:
+    def _analyze_trends(self, days: int, current_summary: Dict = None) -> Dict:
         """Analyze trends over time"""
         
         try:
             trends = {}
             
-            # Compare with previous period
-            current_summary = self.db.get_performance_summary(days)
-            previous_summary = self.db.get_performance_summary(days * 2)
+            # Compare with the preceding period of the same length
+            current_summary = current_summary or self.db.get_performance_summary(days)
+            previous_summary = self.db.get_performance_summary(days, offset_days=days)
             
             if current_summary and previous_summary:
                 # Calculate period-over-period changes
@@ -160,9 +159,8 @@ class LiveAnalytics:
                 current_bets = current_summary.get('total_bets', 0)
                 current_win_rate = current_summary.get('win_rate', 0)
                 
-                # Estimate previous period values (rough approximation)
                 prev_roi = previous_summary.get('roi', 0)
-                prev_bets = previous_summary.get('total_bets', 0) - current_bets
+                prev_bets = previous_summary.get('total_bets', 0)
                 prev_win_rate = previous_summary.get('win_rate', 0)
                 
                 trends = {
@@ -192,11 +190,11 @@ class LiveAnalytics:
             logger.error(f"Failed to analyze trends: {e}")
             return {}
     
-    def _analyze_league_performance(self, days: int) -> Dict:
+    def _analyze_league_performance(self, days: int, summary: Dict = None) -> Dict:
         """Analyze performance by league"""
         
         try:
-            summary = self.db.get_performance_summary(days)
+            summary = summary or self.db.get_performance_summary(days)
             league_breakdown = summary.get('league_breakdown', {})
             
             # Rank leagues by performance
@@ -249,41 +247,35 @@ class LiveAnalytics:
         
         return tier_performance
     
-    def _analyze_timing_patterns(self, opportunities: List[ValueOpportunity]) -> Dict:
-        """Analyze timing patterns in opportunities"""
+    def _analyze_timing_patterns(self, opportunities: List[Dict]) -> Dict:
+        """Analyze timing patterns from hourly opportunity aggregates"""
         
-        if not opportunities:
+        total = sum(row['opportunities'] for row in opportunities)
+        if not total:
             return {}
         
-        # Hour of day analysis
+        # Hour of day and day of week analysis
         hour_counts = {}
-        for opp in opportunities:
-            hour = opp.detected_time.hour
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-        
-        # Day of week analysis
         day_counts = {}
-        for opp in opportunities:
-            day = opp.detected_time.strftime('%A')
-            day_counts[day] = day_counts.get(day, 0) + 1
+        for row in opportunities:
+            hour_start = datetime.strptime(row['hour'], '%Y-%m-%dT%H')
+            hour_counts[hour_start.hour] = hour_counts.get(hour_start.hour, 0) + row['opportunities']
+            day = hour_start.strftime('%A')
+            day_counts[day] = day_counts.get(day, 0) + row['opportunities']
         
         # Find peak hours and days
         peak_hour = max(hour_counts.items(), key=lambda x: x[1]) if hour_counts else (0, 0)
         peak_day = max(day_counts.items(), key=lambda x: x[1]) if day_counts else ('Unknown', 0)
         
         # Time to match analysis
-        time_to_match_hours = []
-        for opp in opportunities:
-            hours_to_match = (opp.commence_time - opp.detected_time).total_seconds() / 3600
-            time_to_match_hours.append(hours_to_match)
+        hours_to_match = sum(row['sum_hours_to_match'] or 0 for row in opportunities)
         
         return {
             'hourly_distribution': hour_counts,
             'daily_distribution': day_counts,
             'peak_hour': {'hour': peak_hour[0], 'count': peak_hour[1]},
             'peak_day': {'day': peak_day[0], 'count': peak_day[1]},
-            'avg_time_to_match_hours': round(statistics.mean(time_to_match_hours), 2) if time_to_match_hours else 0,
-            'median_time_to_match_hours': round(statistics.median(time_to_match_hours), 2) if time_to_match_hours else 0
+            'avg_time_to_match_hours': round(hours_to_match / total, 2)
         }
     
     def _generate_recommendations(self, summary: Dict, advanced_metrics: Dict, trends: Dict) -> List[str]:
@@ -341,23 +333,22 @@ class LiveAnalytics:
         """Get real-time performance metrics"""
         
         try:
-            # Get today's data
-            today_summary = self.db.get_performance_summary(1)
-            today_opportunities = self.db.get_recent_opportunities(24)
+            # Get the last 24 hours and the last hour from the aggregates
+            today_opportunities = self.db.get_opportunity_aggregates(24)
+            recent_opportunities = self.db.get_opportunity_aggregates(1)
             
             # Calculate real-time metrics
             current_hour = datetime.now().hour
-            recent_opportunities = [
-                opp for opp in today_opportunities 
-                if (datetime.now() - opp.detected_time).total_seconds() < 3600
-            ]
+            today_count = sum(row['opportunities'] for row in today_opportunities)
+            recent_count = sum(row['opportunities'] for row in recent_opportunities)
+            today_edge = sum(row['sum_edge'] for row in today_opportunities)
             
             return {
-                'today_opportunities': len(today_opportunities),
-                'last_hour_opportunities': len(recent_opportunities),
-                'today_avg_edge': round(statistics.mean([opp.edge_estimate for opp in today_opportunities]), 2) if today_opportunities else 0,
+                'today_opportunities': today_count,
+                'last_hour_opportunities': recent_count,
+                'today_avg_edge': round(today_edge / today_count, 2) if today_count else 0,
                 'current_hour': current_hour,
-                'system_active': len(recent_opportunities) > 0 or current_hour in [h for start, end in self.config.PEAK_HOURS for h in range(start, end + 1)],
+                'system_active': recent_count > 0 or current_hour in [h for start, end in self.config.PEAK_HOURS for h in range(start, end + 1)],
                 'last_update': datetime.now().isoformat()
             }
             
@@ -401,3 +392,88 @@ class LiveAnalytics:
         except Exception as e:
             logger.error(f"Failed to export data: {e}")
             return None
+    
+    def export_data_stream(self, destination: Union[str, TextIO], days: int = 30,
+                           format: str = 'jsonl', tables: List[str] = None,
+                           compress: bool = None, batch_size: int = 1000,
+                           progress_callback: Callable[[str, int], None] = None,
+                           include_report: bool = False) -> Optional[int]:
+        """Stream analytics data to a file or text stream with bounded memory
+        
+        Rows are paged out of SQLite with keyset pagination and written as
+        they arrive. JSONL output starts with a header line holding the
+        performance summary (read from the ``performance_daily`` aggregates)
+        and, with ``include_report=True``, the full performance report,
+        followed by one line per row tagged with its table. CSV output holds
+        a single table. Paths ending in ``.gz`` (or ``compress=True``) are
+        gzip-compressed; text streams are written uncompressed, so
+        ``compress=True`` with a stream is rejected.
+        
+        ``progress_callback(table, rows_written)`` is called after each page.
+        Returns the number of rows written, or None on failure.
+        """
+        
+        format = format.lower()
+        tables = tables or ['value_opportunities']
+        if format not in ('jsonl', 'csv'):
+            logger.error(f"Unsupported streaming export format: {format}")
+            return None
+        if format == 'csv' and len(tables) != 1:
+            logger.error("CSV export supports exactly one table")
+            return None
+        
+        if compress and not isinstance(destination, str):
+            logger.error("Cannot gzip-compress into a text stream - pass a path or open the stream with gzip")
+            return None
+        
+        stream = destination
+        if isinstance(destination, str):
+            if compress is None:
+                compress = destination.endswith('.gz')
+            if compress:
+                stream = gzip.open(destination, 'wt', encoding='utf-8', newline='')
+            else:
+                stream = open(destination, 'w', encoding='utf-8', newline='')
+        
+        try:
+            since = datetime.now() - timedelta(days=days)
+            rows_written = 0
+            
+            if format == 'jsonl':
+                header = {
+                    'record_type': 'header',
+                    'export_timestamp': datetime.now().isoformat(),
+                    'period_days': days,
+                    'tables': tables,
+                    'performance_summary': self.db.get_performance_summary(days)
+                }
+                if include_report:
+                    header['performance_report'] = self.generate_performance_report(days)
+                stream.write(json.dumps(header) + '\n')
+            
+            for table in tables:
+                writer = None
+                for page in self.db.iter_rows(table, since=since, batch_size=batch_size):
+                    if format == 'jsonl':
+                        stream.writelines(
+                            json.dumps({'record_type': table, **row}) + '\n' for row in page
+                        )
+                    else:
+                        if writer is None:
+                            writer = csv.DictWriter(stream, fieldnames=list(page[0].keys()))
+                            writer.writeheader()
+                        writer.writerows(page)
+                    
+                    rows_written += len(page)
+                    if progress_callback:
+                        progress_callback(table, rows_written)
+            
+            logger.info(f"Exported {rows_written} rows ({format}{', gzip' if compress else ''})")
+            return rows_written
+            
+        except Exception as e:
+            logger.error(f"Failed to stream export data: {e}")
+            return None
+        finally:
+            if stream is not destination:
+                stream.close()
@@ -0,0 +1,136 @@
+"""
+Async facade over OddsDatabase for the asyncio monitors
+Runs every blocking sqlite3 call off the event loop so database latency
+never stalls concurrent HTTP fetches
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
+
+from storage.odds_database import OddsDatabase, PerformanceRecord
+from monitors.odds_tracker import OddsSnapshot, OddsMovement
+from monitors.value_detector import ValueOpportunity
+
+logger = logging.getLogger(__name__)
+
+class AsyncOddsDatabase:
+    """Awaitable API for OddsDatabase
+
+    Writes run on a single dedicated thread that owns its own connection and
+    commits each call in one transaction, so an awaited write is durable.
+    Reads run on a small reader pool whose threads each own a connection
+    too; no sqlite3 call touches the event loop or a shared connection.
+
+    Usage:
+        async with AsyncOddsDatabase() as db:
+            await db.store_many(snapshots)
+            opportunities = await db.recent_opportunities(hours=24)
+    """
+
+    def __init__(self, database: OddsDatabase = None, reader_threads: int = 3):
+        self.db = database or OddsDatabase()
+        self._owns_database = database is None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='OddsDatabaseAsyncWriter',
+                                          initializer=self.db.bind_thread_connection)
+        self._readers = ThreadPoolExecutor(max_workers=reader_threads, thread_name_prefix='OddsDatabaseReader',
+                                           initializer=self.db.bind_thread_connection)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
+
+    async def _write(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, partial(func, *args, **kwargs))
+
+    async def _read(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, partial(func, *args, **kwargs))
+
+    # Writes: return once committed
+
+    async def store_many(self, snapshots: List[OddsSnapshot] = (), movements: List[OddsMovement] = (),
+                         opportunities: List[ValueOpportunity] = ()):
+        """Store snapshots, movements and opportunities in one transaction"""
+        await self._write(self.db.store_direct, snapshots, movements, opportunities)
+
+    async def store_snapshot(self, snapshot: OddsSnapshot):
+        """Store a single odds snapshot"""
+        await self._write(self.db.store_direct, [snapshot])
+
+    async def store_movement(self, movement: OddsMovement):
+        """Store an odds movement"""
+        await self._write(self.db.store_direct, movements=[movement])
+
+    async def store_opportunity(self, opportunity: ValueOpportunity):
+        """Store a value opportunity"""
+        await self._write(self.db.store_direct, opportunities=[opportunity])
+
+    async def store_performance_record(self, record: PerformanceRecord):
+        """Store a performance record and its aggregates"""
+        await self._write(self.db.store_performance_record, record)
+
+    async def flush(self, timeout: float = None) -> bool:
+        """Wait until writes queued on the wrapped OddsDatabase have been committed"""
+        return await self._write(self.db.flush, timeout)
+
+    # Reads
+
+    async def recent_opportunities(self, hours: int = 24) -> List[ValueOpportunity]:
+        """Value opportunities from the last N hours"""
+        return await self._read(self.db.get_recent_opportunities, hours)
+
+    async def odds_history(self, match_id: str, start: datetime = None, end: datetime = None,
+                           tier: str = None, max_points: int = 500) -> List[OddsSnapshot]:
+        """Odds history for a match (see OddsDatabase.get_odds_history)"""
+        return await self._read(self.db.get_odds_history, match_id, start, end, tier, max_points)
+
+    async def odds_ohlc(self, match_id: str, tier: str, start: datetime = None,
+                        end: datetime = None) -> List[Dict]:
+        """OHLC bars for a match from a rollup tier"""
+        return await self._read(self.db.get_odds_ohlc, match_id, tier, start, end)
+
+    async def performance_summary(self, days: int = 30, offset_days: int = 0) -> Dict:
+        """Performance summary for the last N days"""
+        return await self._read(self.db.get_performance_summary, days, offset_days)
+
+    async def opportunity_aggregates(self, hours: int = 24) -> List[Dict]:
+        """Hourly opportunity aggregates for the last N hours"""
+        return await self._read(self.db.get_opportunity_aggregates, hours)
+
+    async def database_stats(self) -> Dict:
+        """Database statistics"""
+        return await self._read(self.db.get_database_stats)
+
+    # Maintenance
+
+    async def cleanup_old_data(self):
+        """Apply the retention policy"""
+        await self._write(self.db.cleanup_old_data)
+
+    async def backup_database(self, backup_path: str = None) -> Optional[str]:
+        """Create a backup of the database"""
+        return await self._write(self.db.backup_database, backup_path)
+
+    async def close(self):
+        """Drain pending work and release the executors
+
+        The wrapped database is closed only if this facade created it.
+        """
+        loop = asyncio.get_running_loop()
+        await self._write(self.db.flush)
+        await loop.run_in_executor(None, self._shutdown_executors)
+        if self._owns_database:
+            await loop.run_in_executor(None, self.db.close)
+        logger.info("✅ AsyncOddsDatabase closed")
+
+    def _shutdown_executors(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
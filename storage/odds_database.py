@@ -5,8 +5,11 @@ Stores odds movements, opportunities, and performance data for analysis
 
 import sqlite3
 import logging
+import queue
+import time
+from itertools import groupby
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import json
 import os
@@ -19,6 +22,141 @@ from monitors.value_detector import ValueOpportunity
 
 logger = logging.getLogger(__name__)
 
+# Statements executed by the group-commit writer thread
+SNAPSHOT_INSERT_SQL = '''
+    INSERT INTO odds_snapshots 
+    (match_id, home_team, away_team, home_odds, away_odds, timestamp, 
+     league, commence_time, bookmaker)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+MOVEMENT_INSERT_SQL = '''
+    INSERT INTO odds_movements 
+    (match_id, team, old_odds, new_odds, change_amount, change_percentage,
+     timestamp, movement_type, significance)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Extends the current run of an unchanged price (change-only storage)
+SNAPSHOT_EXTEND_SQL = '''
+    UPDATE odds_snapshots
+    SET valid_until = MAX(COALESCE(valid_until, timestamp), ?),
+        poll_count = poll_count + 1
+    WHERE match_id = ? AND bookmaker = ? AND timestamp = ?
+'''
+
+OPPORTUNITY_UPSERT_SQL = '''
+    INSERT OR REPLACE INTO value_opportunities 
+    (opportunity_id, match_id, team, opponent, odds, previous_odds,
+     league, commence_time, detected_time, recommended_stake, confidence,
+     edge_estimate, kelly_fraction, urgency_level, priority_score,
+     time_sensitivity, movement_direction, odds_velocity)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# OHLC rollup tiers (name -> bucket width in seconds), finest first
+ROLLUP_TIERS = {'1m': 60, '15m': 900, '1h': 3600}
+
+# How long each tier is kept; None keeps the tier indefinitely
+RAW_RETENTION_HOURS = 48
+ROLLUP_RETENTION_DAYS = {'1m': 7, '15m': 30, '1h': None}
+
+# Raw rows are only served for short windows; longer ranges read rollups
+RAW_QUERY_MAX_HOURS = 6
+
+ROLLUP_UPSERT_SQL = '''
+    INSERT INTO odds_rollups
+    (match_id, bookmaker, tier, bucket_start, home_team, away_team, league,
+     commence_time, home_open, home_high, home_low, home_close,
+     away_open, away_high, away_low, away_close, samples, first_ts, last_ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (match_id, bookmaker, tier, bucket_start) DO UPDATE SET
+        home_open = CASE WHEN excluded.first_ts < first_ts THEN excluded.home_open ELSE home_open END,
+        away_open = CASE WHEN excluded.first_ts < first_ts THEN excluded.away_open ELSE away_open END,
+        home_high = MAX(home_high, excluded.home_high),
+        away_high = MAX(away_high, excluded.away_high),
+        home_low = MIN(home_low, excluded.home_low),
+        away_low = MIN(away_low, excluded.away_low),
+        home_close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.home_close ELSE home_close END,
+        away_close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.away_close ELSE away_close END,
+        samples = samples + excluded.samples,
+        first_ts = MIN(first_ts, excluded.first_ts),
+        last_ts = MAX(last_ts, excluded.last_ts)
+'''
+
+# Keeps performance_daily in step with performance_records; runs in the same
+# transaction as the record insert
+PERFORMANCE_DAILY_UPSERT_SQL = '''
+    INSERT INTO performance_daily
+    (day, league, result, bets, total_stake, total_profit, sum_odds, sum_edge)
+    VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+    ON CONFLICT (day, league, result) DO UPDATE SET
+        bets = bets + 1,
+        total_stake = total_stake + excluded.total_stake,
+        total_profit = total_profit + excluded.total_profit,
+        sum_odds = sum_odds + excluded.sum_odds,
+        sum_edge = sum_edge + excluded.sum_edge
+'''
+
+# Keep opportunity_hourly equal to an aggregate of value_opportunities. These are
+# triggers rather than writer statements because INSERT OR REPLACE of a known
+# opportunity must retract the replaced row (delete triggers fire on REPLACE
+# with recursive_triggers on, see _connect).
+OPPORTUNITY_HOURLY_TRIGGERS = (
+    '''
+    CREATE TRIGGER IF NOT EXISTS opportunity_hourly_insert
+    AFTER INSERT ON value_opportunities
+    BEGIN
+        INSERT INTO opportunity_hourly
+        (hour, league, urgency_level, movement_direction, opportunities,
+         sum_edge, sum_priority, sum_time_sensitivity, sum_hours_to_match)
+        VALUES (substr(NEW.detected_time, 1, 13), NEW.league, NEW.urgency_level,
+                NEW.movement_direction, 1, NEW.edge_estimate, NEW.priority_score,
+                NEW.time_sensitivity,
+                (julianday(NEW.commence_time) - julianday(NEW.detected_time)) * 24)
+        ON CONFLICT (hour, league, urgency_level, movement_direction) DO UPDATE SET
+            opportunities = opportunities + 1,
+            sum_edge = sum_edge + excluded.sum_edge,
+            sum_priority = sum_priority + excluded.sum_priority,
+            sum_time_sensitivity = sum_time_sensitivity + excluded.sum_time_sensitivity,
+            sum_hours_to_match = sum_hours_to_match + excluded.sum_hours_to_match;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS opportunity_hourly_delete
+    AFTER DELETE ON value_opportunities
+    BEGIN
+        UPDATE opportunity_hourly SET
+            opportunities = opportunities - 1,
+            sum_edge = sum_edge - OLD.edge_estimate,
+            sum_priority = sum_priority - OLD.priority_score,
+            sum_time_sensitivity = sum_time_sensitivity - OLD.time_sensitivity,
+            sum_hours_to_match = sum_hours_to_match
+                - (julianday(OLD.commence_time) - julianday(OLD.detected_time)) * 24
+        WHERE hour = substr(OLD.detected_time, 1, 13) AND league = OLD.league
+          AND urgency_level = OLD.urgency_level AND movement_direction = OLD.movement_direction;
+        DELETE FROM opportunity_hourly
+        WHERE hour = substr(OLD.detected_time, 1, 13) AND league = OLD.league
+          AND urgency_level = OLD.urgency_level AND movement_direction = OLD.movement_direction
+          AND opportunities <= 0;
+    END
+    ''',
+)
+
+# Execution order inside a group commit: inserts before the updates that
+# extend them, rollups last. Statements not listed run first, in queue order.
+_WRITE_ORDER = {SNAPSHOT_EXTEND_SQL: 1, ROLLUP_UPSERT_SQL: 2}
+
+# Tables that can be streamed by iter_rows, with the time column they page on
+EXPORTABLE_TABLES = {
+    'value_opportunities': 'detected_time',
+    'odds_snapshots': 'timestamp',
+    'odds_movements': 'timestamp',
+    'performance_records': 'recorded_time',
+}
+
+_WRITER_STOP = object()  # Sentinel that tells the writer thread to drain and exit
+
 @dataclass
 class PerformanceRecord:
     """Record of betting performance for analysis"""
@@ -35,9 +173,17 @@ class PerformanceRecord:
     edge_estimate: float
 
 class OddsDatabase:
-    """Manages historical odds data storage and retrieval with connection pooling"""
+    """Manages historical odds data storage and retrieval with connection pooling
+    
+    Snapshot, movement and opportunity writes are fire-and-forget: they are
+    queued to a single writer thread that group-commits them every
+    ``commit_interval_ms`` milliseconds or ``commit_batch_size`` rows,
+    whichever comes first. The database runs in WAL mode so readers never
+    block the writer.
+    """
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, commit_interval_ms: int = 100,
+                 commit_batch_size: int = 500, write_queue_size: int = 10000):
         self.config = LiveMonitoringConfig()
         self.db_path = db_path or self.config.DATABASE_PATH
         self.connection: Optional[sqlite3.Connection] = None
@@ -48,12 +194,63 @@ class OddsDatabase:
         self.pool: List[sqlite3.Connection] = []
         self._pool_lock = threading.Lock()
         
+        # Connections owned by a single thread (see bind_thread_connection)
+        self._thread_local = threading.local()
+        self._thread_connections: List[sqlite3.Connection] = []
+        
+        # Group-commit writer settings
+        self.commit_interval = commit_interval_ms / 1000.0
+        self.commit_batch_size = commit_batch_size
+        self._write_queue: queue.Queue = queue.Queue(maxsize=write_queue_size)
+        self._writer_thread: Optional[threading.Thread] = None
+        self.writer_stats = {'rows_written': 0, 'commits': 0, 'failed_rows': 0, 'polls_deduplicated': 0}
+        
+        # Change-only snapshot storage: last written run per (match_id, bookmaker)
+        self._last_written: Dict[Tuple[str, str], Dict] = {}
+        self._dedup_lock = threading.RLock()
+        
         # Initialize database
         self._initialize_database()
+        self._start_writer()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent WAL access"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA busy_timeout = 30000')
+        # NORMAL is durable in WAL mode apart from the last commits before a power loss
+        conn.execute('PRAGMA synchronous = NORMAL')
+        # Fire delete triggers for rows replaced by INSERT OR REPLACE
+        conn.execute('PRAGMA recursive_triggers = ON')
+        return conn
+    
+    def bind_thread_connection(self):
+        """Give the calling thread a connection of its own
+        
+        ``get_connection`` on this thread then always uses it instead of the
+        shared pool. Meant as a ``ThreadPoolExecutor`` initializer for threads
+        that serve a single purpose (see AsyncOddsDatabase). The connections
+        are closed by ``close``.
+        """
+        if getattr(self._thread_local, 'connection', None) is None:
+            conn = self._connect()
+            self._thread_local.connection = conn
+            with self._pool_lock:
+                self._thread_connections.append(conn)
     
     @contextmanager
     def get_connection(self):
         """Thread-safe connection context manager with connection pooling"""
+        bound = getattr(self._thread_local, 'connection', None)
+        if bound is not None:
+            try:
+                yield bound
+                bound.commit()
+            except Exception:
+                bound.rollback()
+                raise
+            return
+        
         conn = None
         try:
             # Try to get connection from pool
@@ -62,8 +259,7 @@ class OddsDatabase:
                     conn = self.pool.pop()
                 else:
                     # Create new connection if pool is empty
-                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
-                    conn.row_factory = sqlite3.Row
+                    conn = self._connect()
             
             yield conn
             conn.commit()  # Commit on successful completion
@@ -98,6 +294,7 @@ class OddsDatabase:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         try:
+            self._stop_writer()
             if self.connection:
                 self.connection.close()
                 self.connection = None
@@ -110,8 +307,12 @@ class OddsDatabase:
         """Create database tables if they don't exist"""
         
         try:
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row  # Enable column access by name
+            self.connection = self._connect()
+            
+            # WAL is persistent in the database file, so setting it once is enough
+            journal_mode = self.connection.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+            if journal_mode.lower() != 'wal':
+                logger.warning(f"⚠️ WAL mode unavailable, using {journal_mode} journal")
             
             # Create tables
             self._create_tables()
@@ -139,10 +340,19 @@ class OddsDatabase:
                 timestamp TEXT NOT NULL,
                 league TEXT NOT NULL,
                 commence_time TEXT NOT NULL,
-                bookmaker TEXT DEFAULT 'default'
+                bookmaker TEXT DEFAULT 'default',
+                valid_until TEXT,
+                poll_count INTEGER NOT NULL DEFAULT 1
             )
         ''')
         
+        # Databases created before change-only storage lack the run columns
+        snapshot_columns = {row[1] for row in cursor.execute('PRAGMA table_info(odds_snapshots)')}
+        if 'valid_until' not in snapshot_columns:
+            cursor.execute('ALTER TABLE odds_snapshots ADD COLUMN valid_until TEXT')
+        if 'poll_count' not in snapshot_columns:
+            cursor.execute('ALTER TABLE odds_snapshots ADD COLUMN poll_count INTEGER NOT NULL DEFAULT 1')
+        
         # Odds movements table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS odds_movements (
@@ -203,6 +413,66 @@ class OddsDatabase:
             )
         ''')
         
+        # Materialized performance aggregates, one row per day x league x result
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS performance_daily (
+                day TEXT NOT NULL,
+                league TEXT NOT NULL,
+                result TEXT NOT NULL,
+                bets INTEGER NOT NULL,
+                total_stake REAL NOT NULL,
+                total_profit REAL NOT NULL,
+                sum_odds REAL NOT NULL,
+                sum_edge REAL NOT NULL,
+                PRIMARY KEY (day, league, result)
+            )
+        ''')
+        
+        # Build the aggregates once for records stored before they existed
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM performance_daily)')
+        if not cursor.fetchone()[0]:
+            cursor.execute('''
+                INSERT INTO performance_daily
+                (day, league, result, bets, total_stake, total_profit, sum_odds, sum_edge)
+                SELECT substr(recorded_time, 1, 10), league, COALESCE(result, 'PENDING'),
+                       COUNT(*), SUM(stake), SUM(COALESCE(profit, 0)), SUM(odds), SUM(edge_estimate)
+                FROM performance_records
+                GROUP BY 1, 2, 3
+            ''')
+        
+        # Materialized opportunity aggregates, one row per hour x league x urgency
+        # x movement, maintained by OPPORTUNITY_HOURLY_TRIGGERS
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS opportunity_hourly (
+                hour TEXT NOT NULL,
+                league TEXT NOT NULL,
+                urgency_level TEXT NOT NULL,
+                movement_direction TEXT NOT NULL,
+                opportunities INTEGER NOT NULL,
+                sum_edge REAL NOT NULL,
+                sum_priority REAL NOT NULL,
+                sum_time_sensitivity REAL NOT NULL,
+                sum_hours_to_match REAL NOT NULL,
+                PRIMARY KEY (hour, league, urgency_level, movement_direction)
+            )
+        ''')
+        
+        # Build the aggregates once for opportunities stored before they existed
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM opportunity_hourly)')
+        if not cursor.fetchone()[0]:
+            cursor.execute('''
+                INSERT INTO opportunity_hourly
+                (hour, league, urgency_level, movement_direction, opportunities,
+                 sum_edge, sum_priority, sum_time_sensitivity, sum_hours_to_match)
+                SELECT substr(detected_time, 1, 13), league, urgency_level, movement_direction,
+                       COUNT(*), SUM(edge_estimate), SUM(priority_score), SUM(time_sensitivity),
+                       SUM((julianday(commence_time) - julianday(detected_time)) * 24)
+                FROM value_opportunities
+                GROUP BY 1, 2, 3, 4
+            ''')
+        for trigger_sql in OPPORTUNITY_HOURLY_TRIGGERS:
+            cursor.execute(trigger_sql)
+        
         # System performance table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS system_performance (
@@ -214,134 +484,395 @@ class OddsDatabase:
             )
         ''')
         
+        # OHLC rollups of odds_snapshots, one row per (match, bookmaker, tier, bucket)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS odds_rollups (
+                match_id TEXT NOT NULL,
+                bookmaker TEXT NOT NULL,
+                tier TEXT NOT NULL,
+                bucket_start TEXT NOT NULL,
+                home_team TEXT NOT NULL,
+                away_team TEXT NOT NULL,
+                league TEXT NOT NULL,
+                commence_time TEXT NOT NULL,
+                home_open REAL NOT NULL,
+                home_high REAL NOT NULL,
+                home_low REAL NOT NULL,
+                home_close REAL NOT NULL,
+                away_open REAL NOT NULL,
+                away_high REAL NOT NULL,
+                away_low REAL NOT NULL,
+                away_close REAL NOT NULL,
+                samples INTEGER NOT NULL,
+                first_ts TEXT NOT NULL,
+                last_ts TEXT NOT NULL,
+                PRIMARY KEY (match_id, bookmaker, tier, bucket_start)
+            )
+        ''')
+        
         # Create indexes for better performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_snapshots_match_time ON odds_snapshots (match_id, timestamp)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_movements_match_time ON odds_movements (match_id, timestamp)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_opportunities_detected ON value_opportunities (detected_time)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_recorded ON performance_records (recorded_time)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_snapshots_time ON odds_snapshots (timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_rollups_match_tier ON odds_rollups (match_id, tier, bucket_start)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_rollups_tier_bucket ON odds_rollups (tier, bucket_start)')
         
         self.connection.commit()
     
-    def store_odds_snapshot(self, snapshot: OddsSnapshot):
-        """Store an odds snapshot (optimized with connection pooling)"""
+    # ------------------------------------------------------------------
+    # Group-commit writer
+    # ------------------------------------------------------------------
+    
+    def _start_writer(self):
+        """Start the single writer thread that owns all queued writes"""
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name='OddsDatabaseWriter', daemon=True
+        )
+        self._writer_thread.start()
+    
+    def _stop_writer(self):
+        """Drain the write queue and stop the writer thread"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._enqueue_pending_samples()
+            self._write_queue.put(_WRITER_STOP)
+            self._writer_thread.join()
+        self._writer_thread = None
+    
+    def _enqueue_write(self, sql: str, params: Tuple):
+        """Queue a write for the writer thread; returns immediately unless the queue is full"""
+        if not self._writer_thread:
+            logger.error("Write dropped: OddsDatabase writer is not running")
+            return
+        try:
+            self._write_queue.put_nowait((sql, params))
+        except queue.Full:
+            # Back-pressure: block the producer rather than dropping rows
+            logger.warning("⚠️ Write queue full, waiting for writer to catch up")
+            self._write_queue.put((sql, params))
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every write queued so far has been committed"""
+        if not self._writer_thread or threading.current_thread() is self._writer_thread:
+            return True
+        self._enqueue_pending_samples()
+        done = threading.Event()
+        self._write_queue.put(done)
+        return done.wait(timeout)
+    
+    def _writer_loop(self):
+        """Collect queued writes and commit them in groups"""
+        conn = self._connect()
+        pending: List[Tuple[str, Tuple]] = []
+        waiters: List[threading.Event] = []
+        deadline = None
         
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO odds_snapshots 
-                    (match_id, home_team, away_team, home_odds, away_odds, timestamp, 
-                     league, commence_time, bookmaker)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    snapshot.match_id,
-                    snapshot.home_team,
-                    snapshot.away_team,
-                    snapshot.home_odds,
-                    snapshot.away_odds,
-                    snapshot.timestamp.isoformat(),
-                    snapshot.league,
-                    snapshot.commence_time.isoformat(),
-                    snapshot.bookmaker
-                ))
+            while True:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    item = self._write_queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                
+                stop = item is _WRITER_STOP
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not None and not stop:
+                    pending.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.commit_interval
+                
+                due = deadline is not None and time.monotonic() >= deadline
+                if pending and (stop or waiters or due or len(pending) >= self.commit_batch_size):
+                    self._commit_group(conn, pending)
+                    pending = []
+                    deadline = None
+                
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                
+                if stop:
+                    break
+        finally:
+            conn.close()
+    
+    def _commit_group(self, conn: sqlite3.Connection, rows: List[Tuple[str, Tuple]]):
+        """Write a group of queued rows in one transaction"""
+        try:
+            with conn:
+                # Consecutive rows for the same statement go through one executemany.
+                # The sort is stable, so unlisted statements keep their queue order.
+                ordered = sorted(rows, key=lambda row: _WRITE_ORDER.get(row[0], 0))
+                for sql, group in groupby(ordered, key=lambda row: row[0]):
+                    conn.executemany(sql, [params for _, params in group])
+            self.writer_stats['rows_written'] += len(rows)
+            self.writer_stats['commits'] += 1
+        except sqlite3.Error as e:
+            logger.error(f"Group commit of {len(rows)} rows failed, retrying row by row: {e}")
+            for sql, params in rows:
+                try:
+                    with conn:
+                        conn.execute(sql, params)
+                    self.writer_stats['rows_written'] += 1
+                except sqlite3.Error as row_error:
+                    self.writer_stats['failed_rows'] += 1
+                    logger.error(f"Failed to write row: {row_error}")
+    
+    # ------------------------------------------------------------------
+    # Row conversion
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _snapshot_row(snapshot: OddsSnapshot) -> Tuple:
+        return (
+            snapshot.match_id,
+            snapshot.home_team,
+            snapshot.away_team,
+            snapshot.home_odds,
+            snapshot.away_odds,
+            snapshot.timestamp.isoformat(),
+            snapshot.league,
+            snapshot.commence_time.isoformat(),
+            snapshot.bookmaker
+        )
+    
+    @staticmethod
+    def _bucket_start(timestamp: datetime, seconds: int) -> datetime:
+        """Floor a timestamp to the start of its rollup bucket"""
+        offset = (timestamp.minute * 60 + timestamp.second) % seconds
+        return timestamp.replace(microsecond=0) - timedelta(seconds=offset)
+    
+    @classmethod
+    def _rollup_rows(cls, snapshot: OddsSnapshot, buckets: Dict[str, str],
+                     samples: Dict[str, int] = None) -> List[Tuple]:
+        """OHLC rows for a snapshot's prices, one per given tier bucket
+        
+        Each row counts one poll unless ``samples`` gives a count per tier.
+        """
+        timestamp = snapshot.timestamp.isoformat()
+        return [(
+            snapshot.match_id,
+            snapshot.bookmaker,
+            tier,
+            bucket_start,
+            snapshot.home_team,
+            snapshot.away_team,
+            snapshot.league,
+            snapshot.commence_time.isoformat(),
+            snapshot.home_odds, snapshot.home_odds, snapshot.home_odds, snapshot.home_odds,
+            snapshot.away_odds, snapshot.away_odds, snapshot.away_odds, snapshot.away_odds,
+            samples[tier] if samples else 1,
+            timestamp,
+            timestamp
+        ) for tier, bucket_start in buckets.items()]
+    
+    @classmethod
+    def _pending_rollup_rows(cls, last: Dict) -> List[Tuple]:
+        """Rollup rows adding a run's uncounted polls to its current buckets
+        
+        Resets the run's pending counts; call with the dedup lock held.
+        """
+        pending = {tier: count for tier, count in last['pending'].items() if count}
+        if not pending:
+            return []
+        last['pending'] = {}
+        buckets = {tier: last['buckets'][tier] for tier in pending}
+        return cls._rollup_rows(last['snapshot'], buckets, pending)
+    
+    def _enqueue_pending_samples(self):
+        """Queue the uncounted polls of every open run (read-your-writes for rollups)"""
+        with self._dedup_lock:
+            for last in self._last_written.values():
+                for row in self._pending_rollup_rows(last):
+                    self._enqueue_write(ROLLUP_UPSERT_SQL, row)
+    
+    def _snapshot_writes(self, snapshot: OddsSnapshot) -> List[Tuple[str, Tuple]]:
+        """Statements that store a snapshot using change-only storage
+        
+        A row is written only when the prices differ from the last row written
+        for the same (match_id, bookmaker). Unchanged polls extend that row's
+        ``valid_until`` and ``poll_count`` instead, and touch the rollups only
+        when they enter a new bucket, so every bucket still gets a bar. Polls
+        that stay in a bucket are counted in memory and added to its
+        ``samples`` when the run leaves the bucket or closes, or on ``flush``.
+        """
+        key = (snapshot.match_id, snapshot.bookmaker)
+        prices = (snapshot.home_odds, snapshot.away_odds)
+        timestamp = snapshot.timestamp.isoformat()
+        buckets = {
+            tier: self._bucket_start(snapshot.timestamp, seconds).isoformat()
+            for tier, seconds in ROLLUP_TIERS.items()
+        }
+        
+        writes: List[Tuple[str, Tuple]] = []
+        with self._dedup_lock:
+            last = self._last_written.get(key)
+            if last and last['prices'] == prices and timestamp >= last['row_timestamp']:
+                writes.append((SNAPSHOT_EXTEND_SQL, (
+                    timestamp, snapshot.match_id, snapshot.bookmaker, last['row_timestamp']
+                )))
+                new_buckets = {
+                    tier: bucket for tier, bucket in buckets.items()
+                    if bucket != last['buckets'].get(tier)
+                }
+                # Count the bucket being left before moving on
+                left = {tier: last['pending'].pop(tier, 0) for tier in new_buckets}
+                if any(left.values()):
+                    writes.extend((ROLLUP_UPSERT_SQL, row) for row in self._rollup_rows(
+                        last['snapshot'], {tier: last['buckets'][tier] for tier in left if left[tier]},
+                        left
+                    ))
+                for tier in buckets:
+                    if tier not in new_buckets:
+                        last['pending'][tier] = last['pending'].get(tier, 0) + 1
+                last['buckets'].update(new_buckets)
+                last['last_seen'] = snapshot.timestamp
+                last['snapshot'] = snapshot
+                self.writer_stats['polls_deduplicated'] += 1
+            else:
+                if last:
+                    # Run closed: count its remaining polls
+                    writes.extend((ROLLUP_UPSERT_SQL, row) for row in self._pending_rollup_rows(last))
+                writes.append((SNAPSHOT_INSERT_SQL, self._snapshot_row(snapshot)))
+                new_buckets = buckets
+                self._last_written[key] = {
+                    'prices': prices,
+                    'row_timestamp': timestamp,
+                    'last_seen': snapshot.timestamp,
+                    'snapshot': snapshot,
+                    'buckets': dict(buckets),
+                    'pending': {}
+                }
             
+            writes.extend((ROLLUP_UPSERT_SQL, row) for row in self._rollup_rows(snapshot, new_buckets))
+        return writes
+    
+    def _enqueue_snapshot(self, snapshot: OddsSnapshot):
+        """Queue a snapshot for the group-commit writer"""
+        # Queue under the dedup lock so a run is always queued before its extensions
+        with self._dedup_lock:
+            for sql, params in self._snapshot_writes(snapshot):
+                self._enqueue_write(sql, params)
+    
+    @staticmethod
+    def _expand_run(row: sqlite3.Row) -> List[Tuple[datetime, float, float]]:
+        """Reconstruct the polls of a stored run as (timestamp, home_odds, away_odds)
+        
+        A run holds ``poll_count`` identical polls between ``timestamp`` and
+        ``valid_until``; polls are spread evenly over that interval, which is
+        exact for a fixed polling interval.
+        """
+        start = datetime.fromisoformat(row['timestamp'])
+        polls = row['poll_count'] or 1
+        if polls == 1 or not row['valid_until']:
+            return [(start, row['home_odds'], row['away_odds'])]
+        
+        step = (datetime.fromisoformat(row['valid_until']) - start) / (polls - 1)
+        return [(start + step * i, row['home_odds'], row['away_odds']) for i in range(polls)]
+    
+    @staticmethod
+    def _movement_row(movement: OddsMovement) -> Tuple:
+        return (
+            movement.match_id,
+            movement.team,
+            movement.old_odds,
+            movement.new_odds,
+            movement.change,
+            movement.change_percentage,
+            movement.timestamp.isoformat(),
+            movement.movement_type,
+            movement.significance
+        )
+    
+    @staticmethod
+    def _opportunity_row(opportunity: ValueOpportunity) -> Tuple:
+        return (
+            opportunity.match_id,  # Using match_id as opportunity_id
+            opportunity.match_id.split('_')[0],  # Extract base match_id
+            opportunity.team,
+            opportunity.opponent,
+            opportunity.odds,
+            opportunity.previous_odds,
+            opportunity.league,
+            opportunity.commence_time.isoformat(),
+            opportunity.detected_time.isoformat(),
+            opportunity.recommended_stake,
+            opportunity.confidence,
+            opportunity.edge_estimate,
+            opportunity.kelly_fraction,
+            opportunity.urgency_level,
+            opportunity.priority_score,
+            opportunity.time_sensitivity,
+            opportunity.movement_direction,
+            opportunity.odds_velocity
+        )
+    
+    def store_odds_snapshot(self, snapshot: OddsSnapshot):
+        """Queue an odds snapshot for the group-commit writer (fire-and-forget)"""
+        
+        try:
+            self._enqueue_snapshot(snapshot)
         except Exception as e:
             logger.error(f"Failed to store odds snapshot: {e}")
     
     def store_odds_snapshots_batch(self, snapshots: List[OddsSnapshot]):
-        """Store multiple odds snapshots in a single transaction (batch insert)"""
+        """Queue multiple odds snapshots; the writer commits them together"""
         
         if not snapshots:
             return
         
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.executemany('''
-                    INSERT INTO odds_snapshots 
-                    (match_id, home_team, away_team, home_odds, away_odds, timestamp, 
-                     league, commence_time, bookmaker)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', [(
-                    s.match_id,
-                    s.home_team,
-                    s.away_team,
-                    s.home_odds,
-                    s.away_odds,
-                    s.timestamp.isoformat(),
-                    s.league,
-                    s.commence_time.isoformat(),
-                    s.bookmaker
-                ) for s in snapshots])
+            for snapshot in snapshots:
+                self._enqueue_snapshot(snapshot)
             
-            logger.info(f"✅ Batch inserted {len(snapshots)} odds snapshots")
+            logger.info(f"✅ Queued {len(snapshots)} odds snapshots")
             
         except Exception as e:
             logger.error(f"Failed to store odds snapshots batch: {e}")
     
     def store_odds_movement(self, movement: OddsMovement):
-        """Store an odds movement (optimized with connection pooling)"""
+        """Queue an odds movement for the group-commit writer (fire-and-forget)"""
         
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO odds_movements 
-                    (match_id, team, old_odds, new_odds, change_amount, change_percentage,
-                     timestamp, movement_type, significance)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    movement.match_id,
-                    movement.team,
-                    movement.old_odds,
-                    movement.new_odds,
-                    movement.change,
-                    movement.change_percentage,
-                    movement.timestamp.isoformat(),
-                    movement.movement_type,
-                    movement.significance
-                ))
-            
+            self._enqueue_write(MOVEMENT_INSERT_SQL, self._movement_row(movement))
         except Exception as e:
             logger.error(f"Failed to store odds movement: {e}")
     
     def store_value_opportunity(self, opportunity: ValueOpportunity):
-        """Store a value opportunity (optimized with connection pooling)"""
+        """Queue a value opportunity for the group-commit writer (fire-and-forget)"""
         
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO value_opportunities 
-                    (opportunity_id, match_id, team, opponent, odds, previous_odds,
-                     league, commence_time, detected_time, recommended_stake, confidence,
-                     edge_estimate, kelly_fraction, urgency_level, priority_score,
-                     time_sensitivity, movement_direction, odds_velocity)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    opportunity.match_id,  # Using match_id as opportunity_id
-                    opportunity.match_id.split('_')[0],  # Extract base match_id
-                    opportunity.team,
-                    opportunity.opponent,
-                    opportunity.odds,
-                    opportunity.previous_odds,
-                    opportunity.league,
-                    opportunity.commence_time.isoformat(),
-                    opportunity.detected_time.isoformat(),
-                    opportunity.recommended_stake,
-                    opportunity.confidence,
-                    opportunity.edge_estimate,
-                    opportunity.kelly_fraction,
-                    opportunity.urgency_level,
-                    opportunity.priority_score,
-                    opportunity.time_sensitivity,
-                    opportunity.movement_direction,
-                    opportunity.odds_velocity
-                ))
-            
+            self._enqueue_write(OPPORTUNITY_UPSERT_SQL, self._opportunity_row(opportunity))
         except Exception as e:
             logger.error(f"Failed to store value opportunity: {e}")
     
+    def store_direct(self, snapshots: List[OddsSnapshot] = (), movements: List[OddsMovement] = (),
+                     opportunities: List[ValueOpportunity] = ()):
+        """Write rows in one transaction on the calling thread, bypassing the writer queue
+        
+        For callers that own a writer thread with its own connection
+        (AsyncOddsDatabase). Rows still queued for the group-commit writer
+        are flushed first, so runs are never extended before they exist.
+        """
+        
+        writes: List[Tuple[str, Tuple]] = []
+        writes.extend((MOVEMENT_INSERT_SQL, self._movement_row(m)) for m in movements)
+        writes.extend((OPPORTUNITY_UPSERT_SQL, self._opportunity_row(o)) for o in opportunities)
+        
+        with self._dedup_lock:
+            for snapshot in snapshots:
+                writes.extend(self._snapshot_writes(snapshot))
+            if not writes:
+                return
+            
+            if not self._write_queue.empty():
+                self.flush()
+            with self.get_connection() as conn:
+                self._commit_group(conn, writes)
+    
     def store_performance_record(self, record: PerformanceRecord):
         """Store a performance record (optimized with connection pooling)"""
         
@@ -366,6 +897,15 @@ class OddsDatabase:
                     record.confidence,
                     record.edge_estimate
                 ))
+                cursor.execute(PERFORMANCE_DAILY_UPSERT_SQL, (
+                    record.recorded_time.date().isoformat(),
+                    record.league,
+                    record.result or 'PENDING',
+                    record.stake,
+                    record.profit or 0,
+                    record.odds,
+                    record.edge_estimate
+                ))
             
         except Exception as e:
             logger.error(f"Failed to store performance record: {e}")
@@ -374,6 +914,7 @@ class OddsDatabase:
         """Get value opportunities from the last N hours (optimized with connection pooling)"""
         
         try:
+            self.flush()  # Read-your-writes for opportunities still in the write queue
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
@@ -413,55 +954,82 @@ class OddsDatabase:
             logger.error(f"Failed to get recent opportunities: {e}")
             return []
     
-    def get_performance_summary(self, days: int = 30) -> Dict:
-        """Get performance summary for the last N days (optimized with connection pooling)"""
+    def get_performance_summary(self, days: int = 30, offset_days: int = 0) -> Dict:
+        """Get performance summary for the last N days (rolling N x 24h window)
+        
+        Whole days inside the window are read from the ``performance_daily``
+        aggregates; only the records of the two partial days at its edges are
+        aggregated from ``performance_records``, so the cost does not grow
+        with the number of stored records. ``offset_days`` shifts the window
+        back, e.g. ``days=7, offset_days=7`` is the 7 x 24h before the last 7.
+        """
         
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cutoff_time = (datetime.now() - timedelta(days=days)).isoformat()
+                now = datetime.now()
+                start = now - timedelta(days=offset_days + days)
+                end = now - timedelta(days=offset_days) if offset_days else None
+                end_day = (end or now).date().isoformat()
+                start_day_end = min((start.date() + timedelta(days=1)).isoformat(), end_day)
                 
-                # Get basic stats
                 cursor.execute('''
-                    SELECT 
-                        COUNT(*) as total_bets,
-                        COUNT(CASE WHEN result = 'WIN' THEN 1 END) as wins,
-                        COUNT(CASE WHEN result = 'LOSS' THEN 1 END) as losses,
-                        SUM(stake) as total_staked,
-                        SUM(CASE WHEN profit IS NOT NULL THEN profit ELSE 0 END) as total_profit,
-                        AVG(odds) as avg_odds,
-                        AVG(edge_estimate) as avg_edge
-                    FROM performance_records 
-                    WHERE recorded_time > ?
-                ''', (cutoff_time,))
-                
-                row = cursor.fetchone()
+                    SELECT league, result,
+                           SUM(bets) as bets,
+                           SUM(total_stake) as total_stake,
+                           SUM(total_profit) as total_profit,
+                           SUM(sum_odds) as sum_odds,
+                           SUM(sum_edge) as sum_edge
+                    FROM (
+                        SELECT league, result, bets, total_stake, total_profit, sum_odds, sum_edge
+                        FROM performance_daily
+                        WHERE day > ? AND day < ?
+                        UNION ALL
+                        SELECT league, COALESCE(result, 'PENDING'), 1, stake,
+                               COALESCE(profit, 0), odds, edge_estimate
+                        FROM performance_records
+                        WHERE recorded_time > ? AND recorded_time < ?
+                        UNION ALL
+                        SELECT league, COALESCE(result, 'PENDING'), 1, stake,
+                               COALESCE(profit, 0), odds, edge_estimate
+                        FROM performance_records
+                        WHERE recorded_time >= ? AND (? IS NULL OR recorded_time <= ?)
+                    )
+                    GROUP BY league, result
+                ''', (
+                    start.date().isoformat(), end_day,
+                    start.isoformat(), start_day_end,
+                    end_day, end and end.isoformat(), end and end.isoformat()
+                ))
                 
-                total_bets = row['total_bets'] or 0
-                wins = row['wins'] or 0
-                losses = row['losses'] or 0
-                total_staked = row['total_staked'] or 0
-                total_profit = row['total_profit'] or 0
+                total_bets = wins = losses = 0
+                total_staked = total_profit = sum_odds = sum_edge = 0.0
+                leagues: Dict[str, List[float]] = {}
+                for row in cursor.fetchall():
+                    total_bets += row['bets']
+                    total_staked += row['total_stake']
+                    total_profit += row['total_profit']
+                    sum_odds += row['sum_odds']
+                    sum_edge += row['sum_edge']
+                    if row['result'] == 'WIN':
+                        wins += row['bets']
+                    elif row['result'] == 'LOSS':
+                        losses += row['bets']
+                    
+                    league = leagues.setdefault(row['league'], [0, 0.0])
+                    league[0] += row['bets']
+                    league[1] += row['sum_edge']
                 
                 # Calculate derived metrics
                 win_rate = (wins / max(wins + losses, 1)) * 100
                 roi = (total_profit / max(total_staked, 1)) * 100
                 
-                # Get league breakdown
-                cursor.execute('''
-                    SELECT league, COUNT(*) as count, AVG(edge_estimate) as avg_edge
-                    FROM performance_records 
-                    WHERE recorded_time > ?
-                    GROUP BY league
-                    ORDER BY count DESC
-                ''', (cutoff_time,))
-                
-                league_breakdown = {}
-                for row in cursor.fetchall():
-                    league_breakdown[row['league']] = {
-                        'count': row['count'],
-                        'avg_edge': row['avg_edge']
-                    }
+                league_breakdown = {
+                    league: {'count': count, 'avg_edge': edge_sum / count}
+                    for league, (count, edge_sum) in sorted(
+                        leagues.items(), key=lambda item: item[1][0], reverse=True
+                    )
+                }
                 
                 return {
                     'total_bets': total_bets,
@@ -471,8 +1039,8 @@ class OddsDatabase:
                     'total_staked': round(total_staked, 2),
                     'total_profit': round(total_profit, 2),
                     'roi': round(roi, 2),
-                    'avg_odds': round(row['avg_odds'] or 0, 2),
-                    'avg_edge': round(row['avg_edge'] or 0, 2),
+                    'avg_odds': round(sum_odds / total_bets, 2) if total_bets else 0,
+                    'avg_edge': round(sum_edge / total_bets, 2) if total_bets else 0,
                     'league_breakdown': league_breakdown
                 }
             
@@ -480,61 +1048,311 @@ class OddsDatabase:
             logger.error(f"Failed to get performance summary: {e}")
             return {}
     
-    def get_odds_history(self, match_id: str) -> List[OddsSnapshot]:
-        """Get odds history for a specific match (optimized with connection pooling)"""
+    def get_opportunity_aggregates(self, hours: int = 24) -> List[Dict]:
+        """Get opportunity aggregates for the last N hours (rolling window)
+        
+        Returns one dict per hour x league x urgency x movement with the
+        opportunity count and sums of edge, priority, time sensitivity and
+        hours to match. Whole hours are read from ``opportunity_hourly``;
+        only the partial first hour is aggregated from ``value_opportunities``.
+        """
+        
+        try:
+            self.flush()  # Read-your-writes for opportunities still in the write queue
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                start = datetime.now() - timedelta(hours=hours)
+                start_hour = start.strftime('%Y-%m-%dT%H')
+                next_hour = (start.replace(minute=0, second=0, microsecond=0)
+                             + timedelta(hours=1)).isoformat()
+        
+                cursor.execute('''
+                    SELECT hour, league, urgency_level, movement_direction,
+                           SUM(opportunities) as opportunities,
+                           SUM(sum_edge) as sum_edge,
+                           SUM(sum_priority) as sum_priority,
+                           SUM(sum_time_sensitivity) as sum_time_sensitivity,
+                           SUM(sum_hours_to_match) as sum_hours_to_match
+                    FROM (
+                        SELECT hour, league, urgency_level, movement_direction, opportunities,
+                               sum_edge, sum_priority, sum_time_sensitivity, sum_hours_to_match
+                        FROM opportunity_hourly
+                        WHERE hour > ?
+                        UNION ALL
+                        SELECT substr(detected_time, 1, 13), league, urgency_level,
+                               movement_direction, 1, edge_estimate, priority_score,
+                               time_sensitivity,
+                               (julianday(commence_time) - julianday(detected_time)) * 24
+                        FROM value_opportunities
+                        WHERE detected_time > ? AND detected_time < ?
+                    )
+                    GROUP BY hour, league, urgency_level, movement_direction
+                    ORDER BY hour
+                ''', (start_hour, start.isoformat(), next_hour))
+        
+                return [dict(row) for row in cursor.fetchall()]
+        
+        except Exception as e:
+            logger.error(f"Failed to get opportunity aggregates: {e}")
+            return []
+
+    def iter_rows(self, table: str, since: datetime = None,
+                  batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """Stream a table in time order, one page of row dicts at a time
+        
+        Uses keyset pagination on (time column, id), so each page is an index
+        range scan and memory stays bounded by ``batch_size`` no matter how
+        large the window is.
+        """
+        
+        if table not in EXPORTABLE_TABLES:
+            raise ValueError(f"Table cannot be exported: {table}")
+        time_column = EXPORTABLE_TABLES[table]
+        
+        self.flush()
+        last_key = (since.isoformat() if since else '', 0)
+        while True:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT * FROM {table}
+                    WHERE ({time_column}, id) > (?, ?)
+                    ORDER BY {time_column}, id
+                    LIMIT ?
+                ''', (*last_key, batch_size))
+                page = [dict(row) for row in cursor.fetchall()]
+            
+            if not page:
+                return
+            yield page
+            if len(page) < batch_size:
+                return
+            last_key = (page[-1][time_column], page[-1]['id'])
+    
+    def _select_tier(self, start: datetime, end: datetime, max_points: int) -> str:
+        """Pick the tier to serve a time range from
+        
+        Raw rows are used for short, recent windows. Otherwise the finest
+        rollup that still covers ``start`` and fits the range into
+        ``max_points`` buckets is used, so long ranges read coarse tiers.
+        """
+        now = datetime.now()
+        span_seconds = max((end - start).total_seconds(), 0)
+        
+        if (start >= now - timedelta(hours=RAW_RETENTION_HOURS)
+                and span_seconds <= RAW_QUERY_MAX_HOURS * 3600):
+            return 'raw'
+        
+        for tier, seconds in ROLLUP_TIERS.items():
+            retention_days = ROLLUP_RETENTION_DAYS[tier]
+            if retention_days is not None and start < now - timedelta(days=retention_days):
+                continue
+            if span_seconds / seconds <= max_points:
+                return tier
+        
+        return list(ROLLUP_TIERS)[-1]
+    
+    def get_odds_history(self, match_id: str, start: datetime = None, end: datetime = None,
+                         tier: str = None, max_points: int = 500) -> List[OddsSnapshot]:
+        """Get odds history for a specific match (optimized with connection pooling)
+        
+        Without a time range the raw snapshots are returned. With ``start``
+        the tier is chosen automatically (see ``_select_tier``) unless
+        ``tier`` is given; rollup tiers return one snapshot per bucket
+        carrying the bucket's closing odds.
+        """
+        
+        if start is not None and tier is None:
+            tier = self._select_tier(start, end or datetime.now(), max_points)
+        if tier and tier != 'raw':
+            return [
+                OddsSnapshot(
+                    match_id=bar['match_id'],
+                    home_team=bar['home_team'],
+                    away_team=bar['away_team'],
+                    home_odds=bar['home_close'],
+                    away_odds=bar['away_close'],
+                    timestamp=datetime.fromisoformat(bar['last_ts']),
+                    league=bar['league'],
+                    commence_time=datetime.fromisoformat(bar['commence_time']),
+                    bookmaker=bar['bookmaker']
+                )
+                for bar in self.get_odds_ohlc(match_id, tier, start, end)
+            ]
         
         try:
+            self.flush()  # Read-your-writes for snapshots still in the write queue
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                # Runs that started before ``start`` may still cover it
                 cursor.execute('''
                     SELECT * FROM odds_snapshots 
-                    WHERE match_id = ? 
+                    WHERE match_id = ? AND COALESCE(valid_until, timestamp) >= ? AND timestamp <= ?
                     ORDER BY timestamp ASC
-                ''', (match_id,))
+                ''', (
+                    match_id,
+                    start.isoformat() if start else '',
+                    end.isoformat() if end else '9999'
+                ))
                 
                 snapshots = []
                 for row in cursor.fetchall():
-                    snapshot = OddsSnapshot(
-                        match_id=row['match_id'],
-                        home_team=row['home_team'],
-                        away_team=row['away_team'],
-                        home_odds=row['home_odds'],
-                        away_odds=row['away_odds'],
-                        timestamp=datetime.fromisoformat(row['timestamp']),
-                        league=row['league'],
-                        commence_time=datetime.fromisoformat(row['commence_time']),
-                        bookmaker=row['bookmaker']
-                    )
-                    snapshots.append(snapshot)
+                    commence_time = datetime.fromisoformat(row['commence_time'])
+                    for timestamp, home_odds, away_odds in self._expand_run(row):
+                        if (start and timestamp < start) or (end and timestamp > end):
+                            continue
+                        snapshot = OddsSnapshot(
+                            match_id=row['match_id'],
+                            home_team=row['home_team'],
+                            away_team=row['away_team'],
+                            home_odds=home_odds,
+                            away_odds=away_odds,
+                            timestamp=timestamp,
+                            league=row['league'],
+                            commence_time=commence_time,
+                            bookmaker=row['bookmaker']
+                        )
+                        snapshots.append(snapshot)
                 
+                # Interleave bookmakers whose runs overlap
+                snapshots.sort(key=lambda snapshot: snapshot.timestamp)
                 return snapshots
             
         except Exception as e:
             logger.error(f"Failed to get odds history for {match_id}: {e}")
             return []
     
-    def cleanup_old_data(self):
-        """Clean up old data based on retention policy"""
+    def get_odds_ohlc(self, match_id: str, tier: str, start: datetime = None,
+                      end: datetime = None) -> List[Dict]:
+        """Get OHLC bars for a match from a rollup tier ('1m', '15m' or '1h')"""
+        
+        if tier not in ROLLUP_TIERS:
+            raise ValueError(f"Unknown rollup tier: {tier}")
         
         try:
-            cursor = self.connection.cursor()
-            cutoff_time = (datetime.now() - timedelta(days=self.config.MAX_HISTORY_DAYS)).isoformat()
-            
-            # Clean up old snapshots
-            cursor.execute('DELETE FROM odds_snapshots WHERE timestamp < ?', (cutoff_time,))
-            snapshots_deleted = cursor.rowcount
-            
-            # Clean up old movements
-            cursor.execute('DELETE FROM odds_movements WHERE timestamp < ?', (cutoff_time,))
-            movements_deleted = cursor.rowcount
-            
-            # Clean up old opportunities (keep performance records)
-            cursor.execute('DELETE FROM value_opportunities WHERE detected_time < ?', (cutoff_time,))
-            opportunities_deleted = cursor.rowcount
+            self.flush()
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                # Include the bucket that contains ``start``
+                bucket_from = self._bucket_start(start, ROLLUP_TIERS[tier]).isoformat() if start else ''
+                cursor.execute('''
+                    SELECT * FROM odds_rollups
+                    WHERE match_id = ? AND tier = ? AND bucket_start >= ? AND bucket_start <= ?
+                    ORDER BY bucket_start ASC, bookmaker ASC
+                ''', (match_id, tier, bucket_from, end.isoformat() if end else '9999'))
+                
+                return [dict(row) for row in cursor.fetchall()]
             
-            self.connection.commit()
+        except Exception as e:
+            logger.error(f"Failed to get {tier} OHLC for {match_id}: {e}")
+            return []
+    
+    def _compact_snapshots(self, cursor: sqlite3.Cursor, cutoff_time: str) -> int:
+        """Rebuild rollups from raw snapshots older than the cutoff, then drop them
+        
+        Rollups are normally maintained at ingest; rebuilding from the raw rows
+        before deleting them also covers rows written before rollups existed.
+        The cutoff is aligned to the coarsest bucket, so every rebuilt bucket is
+        complete and can simply replace the stored one. Runs that are still
+        open past the cutoff contribute their earlier polls but are kept.
+        """
+        cutoff = datetime.fromisoformat(cutoff_time)
+        buckets: Dict[Tuple, List] = {}
+        cursor.execute('''
+            SELECT * FROM odds_snapshots WHERE timestamp < ? ORDER BY timestamp ASC
+        ''', (cutoff_time,))
+        for row in cursor:
+            for timestamp, home_odds, away_odds in self._expand_run(row):
+                if timestamp >= cutoff:
+                    break
+                self._add_to_bars(buckets, row, timestamp, home_odds, away_odds)
+        
+        cursor.executemany('''
+            INSERT OR REPLACE INTO odds_rollups
+            (match_id, bookmaker, tier, bucket_start, home_team, away_team, league,
+             commence_time, home_open, home_high, home_low, home_close,
+             away_open, away_high, away_low, away_close, samples, first_ts, last_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [key + tuple(bar) for key, bar in buckets.items()])
+        
+        cursor.execute('DELETE FROM odds_snapshots WHERE COALESCE(valid_until, timestamp) < ?',
+                       (cutoff_time,))
+        return cursor.rowcount
+    
+    def _add_to_bars(self, buckets: Dict[Tuple, List], row: sqlite3.Row, timestamp: datetime,
+                     home_odds: float, away_odds: float):
+        """Fold one poll into the in-memory OHLC bars used by compaction"""
+        iso_timestamp = timestamp.isoformat()
+        for tier, seconds in ROLLUP_TIERS.items():
+            key = (row['match_id'], row['bookmaker'], tier,
+                   self._bucket_start(timestamp, seconds).isoformat())
+            bar = buckets.get(key)
+            if bar is None:
+                buckets[key] = [
+                    row['home_team'], row['away_team'], row['league'], row['commence_time'],
+                    home_odds, home_odds, home_odds, home_odds,
+                    away_odds, away_odds, away_odds, away_odds,
+                    1, iso_timestamp, iso_timestamp
+                ]
+            else:
+                bar[5] = max(bar[5], home_odds)
+                bar[6] = min(bar[6], home_odds)
+                bar[7] = home_odds
+                bar[9] = max(bar[9], away_odds)
+                bar[10] = min(bar[10], away_odds)
+                bar[11] = away_odds
+                bar[12] += 1
+                bar[14] = iso_timestamp
+    
+    def cleanup_old_data(self):
+        """Apply the retention policy
+        
+        Raw snapshots past ``RAW_RETENTION_HOURS`` are compacted into the
+        rollup tiers, and each rollup tier is trimmed to its own retention.
+        Movements and opportunities are deleted after ``MAX_HISTORY_DAYS``.
+        """
+        
+        try:
+            self.flush()
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                now = datetime.now()
+                cutoff_time = (now - timedelta(days=self.config.MAX_HISTORY_DAYS)).isoformat()
+                raw_cutoff = self._bucket_start(
+                    now - timedelta(hours=RAW_RETENTION_HOURS), max(ROLLUP_TIERS.values())
+                ).isoformat()
+                
+                # Forget runs that compaction is about to delete, so the next poll
+                # for those matches starts a new row instead of extending a gone one
+                with self._dedup_lock:
+                    raw_cutoff_time = datetime.fromisoformat(raw_cutoff)
+                    for key in [key for key, last in self._last_written.items()
+                                if last['last_seen'] < raw_cutoff_time]:
+                        del self._last_written[key]
+                
+                # Compact old snapshots into rollups
+                snapshots_compacted = self._compact_snapshots(cursor, raw_cutoff)
+                
+                # Trim rollup tiers that have their own retention
+                rollups_deleted = 0
+                for tier, retention_days in ROLLUP_RETENTION_DAYS.items():
+                    if retention_days is None:
+                        continue
+                    tier_cutoff = (now - timedelta(days=retention_days)).isoformat()
+                    cursor.execute('DELETE FROM odds_rollups WHERE tier = ? AND bucket_start < ?',
+                                   (tier, tier_cutoff))
+                    rollups_deleted += cursor.rowcount
+                
+                # Clean up old movements
+                cursor.execute('DELETE FROM odds_movements WHERE timestamp < ?', (cutoff_time,))
+                movements_deleted = cursor.rowcount
+                
+                # Clean up old opportunities (keep performance records)
+                cursor.execute('DELETE FROM value_opportunities WHERE detected_time < ?', (cutoff_time,))
+                opportunities_deleted = cursor.rowcount
             
-            logger.info(f"Cleaned up old data: {snapshots_deleted} snapshots, "
+            logger.info(f"Cleaned up old data: {snapshots_compacted} snapshots compacted, "
+                       f"{rollups_deleted} expired rollups, "
                        f"{movements_deleted} movements, {opportunities_deleted} opportunities")
             
         except Exception as e:
@@ -548,9 +1366,12 @@ class OddsDatabase:
             backup_path = f"{self.db_path}.backup_{timestamp}"
         
         try:
+            self.flush()
+            
             # Create backup using sqlite3 backup API
             backup_conn = sqlite3.connect(backup_path)
-            self.connection.backup(backup_conn)
+            with self.get_connection() as conn:
+                conn.backup(backup_conn)
             backup_conn.close()
             
             logger.info(f"Database backed up to {backup_path}")
@@ -564,26 +1385,32 @@ class OddsDatabase:
         """Get database statistics"""
         
         try:
-            cursor = self.connection.cursor()
-            
-            stats = {}
-            
-            # Count records in each table
-            tables = ['odds_snapshots', 'odds_movements', 'value_opportunities', 'performance_records']
-            for table in tables:
-                cursor.execute(f'SELECT COUNT(*) FROM {table}')
-                stats[f'{table}_count'] = cursor.fetchone()[0]
-            
-            # Get database file size
-            if os.path.exists(self.db_path):
-                stats['database_size_mb'] = round(os.path.getsize(self.db_path) / (1024 * 1024), 2)
-            
-            # Get date range of data
-            cursor.execute('SELECT MIN(timestamp), MAX(timestamp) FROM odds_snapshots')
-            row = cursor.fetchone()
-            if row[0] and row[1]:
-                stats['data_range_start'] = row[0]
-                stats['data_range_end'] = row[1]
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                stats = {}
+                
+                # Count records in each table
+                tables = ['odds_snapshots', 'odds_rollups', 'odds_movements', 'value_opportunities',
+                          'performance_records', 'performance_daily', 'opportunity_hourly']
+                for table in tables:
+                    cursor.execute(f'SELECT COUNT(*) FROM {table}')
+                    stats[f'{table}_count'] = cursor.fetchone()[0]
+                
+                # Group-commit writer health
+                stats['write_queue_depth'] = self._write_queue.qsize()
+                stats.update({f'writer_{key}': value for key, value in self.writer_stats.items()})
+                
+                # Get database file size
+                if os.path.exists(self.db_path):
+                    stats['database_size_mb'] = round(os.path.getsize(self.db_path) / (1024 * 1024), 2)
+                
+                # Get date range of data
+                cursor.execute('SELECT MIN(timestamp), MAX(timestamp) FROM odds_snapshots')
+                row = cursor.fetchone()
+                if row[0] and row[1]:
+                    stats['data_range_start'] = row[0]
+                    stats['data_range_end'] = row[1]
             
             return stats
             
@@ -593,19 +1420,23 @@ class OddsDatabase:
     
     def close(self):
         """Close database connection and connection pool"""
+        # Drain queued writes before closing anything
+        self._stop_writer()
+        
         # Close main connection
         if self.connection:
             self.connection.close()
             self.connection = None
         
-        # Close all connections in pool
+        # Close all connections in pool and those bound to threads
         with self._pool_lock:
-            for conn in self.pool:
+            for conn in self.pool + self._thread_connections:
                 try:
                     conn.close()
                 except:
                     pass
             self.pool.clear()
+            self._thread_connections.clear()
         
         logger.info("Database connection and pool closed")
     
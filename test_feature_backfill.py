@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests for the Feature Backfill
+Backfill on a fresh database (temporary SQLite database)
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.ml.data_collector import MatchResultsDB
+from src.ml.feature_backfill import FeatureBackfill
+from src.scrapers.sportbex_client import SportbexMatch
+
+
+class TestFeatureBackfill(unittest.TestCase):
+    """The backfill must not depend on the indexes having been built elsewhere"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmpdir.name) / 'match_results.db')
+
+        db = MatchResultsDB(self.db_path)
+        start = datetime(2024, 1, 1)
+        for i in range(10):
+            match = SportbexMatch(f'm{i}', 'ITF W15', f'A{i % 3}', f'B{i % 4}',
+                                  commence_time=start + timedelta(days=i), surface='Clay')
+            db.insert_match(match)
+            db.insert_result(match.match_id, match.player1 if i % 2 else match.player2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fresh_database(self):
+        """count_pending() and run() work before any index table exists"""
+        backfill = FeatureBackfill(self.db_path, chunk_size=4, workers=1)
+        self.assertEqual(backfill.count_pending(), 10)
+
+        result = backfill.run()
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertEqual(result['rows_written'], 10)
+        self.assertEqual(backfill.count_pending(), 0)
+
+        conn = sqlite3.connect(self.db_path)
+        rated = conn.execute("SELECT COUNT(*) FROM match_ratings").fetchone()[0]
+        conn.close()
+        self.assertEqual(rated, 10)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests for the Incremental Learner
+Checkpointed warm starts must not retrain on rows they already saw
+(temporary SQLite database and model directory)
+"""
+
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.ml.incremental_learner import IncrementalLearner, MIN_NEW_ROWS
+from src.ml.lightgbm_trainer import LightGBMTrainer
+from src.ml.xgboost_trainer import XGBoostTrainer
+from src.scrapers.sportbex_client import SportbexMatch
+
+
+class TestIncrementalLearner(unittest.TestCase):
+    """Runs without new results leave the models untouched"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmpdir.name)
+        db_path = str(tmp / 'match_results.db')
+
+        self.learner = IncrementalLearner(db_path=db_path, state_dir=str(tmp))
+        self.learner.xgboost_trainer = XGBoostTrainer(db_path=db_path, model_path=str(tmp / 'xgboost_model.pkl'))
+        self.learner.lightgbm_trainer = LightGBMTrainer(db_path=db_path, model_path=str(tmp / 'lightgbm_model.pkl'))
+
+        self.rng = random.Random(7)
+        self.count = 0
+        self.add_results(200)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def add_results(self, n: int):
+        """Store n matches with features and results"""
+        store = self.learner.feature_store
+        names = store.get_feature_names()
+        start = datetime(2024, 1, 1)
+        for _ in range(n):
+            i = self.count
+            self.count += 1
+            match = SportbexMatch(f'm{i}', 'ITF W15', f'A{i % 30}', f'B{i % 17}',
+                                  commence_time=start + timedelta(hours=i), surface='Clay')
+            store.db.insert_match(match)
+            features = {name: self.rng.random() for name in names}
+            # Alternate the LightGBM screener target so every batch has both classes
+            features['player1_odds'] = features['player2_odds'] = 1.6
+            features['ranking_delta'] = 50.0 if i % 2 else 5.0
+            store.store_features(match.match_id, features)
+            winner = match.player1 if features[names[0]] > 0.5 else match.player2
+            store.db.insert_result(match.match_id, winner)
+
+    def rounds(self) -> int:
+        return self.learner.xgboost_trainer.model.get_booster().num_boosted_rounds()
+
+    def test_runs_without_new_results_are_no_ops(self):
+        """Two runs with no new results add no rounds and register no version"""
+        with mock.patch.object(XGBoostTrainer, 'register_version') as xgb_register, \
+                mock.patch.object(LightGBMTrainer, 'register_version') as lgb_register:
+            first = self.learner.update_models(force_full=True)
+            self.assertEqual(first['mode'], 'full')
+            self.assertTrue(first['success'])
+            rounds = self.rounds()
+            registered = xgb_register.call_count + lgb_register.call_count
+
+            for _ in range(2):
+                result = self.learner.learn_from_new_data()
+                self.assertEqual(result['new_matches'], 0)
+                self.assertEqual(result['mode'], 'none')
+
+            self.assertEqual(self.rounds(), rounds)
+            self.assertEqual(xgb_register.call_count + lgb_register.call_count, registered)
+
+    def test_warm_start_reads_only_new_rows(self):
+        """A warm start trains on the added rows once"""
+        with mock.patch.object(XGBoostTrainer, 'register_version'), \
+                mock.patch.object(LightGBMTrainer, 'register_version'):
+            self.learner.update_models(force_full=True)
+            rounds = self.rounds()
+
+            self.add_results(MIN_NEW_ROWS)
+            update = self.learner.update_models()
+            self.assertEqual(update['mode'], 'incremental')
+            self.assertEqual(update['new_rows'], MIN_NEW_ROWS)
+            self.assertGreater(self.rounds(), rounds)
+
+            rounds = self.rounds()
+            self.assertEqual(self.learner.update_models()['new_rows'], 0)
+            self.assertEqual(self.rounds(), rounds)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+🧪 Tests for the Player Resolver
+Alias storage and name scoring regressions (temporary SQLite database)
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.ml.player_resolver import (
+    CONFIDENCE_INITIAL, PlayerResolver, name_similarity
+)
+
+
+class TestPlayerResolver(unittest.TestCase):
+    """Fuzzy hits must not merge or corrupt players"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / 'match_results.db'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_surname_only_hit_not_stored(self):
+        """A surname-only guess is not saved and cannot capture other initials"""
+        resolver = PlayerResolver(self.db_path)
+        jane = resolver.add_player('Jane Smith')
+
+        match = resolver.resolve('Smith')
+        self.assertIsNotNone(match)
+        self.assertEqual(match.player_id, jane)
+        self.assertEqual([a['alias'] for a in resolver.get_aliases(jane)], ['jane smith'])
+
+        resolver.add_player('Anna Smith')
+        fresh = PlayerResolver(self.db_path)
+        self.assertIsNone(fresh.resolve('Smith B.'))
+
+    def test_initial_mismatch_vetoes_player(self):
+        """Any alias with another initial rules the player out"""
+        resolver = PlayerResolver(self.db_path)
+        jane = resolver.add_player('Jane Smith')
+        resolver.add_alias('Smith', jane, confidence=0.8)
+
+        self.assertIsNone(resolver.resolve('Smith B.', min_confidence=0.0))
+        self.assertEqual(resolver.resolve('Smith J.').player_id, jane)
+
+    def test_different_first_names_not_merged(self):
+        """Jane Smith and Jana Smith are two players"""
+        self.assertLess(name_similarity('Jane Smith', 'Jana Smith'), CONFIDENCE_INITIAL)
+        self.assertEqual(name_similarity('Alex Smith', 'Alexander Smith'), CONFIDENCE_INITIAL)
+        self.assertEqual(name_similarity('Jane Smith', 'Smith J.'), CONFIDENCE_INITIAL)
+
+        resolver = PlayerResolver(self.db_path)
+        jane = resolver.add_player('Jane Smith')
+        resolver.add_alias('Smith J.', jane)
+        self.assertNotEqual(resolver.resolve_or_create('Jana Smith'), jane)
+
+    def test_initial_hit_stored_as_alias(self):
+        """Initial + surname hits are saved for later runs"""
+        resolver = PlayerResolver(self.db_path)
+        jane = resolver.add_player('Jane Smith')
+
+        match = resolver.resolve('Smith J.')
+        self.assertEqual(match.player_id, jane)
+        self.assertIn('smith j', [a['alias'] for a in resolver.get_aliases(jane)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)